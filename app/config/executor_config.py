@@ -64,6 +64,8 @@ class ExecutorSettings:
     qc_max_session_turns: int = 50
     qc_shell_timeout_ms: int = 600000
     code_execution_timeout: int = 7200
+    # Upper bound on one bridged agent run (deep think, manuscript fallback).
+    task_timeout: int = 14400
     # --- Layer 1/3: auto-execution and recovery ---
     force_rerun: bool = False
     auto_recovery: bool = False
@@ -211,6 +213,9 @@ def get_executor_settings() -> ExecutorSettings:
         code_execution_timeout=max(
             30, min(86400, _env_int("CODE_EXECUTION_TIMEOUT", defaults.code_execution_timeout))
         ),
+        task_timeout=max(
+            60, min(86400, _env_int("PLAN_EXECUTOR_TASK_TIMEOUT", defaults.task_timeout))
+        ),
         force_rerun=_env_bool("PLAN_EXECUTOR_FORCE_RERUN", defaults.force_rerun),
         auto_recovery=_env_bool("PLAN_EXECUTOR_AUTO_RECOVERY", defaults.auto_recovery),
         max_recovery_attempts=max(
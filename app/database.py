@@ -190,6 +190,31 @@ def init_db() -> None:
             "ON plan_decomposition_job_index(owner_id, created_at DESC)"
         )
 
+        # Plans with running jobs or in-progress tasks; startup recovery only
+        # visits these instead of every plan_*.sqlite file.
+        registry_exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='plan_recovery_registry'"
+        ).fetchone()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS plan_recovery_registry (
+                plan_id INTEGER PRIMARY KEY,
+                reason TEXT,
+                marked_at REAL NOT NULL,
+                FOREIGN KEY (plan_id) REFERENCES plans (id) ON DELETE CASCADE
+            )
+            """
+        )
+        if registry_exists is None:
+            # Databases created before the registry existed have no record of
+            # which plans were active, so the first recovery pass visits all.
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO plan_recovery_registry (plan_id, reason, marked_at)
+                SELECT id, 'backfill', 0 FROM plans
+                """
+            )
+
         # PhageScope tracking recovery table — persists in-flight tracking jobs so
         # the polling thread can be restarted after a server restart.
         conn.execute(
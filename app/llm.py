@@ -13,10 +13,27 @@ from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 import httpx
 
 from .interfaces import LLMProvider
+from .services.foundation.metrics import counter, histogram
 from .services.foundation.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+_LLM_REQUEST_SECONDS = histogram(
+    "llm_request_seconds",
+    "LLM HTTP request latency per attempt (whole stream for streaming calls).",
+    ("provider", "operation", "outcome"),
+)
+_LLM_FIRST_CHUNK_SECONDS = histogram(
+    "llm_time_to_first_chunk_seconds",
+    "Time from sending a streaming LLM request to its first data chunk.",
+    ("provider", "operation"),
+)
+_LLM_RETRIES = counter(
+    "llm_retries_total",
+    "LLM request attempts retried after a transient failure.",
+    ("provider", "operation"),
+)
+
 _usage_context: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
     "llm_usage_context", default=None
 )
@@ -80,6 +97,19 @@ _DEFAULT_CONNECT_TIMEOUT = 10.0
 _DEFAULT_TIMEOUT = httpx.Timeout(60.0, connect=_DEFAULT_CONNECT_TIMEOUT)
 
 
+def _encode_tool_payload(payload: Dict[str, Any]) -> bytes:
+    """JSON-encode a chat payload, reusing pre-serialized tool schemas when present."""
+    tools = payload.get("tools")
+    serialized_json = getattr(tools, "serialized_json", None)
+    if not callable(serialized_json):
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = json.dumps(
+        {key: value for key, value in payload.items() if key != "tools"},
+        ensure_ascii=False,
+    )
+    return f'{head[:-1]}, "tools": {serialized_json()}}}'.encode("utf-8")
+
+
 def _make_request_timeout(overall: Optional[float]) -> Optional[httpx.Timeout]:
     """Build a per-request ``httpx.Timeout`` that respects the caller's budget.
 
@@ -209,9 +239,9 @@ def _log_usage(
     total_tokens: int,
 ) -> None:
     try:
-        from .repository.llm_usage import log_llm_usage
+        from .repository.llm_usage import queue_llm_usage
         ctx = _usage_context.get()
-        log_llm_usage(
+        queue_llm_usage(
             provider=provider,
             model=model,
             prompt_tokens=prompt_tokens,
@@ -244,6 +274,42 @@ class NativeStreamResult:
     usage: Optional[Dict[str, int]] = None
 
 
+class _StreamTimer:
+    """Records stream duration and time to first chunk for one streaming call."""
+
+    __slots__ = ("provider", "operation", "started", "_first_chunk_seen")
+
+    def __init__(self, provider: str, operation: str) -> None:
+        self.provider = provider
+        self.operation = operation
+        self.started = 0.0
+        self._first_chunk_seen = False
+
+    def first_chunk(self) -> None:
+        if not self._first_chunk_seen:
+            self._first_chunk_seen = True
+            _LLM_FIRST_CHUNK_SECONDS.labels(self.provider, self.operation).observe(
+                time.perf_counter() - self.started
+            )
+
+    async def __aenter__(self) -> "_StreamTimer":
+        self.started = time.perf_counter()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            outcome = "ok"
+        elif issubclass(exc_type, (GeneratorExit, asyncio.CancelledError)):
+            outcome = "cancelled"
+        elif issubclass(exc_type, httpx.HTTPStatusError):
+            outcome = "http_error"
+        else:
+            outcome = "error"
+        _LLM_REQUEST_SECONDS.labels(self.provider, self.operation, outcome).observe(
+            time.perf_counter() - self.started
+        )
+
+
 def _truthy(val: Optional[str]) -> bool:
     return str(val).strip().lower() in {"1", "true", "yes", "y", "on"}
 
@@ -454,6 +520,8 @@ class LLMClient(LLMProvider):
         client = _get_shared_sync_client()
         last_err: Optional[Exception] = None
         for attempt in range(request_retries + 1):
+            started = time.perf_counter()
+            outcome = "error"
             try:
                 response = client.post(
                     self.url, headers=headers, json=payload,
@@ -472,12 +540,15 @@ class LLMClient(LLMProvider):
                             completion_tokens=usage.get("completion_tokens", 0),
                             total_tokens=usage.get("total_tokens", 0),
                         )
+                    outcome = "ok"
                     return content
                 except Exception:
                     raise RuntimeError(f"Unexpected LLM response: {obj}")
             except httpx.HTTPStatusError as e:
+                outcome = "http_error"
                 status_code = e.response.status_code if e.response is not None else None
                 if isinstance(status_code, int) and 500 <= status_code < 600 and attempt < request_retries:
+                    _LLM_RETRIES.labels(self.provider, "chat").inc()
                     delay = max(0.0, self.backoff_base * (2**attempt) + random.uniform(0, self.backoff_base / 4.0))
                     time.sleep(delay)
                     last_err = e
@@ -491,11 +562,16 @@ class LLMClient(LLMProvider):
             except Exception as e:
                 # Treat as transient (network) and retry
                 if attempt < request_retries:
+                    _LLM_RETRIES.labels(self.provider, "chat").inc()
                     delay = max(0.0, self.backoff_base * (2**attempt) + random.uniform(0, self.backoff_base / 4.0))
                     time.sleep(delay)
                     last_err = e
                     continue
                 raise RuntimeError(f"LLM request failed: {e}")
+            finally:
+                _LLM_REQUEST_SECONDS.labels(self.provider, "chat", outcome).observe(
+                    time.perf_counter() - started
+                )
 
     async def chat_async(
         self,
@@ -531,6 +607,8 @@ class LLMClient(LLMProvider):
         client = _get_shared_async_client()
 
         for attempt in range(request_retries + 1):
+            started = time.perf_counter()
+            outcome = "error"
             try:
                 response = await client.post(
                     self.url, headers=headers, json=payload,
@@ -549,12 +627,15 @@ class LLMClient(LLMProvider):
                             completion_tokens=usage.get("completion_tokens", 0),
                             total_tokens=usage.get("total_tokens", 0),
                         )
+                    outcome = "ok"
                     return content
                 except Exception:
                     raise RuntimeError(f"Unexpected LLM response: {obj}")
             except httpx.HTTPStatusError as e:
+                outcome = "http_error"
                 status_code = e.response.status_code if e.response is not None else None
                 if isinstance(status_code, int) and 500 <= status_code < 600 and attempt < request_retries:
+                    _LLM_RETRIES.labels(self.provider, "chat_async").inc()
                     delay = max(0.0, self.backoff_base * (2**attempt) + random.uniform(0, self.backoff_base / 4.0))
                     await asyncio.sleep(delay)
                     continue
@@ -566,10 +647,15 @@ class LLMClient(LLMProvider):
                 raise RuntimeError(f"LLM HTTPError: {status_code} {body}".strip())
             except Exception as e:
                 if attempt < request_retries:
+                    _LLM_RETRIES.labels(self.provider, "chat_async").inc()
                     delay = max(0.0, self.backoff_base * (2**attempt) + random.uniform(0, self.backoff_base / 4.0))
                     await asyncio.sleep(delay)
                     continue
                 raise RuntimeError(f"LLM request failed: {e}")
+            finally:
+                _LLM_REQUEST_SECONDS.labels(self.provider, "chat_async", outcome).observe(
+                    time.perf_counter() - started
+                )
 
     async def stream_chat_async(
         self,
@@ -616,7 +702,7 @@ class LLMClient(LLMProvider):
 
         timeout = _make_request_timeout(self.stream_timeout)
         client = _get_shared_async_client()
-        async with client.stream(
+        async with _StreamTimer(self.provider, "stream_chat") as timer, client.stream(
             "POST", self.url, headers=headers, json=payload,
             timeout=timeout,
         ) as resp:
@@ -635,6 +721,7 @@ class LLMClient(LLMProvider):
                     obj = json.loads(data)
                 except json.JSONDecodeError:
                     continue
+                timer.first_chunk()
 
                 # Extract usage from last chunk (typically has finish_reason)
                 usage = obj.get("usage")
@@ -711,6 +798,7 @@ class LLMClient(LLMProvider):
                     or isinstance(e, (httpx.ConnectError, httpx.RemoteProtocolError))
                 )
                 if is_transient and attempt < max_retries:
+                    _LLM_RETRIES.labels(self.provider, "stream_chat_with_tools").inc()
                     delay = max(0.5, self.backoff_base * (2 ** attempt))
                     logger.warning(
                         "[LLM] stream_chat_with_tools transient error (attempt %d/%d): %s. Retrying in %.1fs",
@@ -776,8 +864,11 @@ class LLMClient(LLMProvider):
 
         timeout = _make_request_timeout(self.stream_timeout)
         client = _get_shared_async_client()
-        async with client.stream("POST", self.url, headers=headers, json=payload,
-                                 timeout=timeout) as resp:
+        async with _StreamTimer(self.provider, "stream_chat_with_tools") as timer, client.stream(
+            "POST", self.url, headers=headers,
+            content=_encode_tool_payload(payload),
+            timeout=timeout,
+        ) as resp:
             resp.raise_for_status()
             async for line in resp.aiter_lines():
                 if not line or not line.startswith("data:"):
@@ -789,6 +880,7 @@ class LLMClient(LLMProvider):
                     obj = json.loads(data)
                 except json.JSONDecodeError:
                     continue
+                timer.first_chunk()
 
                 # Extract usage from last chunk
                 usage = obj.get("usage")
@@ -4,6 +4,7 @@ This module provides the main FastAPI application entry point with centralized
 configuration, lifecycle management, and route registration.
 """
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -36,13 +37,21 @@ from .services.realtime_bus import close_realtime_bus, init_realtime_bus
 # Import router function
 from .routers import get_all_routers
 from .repository.chat_runs import fix_stale_chat_runs_on_startup
-from .repository.plan_repository import fix_stale_plan_task_statuses_on_startup
 from .repository.plan_storage import fix_stale_jobs_on_startup
 from .services.foundation.logging_config import setup_logging
 from .services.foundation.settings import get_settings
+from .services.plans.plan_recovery import DEFAULT_RECOVERY_CONCURRENCY, start_plan_recovery
 from .utils.route_helpers import parse_bool
 
 
+def _plan_recovery_concurrency() -> int:
+    raw = os.getenv("PLAN_RECOVERY_CONCURRENCY")
+    try:
+        return max(1, int(raw)) if raw else DEFAULT_RECOVERY_CONCURRENCY
+    except ValueError:
+        return DEFAULT_RECOVERY_CONCURRENCY
+
+
 @asynccontextmanager
 async def lifespan(_fastapi_app: FastAPI):
     """Application lifespan context manager for FastAPI startup and shutdown.
@@ -116,15 +125,13 @@ async def lifespan(_fastapi_app: FastAPI):
     except Exception as e:
         logging.getLogger("app.main").warning("Failed to fix stale chat runs: %s", e)
 
+    # Plans that had running jobs/tasks are recovered in the background; plan
+    # endpoints wait for (or perform) recovery of the plan they touch.
+    plan_recovery_task = None
     try:
-        task_fixed = fix_stale_plan_task_statuses_on_startup()
-        if task_fixed > 0:
-            logging.getLogger("app.main").info(
-                "Recovered %d interrupted task status(es) from execution results after restart",
-                task_fixed,
-            )
+        plan_recovery_task = start_plan_recovery(max_concurrency=_plan_recovery_concurrency())
     except Exception as e:
-        logging.getLogger("app.main").warning("Failed to fix stale plan task statuses: %s", e)
+        logging.getLogger("app.main").warning("Failed to start plan recovery: %s", e)
 
     # Resume any PhageScope tracking threads that were running before restart
     try:
@@ -209,10 +216,31 @@ async def lifespan(_fastapi_app: FastAPI):
 
     yield
 
+    if plan_recovery_task is not None and not plan_recovery_task.done():
+        plan_recovery_task.cancel()
+
     # Gracefully close shared HTTP connection pools on shutdown.
     await close_realtime_bus()
     await close_shared_clients()
 
+    try:
+        from .services.background_loop import shutdown_background_loop
+        await asyncio.to_thread(shutdown_background_loop)
+    except Exception as e:
+        logging.getLogger("app.main").warning("Failed to stop background event loop: %s", e)
+
+    try:
+        from .repository.llm_usage import shutdown_llm_usage_writer
+        shutdown_llm_usage_writer()
+    except Exception as e:
+        logging.getLogger("app.main").warning("Failed to flush LLM usage records: %s", e)
+
+    try:
+        from .services.upload_extraction import shutdown_archive_extraction_manager
+        shutdown_archive_extraction_manager()
+    except Exception as e:
+        logging.getLogger("app.main").warning("Failed to stop archive extraction workers: %s", e)
+
 
 async def base_error_handler(_request: Request, exc: BaseError):
     """exception."""
@@ -256,7 +284,11 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         )
 
     error_response = handle_api_error(error, include_debug=False)
-    return JSONResponse(status_code=exc.status_code, content=error_response)
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=error_response,
+        headers=getattr(exc, "headers", None),
+    )
 
 
 async def general_exception_handler(request: Request, exc: Exception):
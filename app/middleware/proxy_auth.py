@@ -36,7 +36,7 @@ def _trim_header(value: Optional[str], *, limit: int = 256) -> Optional[str]:
     return text
 def _is_anonymous_path(path: str) -> bool:
     normalized = str(path or "").strip() or "/"
-    if normalized in {"/health", "/health/llm", "/openapi.json", "/docs", "/redoc"}:
+    if normalized in {"/health", "/health/llm", "/metrics", "/openapi.json", "/docs", "/redoc"}:
         return True
     if normalized.startswith("/auth") or normalized.startswith("/sso"):
         return True
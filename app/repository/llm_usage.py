@@ -1,13 +1,61 @@
+"""LLM token usage log.
+
+Usage from LLM calls is queued with :func:`queue_llm_usage` and written by a
+background :class:`LLMUsageWriter` in batches (by size or every
+``LLM_USAGE_FLUSH_INTERVAL_MS``), so completions never wait on a SQLite
+commit.  Each batch also upserts per-minute rollups in
+``llm_usage_rollup_minute``, which the time-window dashboard summary reads
+instead of scanning the raw log.
+"""
+
 from __future__ import annotations
 
+import atexit
 import logging
+import os
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Iterable, List, Optional
 
 from ..database import get_db
+from ..services.foundation.metrics import counter
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_FLUSH_INTERVAL_MS = 500
+DEFAULT_FLUSH_BATCH = 100
+DEFAULT_MAX_BUFFER = 10_000
+
+_USAGE_DROPPED = counter(
+    "llm_usage_records_dropped_total",
+    "LLM usage records dropped because the write buffer was full or a flush failed.",
+)
+
+_INSERT_USAGE_SQL = """
+    INSERT INTO llm_usage_log (
+        provider, model, prompt_tokens, completion_tokens, total_tokens,
+        created_at, session_id, plan_id, task_id, call_purpose,
+        input_cost, output_cost, estimated_cost, cost_currency
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_ROLLUP_SQL = """
+    INSERT INTO llm_usage_rollup_minute (
+        minute, provider, model, call_purpose, call_count,
+        prompt_tokens, completion_tokens, total_tokens, estimated_cost
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(minute, provider, model, call_purpose) DO UPDATE SET
+        call_count = call_count + excluded.call_count,
+        prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+        completion_tokens = completion_tokens + excluded.completion_tokens,
+        total_tokens = total_tokens + excluded.total_tokens,
+        estimated_cost = estimated_cost + excluded.estimated_cost
+"""
+
 
 def init_llm_usage_table() -> None:
     with get_db() as conn:
@@ -29,9 +77,47 @@ def init_llm_usage_table() -> None:
         # Migration: add session-scoped/cost columns if they don't exist
         _migrate_add_session_columns(conn)
         _migrate_add_cost_columns(conn)
+        _create_rollup_table(conn)
         conn.commit()
 
 
+def _create_rollup_table(conn: Any) -> None:
+    """Per-minute usage rollups; backfilled from the raw log on first creation."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS llm_usage_rollup_minute (
+            minute TEXT NOT NULL,
+            provider TEXT NOT NULL,
+            model TEXT NOT NULL,
+            call_purpose TEXT NOT NULL DEFAULT '',
+            call_count INTEGER NOT NULL DEFAULT 0,
+            prompt_tokens INTEGER NOT NULL DEFAULT 0,
+            completion_tokens INTEGER NOT NULL DEFAULT 0,
+            total_tokens INTEGER NOT NULL DEFAULT 0,
+            estimated_cost REAL NOT NULL DEFAULT 0.0,
+            PRIMARY KEY (minute, provider, model, call_purpose)
+        )
+    """)
+    conn.execute("""
+        INSERT INTO llm_usage_rollup_minute (
+            minute, provider, model, call_purpose, call_count,
+            prompt_tokens, completion_tokens, total_tokens, estimated_cost
+        )
+        SELECT
+            substr(created_at, 1, 16),
+            provider,
+            model,
+            COALESCE(call_purpose, ''),
+            COUNT(*),
+            COALESCE(SUM(prompt_tokens), 0),
+            COALESCE(SUM(completion_tokens), 0),
+            COALESCE(SUM(total_tokens), 0),
+            COALESCE(SUM(estimated_cost), 0.0)
+        FROM llm_usage_log
+        WHERE NOT EXISTS (SELECT 1 FROM llm_usage_rollup_minute)
+        GROUP BY substr(created_at, 1, 16), provider, model, COALESCE(call_purpose, '')
+    """)
+
+
 def _migrate_add_columns(conn: Any, columns: List[tuple[str, str]]) -> set[str]:
     cursor = conn.execute("PRAGMA table_info(llm_usage_log)")
     existing_columns = {row["name"] for row in cursor.fetchall()}
@@ -129,7 +215,7 @@ def estimate_llm_cost(
         "cost_currency": "CNY",
     }
 
-def log_llm_usage(
+def _usage_record(
     *,
     provider: str,
     model: str,
@@ -144,7 +230,8 @@ def log_llm_usage(
     output_cost: Optional[float] = None,
     estimated_cost: Optional[float] = None,
     cost_currency: Optional[str] = None,
-) -> None:
+    created_at: Optional[str] = None,
+) -> tuple:
     if estimated_cost is None:
         estimated = estimate_llm_cost(
             provider=provider,
@@ -156,73 +243,269 @@ def log_llm_usage(
         output_cost = estimated["output_cost"] if output_cost is None else output_cost
         estimated_cost = estimated["estimated_cost"]
         cost_currency = cost_currency or estimated["cost_currency"]
+    return (
+        provider,
+        model,
+        prompt_tokens,
+        completion_tokens,
+        total_tokens,
+        created_at or datetime.now().isoformat(),
+        session_id,
+        plan_id,
+        task_id,
+        call_purpose,
+        input_cost,
+        output_cost,
+        estimated_cost,
+        cost_currency,
+    )
+
+
+def _rollup_rows(records: Iterable[tuple]) -> List[tuple]:
+    rollups: Dict[tuple, List[Any]] = {}
+    for record in records:
+        key = (record[5][:16], record[0], record[1], record[9] or "")
+        bucket = rollups.setdefault(key, [0, 0, 0, 0, 0.0])
+        bucket[0] += 1
+        bucket[1] += int(record[2] or 0)
+        bucket[2] += int(record[3] or 0)
+        bucket[3] += int(record[4] or 0)
+        bucket[4] += float(record[12] or 0.0)
+    return [key + tuple(values) for key, values in rollups.items()]
+
 
+def _write_usage_records(conn: Any, records: List[tuple]) -> None:
+    if len(records) == 1:
+        conn.execute(_INSERT_USAGE_SQL, records[0])
+    else:
+        conn.executemany(_INSERT_USAGE_SQL, records)
+    try:
+        conn.executemany(_UPSERT_ROLLUP_SQL, _rollup_rows(records))
+    except Exception as exc:
+        # Databases created before the rollup table existed; the raw log is authoritative.
+        logger.debug("Skipping LLM usage rollup update: %s", exc)
+
+
+def log_llm_usage(
+    *,
+    provider: str,
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    total_tokens: int,
+    session_id: Optional[str] = None,
+    plan_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    call_purpose: Optional[str] = None,
+    input_cost: Optional[float] = None,
+    output_cost: Optional[float] = None,
+    estimated_cost: Optional[float] = None,
+    cost_currency: Optional[str] = None,
+    created_at: Optional[str] = None,
+) -> None:
+    """Write one usage record synchronously (see :func:`queue_llm_usage`)."""
+    record = _usage_record(
+        provider=provider,
+        model=model,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=total_tokens,
+        session_id=session_id,
+        plan_id=plan_id,
+        task_id=task_id,
+        call_purpose=call_purpose,
+        input_cost=input_cost,
+        output_cost=output_cost,
+        estimated_cost=estimated_cost,
+        cost_currency=cost_currency,
+        created_at=created_at,
+    )
     with get_db() as conn:
-        conn.execute(
-            """
-            INSERT INTO llm_usage_log (
-                provider, model, prompt_tokens, completion_tokens, total_tokens,
-                created_at, session_id, plan_id, task_id, call_purpose,
-                input_cost, output_cost, estimated_cost, cost_currency
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                provider,
-                model,
-                prompt_tokens,
-                completion_tokens,
-                total_tokens,
-                datetime.now().isoformat(),
-                session_id,
-                plan_id,
-                task_id,
-                call_purpose,
-                input_cost,
-                output_cost,
-                estimated_cost,
-                cost_currency,
-            ),
-        )
+        _write_usage_records(conn, [record])
         conn.commit()
 
 
+def _env_positive_int(name: str, default: int) -> int:
+    try:
+        value = int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+class LLMUsageWriter:
+    """Buffers usage records and writes them in batches from a daemon thread."""
+
+    def __init__(
+        self,
+        *,
+        flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_MS / 1000.0,
+        batch_size: int = DEFAULT_FLUSH_BATCH,
+        max_buffer: int = DEFAULT_MAX_BUFFER,
+    ) -> None:
+        self._interval = max(0.001, flush_interval_seconds)
+        self._batch_size = max(1, batch_size)
+        self._max_buffer = max(self._batch_size, max_buffer)
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._changed = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @classmethod
+    def from_env(cls) -> "LLMUsageWriter":
+        return cls(
+            flush_interval_seconds=_env_positive_int("LLM_USAGE_FLUSH_INTERVAL_MS", DEFAULT_FLUSH_INTERVAL_MS) / 1000.0,
+            batch_size=_env_positive_int("LLM_USAGE_FLUSH_BATCH", DEFAULT_FLUSH_BATCH),
+            max_buffer=_env_positive_int("LLM_USAGE_MAX_BUFFER", DEFAULT_MAX_BUFFER),
+        )
+
+    @property
+    def pending(self) -> int:
+        with self._changed:
+            return len(self._buffer)
+
+    def submit(self, fields: Dict[str, Any]) -> None:
+        fields.setdefault("created_at", datetime.now().isoformat())
+        with self._changed:
+            if self._closed:
+                # After shutdown there is no writer thread left; write inline.
+                closed = True
+            else:
+                closed = False
+                if len(self._buffer) >= self._max_buffer:
+                    self._buffer.popleft()
+                    _USAGE_DROPPED.inc()
+                self._buffer.append(fields)
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="llm-usage-writer", daemon=True
+                    )
+                    self._thread.start()
+                if len(self._buffer) == 1 or len(self._buffer) >= self._batch_size:
+                    self._changed.notify_all()
+        if closed:
+            log_llm_usage(**fields)
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of records written."""
+        with self._flush_lock:
+            with self._changed:
+                batch = list(self._buffer)
+                self._buffer.clear()
+            if not batch:
+                return 0
+            try:
+                records = [_usage_record(**fields) for fields in batch]
+                with get_db() as conn:
+                    _write_usage_records(conn, records)
+                    conn.commit()
+            except Exception as exc:
+                _USAGE_DROPPED.inc(len(batch))
+                logger.warning("[LLM] Failed to write %d usage record(s): %s", len(batch), exc)
+                return 0
+            return len(records)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        with self._changed:
+            self._closed = True
+            thread = self._thread
+            self._changed.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._changed:
+                while not self._buffer and not self._closed:
+                    self._changed.wait()
+                if self._closed:
+                    break
+                deadline = time.monotonic() + self._interval
+                while not self._closed and len(self._buffer) < self._batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+            self.flush()
+        self.flush()
+
+
+_writer: Optional[LLMUsageWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_llm_usage_writer() -> LLMUsageWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = LLMUsageWriter.from_env()
+                atexit.register(_writer.shutdown)
+    return _writer
+
+
+def queue_llm_usage(**fields: Any) -> None:
+    """Record usage without blocking on SQLite; written by the background writer."""
+    get_llm_usage_writer().submit(fields)
+
+
+def flush_llm_usage() -> int:
+    if _writer is None:
+        return 0
+    return _writer.flush()
+
+
+def shutdown_llm_usage_writer() -> None:
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.shutdown()
+
+
 def get_usage_summary(hours: int = 24) -> Dict[str, Any]:
+    """Usage totals for today (``hours >= 24``) or the last ``hours`` hours.
+
+    Reads the per-minute rollups, so the window is resolved to whole minutes.
+    """
     cutoff = datetime.now().isoformat()[:10] + "T00:00:00"
     if hours < 24:
-        from datetime import timedelta
         cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+    cutoff_minute = cutoff[:16]
+    flush_llm_usage()
 
     with get_db() as conn:
         row = conn.execute(
             """
             SELECT
-                COUNT(*) as call_count,
+                COALESCE(SUM(call_count), 0) as call_count,
                 COALESCE(SUM(prompt_tokens), 0) as total_prompt_tokens,
                 COALESCE(SUM(completion_tokens), 0) as total_completion_tokens,
                 COALESCE(SUM(total_tokens), 0) as total_tokens,
                 COALESCE(SUM(estimated_cost), 0.0) as estimated_cost
-            FROM llm_usage_log
-            WHERE created_at >= ?
+            FROM llm_usage_rollup_minute
+            WHERE minute >= ?
             """,
-            (cutoff,),
+            (cutoff_minute,),
         ).fetchone()
 
         by_model_rows = conn.execute(
             """
             SELECT
                 model,
-                COUNT(*) as call_count,
+                COALESCE(SUM(call_count), 0) as call_count,
                 COALESCE(SUM(prompt_tokens), 0) as prompt_tokens,
                 COALESCE(SUM(completion_tokens), 0) as completion_tokens,
                 COALESCE(SUM(total_tokens), 0) as total_tokens,
                 COALESCE(SUM(estimated_cost), 0.0) as estimated_cost
-            FROM llm_usage_log
-            WHERE created_at >= ?
+            FROM llm_usage_rollup_minute
+            WHERE minute >= ?
             GROUP BY model
             ORDER BY total_tokens DESC
             """,
-            (cutoff,),
+            (cutoff_minute,),
         ).fetchall()
 
     by_model = []
@@ -248,6 +531,7 @@ def get_usage_summary(hours: int = 24) -> Dict[str, Any]:
 
 
 def get_session_usage_summary(session_id: str) -> Dict[str, Any]:
+    flush_llm_usage()
     with get_db() as conn:
         row = conn.execute(
             """
@@ -330,6 +614,7 @@ def get_session_usage_summary(session_id: str) -> Dict[str, Any]:
 
 
 def get_plan_tasks_usage_summary(plan_id: int) -> List[Dict[str, Any]]:
+    flush_llm_usage()
     with get_db() as conn:
         rows = conn.execute(
             """
@@ -6,6 +6,7 @@ from collections import defaultdict
 from typing import Any, Dict, List, Optional, Tuple, Set
 
 from ..database import get_db, plan_db_connection
+from ..services.foundation.metrics import histogram, timed
 from ..services.request_principal import get_current_principal
 from ..services.plans.dependency_validation import (
     build_normalized_dependency_map,
@@ -13,14 +14,24 @@ from ..services.plans.dependency_validation import (
 )
 from ..services.plans.plan_models import PlanNode, PlanSummary, PlanTree
 from .plan_storage import (
+    ACTIVE_TASK_STATUSES,
+    clear_plan_recovery_if_idle,
+    fail_interrupted_plan_jobs,
     get_plan_db_path,
     initialize_plan_database,
+    mark_plan_needs_recovery,
     remove_plan_database,
     update_plan_metadata,
 )
 
 logger = logging.getLogger(__name__)
 
+_REPOSITORY_SECONDS = histogram(
+    "plan_repository_seconds",
+    "Latency of PlanRepository operations.",
+    ("method",),
+)
+
 
 class PlanRepository:
     """Repository for plan metadata (main DB) and per-plan SQLite storage."""
@@ -29,6 +40,7 @@ class PlanRepository:
         self._execution_column_checked: set[int] = set()
         self._status_column_checked: set[int] = set()
 
+    @timed(_REPOSITORY_SECONDS, method="list_plans")
     def list_plans(self, *, owner: Optional[str] = None) -> List[PlanSummary]:
         resolved_owner = _resolve_owner(owner)
         sql = """
@@ -58,11 +70,13 @@ class PlanRepository:
             )
         return summaries
 
+    @timed(_REPOSITORY_SECONDS, method="get_plan_tree")
     def get_plan_tree(self, plan_id: int) -> PlanTree:
         plan_row = self._get_plan_record(plan_id)
         task_rows, dependency_map = self._load_tasks_and_dependencies(plan_id)
         return _rows_to_plan_tree(plan_id, plan_row, task_rows, dependency_map)
 
+    @timed(_REPOSITORY_SECONDS, method="get_plan_summary")
     def get_plan_summary(self, plan_id: int) -> PlanSummary:
         plan_row = self._get_plan_record(plan_id)
         return PlanSummary(
@@ -74,6 +88,7 @@ class PlanRepository:
             updated_at=plan_row["updated_at"],
         )
 
+    @timed(_REPOSITORY_SECONDS, method="create_plan")
     def create_plan(
         self,
         title: str,
@@ -111,11 +126,13 @@ class PlanRepository:
         )
         return self.get_plan_tree(plan_id)
 
+    @timed(_REPOSITORY_SECONDS, method="delete_plan")
     def delete_plan(self, plan_id: int) -> None:
         remove_plan_database(plan_id)
         with get_db() as conn:
             conn.execute("DELETE FROM plans WHERE id=?", (plan_id,))
 
+    @timed(_REPOSITORY_SECONDS, method="update_plan_metadata")
     def update_plan_metadata(self, plan_id: int, metadata: Dict[str, Any]) -> None:
         """Merge new metadata keys into the existing plan metadata.
 
@@ -143,6 +160,7 @@ class PlanRepository:
                 (metadata_json, plan_id),
             )
 
+    @timed(_REPOSITORY_SECONDS, method="create_task")
     def create_task(
         self,
         plan_id: int,
@@ -175,6 +193,7 @@ class PlanRepository:
         self._touch_plan(plan_id)
         return node
 
+    @timed(_REPOSITORY_SECONDS, method="update_task")
     def update_task(
         self,
         plan_id: int,
@@ -206,6 +225,8 @@ class PlanRepository:
                 execution_result=execution_result,
             )
 
+        if status is not None and status.strip().lower() in ACTIVE_TASK_STATUSES:
+            mark_plan_needs_recovery(plan_id, reason=f"task:{task_id}")
         self._touch_plan(plan_id)
         return node
 
@@ -453,6 +474,7 @@ class PlanRepository:
 
         return updated
 
+    @timed(_REPOSITORY_SECONDS, method="cascade_update_descendants_status")
     def cascade_update_descendants_status(
         self,
         plan_id: int,
@@ -514,12 +536,14 @@ class PlanRepository:
             self._touch_plan(plan_id)
         return updated
 
+    @timed(_REPOSITORY_SECONDS, method="delete_task")
     def delete_task(self, plan_id: int, task_id: int) -> None:
         with plan_db_connection(get_plan_db_path(plan_id)) as conn:
             self._delete_task_with_conn(conn, plan_id, task_id)
 
         self._touch_plan(plan_id)
 
+    @timed(_REPOSITORY_SECONDS, method="move_task")
     def move_task(
         self,
         plan_id: int,
@@ -540,6 +564,7 @@ class PlanRepository:
         self._touch_plan(plan_id)
         return node
 
+    @timed(_REPOSITORY_SECONDS, method="apply_changes_atomically")
     def apply_changes_atomically(
         self,
         plan_id: int,
@@ -685,6 +710,7 @@ class PlanRepository:
 
         raise ValueError(f"Change #{idx} has unknown action: {action or '<missing>'}")
 
+    @timed(_REPOSITORY_SECONDS, method="upsert_plan_tree")
     def upsert_plan_tree(self, tree: PlanTree, *, note: Optional[str] = None) -> None:
         ordered_nodes = tree.ordered_nodes()
         snapshot_json = (
@@ -802,12 +828,14 @@ class PlanRepository:
 
         self._touch_plan(tree.id)
 
+    @timed(_REPOSITORY_SECONDS, method="get_node")
     def get_node(self, plan_id: int, task_id: int) -> PlanNode:
         with plan_db_connection(get_plan_db_path(plan_id)) as conn:
             self._ensure_task_columns(conn, plan_id)
             self._reconcile_task_statuses_from_execution_results(conn, plan_id)
             return self._get_node_from_conn(conn, plan_id, task_id)
 
+    @timed(_REPOSITORY_SECONDS, method="subgraph")
     def subgraph(
         self, plan_id: int, node_id: int, max_depth: int = 2
     ) -> List[PlanNode]:
@@ -1102,6 +1130,7 @@ class PlanRepository:
                 (index, row["id"]),
             )
 
+    @timed(_REPOSITORY_SECONDS, method="reindex_all_positions")
     def reindex_all_positions(self, plan_id: int) -> None:
         """Recompact positions for every parent group in the plan.
 
@@ -1603,8 +1632,32 @@ def _resolve_owner(owner: Optional[str]) -> Optional[str]:
     return current.owner_id
 
 
+def recover_interrupted_plan(plan_id: int, repo: Optional[PlanRepository] = None) -> int:
+    """Fail interrupted jobs and reset interrupted tasks of one plan after a restart.
+
+    Returns the number of task rows whose status was recovered. The plan is
+    removed from the recovery registry once nothing in it is still active.
+    """
+
+    plan_path = get_plan_db_path(plan_id)
+    recovered = 0
+    if plan_path.exists():
+        fail_interrupted_plan_jobs(plan_id)
+        with plan_db_connection(plan_path) as conn:
+            recovered = (repo or PlanRepository())._reconcile_active_task_statuses_from_execution_results(
+                conn,
+                plan_id,
+            )
+    clear_plan_recovery_if_idle(plan_id)
+    return recovered
+
+
 def fix_stale_plan_task_statuses_on_startup() -> int:
-    """Recover interrupted task rows whose execution_result already reached a terminal state."""
+    """Recover interrupted task rows whose execution_result already reached a terminal state.
+
+    Scans every plan; the application lifespan uses the recovery registry
+    (``app.services.plans.plan_recovery``) instead.
+    """
 
     repo = PlanRepository()
     with get_db() as conn:
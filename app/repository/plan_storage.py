@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from app.config.database_config import get_database_config
 from app.database import get_db, plan_db_connection
@@ -16,6 +19,9 @@ logger = logging.getLogger(__name__)
 SCHEMA_VERSION = "2"
 LEGACY_LOCAL_OWNER_ID = "legacy-local"
 
+ACTIVE_JOB_STATUSES = ("running", "queued")
+ACTIVE_TASK_STATUSES = ("running", "queued", "delegating")
+
 SENSITIVE_KEYS = {
     "api_key",
     "authorization",
@@ -140,6 +146,8 @@ def initialize_plan_database(
 
         _ensure_decomposition_tables(conn)
         _ensure_action_log_tables(conn, plan_id=plan_id)
+        _ensure_artifact_manifest_tables(conn)
+    _mark_artifact_manifest_ready(db_path)
 
     logger.info("Initialized plan database %s at %s", plan_id, db_path)
     return db_path
@@ -309,6 +317,8 @@ def record_decomposition_job(
                 metadata_json,
             ),
         )
+    if plan_id is not None and status in ACTIVE_JOB_STATUSES:
+        mark_plan_needs_recovery(plan_id, reason=f"job:{job_type}")
 
 
 def update_decomposition_job_status(
@@ -352,6 +362,12 @@ def update_decomposition_job_status(
             f"UPDATE decomposition_jobs SET {', '.join(sets)} WHERE job_id=?",
             params,
         )
+    if plan_id is None or status is None:
+        return
+    if status in ACTIVE_JOB_STATUSES:
+        mark_plan_needs_recovery(plan_id, reason="job")
+    else:
+        clear_plan_recovery_if_idle(plan_id)
 
 
 def append_decomposition_job_log(
@@ -544,6 +560,198 @@ def _ensure_action_log_tables(conn, *, plan_id: Optional[int] = None) -> None:
         )
 
 
+def _ensure_artifact_manifest_tables(conn) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS artifact_manifest_meta (
+            session_key TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            fields_json TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS artifact_manifest (
+            session_key TEXT NOT NULL,
+            alias TEXT NOT NULL,
+            producer_task_id INTEGER,
+            path TEXT,
+            entry_hash TEXT NOT NULL,
+            entry_json TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (session_key, alias)
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_artifact_manifest_producer "
+        "ON artifact_manifest(session_key, producer_task_id)"
+    )
+
+
+# Plan databases whose manifest tables exist.  New databases get them in
+# initialize_plan_database; older ones are migrated once per process here.
+_artifact_manifest_ready: set[str] = set()
+_artifact_manifest_ready_lock = threading.Lock()
+
+
+def _mark_artifact_manifest_ready(db_path: Path) -> None:
+    with _artifact_manifest_ready_lock:
+        _artifact_manifest_ready.add(str(db_path))
+
+
+def _ensure_artifact_manifest_ready(conn, db_path: Path) -> None:
+    if str(db_path) in _artifact_manifest_ready:
+        return
+    _ensure_artifact_manifest_tables(conn)
+    _mark_artifact_manifest_ready(db_path)
+
+
+def _existing_plan_db_path(plan_id: int) -> Optional[Path]:
+    db_path = get_plan_db_path(plan_id)
+    return db_path if db_path.exists() else None
+
+
+def _artifact_entry_row(entry: Any) -> Tuple[Optional[int], Optional[str], str, str]:
+    """``(producer_task_id, path, entry_hash, entry_json)`` for one manifest entry."""
+    entry_json = json.dumps(entry, ensure_ascii=False, sort_keys=True, default=str)
+    entry_hash = hashlib.sha256(entry_json.encode("utf-8")).hexdigest()
+    producer: Optional[int] = None
+    path: Optional[str] = None
+    if isinstance(entry, dict):
+        try:
+            producer = int(entry.get("producer_task_id"))
+        except (TypeError, ValueError):
+            producer = None
+        path = str(entry["path"]) if entry.get("path") else None
+    return producer, path, entry_hash, entry_json
+
+
+def load_artifact_manifest_record(plan_id: int, session_key: str = "") -> Optional[Dict[str, Any]]:
+    """Read the stored artifact manifest of one plan/session.
+
+    Returns ``None`` when the plan has no database.  A manifest that was never
+    written comes back with ``version`` 0.
+    """
+    db_path = _existing_plan_db_path(plan_id)
+    if db_path is None:
+        return None
+    with plan_db_connection(db_path) as conn:
+        _ensure_artifact_manifest_ready(conn, db_path)
+        meta = conn.execute(
+            "SELECT version, fields_json FROM artifact_manifest_meta WHERE session_key=?",
+            (session_key,),
+        ).fetchone()
+        rows = conn.execute(
+            "SELECT alias, entry_json FROM artifact_manifest WHERE session_key=? ORDER BY alias",
+            (session_key,),
+        ).fetchall()
+    fields = _json_load(meta["fields_json"]) if meta else None
+    return {
+        "version": int(meta["version"]) if meta else 0,
+        "fields": fields if isinstance(fields, dict) else {},
+        "artifacts": {row["alias"]: _json_load(row["entry_json"]) for row in rows},
+    }
+
+
+def get_artifact_manifest_version(plan_id: int, session_key: str = "") -> Optional[int]:
+    """Current manifest version, or ``None`` when the plan has no database."""
+    db_path = _existing_plan_db_path(plan_id)
+    if db_path is None:
+        return None
+    with plan_db_connection(db_path) as conn:
+        _ensure_artifact_manifest_ready(conn, db_path)
+        row = conn.execute(
+            "SELECT version FROM artifact_manifest_meta WHERE session_key=?",
+            (session_key,),
+        ).fetchone()
+    return int(row["version"]) if row else 0
+
+
+def upsert_artifact_manifest(
+    plan_id: int,
+    session_key: str = "",
+    *,
+    fields: Optional[Dict[str, Any]] = None,
+    artifacts: Optional[Dict[str, Any]] = None,
+    legacy: Optional[Callable[[], Tuple[Dict[str, Any], Dict[str, Any]]]] = None,
+) -> Optional[Tuple[int, bool]]:
+    """Merge manifest fields and artifact entries into the plan database.
+
+    Only entries whose content differs from the stored row are written, and
+    the manifest version is bumped once per call that changed anything.
+    ``legacy`` is consulted the first time a manifest is stored and returns
+    ``(fields, artifacts)`` to seed it with.  Returns ``(version, changed)``,
+    or ``None`` when the plan has no database.
+    """
+    db_path = _existing_plan_db_path(plan_id)
+    if db_path is None:
+        return None
+    fields = dict(fields or {})
+    artifacts = dict(artifacts or {})
+    with plan_db_connection(db_path) as conn:
+        _ensure_artifact_manifest_ready(conn, db_path)
+        conn.execute("BEGIN IMMEDIATE")
+        meta = conn.execute(
+            "SELECT version, fields_json FROM artifact_manifest_meta WHERE session_key=?",
+            (session_key,),
+        ).fetchone()
+        if meta is None and legacy is not None:
+            legacy_fields, legacy_artifacts = legacy()
+            fields = {**legacy_fields, **fields}
+            artifacts = {**legacy_artifacts, **artifacts}
+        current_version = int(meta["version"]) if meta else 0
+        stored_fields = (_json_load(meta["fields_json"]) if meta else None) or {}
+        merged_fields = {**stored_fields, **fields}
+        stored_hashes = {
+            row["alias"]: row["entry_hash"]
+            for row in conn.execute(
+                "SELECT alias, entry_hash FROM artifact_manifest WHERE session_key=?",
+                (session_key,),
+            )
+        }
+        version = current_version + 1
+        changed_rows = []
+        for alias, entry in artifacts.items():
+            producer, path, entry_hash, entry_json = _artifact_entry_row(entry)
+            if stored_hashes.get(alias) != entry_hash:
+                changed_rows.append((session_key, alias, producer, path, entry_hash, entry_json, version))
+        if meta is not None and not changed_rows and merged_fields == stored_fields:
+            return current_version, False
+
+        conn.executemany(
+            """
+            INSERT INTO artifact_manifest (
+                session_key, alias, producer_task_id, path, entry_hash, entry_json, version
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(session_key, alias) DO UPDATE SET
+                producer_task_id=excluded.producer_task_id,
+                path=excluded.path,
+                entry_hash=excluded.entry_hash,
+                entry_json=excluded.entry_json,
+                version=excluded.version,
+                updated_at=CURRENT_TIMESTAMP
+            """,
+            changed_rows,
+        )
+        conn.execute(
+            """
+            INSERT INTO artifact_manifest_meta (session_key, version, fields_json)
+            VALUES (?, ?, ?)
+            ON CONFLICT(session_key) DO UPDATE SET
+                version=excluded.version,
+                fields_json=excluded.fields_json,
+                updated_at=CURRENT_TIMESTAMP
+            """,
+            (session_key, version, _json_dump(merged_fields)),
+        )
+    return version, True
+
+
 def _trim_text(value: Optional[str], *, limit: int = 1024) -> Optional[str]:
     if value is None:
         return None
@@ -816,6 +1024,29 @@ def cleanup_action_logs(
                 )
 
 
+def _fail_interrupted_jobs(conn, finished_at: str) -> int:
+    _ensure_decomposition_tables(conn)
+    result = conn.execute(
+        """
+        UPDATE decomposition_jobs 
+        SET status='failed', error='Job interrupted by server restart', finished_at=?
+        WHERE status IN ('running', 'queued')
+        """,
+        (finished_at,),
+    )
+    return result.rowcount
+
+
+def fail_interrupted_plan_jobs(plan_id: int) -> int:
+    """Mark running/queued jobs stored in one plan database as failed."""
+    db_path = get_plan_db_path(plan_id)
+    if not db_path.exists():
+        return 0
+    now = datetime.now(timezone(timedelta(hours=8))).isoformat()
+    with plan_db_connection(db_path) as conn:
+        return _fail_interrupted_jobs(conn, now)
+
+
 def fix_stale_jobs_on_startup() -> int:
     """
     job. 
@@ -824,6 +1055,11 @@ def fix_stale_jobs_on_startup() -> int:
     running/queued status job  failed, 
     backendexecute. 
 
+    Only the system job database and action logs are handled here; jobs
+    stored in per-plan databases are failed by the background plan recovery
+    (see ``list_plans_needing_recovery``), which visits only plans that were
+    marked active instead of every ``plan_*.sqlite`` file.
+
     Returns:
         job count
     """
@@ -834,37 +1070,10 @@ def fix_stale_jobs_on_startup() -> int:
     if system_db.exists():
         try:
             with plan_db_connection(system_db) as conn:
-                _ensure_decomposition_tables(conn)
-                result = conn.execute(
-                    """
-                    UPDATE decomposition_jobs 
-                    SET status='failed', error='Job interrupted by server restart', finished_at=?
-                    WHERE status IN ('running', 'queued')
-                    """,
-                    (now,),
-                )
-                fixed_count += result.rowcount
+                fixed_count += _fail_interrupted_jobs(conn, now)
         except Exception as e:
             logger.warning("Failed to fix stale jobs in system db: %s", e)
 
-    plan_store_dir = get_database_config().get_plan_store_dir()
-    if plan_store_dir.exists():
-        for plan_db in plan_store_dir.glob("plan_*.sqlite"):
-            try:
-                with plan_db_connection(plan_db) as conn:
-                    _ensure_decomposition_tables(conn)
-                    result = conn.execute(
-                        """
-                        UPDATE decomposition_jobs 
-                        SET status='failed', error='Job interrupted by server restart', finished_at=?
-                        WHERE status IN ('running', 'queued')
-                        """,
-                        (now,),
-                    )
-                    fixed_count += result.rowcount
-            except Exception as e:
-                logger.warning("Failed to fix stale jobs in %s: %s", plan_db, e)
-
     if system_db.exists():
         try:
             with plan_db_connection(system_db) as conn:
@@ -885,6 +1094,81 @@ def fix_stale_jobs_on_startup() -> int:
     return fixed_count
 
 
+# ---------------------------------------------------------------------------
+# Plan recovery registry
+# ---------------------------------------------------------------------------
+
+def mark_plan_needs_recovery(plan_id: int, *, reason: Optional[str] = None) -> None:
+    """Record that ``plan_id`` has a running job or an in-progress task."""
+    try:
+        with get_db() as conn:
+            conn.execute(
+                """
+                INSERT INTO plan_recovery_registry (plan_id, reason, marked_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(plan_id) DO UPDATE SET
+                    reason=excluded.reason,
+                    marked_at=excluded.marked_at
+                """,
+                (plan_id, reason, time.time()),
+            )
+    except Exception as exc:
+        logger.warning("Failed to mark plan %s for recovery: %s", plan_id, exc)
+
+
+def _plan_has_active_work(plan_id: int) -> bool:
+    db_path = get_plan_db_path(plan_id)
+    if not db_path.exists():
+        return False
+    job_marks = ",".join("?" for _ in ACTIVE_JOB_STATUSES)
+    task_marks = ",".join("?" for _ in ACTIVE_TASK_STATUSES)
+    with plan_db_connection(db_path) as conn:
+        tables = {
+            row["name"]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+        }
+        if "decomposition_jobs" in tables and conn.execute(
+            f"SELECT 1 FROM decomposition_jobs WHERE status IN ({job_marks}) LIMIT 1",
+            ACTIVE_JOB_STATUSES,
+        ).fetchone():
+            return True
+        if "tasks" in tables and conn.execute(
+            f"SELECT 1 FROM tasks WHERE LOWER(TRIM(status)) IN ({task_marks}) LIMIT 1",
+            ACTIVE_TASK_STATUSES,
+        ).fetchone():
+            return True
+    return False
+
+
+def clear_plan_recovery_if_idle(plan_id: int) -> bool:
+    """Drop ``plan_id`` from the registry once it has no active jobs or tasks.
+
+    Marks written while the plan database is being inspected are kept, so a
+    task that starts concurrently is never lost.
+    """
+    checked_at = time.time()
+    try:
+        if _plan_has_active_work(plan_id):
+            return False
+        with get_db() as conn:
+            conn.execute(
+                "DELETE FROM plan_recovery_registry WHERE plan_id=? AND marked_at <= ?",
+                (plan_id, checked_at),
+            )
+    except Exception as exc:
+        logger.warning("Failed to clear recovery mark for plan %s: %s", plan_id, exc)
+        return False
+    return True
+
+
+def list_plans_needing_recovery() -> List[int]:
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT plan_id FROM plan_recovery_registry ORDER BY plan_id ASC"
+        ).fetchall()
+    return [int(row["plan_id"]) for row in rows]
+
+
 # ---------------------------------------------------------------------------
 # PhageScope tracking recovery helpers
 # ---------------------------------------------------------------------------
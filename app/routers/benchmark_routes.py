@@ -20,6 +20,8 @@ def benchmark_api(payload: Dict[str, Any] = Body(...)):
       - topic: str
       - configs: List[str] like ["base,use_context=False","ctx,use_context=True,max_chars=3000"]
       - sections: int (default 5)
+      - workers: int (default 1) configs evaluated concurrently in worker processes
+      - seed: int (default 0) base seed for deterministic per-config seeding
     """
     try:
         if not isinstance(payload, dict):
@@ -35,8 +37,10 @@ def benchmark_api(payload: Dict[str, Any] = Body(...)):
             sections = int(sections)
         except (ValueError, TypeError):
             sections = 5
+        workers = parse_int(payload.get("workers", 1), default=1, min_value=1, max_value=8)
+        seed = parse_int(payload.get("seed", 0), default=0, min_value=0, max_value=2**31 - 1)
 
-        out = run_benchmark(topic.strip(), configs, sections=sections)
+        out = run_benchmark(topic.strip(), configs, sections=sections, workers=workers, seed=seed)
         return out
     except HTTPException:
         raise
@@ -0,0 +1,111 @@
+"""Single-pass multi-pattern phrase matching for chat request routing.
+
+Routing consults dozens of phrase tables for every message.  Instead of
+scanning the message once per table, all phrases are compiled into one
+Aho-Corasick automaton at import time; a single pass over the lowercased
+message yields every table (category) with at least one hit.  Results are
+memoized per text because the same message is classified by several
+routing helpers within one turn.
+
+``pyahocorasick`` is used when installed; otherwise a pure-Python automaton
+with identical semantics is built.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Set
+
+try:  # pragma: no cover - optional accelerator
+    import ahocorasick  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - exercised when the wheel is absent
+    ahocorasick = None
+
+_MATCH_CACHE_SIZE = 512
+
+
+class _PurePythonAutomaton:
+    """Minimal Aho-Corasick automaton mapping phrases to category sets."""
+
+    def __init__(self, phrases: Mapping[str, FrozenSet[str]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._outputs: List[FrozenSet[str]] = [frozenset()]
+        for phrase, categories in phrases.items():
+            node = 0
+            for char in phrase:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._outputs.append(frozenset())
+                node = nxt
+            self._outputs[node] = self._outputs[node] | categories
+
+        self._fail: List[int] = [0] * len(self._goto)
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] | self._outputs[self._fail[child]]
+
+    def categories_in(self, text: str) -> FrozenSet[str]:
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        found: Set[str] = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        return frozenset(found)
+
+
+class _PyAhoCorasickAutomaton:
+    def __init__(self, phrases: Mapping[str, FrozenSet[str]]) -> None:
+        self._automaton = ahocorasick.Automaton()
+        for phrase, categories in phrases.items():
+            self._automaton.add_word(phrase, categories)
+        self._automaton.make_automaton()
+
+    def categories_in(self, text: str) -> FrozenSet[str]:
+        found: Set[str] = set()
+        for _end, categories in self._automaton.iter(text):
+            found.update(categories)
+        return frozenset(found)
+
+
+class PhraseMatcher:
+    """Match text against many named phrase tables in one pass.
+
+    Phrases are lowercased at build time; callers pass lowercased text.
+    """
+
+    def __init__(self, tables: Mapping[str, Iterable[str]]) -> None:
+        phrase_categories: Dict[str, Set[str]] = {}
+        for category, phrases in tables.items():
+            for phrase in phrases:
+                normalized = str(phrase).lower()
+                if normalized:
+                    phrase_categories.setdefault(normalized, set()).add(category)
+        frozen = {phrase: frozenset(cats) for phrase, cats in phrase_categories.items()}
+        self.categories = frozenset(tables)
+        self.backend = "pyahocorasick" if ahocorasick is not None else "python"
+        if ahocorasick is not None:
+            self._automaton = _PyAhoCorasickAutomaton(frozen)
+        else:
+            self._automaton = _PurePythonAutomaton(frozen)
+        self.categories_in = lru_cache(maxsize=_MATCH_CACHE_SIZE)(self._automaton.categories_in)
+
+    def contains(self, lowered_text: str, category: str) -> bool:
+        return category in self.categories_in(lowered_text)
@@ -15,6 +15,7 @@ from .guardrails import (
     extract_task_ids_from_text,
     local_manuscript_assembly_request,
 )
+from .phrase_matcher import PhraseMatcher
 from .subject_identity import (
     build_subject_aliases,
     canonicalize_subject_ref,
@@ -50,6 +51,22 @@ _NON_PHAGESCOPE_TABULAR_FILE_EXTS = (
     ".parquet",
     ".feather",
 )
+# A PhageScope subject plus one of these verbs upgrades the request to research.
+_PHAGESCOPE_EXPLORATION_VERBS = (
+    "analyze",
+    "analyse",
+    "inspect",
+    "audit",
+    "review",
+    "look",
+    "explore",
+    "start",
+    "分析",
+    "查看",
+    "看看",
+    "检查",
+    "探索",
+)
 
 
 def _directory_positively_lacks_phagescope_meta_data(value: str) -> bool:
@@ -81,6 +98,10 @@ _GREETING_TOKENS_EXACT = {
     "thank you",
 }
 
+_GREETING_TOKENS_COLLAPSED = frozenset(
+    _NON_WORD_RE.sub("", token.lower()) for token in _GREETING_TOKENS_EXACT
+)
+
 _SOCIAL_PHRASES = (
     "你好",
     "您好",
@@ -373,7 +394,7 @@ _EXECUTE_PHRASES = (
     "测试一下",
 )
 
-# NOTE: All phrases MUST be lowercase — used with _contains_any_lowered().
+# NOTE: All phrases MUST be lowercase — used with _has_phrase_lowered().
 _PLAN_REQUEST_PHRASES = (
     "create plan",
     "create a plan",
@@ -596,7 +617,7 @@ _PLAN_STATUS_QUERY_MARKERS = (
     "汇报",
 )
 
-# NOTE: All phrases MUST be lowercase — used with _contains_any_lowered().
+# NOTE: All phrases MUST be lowercase — used with _has_phrase_lowered().
 _PLAN_NEW_REQUEST_PHRASES = (
     "new plan",
     "another plan",
@@ -953,6 +974,9 @@ _REFERENTIAL_CUES = (
     "this one",
 )
 
+_REMOTE_STATUS_WORDS = ("状态", "进度", "在跑", "运行", "完成", "status", "running", "progress")
+_REMOTE_TASK_ID_RE = re.compile(r"(<?!\d)\d{5,}(?!\d)")
+
 # All registered tools — the LLM sees every tool and decides which to use.
 # Inspired by Claude Code: flat tool pool, no per-request filtering.
 ALL_TOOLS: List[str] = [
@@ -1240,24 +1264,7 @@ def resolve_request_routing(
         )
         and not _directory_positively_lacks_phagescope_meta_data(subject_ref_raw)
         and request_tier == "standard"
-        and _contains_any_lowered(
-            effective_user_message.lower(),
-            (
-                "analyze",
-                "analyse",
-                "inspect",
-                "audit",
-                "review",
-                "look",
-                "explore",
-                "start",
-                "分析",
-                "查看",
-                "看看",
-                "检查",
-                "探索",
-            ),
-        )
+        and _has_phrase_lowered(effective_user_message.lower(), "phagescope_exploration_verbs")
     ):
         request_tier = "research"
         combined_reasons.append("phagescope_dataset_analysis")
@@ -1348,21 +1355,21 @@ def classify_request_tier(
 
     plan_bound = plan_id is not None or context_dict.get("plan_id") is not None
 
-    has_research_cue = _contains_any(lowered, _RESEARCH_PHRASES)
-    has_time_sensitive_cue = _contains_any(lowered, _TIME_SENSITIVE_PHRASES)
+    has_research_cue = _has_phrase(lowered, "research_phrases")
+    has_time_sensitive_cue = _has_phrase(lowered, "time_sensitive_phrases")
     if has_research_cue:
         reasons.append("research_cue")
     if has_time_sensitive_cue:
         reasons.append("time_sensitive_cue")
 
-    has_execute_keyword = _contains_any(lowered, _EXECUTE_PHRASES)
-    has_depth_cue = _contains_any(lowered, _DEPTH_CUES)
+    has_execute_keyword = _has_phrase(lowered, "execute_phrases")
+    has_depth_cue = _has_phrase(lowered, "depth_cues")
     if has_depth_cue:
         reasons.append("depth_cue")
 
-    has_followthrough_cue = _contains_any(lowered, _FOLLOWTHROUGH_PHRASES)
-    has_action_verb = _contains_any(lowered, _ACTION_VERB_PHRASES)
-    is_chat_continuation = _contains_any(lowered, _CHAT_CONTINUATION_PHRASES)
+    has_followthrough_cue = _has_phrase(lowered, "followthrough_phrases")
+    has_action_verb = _has_phrase(lowered, "action_verb_phrases")
+    is_chat_continuation = _has_phrase(lowered, "chat_continuation_phrases")
     followthrough_implies_execute = (
         has_followthrough_cue and has_action_verb and not is_chat_continuation
     )
@@ -1413,10 +1420,9 @@ def classify_request_tier(
         return "research", reasons, is_direct_followup, 0.6
 
     # 2b. Remote status queries
-    _REMOTE_STATUS_WORDS = ("状态", "进度", "在跑", "运行", "完成", "status", "running", "progress")
     if (
-        re.search(r"(<?!\d)\d{5,}(?!\d)", lowered)
-        and _contains_any(lowered, _REMOTE_STATUS_WORDS)
+        _REMOTE_TASK_ID_RE.search(lowered)
+        and _has_phrase(lowered, "remote_status_words")
     ):
         reasons.append("remote_status_query")
         return "standard", reasons, is_direct_followup, 0.3
@@ -1424,10 +1430,8 @@ def classify_request_tier(
     # 3. Greetings / thanks: brief social tokens no longer downgrade to
     #    a deprecated "light" tier — they now route to standard tier with
     #    brevity_hint=True so the LLM still keeps the answer short.
-    is_greeting = collapsed in {
-        _NON_WORD_RE.sub("", token.lower()) for token in _GREETING_TOKENS_EXACT
-    }
-    is_social_phrase = _contains_any(lowered, _SOCIAL_PHRASES)
+    is_greeting = collapsed in _GREETING_TOKENS_COLLAPSED
+    is_social_phrase = _has_phrase(lowered, "social_phrases")
 
     if is_greeting or is_social_phrase:
         reasons.append("greeting_or_social")
@@ -1675,16 +1679,28 @@ def build_request_tier_profile(
     )
 
 
+def _has_phrase(text: str, category: str) -> bool:
+    """Return True if any phrase of the *category* table occurs in *text* (case-insensitive).
+
+    Answered by the shared automaton, one pass per distinct text.
+    """
+    return _PHRASE_MATCHER.contains(text.lower(), category)
+
+
+def _has_phrase_lowered(lowered_text: str, category: str) -> bool:
+    """Like _has_phrase but caller guarantees text is already lowercased."""
+    return _PHRASE_MATCHER.contains(lowered_text, category)
+
+
 def _contains_any(text: str, phrases: Sequence[str]) -> bool:
+    """Return True if any phrase occurs in *text* (case-insensitive).
+
+    For ad-hoc phrase sequences; module-level tables go through _has_phrase.
+    """
     haystack = text.lower()
     return any(phrase.lower() in haystack for phrase in phrases)
 
 
-def _contains_any_lowered(lowered_text: str, phrases: Sequence[str]) -> bool:
-    """Like _contains_any but caller guarantees text is already lowercased."""
-    return any(phrase in lowered_text for phrase in phrases)
-
-
 def _has_explicit_plan_request(text: str) -> bool:
     lowered = str(text or "").strip().lower()
     if not lowered:
@@ -1693,52 +1709,52 @@ def _has_explicit_plan_request(text: str) -> bool:
         return False
     if _has_negated_plan_create_request(lowered):
         return False
-    return _contains_any_lowered(lowered, _PLAN_REQUEST_PHRASES) or _contains_any_lowered(
-        lowered, _PLAN_NEW_REQUEST_PHRASES
-    ) or bool(_PLAN_REQUEST_RE.search(lowered))
+    return _has_phrase_lowered(lowered, "plan_request_phrases") or _has_phrase_lowered(lowered, "plan_new_request_phrases") or bool(_PLAN_REQUEST_RE.search(lowered))
+
+
+_NEGATED_PLAN_CREATE_MARKERS = (
+    "do not create a plan",
+    "don't create a plan",
+    "dont create a plan",
+    "without creating a plan",
+    "no plan creation",
+    "no plan needed",
+    "no plan necessary",
+    "不要创建 plan",
+    "不要创建plan",
+    "不要建 plan",
+    "不要建plan",
+    "不要创建计划",
+    "不要生成计划",
+    "不要生成 plan",
+    "不要生成plan",
+    "不要制作计划",
+    "不要制作plan",
+    "不要设计plan",
+    "不要设计 plan",
+    "不要设计计划",
+    "不要做plan",
+    "不要做 plan",
+    "不需要plan",
+    "不需要 plan",
+    "不需要计划",
+    "不需要生成plan",
+    "不需要创建plan",
+    "暂且不需要设计plan",
+    "暂且不需要plan",
+    "暂时不需要plan",
+    "目前不需要plan",
+    "不用生成plan",
+    "不用生成计划",
+    "不用创建plan",
+    "不用创建计划",
+)
 
 
 def _has_negated_plan_create_request(lowered: str) -> bool:
     if not lowered:
         return False
-    markers = (
-        "do not create a plan",
-        "don't create a plan",
-        "dont create a plan",
-        "without creating a plan",
-        "no plan creation",
-        "no plan needed",
-        "no plan necessary",
-        "不要创建 plan",
-        "不要创建plan",
-        "不要建 plan",
-        "不要建plan",
-        "不要创建计划",
-        "不要生成计划",
-        "不要生成 plan",
-        "不要生成plan",
-        "不要制作计划",
-        "不要制作plan",
-        "不要设计plan",
-        "不要设计 plan",
-        "不要设计计划",
-        "不要做plan",
-        "不要做 plan",
-        "不需要plan",
-        "不需要 plan",
-        "不需要计划",
-        "不需要生成plan",
-        "不需要创建plan",
-        "暂且不需要设计plan",
-        "暂且不需要plan",
-        "暂时不需要plan",
-        "目前不需要plan",
-        "不用生成plan",
-        "不用生成计划",
-        "不用创建plan",
-        "不用创建计划",
-    )
-    return _contains_any_lowered(lowered, markers)
+    return _has_phrase_lowered(lowered, "negated_plan_create_markers")
 
 
 def _is_internal_contract_repair_request(text: str) -> bool:
@@ -1765,7 +1781,7 @@ def resolve_plan_lifecycle_intent(
         return PlanLifecycleIntent()
 
     create_requested = _has_explicit_plan_request(text)
-    new_plan_requested = _contains_any_lowered(lowered, _PLAN_NEW_REQUEST_PHRASES)
+    new_plan_requested = _has_phrase_lowered(lowered, "plan_new_request_phrases")
     review_requested = _has_explicit_plan_review_request(
         text,
         plan_bound=plan_bound,
@@ -1779,15 +1795,12 @@ def resolve_plan_lifecycle_intent(
 
     execute_requested = False
     if create_requested:
-        execute_requested = _contains_any_lowered(
-            lowered,
-            _PLAN_EXECUTE_AFTER_CREATE_PHRASES,
-        )
+        execute_requested = _has_phrase_lowered(lowered, "plan_execute_after_create_phrases")
     elif plan_bound:
         execute_requested = _is_full_plan_execution_request(
             text,
             plan_bound=True,
-        ) or _contains_any_lowered(lowered, _PLAN_EXECUTE_STANDALONE_PHRASES)
+        ) or _has_phrase_lowered(lowered, "plan_execute_standalone_phrases")
 
     subject_changed = False
     if plan_bound and isinstance(subject_resolution, Mapping):
@@ -1797,7 +1810,7 @@ def resolve_plan_lifecycle_intent(
         and create_requested
         and subject_changed
         and not new_plan_requested
-        and not _contains_any_lowered(lowered, _PLAN_UPDATE_CURRENT_MARKERS)
+        and not _has_phrase_lowered(lowered, "plan_update_current_markers")
     )
 
     return PlanLifecycleIntent(
@@ -1836,7 +1849,7 @@ def _is_unambiguous_full_plan_request(text: str) -> bool:
     lowered = str(text or "").strip().lower()
     if not lowered:
         return False
-    return _contains_any_lowered(lowered, _UNAMBIGUOUS_FULL_PLAN_MARKERS)
+    return _has_phrase_lowered(lowered, "unambiguous_full_plan_markers")
 
 
 def _is_full_plan_execution_request(text: str, *, plan_bound: bool) -> bool:
@@ -1850,14 +1863,10 @@ def _is_full_plan_execution_request(text: str, *, plan_bound: bool) -> bool:
     lowered = str(text or "").strip().lower()
     if not lowered:
         return False
-    if not _contains_any_lowered(lowered, _FULL_PLAN_EXECUTION_PHRASES):
+    if not _has_phrase_lowered(lowered, "full_plan_execution_phrases"):
         return False
-    looks_like_status_question = _contains_any_lowered(
-        lowered, _FULL_PLAN_STATUS_QUERY_MARKERS,
-    )
-    has_imperative_context = _contains_any_lowered(
-        lowered, _FULL_PLAN_IMPERATIVE_CONTEXTS,
-    )
+    looks_like_status_question = _has_phrase_lowered(lowered, "full_plan_status_query_markers")
+    has_imperative_context = _has_phrase_lowered(lowered, "full_plan_imperative_contexts")
     if looks_like_status_question and not has_imperative_context:
         return False
     return True
@@ -1876,11 +1885,11 @@ def _has_explicit_plan_review_request(
         return False
     if _looks_like_content_artifact_request(lowered):
         return False
-    if _contains_any_lowered(lowered, _PLAN_REVIEW_PHRASES):
+    if _has_phrase_lowered(lowered, "plan_review_phrases"):
         return True
-    if not _contains_any(lowered, _PLAN_REVIEW_MARKERS):
+    if not _has_phrase(lowered, "plan_review_markers"):
         return False
-    return _contains_any(lowered, _PLAN_TARGET_MARKERS)
+    return _has_phrase(lowered, "plan_target_markers")
 
 
 def _has_explicit_plan_optimize_request(
@@ -1898,32 +1907,32 @@ def _has_explicit_plan_optimize_request(
         return False
     if _looks_like_content_artifact_request(lowered):
         return False
-    if _contains_any_lowered(lowered, _PLAN_OPTIMIZE_PHRASES):
+    if _has_phrase_lowered(lowered, "plan_optimize_phrases"):
         return True
-    if not _contains_any(lowered, _PLAN_OPTIMIZE_MARKERS):
+    if not _has_phrase(lowered, "plan_optimize_markers"):
         return False
-    return _contains_any(lowered, _PLAN_TARGET_MARKERS)
+    return _has_phrase(lowered, "plan_target_markers")
 
 
 def _looks_like_plan_status_query(lowered: str) -> bool:
-    if not lowered or not _contains_any(lowered, _PLAN_TARGET_MARKERS):
+    if not lowered or not _has_phrase(lowered, "plan_target_markers"):
         return False
-    if _contains_any_lowered(lowered, _PLAN_STATUS_QUERY_PHRASES):
+    if _has_phrase_lowered(lowered, "plan_status_query_phrases"):
         return True
     if not _contains_any(lowered, ("update", "更新")):
         return False
-    return _contains_any(lowered, _PLAN_STATUS_QUERY_MARKERS)
+    return _has_phrase(lowered, "plan_status_query_markers")
 
 
 def _looks_like_content_artifact_request(lowered: str) -> bool:
     if not lowered:
         return False
-    has_content_object = _contains_any(lowered, _CONTENT_GENERATION_OBJECT_MARKERS)
+    has_content_object = _has_phrase(lowered, "content_generation_object_markers")
     if not has_content_object:
         return False
-    if _contains_any_lowered(lowered, _PLAN_REVIEW_PHRASES) or _contains_any_lowered(lowered, _PLAN_OPTIMIZE_PHRASES):
-        explicit_plan_target = _contains_any(lowered, _PLAN_TARGET_MARKERS)
-        if explicit_plan_target and not _contains_any(lowered, _CONTENT_GENERATION_ACTION_MARKERS):
+    if _has_phrase_lowered(lowered, "plan_review_phrases") or _has_phrase_lowered(lowered, "plan_optimize_phrases"):
+        explicit_plan_target = _has_phrase(lowered, "plan_target_markers")
+        if explicit_plan_target and not _has_phrase(lowered, "content_generation_action_markers"):
             return False
     return True
 
@@ -1944,7 +1953,7 @@ def requests_image_regeneration(message: str) -> bool:
     lowered = str(message or "").strip().lower()
     if not lowered:
         return False
-    return _contains_any(lowered, _IMAGE_REGENERATE_PHRASES)
+    return _has_phrase(lowered, "image_regenerate_phrases")
 
 
 def requests_existing_image_display(
@@ -1958,9 +1967,9 @@ def requests_existing_image_display(
         return False
     if context is not None and not _has_recent_image_artifacts(context):
         return False
-    has_show = _contains_any(lowered, _IMAGE_SHOW_PHRASES)
-    has_image_noun = _contains_any(lowered, _IMAGE_NOUN_PHRASES)
-    has_reference = _contains_any(lowered, _IMAGE_REFERENCE_PHRASES)
+    has_show = _has_phrase(lowered, "image_show_phrases")
+    has_image_noun = _has_phrase(lowered, "image_noun_phrases")
+    has_reference = _has_phrase(lowered, "image_reference_phrases")
     return (has_show and has_image_noun) or has_reference
 
 
@@ -1977,13 +1986,13 @@ def should_prioritize_existing_image_display(
         return False
     if task_bound or plan_followthrough or followthrough_implies_execute:
         return False
-    if _contains_any(lowered, _IMAGE_DISPLAY_EXECUTION_OVERRIDE_PHRASES):
+    if _has_phrase(lowered, "image_display_execution_override_phrases"):
         return False
     return True
 
 
 def _references_prior_subject(lowered: str) -> bool:
-    return _contains_any(lowered, _REFERENTIAL_CUES)
+    return _has_phrase(lowered, "referential_cues")
 
 
 def _references_mutation_subject(
@@ -1993,9 +2002,9 @@ def _references_mutation_subject(
 ) -> bool:
     if last_subject_action_class not in {"read_only", "inspect", "mutation"}:
         return False
-    has_mutation_verb = _contains_any(lowered, _LOCAL_MUTATION_PHRASES)
-    has_archive_target = _contains_any(lowered, _ARCHIVE_OBJECT_PHRASES)
-    has_scope_target = _contains_any(lowered, _MUTATION_SCOPE_PHRASES)
+    has_mutation_verb = _has_phrase(lowered, "local_mutation_phrases")
+    has_archive_target = _has_phrase(lowered, "archive_object_phrases")
+    has_scope_target = _has_phrase(lowered, "mutation_scope_phrases")
     return has_mutation_verb and (has_archive_target or has_scope_target)
 
 
@@ -2048,10 +2057,10 @@ def resolve_intent_type(
     # execute_task so DeepThink safeguards (probe-only detection,
     # verification-only replacement, bound-task final-answer prompt) activate.
     effective_task_id = current_task_id or context_dict.get("current_task_id")
-    if effective_task_id is not None and _contains_any(lowered, _BOUND_TASK_EXECUTE_CUES):
+    if effective_task_id is not None and _has_phrase(lowered, "bound_task_execute_cues"):
         # Exclude chat continuations ("继续说", "keep explaining") which
         # should stay as chat even when task-bound.
-        if not _contains_any(lowered, _CHAT_CONTINUATION_PHRASES):
+        if not _has_phrase(lowered, "chat_continuation_phrases"):
             reasons.append("intent_execute_task")
             reasons.append("bound_task_execution_cue")
             return "execute_task", reasons
@@ -2065,7 +2074,7 @@ def resolve_intent_type(
 
 
 def _infer_subject_kind_from_text(path_text: str, lowered_message: str) -> SubjectKind:
-    if _contains_any(lowered_message, _DIRECTORY_PHRASES):
+    if _has_phrase(lowered_message, "directory_phrases"):
         return "directory"
     if path_text.endswith("/"):
         return "directory"
@@ -2133,3 +2142,51 @@ def _last_role(
         if str(item.get("role") or "").strip().lower() == role:
             return item
     return None
+
+
+# Phrase tables answered by the shared automaton, by category name.  Call
+# sites name the category (``_has_phrase(text, "research_phrases")``); adding
+# a table means adding it here.
+_PHRASE_TABLES: Dict[str, Sequence[str]] = {
+    "action_verb_phrases": _ACTION_VERB_PHRASES,
+    "archive_object_phrases": _ARCHIVE_OBJECT_PHRASES,
+    "bound_task_execute_cues": _BOUND_TASK_EXECUTE_CUES,
+    "chat_continuation_phrases": _CHAT_CONTINUATION_PHRASES,
+    "content_generation_action_markers": _CONTENT_GENERATION_ACTION_MARKERS,
+    "content_generation_object_markers": _CONTENT_GENERATION_OBJECT_MARKERS,
+    "depth_cues": _DEPTH_CUES,
+    "directory_phrases": _DIRECTORY_PHRASES,
+    "execute_phrases": _EXECUTE_PHRASES,
+    "followthrough_phrases": _FOLLOWTHROUGH_PHRASES,
+    "full_plan_execution_phrases": _FULL_PLAN_EXECUTION_PHRASES,
+    "full_plan_imperative_contexts": _FULL_PLAN_IMPERATIVE_CONTEXTS,
+    "full_plan_status_query_markers": _FULL_PLAN_STATUS_QUERY_MARKERS,
+    "image_display_execution_override_phrases": _IMAGE_DISPLAY_EXECUTION_OVERRIDE_PHRASES,
+    "image_noun_phrases": _IMAGE_NOUN_PHRASES,
+    "image_reference_phrases": _IMAGE_REFERENCE_PHRASES,
+    "image_regenerate_phrases": _IMAGE_REGENERATE_PHRASES,
+    "image_show_phrases": _IMAGE_SHOW_PHRASES,
+    "local_mutation_phrases": _LOCAL_MUTATION_PHRASES,
+    "mutation_scope_phrases": _MUTATION_SCOPE_PHRASES,
+    "negated_plan_create_markers": _NEGATED_PLAN_CREATE_MARKERS,
+    "phagescope_exploration_verbs": _PHAGESCOPE_EXPLORATION_VERBS,
+    "plan_execute_after_create_phrases": _PLAN_EXECUTE_AFTER_CREATE_PHRASES,
+    "plan_execute_standalone_phrases": _PLAN_EXECUTE_STANDALONE_PHRASES,
+    "plan_new_request_phrases": _PLAN_NEW_REQUEST_PHRASES,
+    "plan_optimize_markers": _PLAN_OPTIMIZE_MARKERS,
+    "plan_optimize_phrases": _PLAN_OPTIMIZE_PHRASES,
+    "plan_request_phrases": _PLAN_REQUEST_PHRASES,
+    "plan_review_markers": _PLAN_REVIEW_MARKERS,
+    "plan_review_phrases": _PLAN_REVIEW_PHRASES,
+    "plan_status_query_markers": _PLAN_STATUS_QUERY_MARKERS,
+    "plan_status_query_phrases": _PLAN_STATUS_QUERY_PHRASES,
+    "plan_target_markers": _PLAN_TARGET_MARKERS,
+    "plan_update_current_markers": _PLAN_UPDATE_CURRENT_MARKERS,
+    "referential_cues": _REFERENTIAL_CUES,
+    "remote_status_words": _REMOTE_STATUS_WORDS,
+    "research_phrases": _RESEARCH_PHRASES,
+    "social_phrases": _SOCIAL_PHRASES,
+    "time_sensitive_phrases": _TIME_SENSITIVE_PHRASES,
+    "unambiguous_full_plan_markers": _UNAMBIGUOUS_FULL_PLAN_MARKERS,
+}
+_PHRASE_MATCHER = PhraseMatcher(_PHRASE_TABLES)
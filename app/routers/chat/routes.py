@@ -21,6 +21,7 @@ from app.services.plans.decomposition_jobs import plan_decomposition_jobs
 from app.services.plans.plan_session import PlanSession
 from app.services.request_principal import get_request_owner_id
 from app.services.session_title_service import SessionNotFoundError
+from app.services.upload_extraction import describe_attachment_extraction
 from app.services.upload_storage import delete_session_storage
 
 from .action_execution import _execute_action_run, get_action_status, retry_action_run
@@ -185,10 +186,10 @@ async def chat_message(
                     att_type = att.get("type", "file")
                     att_name = att.get("name", "Unknown file")
                     att_path = att.get("path", "")
-                    att_extracted = att.get("extracted_path")
+                    extraction_note = describe_attachment_extraction(att)
                     attachment_info += f"- {att_name} ({att_type}): {att_path}\n"
-                    if att_extracted:
-                        attachment_info += f"  extracted: {att_extracted}\n"
+                    if extraction_note:
+                        attachment_info += f"  {extraction_note}\n"
 
                     # Auto-read text-like content where possible.
                     if att_path:
@@ -6,6 +6,7 @@ import logging
 from typing import Any, Dict, Tuple
 
 from app.services.plans.plan_session import PlanSession
+from app.services.upload_extraction import describe_attachment_extraction
 
 from .models import ChatRequest
 from .services import (
@@ -96,10 +97,10 @@ def build_agent_for_chat_request(
                 att_type = att.get("type", "file")
                 att_name = att.get("name", "Unknown file")
                 att_path = att.get("path", "")
-                att_extracted = att.get("extracted_path")
+                extraction_note = describe_attachment_extraction(att)
                 attachment_info += f"- {att_name} ({att_type}): {att_path}\n"
-                if att_extracted:
-                    attachment_info += f"  extracted: {att_extracted}\n"
+                if extraction_note:
+                    attachment_info += f"  {extraction_note}\n"
         has_image = any(
             att.get("type") == "image" for att in attachments if isinstance(att, dict)
         )
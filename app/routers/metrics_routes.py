@@ -0,0 +1,41 @@
+"""
+In-process performance metrics.
+
+``GET /metrics`` serves the metrics registry in the Prometheus text
+exposition format; ``GET /metrics/summary`` returns the same series as JSON
+with p50/p90/p99 latencies for quick inspection.
+"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..services.foundation.metrics import get_metrics_registry
+from . import register_router
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+register_router(
+    namespace="metrics",
+    version="v1",
+    path="/metrics",
+    router=router,
+    tags=["metrics"],
+    description="Latency histograms and counters",
+)
+
+
+@router.get("", response_class=PlainTextResponse, summary="Prometheus metrics")
+async def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        get_metrics_registry().render_prometheus(),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
+
+
+@router.get("/summary", summary="Metrics summary")
+async def metrics_summary() -> Dict[str, Any]:
+    return get_metrics_registry().summary()
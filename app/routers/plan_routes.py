@@ -25,6 +25,7 @@ from app.services.plans.acceptance_criteria import (
 from app.services.plans.dependency_planner import DependencyPlan, compute_dependency_plan
 from app.services.plans.plan_decomposer import PlanDecomposer, DecompositionResult
 from app.services.plans.plan_executor import ExecutionConfig, PlanExecutor
+from app.services.plans.plan_recovery import PlanRecoveryPending, ensure_plan_recovered
 from app.services.plans.audit_repair_loop import AuditRepairLoopConfig, AuditRepairLoopService
 from app.services.plans.artifact_preflight import ArtifactPreflightResult, ArtifactPreflightService
 from app.services.plans.status_resolver import PlanStatusResolver
@@ -73,6 +74,10 @@ if TYPE_CHECKING:
 _task_execution_locks: Dict[Tuple[int, int], threading.Lock] = {}
 _task_execution_locks_guard = threading.Lock()
 
+# How long a request waits for another worker to finish recovering its plan
+# after a restart before answering 503.
+_PLAN_RECOVERY_WAIT_SECONDS = 5.0
+
 
 def _default_plan_paper_mode() -> bool:
     raw = os.getenv("PLAN_PAPER_MODE_DEFAULT")
@@ -90,6 +95,14 @@ def _ensure_plan_access(plan_id: int, request: Request) -> None:
     if row is None:
         raise HTTPException(status_code=404, detail=f"Plan {plan_id} not found")
     ensure_owner_access(request, row["owner"], detail="plan owner mismatch")
+    try:
+        ensure_plan_recovered(plan_id, timeout=_PLAN_RECOVERY_WAIT_SECONDS)
+    except PlanRecoveryPending as exc:
+        raise HTTPException(
+            status_code=503,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
 
 
 def _load_authorized_plan_tree(plan_id: int, request: Request):
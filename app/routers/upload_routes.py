@@ -4,22 +4,28 @@ File Upload Routes
 fileupload, sessionmedium
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
-import shutil
-import tarfile
 import uuid
-import zipfile
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional, Tuple
 
 from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from . import register_router
 from ..database import get_db
 from ..services.request_principal import ensure_owner_access
+from ..services.upload_extraction import (
+    ExtractionJob,
+    detect_archive_format,
+    get_archive_extraction_manager,
+)
 from ..services.upload_storage import ensure_session_dir
 
 logger = logging.getLogger(__name__)
@@ -196,6 +202,7 @@ MAX_FILE_SIZE = {
     "bioinformatics": None,  # allow large sequencing files (FASTQ can be huge)
 }
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
 UPLOAD_SUBDIR = "uploads"
 EXTRACT_SUBDIR = "extracted"
 
@@ -223,6 +230,9 @@ class UploadResponse(BaseModel):
     is_archive: Optional[bool] = None
     extracted_path: Optional[str] = None
     extracted_files: Optional[int] = None
+    extraction_id: Optional[str] = None
+    extraction_status: Optional[str] = None
+    sha256: Optional[str] = None
     session_id: Optional[str] = None
 
 
@@ -319,52 +329,32 @@ def _resolve_extract_dir(session_id: str, file_id: str, safe_name: str) -> Path:
     return extract_root / f"{file_id}_{stem}"
 
 
-def _is_within_directory(base_dir: Path, target_path: Path) -> bool:
-    base_dir = base_dir.resolve()
-    target_path = target_path.resolve()
-    return os.path.commonpath([str(base_dir), str(target_path)]) == str(base_dir)
-
-
-def _safe_extract_zip(zip_file: zipfile.ZipFile, dest_dir: Path) -> int:
-    count = 0
-    for member in zip_file.infolist():
-        member_path = dest_dir / member.filename
-        if not _is_within_directory(dest_dir, member_path):
-            raise HTTPException(status_code=400, detail="Archive entry escapes destination directory")
-        if not member.is_dir():
-            count += 1
-    zip_file.extractall(dest_dir)
-    return count
-
-
-def _safe_extract_tar(tar_file: tarfile.TarFile, dest_dir: Path) -> int:
-    count = 0
-    for member in tar_file.getmembers():
-        if member.islnk() or member.issym():
-            raise HTTPException(status_code=400, detail="Archive links are not allowed for security reasons")
-        member_path = dest_dir / member.name
-        if not _is_within_directory(dest_dir, member_path):
-            raise HTTPException(status_code=400, detail="Archive entry escapes destination directory")
-        if member.isfile():
-            count += 1
-    tar_file.extractall(dest_dir)
-    return count
-
-
-def _extract_archive(file_path: Path, dest_dir: Path) -> int:
-    if zipfile.is_zipfile(file_path):
-        with zipfile.ZipFile(file_path) as zip_file:
-            return _safe_extract_zip(zip_file, dest_dir)
-
-    if tarfile.is_tarfile(file_path):
-        with tarfile.open(file_path) as tar_file:
-            return _safe_extract_tar(tar_file, dest_dir)
+def _get_max_size(category: str) -> Optional[int]:
+    return MAX_FILE_SIZE.get(category, DEFAULT_MAX_FILE_SIZE)
 
-    raise HTTPException(status_code=400, detail="Unsupported archive format. Only .zip and .tar are allowed")
 
+def _write_upload_stream(
+    source: BinaryIO,
+    file_path: Path,
+    max_size: Optional[int],
+) -> Tuple[int, str]:
+    """Copy an upload to disk in 1MB chunks, hashing it on the way.
 
-def _get_max_size(category: str) -> Optional[int]:
-    return MAX_FILE_SIZE.get(category, DEFAULT_MAX_FILE_SIZE)
+    Runs in a worker thread; returns ``(size, sha256)``.
+    """
+    digest = hashlib.sha256()
+    file_size = 0
+    with open(file_path, "wb") as f:
+        while chunk := source.read(UPLOAD_CHUNK_SIZE):
+            file_size += len(chunk)
+            if max_size is not None and file_size > max_size:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"file,  {max_size / 1024 / 1024:.1f}MB",
+                )
+            digest.update(chunk)
+            f.write(chunk)
+    return file_size, digest.hexdigest()
 
 
 async def _save_upload_file(
@@ -375,6 +365,9 @@ async def _save_upload_file(
     """
     saveuploadfile
 
+    The copy runs off the event loop; archives are extracted in the
+    background and reported through ``/upload/extractions/{extraction_id}``.
+
     Returns:
         file
     """
@@ -385,22 +378,12 @@ async def _save_upload_file(
     session_dir = _get_session_upload_dir(session_id)
     file_path = session_dir / f"{file_id}_{safe_name}"
 
-    file_size = 0
     max_size = _get_max_size(category)
 
     try:
-        with open(file_path, "wb") as f:
-            while chunk := await file.read(8192):  # 8KB chunks
-                file_size += len(chunk)
-                if max_size is not None and file_size > max_size:
-                    f.close()
-                    file_path.unlink(missing_ok=True)
-                    raise HTTPException(
-                        status_code=413,
-                        detail=f"file,  {max_size / 1024 / 1024:.1f}MB",
-                    )
-                f.write(chunk)
+        file_size, sha256 = await asyncio.to_thread(_write_upload_stream, file.file, file_path, max_size)
     except HTTPException:
+        file_path.unlink(missing_ok=True)
         raise
     except Exception as e:
         logger.error(f"savefilefailed: {e}")
@@ -408,21 +391,18 @@ async def _save_upload_file(
         raise HTTPException(status_code=500, detail=f"savefilefailed: {str(e)}")
 
     extracted_path = None
-    extracted_files = None
+    extraction: Optional[ExtractionJob] = None
 
     if category == "archive":
+        if await asyncio.to_thread(detect_archive_format, file_path) is None:
+            raise HTTPException(status_code=400, detail="Unsupported archive format. Only .zip and .tar are allowed")
         extract_dir = _resolve_extract_dir(session_id, file_id, safe_name)
-        extract_dir.mkdir(parents=True, exist_ok=True)
-        try:
-            extracted_files = _extract_archive(file_path, extract_dir)
-            extracted_path = str(extract_dir)
-        except HTTPException:
-            shutil.rmtree(extract_dir, ignore_errors=True)
-            raise
-        except Exception as e:
-            shutil.rmtree(extract_dir, ignore_errors=True)
-            logger.error(f"failed: {e}")
-            raise HTTPException(status_code=500, detail=f"failed: {str(e)}")
+        extraction = get_archive_extraction_manager().submit(
+            session_id=session_id,
+            archive_path=file_path,
+            dest_dir=extract_dir,
+        )
+        extracted_path = str(extract_dir)
 
     if file_size < 1024:
         size_str = f"{file_size} B"
@@ -441,10 +421,13 @@ async def _save_upload_file(
         "file_size": size_str,
         "file_size_bytes": file_size,
         "file_type": file_type,
+        "sha256": sha256,
         "category": category,
         "is_archive": category == "archive",
         "extracted_path": extracted_path,
-        "extracted_files": extracted_files,
+        "extracted_files": None,
+        "extraction_id": extraction.extraction_id if extraction else None,
+        "extraction_status": extraction.status if extraction else None,
         "uploaded_at": datetime.now().isoformat(),
         "session_id": session_id,
     }
@@ -491,6 +474,9 @@ async def upload_file(
             is_archive=file_info.get("is_archive"),
             extracted_path=file_info.get("extracted_path"),
             extracted_files=file_info.get("extracted_files"),
+            extraction_id=file_info.get("extraction_id"),
+            extraction_status=file_info.get("extraction_status"),
+            sha256=file_info.get("sha256"),
             session_id=session_id,
         )
     except HTTPException:
@@ -541,6 +527,9 @@ async def upload_image(
             is_archive=file_info.get("is_archive"),
             extracted_path=file_info.get("extracted_path"),
             extracted_files=file_info.get("extracted_files"),
+            extraction_id=file_info.get("extraction_id"),
+            extraction_status=file_info.get("extraction_status"),
+            sha256=file_info.get("sha256"),
             session_id=session_id,
         )
     except HTTPException:
@@ -550,6 +539,61 @@ async def upload_image(
         raise HTTPException(status_code=500, detail=f"upload failed: {str(e)}")
 
 
+def _sse_message(payload: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _get_extraction_job(extraction_id: str, session_id: str, request: Request) -> ExtractionJob:
+    if not session_id or not session_id.strip():
+        raise HTTPException(status_code=400, detail="session_id is required")
+    _ensure_session_access(session_id, request)
+    job = get_archive_extraction_manager().get(extraction_id)
+    if job is None or job.session_id != session_id:
+        raise HTTPException(status_code=404, detail="Extraction not found")
+    return job
+
+
+@router.get("/extractions/{extraction_id}")
+async def get_extraction_status(extraction_id: str, session_id: str, request: Request) -> Dict[str, Any]:
+    """
+    Report the progress of a background archive extraction.
+
+    Args:
+        extraction_id: ID returned by the upload response.
+        session_id: Session ID.
+
+    Returns:
+        Extraction status payload.
+    """
+    job = _get_extraction_job(extraction_id, session_id, request)
+    payload = job.to_dict(include_events=False)
+    payload["success"] = True
+    return payload
+
+
+@router.get("/extractions/{extraction_id}/events")
+async def stream_extraction_events(extraction_id: str, session_id: str, request: Request) -> StreamingResponse:
+    """Stream extraction progress as server-sent events until it finishes."""
+    job = _get_extraction_job(extraction_id, session_id, request)
+
+    async def event_generator() -> AsyncIterator[str]:
+        cursor = 0
+        while True:
+            if await request.is_disconnected():
+                break
+            events = await job.events_after(cursor, 15.0)
+            cursor += len(events)
+            for event in events:
+                yield _sse_message(event)
+            if job.done and cursor >= len(job.events):
+                break
+            if not events:
+                yield _sse_message({"type": "heartbeat", **job.to_dict(include_events=False)})
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(event_generator(), media_type="text/event-stream", headers=headers)
+
+
 @router.delete("/{file_id}")
 async def delete_file(file_id: str, session_id: str, request: Request) -> Dict[str, Any]:
     """
@@ -0,0 +1,195 @@
+"""Long-lived background event loop for calling coroutines from sync code.
+
+Synchronous code paths (the plan executor, tool bridges) used to run each
+coroutine on a fresh ``asyncio.run`` loop in a throwaway thread.  Every call
+then paid thread and loop start-up, and because httpx clients are scoped per
+event loop (see ``app.llm``), lost its pooled LLM connections as well.
+
+:class:`BackgroundEventLoop` keeps one loop running in a daemon thread for
+the life of the process.  :meth:`BackgroundEventLoop.run` schedules a
+coroutine there with the caller's ``contextvars`` (usage context, request
+principal, ...) and blocks for its result; on timeout the task is cancelled
+on the loop rather than left running.  The FastAPI lifespan calls
+:func:`shutdown_background_loop` to cancel stragglers, close the loop's LLM
+client and join the thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import logging
+import threading
+from typing import Any, Coroutine, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHUTDOWN_TIMEOUT = 5.0
+
+
+class BackgroundEventLoop:
+    """An event loop running forever in its own daemon thread."""
+
+    def __init__(self, name: str = "background-event-loop") -> None:
+        self._name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+    @property
+    def is_running(self) -> bool:
+        loop = self._loop
+        return loop is not None and loop.is_running()
+
+    def in_loop_thread(self) -> bool:
+        thread = self._thread
+        return thread is not None and threading.current_thread() is thread
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            return loop
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                thread = threading.Thread(
+                    target=self._run_forever,
+                    args=(loop, started),
+                    name=self._name,
+                    daemon=True,
+                )
+                thread.start()
+                started.wait()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
+
+    @staticmethod
+    def _run_forever(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> "concurrent.futures.Future[Any]":
+        """Schedule ``coro`` on the loop; cancelling the future cancels the task."""
+        loop = self._ensure_started()
+        future: "concurrent.futures.Future[Any]" = concurrent.futures.Future()
+
+        def _start() -> None:
+            if future.cancelled():
+                coro.close()
+                return
+            # Runs inside the caller's copied context, which the task inherits.
+            task = loop.create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            task.add_done_callback(lambda done: _copy_outcome(done, future))
+            future.add_done_callback(lambda f: _cancel_task(f, task, loop))
+
+        loop.call_soon_threadsafe(_start, context=contextvars.copy_context())
+        return future
+
+    def run(self, coro: Coroutine[Any, Any, Any], *, timeout: Optional[float] = None) -> Any:
+        """Run ``coro`` on the loop and block until it finishes or ``timeout`` expires."""
+        if self.in_loop_thread():
+            raise RuntimeError("BackgroundEventLoop.run() would block its own event loop")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Coroutine did not finish within {timeout}s") from None
+
+    def shutdown(self, timeout: float = DEFAULT_SHUTDOWN_TIMEOUT) -> None:
+        """Cancel outstanding tasks, close the loop's LLM client and stop the thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or loop.is_closed():
+            return
+        if loop.is_running():
+            drain = asyncio.run_coroutine_threadsafe(self._drain(), loop)
+            try:
+                drain.result(timeout)
+            except Exception as exc:
+                logger.warning("Background event loop did not drain cleanly: %s", exc)
+            loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+    async def _drain(self) -> None:
+        from app.llm import close_current_loop_async_client
+
+        pending = [task for task in self._tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await close_current_loop_async_client()
+
+
+def _cancel_task(
+    future: "concurrent.futures.Future[Any]",
+    task: asyncio.Task,
+    loop: asyncio.AbstractEventLoop,
+) -> None:
+    if future.cancelled() and not loop.is_closed():
+        loop.call_soon_threadsafe(task.cancel)
+
+
+def _copy_outcome(task: asyncio.Task, future: "concurrent.futures.Future[Any]") -> None:
+    if future.cancelled():
+        return
+    try:
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+    except concurrent.futures.InvalidStateError:
+        # The caller cancelled while the outcome was being copied.
+        pass
+
+
+_background_loop: Optional[BackgroundEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                _background_loop = BackgroundEventLoop()
+                atexit.register(_background_loop.shutdown)
+    return _background_loop
+
+
+def run_coroutine_sync(coro: Coroutine[Any, Any, Any], *, timeout: Optional[float] = None) -> Any:
+    """Run ``coro`` on the shared background loop from synchronous code."""
+    return get_background_loop().run(coro, timeout=timeout)
+
+
+def shutdown_background_loop(timeout: float = DEFAULT_SHUTDOWN_TIMEOUT) -> None:
+    if _background_loop is not None:
+        _background_loop.shutdown(timeout)
+
+
+__all__ = [
+    "BackgroundEventLoop",
+    "get_background_loop",
+    "run_coroutine_sync",
+    "shutdown_background_loop",
+]
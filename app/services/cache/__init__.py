@@ -9,6 +9,7 @@ from .base_cache import BaseCache, CacheEntry
 from .cache_factory import CacheFactory
 from .embedding_cache import EmbeddingCache, get_embedding_cache
 from .llm_cache import LLMCache, get_llm_cache
+from .lru_store import LRUStore, SingleFlight
 
 __all__ = [
     "BaseCache",
@@ -18,4 +19,6 @@ __all__ = [
     "get_embedding_cache",
     "LLMCache",
     "get_llm_cache",
+    "LRUStore",
+    "SingleFlight",
 ]
\ No newline at end of file
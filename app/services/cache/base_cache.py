@@ -3,6 +3,10 @@ Base Cache Implementation
 
 Provides a unified caching foundation with thread-safe operations,
 TTL management, and persistent storage support.
+
+The memory tier is an :class:`~.lru_store.LRUStore`: sharded locks, O(1)
+LRU promotion and eviction on insert, per-entry size accounting and a TTL
+heap, so neither inserts nor the background cleanup scan every entry.
 """
 
 import hashlib
@@ -16,8 +20,22 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple, Union
 from pathlib import Path
 
+from ..foundation.metrics import counter, histogram
+from .lru_store import LRUStore, SingleFlight, estimate_size
+
 logger = logging.getLogger(__name__)
 
+_CACHE_REQUESTS = counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result.",
+    ("cache", "result"),
+)
+_CACHE_GET_SECONDS = histogram(
+    "cache_get_seconds",
+    "Latency of cache lookups, including the persistent tier.",
+    ("cache",),
+)
+
 
 @dataclass
 class CacheEntry:
@@ -85,7 +103,8 @@ class BaseCache(ABC):
         max_size: int = 1000,
         default_ttl: int = 3600,
         enable_persistent: bool = True,
-        cleanup_interval: int = 300
+        cleanup_interval: int = 300,
+        max_memory_bytes: Optional[int] = None,
     ):
         """
         Initialize base cache.
@@ -96,6 +115,7 @@ class BaseCache(ABC):
             default_ttl: Default TTL in seconds
             enable_persistent: Whether to enable persistent storage
             cleanup_interval: Cleanup interval in seconds
+            max_memory_bytes: Optional byte budget for the memory tier
         """
         self.cache_name = cache_name
         self.max_size = max_size
@@ -103,11 +123,18 @@ class BaseCache(ABC):
         self.enable_persistent = enable_persistent
         self.cleanup_interval = cleanup_interval
         
-        # Memory cache (key -> CacheEntry)
-        self._memory_cache: Dict[str, CacheEntry] = {}
+        # Memory cache (key -> CacheEntry), LRU-ordered and size-bounded
+        self._memory_cache = LRUStore(
+            max_size,
+            max_bytes=max_memory_bytes,
+            size_of=self._entry_size,
+            deadline_of=self._entry_deadline,
+        )
         
-        # Thread safety
+        # Thread safety: the store locks its own shards; this lock guards
+        # statistics and multi-step operations in subclasses.
         self._lock = threading.RLock()
+        self._flights = SingleFlight()
         
         # Statistics
         self._stats = {
@@ -125,6 +152,15 @@ class BaseCache(ABC):
         # Background cleanup
         self._start_cleanup_thread()
 
+    @staticmethod
+    def _entry_size(entry: CacheEntry) -> int:
+        return estimate_size(getattr(entry, "value", entry))
+
+    @staticmethod
+    def _entry_deadline(entry: CacheEntry) -> Optional[float]:
+        ttl = getattr(entry, "ttl", None)
+        return entry.created_at + ttl if ttl is not None else None
+
     def _get_db_path(self) -> str:
         """Get database file path for this cache."""
         from ...config.database_config import get_cache_database_path
@@ -192,40 +228,48 @@ class BaseCache(ABC):
         Returns:
             Cached value or None if not found/expired
         """
+        started = time.perf_counter()
+        value = self._get(key)
+        _CACHE_REQUESTS.labels(self.cache_name, "miss" if value is None else "hit").inc()
+        _CACHE_GET_SECONDS.labels(self.cache_name).observe(time.perf_counter() - started)
+        return value
+
+    def _get(self, key: str) -> Optional[Any]:
+        # Check memory cache
+        entry = self._memory_cache.get(key)
+        if entry is not None:
+            if entry.is_expired():
+                self._memory_cache.pop(key, None)
+                if self.enable_persistent:
+                    self._delete_from_db(key)
+                self._record(hit=False)
+                return None
+
+            entry.update_access()
+            self._update_in_db(entry)
+            self._record(hit=True)
+            return entry.value
+
+        # Check persistent storage
+        if self.enable_persistent:
+            entry = self._load_from_db(key)
+            if entry:
+                if not entry.is_expired():
+                    entry.update_access()
+                    self._memory_cache[key] = entry
+                    self._update_in_db(entry)
+                    self._record(hit=True)
+                    return entry.value
+                else:
+                    self._delete_from_db(key)
+
+        self._record(hit=False)
+        return None
+
+    def _record(self, *, hit: bool) -> None:
         with self._lock:
             self._stats['total_requests'] += 1
-            
-            # Check memory cache
-            if key in self._memory_cache:
-                entry = self._memory_cache[key]
-                
-                if entry.is_expired():
-                    del self._memory_cache[key]
-                    if self.enable_persistent:
-                        self._delete_from_db(key)
-                    self._stats['misses'] += 1
-                    return None
-                
-                entry.update_access()
-                self._update_in_db(entry)
-                self._stats['hits'] += 1
-                return entry.value
-            
-            # Check persistent storage
-            if self.enable_persistent:
-                entry = self._load_from_db(key)
-                if entry:
-                    if not entry.is_expired():
-                        self._memory_cache[key] = entry
-                        entry.update_access()
-                        self._update_in_db(entry)
-                        self._stats['hits'] += 1
-                        return entry.value
-                    else:
-                        self._delete_from_db(key)
-            
-            self._stats['misses'] += 1
-            return None
+            self._stats['hits' if hit else 'misses'] += 1
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """
@@ -240,12 +284,10 @@ class BaseCache(ABC):
             ttl = self.default_ttl
             
         entry = CacheEntry(key=key, value=value, ttl=ttl)
+        self._memory_cache[key] = entry
         
-        with self._lock:
-            self._memory_cache[key] = entry
-            
-            if self.enable_persistent:
-                self._save_to_db(entry)
+        if self.enable_persistent:
+            self._save_to_db(entry)
 
     def delete(self, key: str) -> bool:
         """
@@ -257,18 +299,13 @@ class BaseCache(ABC):
         Returns:
             True if entry was deleted, False if not found
         """
-        with self._lock:
-            deleted = False
-            
-            if key in self._memory_cache:
-                del self._memory_cache[key]
+        deleted = self._memory_cache.pop(key, None) is not None
+        
+        if self.enable_persistent:
+            if self._delete_from_db(key):
                 deleted = True
-            
-            if self.enable_persistent:
-                if self._delete_from_db(key):
-                    deleted = True
-            
-            return deleted
+        
+        return deleted
 
     def clear(self) -> None:
         """Clear all entries from cache."""
@@ -304,6 +341,8 @@ class BaseCache(ABC):
                 'hit_rate': hit_rate * 100,  # Convert to percentage
                 'current_size': len(self._memory_cache),
                 'memory_size': len(self._memory_cache),  # Keep for backward compatibility
+                'memory_bytes': self._memory_cache.memory_bytes,
+                'evictions': self._stats['evictions'] + self._memory_cache.evictions,
                 'max_size': self.max_size,
                 'default_ttl': self.default_ttl,
                 'enable_persistent': self.enable_persistent,
@@ -365,59 +404,33 @@ class BaseCache(ABC):
     def _cleanup_expired(self) -> int:
         """Remove expired entries from cache."""
         current_time = time.time()
-        expired_keys = []
+        # Only entries whose TTL deadline has passed are visited.
+        expired_keys = self._memory_cache.expire(current_time)
         
-        with self._lock:
-            # Check memory cache
-            for key, entry in self._memory_cache.items():
-                if entry.is_expired(current_time):
-                    expired_keys.append(key)
-            
-            # Remove expired entries
-            for key in expired_keys:
-                del self._memory_cache[key]
-                if self.enable_persistent:
-                    self._delete_from_db(key)
-            
-            # Also cleanup expired entries from database
-            if self.enable_persistent:
-                try:
-                    with sqlite3.connect(self._db_path) as conn:
-                        cursor = conn.execute('''
-                            DELETE FROM cache_entries 
-                            WHERE created_at + ttl < ?
-                        ''', (current_time,))
-                        deleted_count = cursor.rowcount + len(expired_keys)
-                        conn.commit()
-                        if deleted_count > 0:
-                            logger.debug(f"Cleaned {deleted_count} expired entries from {self.cache_name}")
-                        return deleted_count
-                except Exception as e:
-                    logger.error(f"Failed to cleanup expired entries: {e}")
-            
-            return len(expired_keys)
+        # Also cleanup expired entries from database
+        if self.enable_persistent:
+            try:
+                with sqlite3.connect(self._db_path) as conn:
+                    cursor = conn.execute('''
+                        DELETE FROM cache_entries 
+                        WHERE created_at + ttl < ?
+                    ''', (current_time,))
+                    deleted_count = cursor.rowcount + len(expired_keys)
+                    conn.commit()
+                    if deleted_count > 0:
+                        logger.debug(f"Cleaned {deleted_count} expired entries from {self.cache_name}")
+                    return deleted_count
+            except Exception as e:
+                logger.error(f"Failed to cleanup expired entries: {e}")
+        
+        return len(expired_keys)
 
     def _enforce_memory_limit(self) -> int:
         """Enforce memory cache size limit using LRU eviction."""
-        if len(self._memory_cache) <= self.max_size:
-            return 0
-        
-        # Sort by last accessed time (LRU)
-        sorted_entries = sorted(
-            self._memory_cache.items(),
-            key=lambda x: x[1].last_accessed
-        )
-        
-        evicted_count = len(self._memory_cache) - self.max_size
-        evicted = []
-        
-        with self._lock:
-            for key, _ in sorted_entries[:evicted_count]:
-                del self._memory_cache[key]
-                if self.enable_persistent:
-                    self._delete_from_db(key)
-                evicted.append(key)
-                self._stats['evictions'] += 1
+        # Inserts already evict; this only matters after max_size changes.
+        if self._memory_cache.max_entries != self.max_size:
+            self._memory_cache.resize(self.max_size, self._memory_cache.max_bytes)
+        evicted_count = self._memory_cache.enforce_limits()
         
         if evicted_count > 0:
             logger.debug(f"Evicted {evicted_count} entries from {self.cache_name} cache")
@@ -448,13 +461,20 @@ class BaseCache(ABC):
         if value is not None:
             return value
         
-        # Compute value
-        try:
-            value = compute_func(*args, **kwargs)
-        except Exception as e:
-            logger.error(f"Error computing value for key {key}: {e}")
-            raise
+        def _compute() -> Any:
+            # A concurrent caller may have filled the key while we waited.
+            entry = self._memory_cache.peek(key)
+            if entry is not None and not entry.is_expired():
+                return entry.value
+            try:
+                computed = compute_func(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Error computing value for key {key}: {e}")
+                raise
+            
+            # Cache computed value
+            self.set(key, computed, ttl)
+            return computed
         
-        # Cache computed value
-        self.set(key, value, ttl)
-        return value
\ No newline at end of file
+        # Concurrent misses on the same key share one computation
+        return self._flights.do(key, _compute)
\ No newline at end of file
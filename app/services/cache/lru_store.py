@@ -0,0 +1,307 @@
+"""
+Sharded LRU store and single-flight helper for the cache layer.
+
+:class:`LRUStore` is the in-memory tier behind :class:`BaseCache`.  Keys are
+spread over independently locked shards; each shard keeps its entries in an
+``OrderedDict`` so a hit is an O(1) ``move_to_end`` and an eviction an O(1)
+``popitem(last=False)``.  Entry sizes are accounted on insert, so byte limits
+are enforced without rescanning, and TTL deadlines sit in a per-shard heap so
+expiring entries costs O(k log n) for the k that are due rather than a sweep
+of every entry.
+
+The store exposes a ``MutableMapping``-style surface (``store[key] = entry``,
+``del store[key]``, ``len``, iteration over a snapshot of keys) because cache
+subclasses manipulate ``_memory_cache`` directly.
+
+:class:`SingleFlight` lets concurrent cache misses on the same key share one
+computation.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+_MAX_SHARDS = 16
+_ENTRIES_PER_SHARD = 256
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """Shallow byte estimate of ``value`` plus its immediate items."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    return size
+
+
+class _Shard:
+    __slots__ = ("lock", "entries", "sizes", "deadlines", "expiry", "bytes")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.sizes: Dict[Hashable, int] = {}
+        self.deadlines: Dict[Hashable, float] = {}
+        # (deadline, sequence, key); stale items are skipped when popped.
+        self.expiry: List[Tuple[float, int, Hashable]] = []
+        self.bytes = 0
+
+    def discard(self, key: Hashable) -> Any:
+        # Callers hold self.lock.
+        value = self.entries.pop(key)
+        self.bytes -= self.sizes.pop(key, 0)
+        self.deadlines.pop(key, None)
+        return value
+
+
+class LRUStore:
+    """Thread-safe LRU mapping with per-shard locks, byte accounting and TTL heaps."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        *,
+        max_bytes: Optional[int] = None,
+        shards: Optional[int] = None,
+        size_of: Callable[[Any], int] = estimate_size,
+        deadline_of: Optional[Callable[[Any], Optional[float]]] = None,
+    ) -> None:
+        if shards is None:
+            # Small caches stay on one shard so eviction order is exact LRU.
+            shards = max(1, min(_MAX_SHARDS, max_entries // _ENTRIES_PER_SHARD))
+        self._shards = [_Shard() for _ in range(shards)]
+        self._size_of = size_of
+        self._deadline_of = deadline_of
+        self._sequence = itertools.count()
+        self._evictions = 0
+        self._counter_lock = threading.Lock()
+        self.resize(max_entries, max_bytes)
+
+    def resize(self, max_entries: int, max_bytes: Optional[int] = None) -> None:
+        count = len(self._shards)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._shard_entries = max(1, math.ceil(max_entries / count))
+        self._shard_bytes = math.ceil(max_bytes / count) if max_bytes else None
+
+    def _shard(self, key: Hashable) -> _Shard:
+        shards = self._shards
+        return shards[hash(key) % len(shards)] if len(shards) > 1 else shards[0]
+
+    def _evict(self, shard: _Shard) -> int:
+        # Callers hold shard.lock; the newest entry is never evicted for size.
+        evicted = 0
+        byte_limit = self._shard_bytes
+        while len(shard.entries) > self._shard_entries or (
+            byte_limit is not None and shard.bytes > byte_limit and len(shard.entries) > 1
+        ):
+            key, _ = shard.entries.popitem(last=False)
+            shard.bytes -= shard.sizes.pop(key, 0)
+            shard.deadlines.pop(key, None)
+            evicted += 1
+        if evicted:
+            with self._counter_lock:
+                self._evictions += evicted
+        return evicted
+
+    # -- mapping surface -------------------------------------------------
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value and mark it most recently used."""
+        shard = self._shard(key)
+        with shard.lock:
+            value = shard.entries.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            shard.entries.move_to_end(key)
+            return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value without touching its recency."""
+        shard = self._shard(key)
+        with shard.lock:
+            return shard.entries.get(key, default)
+
+    def set(self, key: Hashable, value: Any, *, size: Optional[int] = None, deadline: Optional[float] = None) -> int:
+        """Insert or replace ``key``; returns the number of entries evicted."""
+        if size is None:
+            size = self._size_of(value)
+        if deadline is None and self._deadline_of is not None:
+            deadline = self._deadline_of(value)
+        shard = self._shard(key)
+        with shard.lock:
+            if key in shard.entries:
+                shard.bytes -= shard.sizes.get(key, 0)
+            shard.entries[key] = value
+            shard.entries.move_to_end(key)
+            shard.sizes[key] = size
+            shard.bytes += size
+            if deadline is not None:
+                shard.deadlines[key] = deadline
+                heapq.heappush(shard.expiry, (deadline, next(self._sequence), key))
+            else:
+                shard.deadlines.pop(key, None)
+            return self._evict(shard)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        shard = self._shard(key)
+        with shard.lock:
+            if key not in shard.entries:
+                return default
+            return shard.discard(key)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        shard = self._shard(key)
+        with shard.lock:
+            value = shard.entries[key]
+            shard.entries.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+        shard = self._shard(key)
+        with shard.lock:
+            shard.discard(key)
+
+    def __contains__(self, key: object) -> bool:
+        shard = self._shard(key)  # type: ignore[arg-type]
+        with shard.lock:
+            return key in shard.entries
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.keys())
+
+    def keys(self) -> List[Hashable]:
+        """Snapshot of the keys, least recently used first within each shard."""
+        keys: List[Hashable] = []
+        for shard in self._shards:
+            with shard.lock:
+                keys.extend(shard.entries)
+        return keys
+
+    def values(self) -> List[Any]:
+        return [value for _, value in self.items()]
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        items: List[Tuple[Hashable, Any]] = []
+        for shard in self._shards:
+            with shard.lock:
+                items.extend(shard.entries.items())
+        return items
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.sizes.clear()
+                shard.deadlines.clear()
+                shard.expiry.clear()
+                shard.bytes = 0
+
+    # -- maintenance -----------------------------------------------------
+
+    def expire(self, now: Optional[float] = None) -> List[Hashable]:
+        """Drop entries whose deadline has passed; returns their keys."""
+        now = time.time() if now is None else now
+        expired: List[Hashable] = []
+        for shard in self._shards:
+            with shard.lock:
+                heap = shard.expiry
+                while heap and heap[0][0] <= now:
+                    deadline, _, key = heapq.heappop(heap)
+                    # Skip heap items left behind by replaced or removed entries.
+                    if shard.deadlines.get(key) == deadline:
+                        shard.discard(key)
+                        expired.append(key)
+                if len(heap) > 2 * len(shard.deadlines) + 64:
+                    shard.expiry = [item for item in heap if shard.deadlines.get(item[2]) == item[0]]
+                    heapq.heapify(shard.expiry)
+        return expired
+
+    def enforce_limits(self) -> int:
+        """Evict down to the current limits, e.g. after :meth:`resize`."""
+        evicted = 0
+        for shard in self._shards:
+            with shard.lock:
+                evicted += self._evict(shard)
+        return evicted
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(shard.bytes for shard in self._shards)
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "owner")
+
+    def __init__(self, owner: int) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.owner = owner
+
+
+class SingleFlight:
+    """Run at most one computation per key at a time; concurrent callers share it."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        thread_id = threading.get_ident()
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight(thread_id)
+                self._flights[key] = flight
+
+        if not leader:
+            if flight.owner == thread_id:
+                # Re-entrant call for the key this thread is already computing.
+                return compute()
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+
+__all__ = ["LRUStore", "SingleFlight", "estimate_size"]
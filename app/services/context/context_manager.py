@@ -8,10 +8,13 @@ Phase 4 of the architecture evolution (see docs/architecture-evolution.md).
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Callable, Awaitable, Dict, List, Optional
+from typing import Any, Callable, Awaitable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +25,21 @@ logger = logging.getLogger(__name__)
 from functools import lru_cache
 
 
+_ENCODING_NAME = "cl100k_base"
+
+# Bounded LRU of token counts keyed by (content digest, length, encoding).
+# History messages are re-estimated every DeepThink iteration and across
+# turns; the digest is far cheaper than re-encoding the text.
+_TOKEN_MEMO_MAX_ENTRIES = 8192
+_token_memo: "OrderedDict[Tuple[str, int, str], int]" = OrderedDict()
+_token_memo_lock = threading.Lock()
+
+
 @lru_cache(maxsize=1)
 def _get_encoder():
     """Return a cached tiktoken encoder (lazy-loaded, cached after first call)."""
     import tiktoken
-    return tiktoken.get_encoding("cl100k_base")
+    return tiktoken.get_encoding(_ENCODING_NAME)
 
 
 def estimate_tokens(text: str) -> int:
@@ -34,9 +47,30 @@ def estimate_tokens(text: str) -> int:
 
     This is an approximation — exact counts depend on the actual model
     tokenizer, but cl100k_base is a reasonable proxy for Qwen/OpenAI/Claude.
+    Results are memoized by content hash, so repeated estimates of the same
+    text do not re-run the tokenizer.
     """
     if not text:
         return 0
+    key = (
+        hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest(),
+        len(text),
+        _ENCODING_NAME,
+    )
+    with _token_memo_lock:
+        cached = _token_memo.get(key)
+        if cached is not None:
+            _token_memo.move_to_end(key)
+            return cached
+    count = _estimate_tokens_uncached(text)
+    with _token_memo_lock:
+        _token_memo[key] = count
+        if len(_token_memo) > _TOKEN_MEMO_MAX_ENTRIES:
+            _token_memo.popitem(last=False)
+    return count
+
+
+def _estimate_tokens_uncached(text: str) -> int:
     try:
         encoded_tokens = len(_get_encoder().encode(text))
         cjk_chars = _count_cjk_chars(text)
@@ -200,10 +234,38 @@ class ContextWindowManager:
         self.warning_ratio = warning_ratio
         self.critical_ratio = critical_ratio
         self._compaction_count = 0
+        # id(message) -> (message, content, tool_calls, tokens).  Holding the
+        # message keeps its id from being reused; content/tool_calls identity
+        # detects replacement of either field.
+        self._message_tokens: Dict[int, Tuple[Dict[str, Any], Any, Any, int]] = {}
+
+    def _estimate_messages(self, messages: List[Dict[str, Any]]) -> int:
+        """Sum per-message token counts, estimating only messages not seen before."""
+        previous = self._message_tokens
+        current: Dict[int, Tuple[Dict[str, Any], Any, Any, int]] = {}
+        total = 0
+        for message in messages:
+            content = message.get("content")
+            tool_calls = message.get("tool_calls")
+            entry = previous.get(id(message))
+            if (
+                entry is not None
+                and entry[0] is message
+                and entry[1] is content
+                and entry[2] is tool_calls
+            ):
+                tokens = entry[3]
+            else:
+                tokens = estimate_message_tokens(message)
+            current[id(message)] = (message, content, tool_calls, tokens)
+            total += tokens
+        # Only the current list is retained, so compacted-away messages are dropped.
+        self._message_tokens = current
+        return total
 
     def check_usage(self, messages: List[Dict[str, Any]]) -> ContextUsage:
         """Estimate token usage and return a usage snapshot."""
-        used = estimate_messages_tokens(messages)
+        used = self._estimate_messages(messages)
         ratio = used / self.max_context_tokens if self.max_context_tokens > 0 else 0.0
         return ContextUsage(
             used_tokens=used,
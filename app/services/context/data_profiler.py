@@ -13,12 +13,13 @@ This helps the agent make informed decisions before generating code.
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
 import os
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -138,11 +139,47 @@ class DataProfiler:
     ]
     
     def __init__(self):
-        self._cache: Dict[str, DataProfile] = {}
+        # data_dir -> (directory signature, profile)
+        self._cache: Dict[str, Tuple[Optional[str], DataProfile]] = {}
     
     def clear_cache(self):
         """Clear the profile cache."""
         self._cache.clear()
+
+    @staticmethod
+    def _directory_signature(data_dir: str) -> Optional[str]:
+        """Fingerprint every profiled file by (path, size, mtime_ns).
+
+        Directory mtimes alone miss in-place edits, which leave the parent
+        directory untouched; this is one stat per file, as profiling does.
+        Hidden files are skipped, matching :meth:`_profile_sync`.
+        """
+        root = os.path.realpath(data_dir)
+        digest = hashlib.sha1()
+        stack = [root]
+        try:
+            while stack:
+                current = stack.pop()
+                with os.scandir(current) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+                for entry in entries:
+                    if entry.is_dir():
+                        # os.walk lists but does not descend into symlinked dirs.
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                        continue
+                    if entry.name.startswith('.'):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    digest.update(
+                        f"{entry.path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8", "replace")
+                    )
+        except OSError:
+            return None
+        return digest.hexdigest()
     
     async def profile(self, data_dir: str, force_refresh: bool = False) -> DataProfile:
         """
@@ -155,10 +192,12 @@ class DataProfiler:
         Returns:
             DataProfile with complete analysis
         """
-        # Check cache first
-        if not force_refresh and data_dir in self._cache:
+        # Check cache first; entries are reused only while the tree is unchanged
+        signature = await asyncio.to_thread(self._directory_signature, data_dir)
+        cached = self._cache.get(data_dir)
+        if not force_refresh and cached is not None and cached[0] == signature:
             logger.debug(f"Using cached profile for {data_dir}")
-            return self._cache[data_dir]
+            return cached[1]
         
         logger.info(f"Profiling data directory: {data_dir}")
         
@@ -166,7 +205,7 @@ class DataProfiler:
         profile = await asyncio.to_thread(self._profile_sync, data_dir)
         
         # Cache the result
-        self._cache[data_dir] = profile
+        self._cache[data_dir] = (signature, profile)
         
         return profile
     
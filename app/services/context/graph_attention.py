@@ -13,6 +13,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 
 from ...repository.tasks import SqliteTaskRepository
+from ..embeddings.similarity_kernels import cosine_similarities
 
 logger = logging.getLogger(__name__)
 
@@ -234,28 +235,18 @@ class GraphAttentionReranker:
             return {task_id: 0.0 for task_id in task_ids}
 
         query_idx = task_ids.index(query_task_id)
-        n = len(task_ids)
-
-        # Simplified multi-head attention mechanism
-        attention_scores = {}
-
-        for i, task_id in enumerate(task_ids):
-            if i == query_idx:
-                attention_scores[task_id] = 1.0  # Query node itself
-                continue
-
-            # Calculate attention weight
-            attention_weight = self._compute_pairwise_attention(query_idx, i, node_features, adjacency)
 
-            attention_scores[task_id] = attention_weight
+        # Simplified attention: feature similarity to every node in one pass
+        feature_similarity = cosine_similarities(node_features[query_idx], node_features)
+        weights = np.maximum(0.7 * feature_similarity + 0.3 * adjacency[query_idx], 0.0)
+        weights[query_idx] = 1.0  # Query node itself
 
         # Normalize attention scores
-        max_score = max(attention_scores.values()) if attention_scores else 1.0
+        max_score = float(weights.max()) if weights.size else 1.0
         if max_score > 0:
-            for task_id in attention_scores:
-                attention_scores[task_id] /= max_score
+            weights = weights / max_score
 
-        return attention_scores
+        return {task_id: float(weight) for task_id, weight in zip(task_ids, weights)}
 
     def _compute_pairwise_attention(
         self, query_idx: int, candidate_idx: int, node_features: np.ndarray, adjacency: np.ndarray
@@ -279,14 +270,7 @@ class GraphAttentionReranker:
     def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
         """Compute cosine similarity"""
         try:
-            norm1 = np.linalg.norm(vec1)
-            norm2 = np.linalg.norm(vec2)
-
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-
-            similarity = np.dot(vec1, vec2) / (norm1 * norm2)
-            return float(np.clip(similarity, -1.0, 1.0))
+            return float(cosine_similarities(vec1, vec2)[0])
         except Exception:
             return 0.0
 
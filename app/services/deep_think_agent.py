@@ -4046,6 +4046,7 @@ class DeepThinkAgent:
         from app.services.execution.async_tool_executor import (
             PendingToolCall,
             classify_tool_concurrency,
+            classify_tool_resources,
             execute_with_concurrency,
         )
 
@@ -4263,6 +4264,10 @@ class DeepThinkAgent:
                         await self._safe_callback(current_step)
 
                     pending = []
+                    resource_context = {
+                        "session_id": str(self.request_profile.get("session_id") or "").strip() or None,
+                        "plan_id": self._current_plan_id(),
+                    }
                     for idx, tc in enumerate(executable_calls):
                         name = str(getattr(tc, "name", "") or "")
                         pending.append(PendingToolCall(
@@ -4272,6 +4277,11 @@ class DeepThinkAgent:
                                 tc=_tc, iteration=iteration, index=_idx,
                             ),
                             is_concurrent_safe=classify_tool_concurrency(name),
+                            resources=classify_tool_resources(
+                                name,
+                                getattr(tc, "arguments", None) or {},
+                                context=resource_context,
+                            ),
                         ))
                     tool_results = await execute_with_concurrency(pending)
 
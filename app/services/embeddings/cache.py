@@ -4,22 +4,273 @@ Embedding Cache Management Module
 
 Provides efficient embedding cache mechanism to avoid redundant computation of vectors for the same text,
 supports both in-memory cache and persistent storage modes.
+
+The persistent layer (:class:`EmbeddingVectorStore`) keeps one long-lived WAL connection per
+database file, shared by every cache instance that points at it. Vectors are stored as float32
+BLOBs, batch lookups are answered with a single ``IN (...)`` query, and access statistics are
+buffered in memory and flushed periodically instead of committing an ``UPDATE`` on every hit.
 """
 
+import atexit
 import hashlib
 import json
 import logging
-import os
 import sqlite3
+import threading
 import time
+from array import array
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from app.services.foundation.config import get_config
 from app.services.foundation.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# SQLite's default limit on host parameters is 999 on older builds.
+_SQL_BATCH = 500
+_STATS_FLUSH_INTERVAL = 30.0
+_STATS_FLUSH_THRESHOLD = 512
+
+
+def encode_vector(embedding: Sequence[float]) -> bytes:
+    """Pack an embedding as native-endian float32."""
+    return array("f", embedding).tobytes()
+
+
+def decode_vector(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class EmbeddingVectorStore:
+    """SQLite-backed embedding vectors behind one shared, long-lived connection."""
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        flush_interval: float = _STATS_FLUSH_INTERVAL,
+        flush_threshold: int = _STATS_FLUSH_THRESHOLD,
+    ):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # text_hash -> [pending access count, latest access time]
+        self._pending_access: Dict[str, List[float]] = {}
+        self._last_flush = time.monotonic()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Callers hold self._lock.
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_vectors (
+                    text_hash TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    access_count INTEGER DEFAULT 0,
+                    last_accessed REAL DEFAULT 0.0
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_vectors_model ON embedding_vectors(model)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vectors_last_accessed ON embedding_vectors(last_accessed)"
+            )
+            self._migrate_json_rows(conn)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _migrate_json_rows(conn: sqlite3.Connection) -> None:
+        """Convert rows from the legacy JSON ``embedding_cache`` table, then drop it."""
+        legacy = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='embedding_cache'"
+        ).fetchone()
+        if not legacy:
+            return
+        cursor = conn.execute(
+            "SELECT text_hash, embedding_json, model, created_at, access_count, last_accessed FROM embedding_cache"
+        )
+        migrated = 0
+        while True:
+            rows = cursor.fetchmany(_SQL_BATCH)
+            if not rows:
+                break
+            records = []
+            for text_hash, embedding_json, model, created_at, access_count, last_accessed in rows:
+                try:
+                    embedding = json.loads(embedding_json)
+                except (TypeError, ValueError):
+                    continue
+                records.append(
+                    (text_hash, model, len(embedding), encode_vector(embedding), created_at, access_count or 0, last_accessed or 0.0)
+                )
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO embedding_vectors
+                (text_hash, model, dim, vector, created_at, access_count, last_accessed)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                records,
+            )
+            migrated += len(records)
+        conn.execute("DROP TABLE embedding_cache")
+        logger.info(f"Migrated {migrated} embedding cache rows to float32 storage")
+
+    def get_many(self, text_hashes: Iterable[str], model: str) -> Dict[str, List[float]]:
+        """Vectors for the known hashes, fetched with one query per 500 keys."""
+        keys = list(dict.fromkeys(text_hashes))
+        found: Dict[str, List[float]] = {}
+        if not keys:
+            return found
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(keys), _SQL_BATCH):
+                chunk = keys[start : start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embedding_vectors WHERE model = ? AND text_hash IN ({placeholders})",
+                    (model, *chunk),
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = decode_vector(blob)
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[str, Sequence[float], str]], timestamp: Optional[float] = None) -> None:
+        """Upsert ``(text_hash, embedding, model)`` triples in one transaction."""
+        now = time.time() if timestamp is None else timestamp
+        records = [
+            (text_hash, model, len(embedding), encode_vector(embedding), now, 1, now)
+            for text_hash, embedding, model in entries
+        ]
+        if not records:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO embedding_vectors
+                    (text_hash, model, dim, vector, created_at, access_count, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    records,
+                )
+
+    def record_access(self, text_hashes: Iterable[str], timestamp: Optional[float] = None) -> None:
+        """Buffer access statistics; they are written on the next periodic flush."""
+        now = time.time() if timestamp is None else timestamp
+        with self._lock:
+            for text_hash in text_hashes:
+                pending = self._pending_access.get(text_hash)
+                if pending is None:
+                    self._pending_access[text_hash] = [1, now]
+                else:
+                    pending[0] += 1
+                    pending[1] = now
+            due = (
+                len(self._pending_access) >= self.flush_threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered access statistics; returns the number of rows updated."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending_access:
+                return 0
+            pending, self._pending_access = self._pending_access, {}
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    """
+                    UPDATE embedding_vectors
+                    SET access_count = access_count + ?, last_accessed = MAX(last_accessed, ?)
+                    WHERE text_hash = ?
+                    """,
+                    [(count, last, text_hash) for text_hash, (count, last) in pending.items()],
+                )
+            return len(pending)
+
+    def count(self) -> int:
+        with self._lock:
+            row = self._connection().execute("SELECT COUNT(*) FROM embedding_vectors").fetchone()
+        return row[0] if row else 0
+
+    def model_distribution(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT model, COUNT(*) FROM embedding_vectors GROUP BY model"
+            ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending_access.clear()
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM embedding_vectors")
+
+    def delete_older_than(self, cutoff_time: float) -> int:
+        self.flush()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute("DELETE FROM embedding_vectors WHERE last_accessed < ?", (cutoff_time,))
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """Flush pending statistics and close the connection; it reopens on next use."""
+        with self._lock:
+            if self._conn is None:
+                self._pending_access.clear()
+                return
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to flush embedding cache statistics: {e}")
+            self._conn.close()
+            self._conn = None
+
+
+_vector_stores: Dict[str, EmbeddingVectorStore] = {}
+_vector_stores_lock = threading.Lock()
+
+
+def get_embedding_vector_store(db_path: str) -> EmbeddingVectorStore:
+    """Shared store for ``db_path`` so every cache reuses one connection."""
+    store = _vector_stores.get(db_path)
+    if store is None:
+        with _vector_stores_lock:
+            store = _vector_stores.get(db_path)
+            if store is None:
+                store = EmbeddingVectorStore(db_path)
+                _vector_stores[db_path] = store
+    return store
+
+
+def close_embedding_vector_stores() -> None:
+    with _vector_stores_lock:
+        stores = list(_vector_stores.values())
+    for store in stores:
+        store.close()
+
+
+atexit.register(close_embedding_vector_stores)
+
 
 @dataclass
 class CacheEntry:
@@ -47,6 +298,7 @@ class EmbeddingCache:
         # Persistent cache database path
         from ...config.database_config import get_cache_database_path
         self.cache_db_path = get_cache_database_path("embedding")
+        self._store: Optional[EmbeddingVectorStore] = None
 
         if self.enable_persistent:
             self._init_persistent_cache()
@@ -56,24 +308,11 @@ class EmbeddingCache:
     def _init_persistent_cache(self):
         """Initialize persistent cache database"""
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS embedding_cache (
-                        text_hash TEXT PRIMARY KEY,
-                        embedding_json TEXT NOT NULL,
-                        model TEXT NOT NULL,
-                        created_at REAL NOT NULL,
-                        access_count INTEGER DEFAULT 0,
-                        last_accessed REAL DEFAULT 0.0
-                    )
-                """
-                )
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_model ON embedding_cache(model)")
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_last_accessed ON embedding_cache(last_accessed)")
-                conn.commit()
+            self._store = get_embedding_vector_store(self.cache_db_path)
+            self._store.count()
         except Exception as e:
             logger.error(f"Failed to initialize persistent cache: {e}")
+            self._store = None
             self.enable_persistent = False
 
     def _compute_text_hash(self, text: str, model: str) -> str:
@@ -83,104 +322,17 @@ class EmbeddingCache:
 
     def get(self, text: str, model: str = None) -> Optional[List[float]]:
         """Get embedding from cache"""
-        if not text.strip():
-            return None
-
-        model = model or self.config.embedding_model
-        text_hash = self._compute_text_hash(text, model)
-        current_time = time.time()
-
-        # 1. First check memory cache
-        if text_hash in self._memory_cache:
-            entry = self._memory_cache[text_hash]
-            entry.access_count += 1
-            entry.last_accessed = current_time
-            logger.debug(f"Cache hit (memory): {text_hash[:8]}...")
-            return entry.embedding.copy()
-
-        # 2. Check persistent cache
-        if self.enable_persistent:
-            try:
-                with sqlite3.connect(self.cache_db_path) as conn:
-                    row = conn.execute(
-                        "SELECT embedding_json, access_count FROM embedding_cache WHERE text_hash = ? AND model = ?",
-                        (text_hash, model),
-                    ).fetchone()
-
-                    if row:
-                        embedding = json.loads(row[0])
-                        access_count = row[1] + 1
-
-                        # Update access statistics
-                        conn.execute(
-                            "UPDATE embedding_cache SET access_count = ?, last_accessed = ? WHERE text_hash = ?",
-                            (access_count, current_time, text_hash),
-                        )
-                        conn.commit()
-
-                        # Load to memory cache
-                        self._add_to_memory_cache(
-                            CacheEntry(
-                                text_hash=text_hash,
-                                embedding=embedding,
-                                model=model,
-                                created_at=current_time,
-                                access_count=access_count,
-                                last_accessed=current_time,
-                            )
-                        )
-
-                        logger.debug(f"Cache hit (persistent): {text_hash[:8]}...")
-                        return embedding.copy()
-            except Exception as e:
-                logger.warning(f"Failed to read from persistent cache: {e}")
-
-        logger.debug(f"Cache miss: {text_hash[:8]}...")
-        return None
+        results, _ = self.get_batch([text], model)
+        return results[0]
 
     def put(self, text: str, embedding: List[float], model: str = None) -> None:
         """Store embedding in cache"""
-        if not text.strip() or not embedding:
-            return
-
-        model = model or self.config.embedding_model
-        text_hash = self._compute_text_hash(text, model)
-        current_time = time.time()
-
-        entry = CacheEntry(
-            text_hash=text_hash,
-            embedding=embedding.copy(),
-            model=model,
-            created_at=current_time,
-            access_count=1,
-            last_accessed=current_time,
-        )
-
-        # Store in memory cache
-        self._add_to_memory_cache(entry)
-
-        # Store in persistent cache
-        if self.enable_persistent:
-            try:
-                with sqlite3.connect(self.cache_db_path) as conn:
-                    conn.execute(
-                        """
-                        INSERT OR REPLACE INTO embedding_cache 
-                        (text_hash, embedding_json, model, created_at, access_count, last_accessed)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                        (text_hash, json.dumps(embedding), model, current_time, 1, current_time),
-                    )
-                    conn.commit()
-            except Exception as e:
-                logger.warning(f"Failed to write to persistent cache: {e}")
-
-        logger.debug(f"Cache stored: {text_hash[:8]}...")
+        self.put_batch([text], [embedding], model)
 
     def _add_to_memory_cache(self, entry: CacheEntry) -> None:
         """Add entry to memory cache, handle capacity limits"""
         # If cache is full, remove least used entries
-        if len(self._memory_cache) >= self.cache_size:
+        if entry.text_hash not in self._memory_cache and len(self._memory_cache) >= self.cache_size:
             self._evict_lru()
 
         self._memory_cache[entry.text_hash] = entry
@@ -202,15 +354,51 @@ class EmbeddingCache:
     def get_batch(self, texts: List[str], model: str = None) -> Tuple[List[Optional[List[float]]], List[int]]:
         """Batch get embeddings, return (result list, indices of missed texts)"""
         model = model or self.config.embedding_model
-        results = []
-        cache_misses = []
+        current_time = time.time()
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
 
+        # 1. First check memory cache
         for i, text in enumerate(texts):
-            embedding = self.get(text, model)
-            results.append(embedding)
-            if embedding is None:
-                cache_misses.append(i)
-
+            if not text.strip():
+                continue
+            text_hash = self._compute_text_hash(text, model)
+            entry = self._memory_cache.get(text_hash)
+            if entry is not None:
+                entry.access_count += 1
+                entry.last_accessed = current_time
+                results[i] = entry.embedding.copy()
+            else:
+                pending.setdefault(text_hash, []).append(i)
+
+        # 2. Check persistent cache with one query for all memory misses
+        if pending and self._store is not None:
+            try:
+                found = self._store.get_many(pending, model)
+            except Exception as e:
+                logger.warning(f"Failed to read from persistent cache: {e}")
+                found = {}
+            for text_hash, embedding in found.items():
+                self._add_to_memory_cache(
+                    CacheEntry(
+                        text_hash=text_hash,
+                        embedding=embedding,
+                        model=model,
+                        created_at=current_time,
+                        access_count=1,
+                        last_accessed=current_time,
+                    )
+                )
+                for i in pending[text_hash]:
+                    results[i] = embedding.copy()
+            if found:
+                try:
+                    self._store.record_access(found, current_time)
+                except Exception as e:
+                    logger.warning(f"Failed to update persistent cache statistics: {e}")
+            logger.debug(f"Cache lookup: {len(found)} persistent hits of {len(pending)} memory misses")
+
+        cache_misses = [i for i, embedding in enumerate(results) if embedding is None]
         return results, cache_misses
 
     def put_batch(self, texts: List[str], embeddings: List[List[float]], model: str = None) -> None:
@@ -218,8 +406,33 @@ class EmbeddingCache:
         if len(texts) != len(embeddings):
             raise ValueError("texts and embeddings must have the same length")
 
+        model = model or self.config.embedding_model
+        current_time = time.time()
+        stored: Dict[str, List[float]] = {}
         for text, embedding in zip(texts, embeddings):
-            self.put(text, embedding, model)
+            if not text.strip() or not embedding:
+                continue
+            text_hash = self._compute_text_hash(text, model)
+            stored[text_hash] = list(embedding)
+            self._add_to_memory_cache(
+                CacheEntry(
+                    text_hash=text_hash,
+                    embedding=list(embedding),
+                    model=model,
+                    created_at=current_time,
+                    access_count=1,
+                    last_accessed=current_time,
+                )
+            )
+
+        if stored and self._store is not None:
+            try:
+                self._store.put_many(
+                    ((text_hash, embedding, model) for text_hash, embedding in stored.items()),
+                    current_time,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to write to persistent cache: {e}")
 
     def clear_memory(self) -> None:
         """Clear memory cache"""
@@ -228,15 +441,21 @@ class EmbeddingCache:
 
     def clear_persistent(self) -> None:
         """Clear persistent cache"""
-        if self.enable_persistent:
+        if self._store is not None:
             try:
-                with sqlite3.connect(self.cache_db_path) as conn:
-                    conn.execute("DELETE FROM embedding_cache")
-                    conn.commit()
+                self._store.clear()
                 logger.info("Persistent cache cleared")
             except Exception as e:
                 logger.error(f"Failed to clear persistent cache: {e}")
 
+    def flush(self) -> None:
+        """Write buffered access statistics to the persistent cache"""
+        if self._store is not None:
+            try:
+                self._store.flush()
+            except Exception as e:
+                logger.warning(f"Failed to flush persistent cache statistics: {e}")
+
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics information"""
         stats = {
@@ -245,15 +464,10 @@ class EmbeddingCache:
             "persistent_enabled": self.enable_persistent,
         }
 
-        if self.enable_persistent:
+        if self._store is not None:
             try:
-                with sqlite3.connect(self.cache_db_path) as conn:
-                    row = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()
-                    stats["persistent_cache_size"] = row[0] if row else 0
-
-                    # Get model distribution
-                    model_rows = conn.execute("SELECT model, COUNT(*) FROM embedding_cache GROUP BY model").fetchall()
-                    stats["model_distribution"] = {row[0]: row[1] for row in model_rows}
+                stats["persistent_cache_size"] = self._store.count()
+                stats["model_distribution"] = self._store.model_distribution()
             except Exception as e:
                 logger.warning(f"Failed to get persistent cache stats: {e}")
                 stats["persistent_cache_size"] = 0
@@ -263,19 +477,15 @@ class EmbeddingCache:
 
     def cleanup_old_entries(self, days: int = 30) -> int:
         """Clean up old cache entries"""
-        if not self.enable_persistent:
+        if self._store is None:
             return 0
 
         cutoff_time = time.time() - (days * 24 * 3600)
 
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
-                cursor = conn.execute("DELETE FROM embedding_cache WHERE last_accessed < ?", (cutoff_time,))
-                deleted_count = cursor.rowcount
-                conn.commit()
-
-                logger.info(f"Cleaned up {deleted_count} old cache entries (older than {days} days)")
-                return deleted_count
+            deleted_count = self._store.delete_older_than(cutoff_time)
+            logger.info(f"Cleaned up {deleted_count} old cache entries (older than {days} days)")
+            return deleted_count
         except Exception as e:
             logger.error(f"Failed to cleanup old cache entries: {e}")
             return 0
@@ -11,6 +11,8 @@ from typing import Any, Dict, List, Tuple
 
 import numpy as np
 
+from app.services.embeddings import similarity_kernels as kernels
+
 logger = logging.getLogger(__name__)
 
 
@@ -109,12 +111,21 @@ class SimilarityCalculator:
         if not query_embedding or not target_embeddings:
             return []
 
-        similarities = []
-        for target_embedding in target_embeddings:
-            similarity = self.compute_similarity(query_embedding, target_embedding)
-            similarities.append(similarity)
+        try:
+            dim = len(query_embedding)
+            if all(len(target) == dim for target in target_embeddings):
+                return kernels.cosine_similarities(query_embedding, target_embeddings).tolist()
+            if self.allow_dimension_mismatch:
+                warned = {dim}
+                for target in target_embeddings:
+                    if target and len(target) not in warned:
+                        warned.add(len(target))
+                        self._align_dimensions(query_embedding, target)
+                return kernels.ragged_cosine_similarities(query_embedding, target_embeddings).tolist()
+        except Exception as e:
+            logger.error(f"Vectorized similarity computation failed: {e}")
 
-        return similarities
+        return [self.compute_similarity(query_embedding, target) for target in target_embeddings]
 
     def compute_similarities_batch(
         self, query_embedding: List[float], target_embeddings: List[List[float]]
@@ -129,30 +140,7 @@ class SimilarityCalculator:
         Returns:
             List of similarities
         """
-        if not query_embedding or not target_embeddings:
-            return []
-
-        try:
-            query_vec = np.array(query_embedding, dtype=np.float32)
-            target_matrix = np.array(target_embeddings, dtype=np.float32)
-
-            # Batch compute cosine similarities
-            dot_products = np.dot(target_matrix, query_vec)
-            query_norm = np.linalg.norm(query_vec)
-            target_norms = np.linalg.norm(target_matrix, axis=1)
-
-            # Avoid division by zero
-            valid_mask = (target_norms != 0) & (query_norm != 0)
-            similarities = np.zeros(len(target_embeddings))
-
-            if query_norm != 0:
-                similarities[valid_mask] = dot_products[valid_mask] / (target_norms[valid_mask] * query_norm)
-
-            return similarities.tolist()
-
-        except Exception as e:
-            logger.error(f"Batch similarity computation failed: {e}")
-            return self.compute_similarities(query_embedding, target_embeddings)
+        return self.compute_similarities(query_embedding, target_embeddings)
 
     def find_most_similar(
         self, query_embedding: List[float], candidates: List[Dict[str, Any]], k: int = 5, min_similarity: float = 0.0
@@ -189,17 +177,12 @@ class SimilarityCalculator:
         similarities = self.compute_similarities_batch(query_embedding, candidate_embeddings)
 
         # Add similarity to candidates
-        for i, candidate in enumerate(valid_candidates):
-            candidate["similarity"] = similarities[i]
-
-        # Filter candidates below threshold
-        filtered_candidates = [c for c in valid_candidates if c["similarity"] >= min_similarity]
-
-        # Sort by similarity
-        sorted_candidates = sorted(filtered_candidates, key=lambda x: x["similarity"], reverse=True)
+        for candidate, similarity in zip(valid_candidates, similarities):
+            candidate["similarity"] = similarity
 
-        # Return top k
-        result = sorted_candidates[:k]
+        # Top k above threshold, without sorting every candidate
+        indices, _ = kernels.top_k(np.asarray(similarities), k, min_score=min_similarity)
+        result = [valid_candidates[i] for i in indices.tolist()]
 
         logger.debug(f"Found {len(result)} most similar items from {len(candidates)} candidates")
         return result
@@ -218,34 +201,18 @@ class SimilarityCalculator:
         if not embeddings or len(embeddings) < 2:
             return []
 
-        similar_pairs = []
-
         try:
-            embedding_matrix = np.array(embeddings, dtype=np.float32)
-
-            # Compute similarity matrix for all vector pairs
-            norms = np.linalg.norm(embedding_matrix, axis=1)
-            normalized_embeddings = embedding_matrix / norms[:, np.newaxis]
-            similarity_matrix = np.dot(normalized_embeddings, normalized_embeddings.T)
-
-            # Find similar pairs above threshold
-            for i in range(len(embeddings)):
-                for j in range(i + 1, len(embeddings)):
-                    similarity = similarity_matrix[i, j]
-                    if similarity >= threshold:
-                        similar_pairs.append((i, j, float(similarity)))
-
+            similar_pairs = kernels.similar_pairs(embeddings, threshold)
         except Exception as e:
             logger.error(f"Similar pairs computation failed: {e}")
             # Fallback to pairwise computation
+            similar_pairs = []
             for i in range(len(embeddings)):
                 for j in range(i + 1, len(embeddings)):
                     similarity = self.compute_similarity(embeddings[i], embeddings[j])
                     if similarity >= threshold:
                         similar_pairs.append((i, j, similarity))
-
-        # Sort by similarity
-        similar_pairs.sort(key=lambda x: x[2], reverse=True)
+            similar_pairs.sort(key=lambda x: x[2], reverse=True)
 
         logger.debug(f"Found {len(similar_pairs)} similar pairs above threshold {threshold}")
         return similar_pairs
@@ -287,19 +254,16 @@ class SimilarityCalculator:
 
         try:
             # Compute average similarity of all vector pairs
-            total_similarity = 0.0
-            pair_count = 0
-
-            for i in range(len(embeddings)):
-                for j in range(i + 1, len(embeddings)):
-                    similarity = self.compute_similarity(embeddings[i], embeddings[j])
-                    total_similarity += similarity
-                    pair_count += 1
-
-            if pair_count == 0:
-                return 0.0
-
-            avg_similarity = total_similarity / pair_count
+            try:
+                avg_similarity = kernels.mean_pairwise_similarity(embeddings)
+            except ValueError:
+                # Mixed dimensions: compare pair by pair on the common prefix
+                similarities = [
+                    self.compute_similarity(embeddings[i], embeddings[j])
+                    for i in range(len(embeddings))
+                    for j in range(i + 1, len(embeddings))
+                ]
+                avg_similarity = sum(similarities) / len(similarities)
             diversity_score = 1.0 - avg_similarity  # Lower similarity means higher diversity
 
             return max(0.0, min(1.0, diversity_score))  # Clamp to 0-1 range
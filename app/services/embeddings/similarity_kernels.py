@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Vectorized cosine-similarity kernels.
+
+Vectors are packed once into a C-contiguous float32 matrix and L2-normalized
+in place, so a batch of similarities is a single matrix product (one BLAS
+call) instead of a Python loop over pairs.  Top-k selection uses
+``argpartition`` and only sorts the k selected scores.
+
+Zero vectors have similarity 0 with everything.  Results are clipped to
+[-1, 1] to absorb float32 rounding.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+VectorLike = Union[Sequence[float], np.ndarray]
+MatrixLike = Union[Sequence[Sequence[float]], np.ndarray]
+
+
+def as_matrix(vectors: MatrixLike, dim: Optional[int] = None) -> np.ndarray:
+    """Pack equal-length vectors into a C-contiguous float32 ``(n, dim)`` matrix."""
+    if isinstance(vectors, np.ndarray):
+        matrix = vectors
+    elif len(vectors) == 0:
+        matrix = np.zeros((0, dim or 0), dtype=np.float32)
+    else:
+        matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.ndim != 2:
+        raise ValueError(f"expected a 2-D matrix of vectors, got shape {matrix.shape}")
+    return np.ascontiguousarray(matrix, dtype=np.float32)
+
+
+def normalize_rows(matrix: MatrixLike, *, copy: bool = True) -> np.ndarray:
+    """L2-normalize each row; zero rows stay zero."""
+    normalized = as_matrix(matrix)
+    if copy and normalized is matrix:
+        normalized = normalized.copy()
+    norms = np.linalg.norm(normalized, axis=1, keepdims=True)
+    np.divide(normalized, norms, out=normalized, where=norms > 0)
+    return normalized
+
+
+def cosine_similarity_matrix(queries: MatrixLike, targets: MatrixLike, *, normalized: bool = False) -> np.ndarray:
+    """``(len(queries), len(targets))`` cosine similarities from one matrix product.
+
+    Pass ``normalized=True`` when both inputs already went through
+    :func:`normalize_rows`, e.g. a target matrix reused across queries.
+    """
+    if normalized:
+        query_matrix, target_matrix = as_matrix(queries), as_matrix(targets)
+    else:
+        query_matrix, target_matrix = normalize_rows(queries), normalize_rows(targets)
+    if query_matrix.shape[1] != target_matrix.shape[1]:
+        raise ValueError(f"dimension mismatch: {query_matrix.shape[1]} vs {target_matrix.shape[1]}")
+    scores = query_matrix @ target_matrix.T
+    np.clip(scores, -1.0, 1.0, out=scores)
+    return scores
+
+
+def cosine_similarities(query: VectorLike, targets: MatrixLike, *, normalized: bool = False) -> np.ndarray:
+    """Cosine similarity of one query against every target row."""
+    return cosine_similarity_matrix(query, targets, normalized=normalized)[0]
+
+
+def ragged_cosine_similarities(query: Sequence[float], targets: Sequence[Sequence[float]]) -> np.ndarray:
+    """Cosine similarities when target lengths may differ from the query's.
+
+    Each target is compared on its common prefix with the query (both
+    truncated to the shorter length).  Targets are grouped by length so
+    every group is still one matrix product.
+    """
+    scores = np.zeros(len(targets), dtype=np.float32)
+    groups: Dict[int, List[int]] = {}
+    for index, target in enumerate(targets):
+        groups.setdefault(len(target), []).append(index)
+    query_vector = np.asarray(query, dtype=np.float32)
+    for length, indices in groups.items():
+        width = min(length, query_vector.shape[0])
+        if width == 0:
+            continue
+        block = as_matrix([targets[index] for index in indices])[:, :width]
+        scores[indices] = cosine_similarities(query_vector[:width], block)
+    return scores
+
+
+def top_k(
+    scores: np.ndarray, k: int, *, min_score: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and values of the ``k`` highest scores, best first.
+
+    Uses ``argpartition`` so only the selected scores are sorted.  Scores
+    below ``min_score`` are dropped.  Ties keep index order.
+    """
+    scores = np.asarray(scores)
+    if min_score is not None:
+        candidates = np.flatnonzero(scores >= min_score)
+    else:
+        candidates = np.arange(scores.shape[0])
+    if k <= 0 or candidates.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=scores.dtype)
+    if candidates.size > k:
+        selected = np.argpartition(-scores[candidates], k - 1)[:k]
+        candidates = np.sort(candidates[selected])
+    order = np.argsort(-scores[candidates], kind="stable")
+    indices = candidates[order]
+    return indices, scores[indices]
+
+
+def similar_pairs(matrix: MatrixLike, threshold: float) -> List[Tuple[int, int, float]]:
+    """Pairs ``(i, j, score)`` with ``i < j`` and cosine >= ``threshold``, best first."""
+    scores = cosine_similarity_matrix(matrix, matrix)
+    rows, cols = np.nonzero(np.triu(scores >= threshold, k=1))
+    values = scores[rows, cols]
+    order = np.argsort(-values, kind="stable")
+    return [(int(rows[i]), int(cols[i]), float(values[i])) for i in order]
+
+
+def mean_pairwise_similarity(matrix: MatrixLike) -> float:
+    """Mean cosine similarity over all unordered pairs of distinct rows."""
+    normalized = normalize_rows(matrix)
+    count = normalized.shape[0]
+    if count < 2:
+        return 0.0
+    # sum_{i<j} s_ij = (|sum_i v_i|^2 - sum_i |v_i|^2) / 2 for unit (or zero) rows.
+    total = normalized.sum(axis=0, dtype=np.float64)
+    self_terms = float(np.einsum("ij,ij->", normalized, normalized, dtype=np.float64))
+    pair_sum = (float(total @ total) - self_terms) / 2.0
+    return pair_sum / (count * (count - 1) / 2)
+
+
+__all__ = [
+    "as_matrix",
+    "cosine_similarities",
+    "cosine_similarity_matrix",
+    "mean_pairwise_similarity",
+    "normalize_rows",
+    "ragged_cosine_similarities",
+    "similar_pairs",
+    "top_k",
+]
@@ -7,21 +7,26 @@
 """
 
 import hashlib
-import json
 import logging
-import os
-import sqlite3
 import threading
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
+from app.services.embeddings.cache import EmbeddingVectorStore, get_embedding_vector_store
 from app.services.foundation.config import get_config
+from app.services.foundation.metrics import counter
 from app.services.foundation.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+_CACHE_REQUESTS = counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result.",
+    ("cache", "result"),
+)
+
 
 @dataclass
 class ThreadSafeCacheEntry:
@@ -58,11 +63,9 @@ class ThreadSafeEmbeddingCache:
         self._memory_cache: Dict[str, ThreadSafeCacheEntry] = {}
         self._cache_lock = RWLock()
 
-        self._db_lock = threading.RLock()
-        self._db_connections: Dict[int, sqlite3.Connection] = {}
-
         from ...config.database_config import get_cache_database_path
         self.cache_db_path = get_cache_database_path("embedding")
+        self._store: Optional[EmbeddingVectorStore] = None
 
         if self.enable_persistent:
             self._init_persistent_cache()
@@ -74,46 +77,13 @@ class ThreadSafeEmbeddingCache:
     def _init_persistent_cache(self):
         """database"""
         try:
-            with self._get_db_connection() as conn:
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS embedding_cache (
-                        text_hash TEXT PRIMARY KEY,
-                        embedding_json TEXT NOT NULL,
-                        model TEXT NOT NULL,
-                        created_at REAL NOT NULL,
-                        access_count INTEGER DEFAULT 0,
-                        last_accessed REAL DEFAULT 0.0
-                    )
-                """
-                )
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_model ON embedding_cache(model)")
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_last_accessed ON embedding_cache(last_accessed)")
-                conn.commit()
+            self._store = get_embedding_vector_store(self.cache_db_path)
+            self._store.count()
         except Exception as e:
             logger.error(f"Failed to initialize persistent cache: {e}")
+            self._store = None
             self.enable_persistent = False
 
-    @contextmanager
-    def _get_db_connection(self):
-        """getdatabaseconnection"""
-        thread_id = threading.get_ident()
-
-        with self._db_lock:
-            if thread_id not in self._db_connections:
-                self._db_connections[thread_id] = sqlite3.connect(
-                    self.cache_db_path, timeout=30.0, check_same_thread=False
-                )
-
-        conn = self._db_connections[thread_id]
-        try:
-            yield conn
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            pass
-
     def _compute_text_hash(self, text: str, model: str) -> str:
         """model"""
         content = f"{model}:{text}"
@@ -121,90 +91,12 @@ class ThreadSafeEmbeddingCache:
 
     def get(self, text: str, model: str = None) -> Optional[List[float]]:
         """get"""
-        if not text.strip():
-            return None
-
-        model = model or self.config.embedding_model
-        text_hash = self._compute_text_hash(text, model)
-        current_time = time.time()
-
-        with self._cache_lock.read_lock():
-            if text_hash in self._memory_cache:
-                entry = self._memory_cache[text_hash]
-                entry.update_access_stats(current_time)
-                logger.debug(f"Cache hit (memory): {text_hash[:8]}...")
-                return entry.get_embedding_copy()
-
-        if self.enable_persistent:
-            embedding = self._get_from_persistent_cache(text_hash, model, current_time)
-            if embedding is not None:
-                return embedding
-
-        logger.debug(f"Cache miss: {text_hash[:8]}...")
-        return None
-
-    def _get_from_persistent_cache(self, text_hash: str, model: str, current_time: float) -> Optional[List[float]]:
-        """get"""
-        try:
-            with self._get_db_connection() as conn:
-                row = conn.execute(
-                    "SELECT embedding_json, access_count FROM embedding_cache WHERE text_hash = ? AND model = ?",
-                    (text_hash, model),
-                ).fetchone()
-
-                if row:
-                    embedding = json.loads(row[0])
-                    access_count = row[1] + 1
-
-                    conn.execute(
-                        "UPDATE embedding_cache SET access_count = ?, last_accessed = ? WHERE text_hash = ?",
-                        (access_count, current_time, text_hash),
-                    )
-                    conn.commit()
-
-                    self._load_to_memory_cache(
-                        ThreadSafeCacheEntry(
-                            text_hash=text_hash,
-                            embedding=embedding,
-                            model=model,
-                            created_at=current_time,
-                            access_count=access_count,
-                            last_accessed=current_time,
-                        )
-                    )
-
-                    logger.debug(f"Cache hit (persistent): {text_hash[:8]}...")
-                    return embedding.copy()
-        except Exception as e:
-            logger.warning(f"Failed to read from persistent cache: {e}")
-
-        return None
+        results, _ = self.get_batch([text], model)
+        return results[0]
 
     def put(self, text: str, embedding: List[float], model: str = None) -> None:
         """"""
-        if not text.strip() or not embedding:
-            return
-
-        model = model or self.config.embedding_model
-        text_hash = self._compute_text_hash(text, model)
-        current_time = time.time()
-
-        entry = ThreadSafeCacheEntry(
-            text_hash=text_hash,
-            embedding=embedding.copy(),
-            model=model,
-            created_at=current_time,
-            access_count=1,
-            last_accessed=current_time,
-        )
-
-        with self._cache_lock.write_lock():
-            self._add_to_memory_cache_unsafe(entry)
-
-        if self.enable_persistent:
-            self._save_to_persistent_cache(entry)
-
-        logger.debug(f"Cache stored: {text_hash[:8]}...")
+        self.put_batch([text], [embedding], model)
 
     def _load_to_memory_cache(self, entry: ThreadSafeCacheEntry) -> None:
         """load()"""
@@ -213,7 +105,7 @@ class ThreadSafeEmbeddingCache:
 
     def _add_to_memory_cache_unsafe(self, entry: ThreadSafeCacheEntry) -> None:
         """(, )"""
-        if len(self._memory_cache) >= self.cache_size:
+        if entry.text_hash not in self._memory_cache and len(self._memory_cache) >= self.cache_size:
             self._evict_lru_unsafe()
 
         self._memory_cache[entry.text_hash] = entry
@@ -231,50 +123,108 @@ class ThreadSafeEmbeddingCache:
         del self._memory_cache[lru_key]
         logger.debug(f"Evicted from memory cache: {lru_key[:8]}...")
 
-    def _save_to_persistent_cache(self, entry: ThreadSafeCacheEntry) -> None:
-        """save"""
-        try:
-            with self._get_db_connection() as conn:
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO embedding_cache 
-                    (text_hash, embedding_json, model, created_at, access_count, last_accessed)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        entry.text_hash,
-                        json.dumps(entry.embedding),
-                        entry.model,
-                        entry.created_at,
-                        entry.access_count,
-                        entry.last_accessed,
-                    ),
-                )
-                conn.commit()
-        except Exception as e:
-            logger.warning(f"Failed to write to persistent cache: {e}")
-
     def get_batch(self, texts: List[str], model: str = None) -> Tuple[List[Optional[List[float]]], List[int]]:
-        """get()"""
+        """get(memory first, then one persistent query for all misses)"""
         model = model or self.config.embedding_model
-        results = []
-        cache_misses = []
-
-        for i, text in enumerate(texts):
-            embedding = self.get(text, model)
-            results.append(embedding)
-            if embedding is None:
-                cache_misses.append(i)
+        current_time = time.time()
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+        memory_hits = 0
 
+        with self._cache_lock.read_lock():
+            for i, text in enumerate(texts):
+                if not text.strip():
+                    continue
+                text_hash = self._compute_text_hash(text, model)
+                entry = self._memory_cache.get(text_hash)
+                if entry is not None:
+                    entry.update_access_stats(current_time)
+                    results[i] = entry.get_embedding_copy()
+                    memory_hits += 1
+                else:
+                    pending.setdefault(text_hash, []).append(i)
+
+        persistent_hits = 0
+        if pending and self._store is not None:
+            found = self._get_from_persistent_cache(pending, model, current_time)
+            for text_hash, embedding in found.items():
+                for i in pending[text_hash]:
+                    results[i] = embedding.copy()
+                    persistent_hits += 1
+
+        cache_misses = [i for i, embedding in enumerate(results) if embedding is None]
+        if memory_hits:
+            _CACHE_REQUESTS.labels("embedding", "hit_memory").inc(memory_hits)
+        if persistent_hits:
+            _CACHE_REQUESTS.labels("embedding", "hit_persistent").inc(persistent_hits)
+        if cache_misses:
+            _CACHE_REQUESTS.labels("embedding", "miss").inc(len(cache_misses))
         return results, cache_misses
 
+    def _get_from_persistent_cache(
+        self, pending: Dict[str, List[int]], model: str, current_time: float
+    ) -> Dict[str, List[float]]:
+        """get(one IN query; access statistics are buffered by the store)"""
+        try:
+            found = self._store.get_many(pending, model)
+        except Exception as e:
+            logger.warning(f"Failed to read from persistent cache: {e}")
+            return {}
+
+        if found:
+            with self._cache_lock.write_lock():
+                for text_hash, embedding in found.items():
+                    self._add_to_memory_cache_unsafe(
+                        ThreadSafeCacheEntry(
+                            text_hash=text_hash,
+                            embedding=embedding,
+                            model=model,
+                            created_at=current_time,
+                            access_count=1,
+                            last_accessed=current_time,
+                        )
+                    )
+            try:
+                self._store.record_access(found, current_time)
+            except Exception as e:
+                logger.warning(f"Failed to update persistent cache statistics: {e}")
+        return found
+
     def put_batch(self, texts: List[str], embeddings: List[List[float]], model: str = None) -> None:
-        """()"""
+        """(one transaction)"""
         if len(texts) != len(embeddings):
             raise ValueError("texts and embeddings must have the same length")
 
+        model = model or self.config.embedding_model
+        current_time = time.time()
+        entries: Dict[str, ThreadSafeCacheEntry] = {}
         for text, embedding in zip(texts, embeddings):
-            self.put(text, embedding, model)
+            if not text.strip() or not embedding:
+                continue
+            text_hash = self._compute_text_hash(text, model)
+            entries[text_hash] = ThreadSafeCacheEntry(
+                text_hash=text_hash,
+                embedding=list(embedding),
+                model=model,
+                created_at=current_time,
+                access_count=1,
+                last_accessed=current_time,
+            )
+        if not entries:
+            return
+
+        with self._cache_lock.write_lock():
+            for entry in entries.values():
+                self._add_to_memory_cache_unsafe(entry)
+
+        if self._store is not None:
+            try:
+                self._store.put_many(
+                    ((entry.text_hash, entry.embedding, model) for entry in entries.values()),
+                    current_time,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to write to persistent cache: {e}")
 
     def get_stats(self) -> Dict[str, Any]:
         """getstatistics()"""
@@ -285,14 +235,10 @@ class ThreadSafeEmbeddingCache:
                 "persistent_enabled": self.enable_persistent,
             }
 
-        if self.enable_persistent:
+        if self._store is not None:
             try:
-                with self._get_db_connection() as conn:
-                    row = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()
-                    stats["persistent_cache_size"] = row[0] if row else 0
-
-                    model_rows = conn.execute("SELECT model, COUNT(*) FROM embedding_cache GROUP BY model").fetchall()
-                    stats["model_distribution"] = {row[0]: row[1] for row in model_rows}
+                stats["persistent_cache_size"] = self._store.count()
+                stats["model_distribution"] = self._store.model_distribution()
             except Exception as e:
                 logger.warning(f"Failed to get persistent cache stats: {e}")
                 stats["persistent_cache_size"] = 0
@@ -308,13 +254,11 @@ class ThreadSafeEmbeddingCache:
 
     def shutdown(self) -> None:
         """close"""
-        with self._db_lock:
-            for conn in self._db_connections.values():
-                try:
-                    conn.close()
-                except Exception:
-                    pass
-            self._db_connections.clear()
+        if self._store is not None:
+            try:
+                self._store.close()
+            except Exception as e:
+                logger.warning(f"Failed to close persistent cache: {e}")
         logger.info("Thread-safe embedding cache shutdown completed")
 
 
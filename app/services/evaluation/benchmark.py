@@ -6,7 +6,11 @@ markdown summary.
 """
 
 import csv
+import hashlib
+import multiprocessing
 import os
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 from ...database import init_db
@@ -64,6 +68,21 @@ def _create_report_tasks(topic: str, sections: int) -> List[int]:
     return ids
 
 
+def _config_seed(seed: int, name: str) -> int:
+    """Derive a per-config seed that is stable across processes and runs."""
+    digest = hashlib.sha256(f"{seed}:{name}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big")
+
+
+def _seed_everything(seed: int) -> None:
+    random.seed(seed)
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    np.random.seed(seed)
+
+
 def _accumulate_dimensions(dim_sums: Dict[str, float], dims: Any) -> None:
     for key in ["relevance", "completeness", "accuracy", "clarity", "coherence", "scientific_rigor"]:
         val = getattr(dims, key, None)
@@ -77,22 +96,159 @@ def _avg_dimensions(dim_sums: Dict[str, float], count: int) -> Dict[str, float]:
     return {k: round(v / count, 3) for k, v in dim_sums.items()}
 
 
+def _process_pool(workers: int) -> Executor:
+    # Spawned workers start from a clean interpreter, so no SQLite handle or
+    # LLM client is shared with the parent process.
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_db,
+    )
+
+
+def _run_config(
+    job: Tuple[str, Dict[str, str], List[int], str, Optional[str], int],
+) -> Tuple[str, Dict[str, Any]]:
+    """Run one benchmark config over its tasks; safe to call in a worker process."""
+    name, kv, task_ids, topic, outdir, config_seed = job
+    _seed_everything(config_seed)
+
+    use_context = _to_bool(kv.get("use_context", "false"), default=False)
+    max_iters = _to_int(kv.get("max_iterations", "3"), 3)
+    try:
+        quality_threshold = float(kv.get("quality_threshold", "0.8"))
+    except Exception:
+        quality_threshold = 0.8
+
+    ctx_opts = None
+    if use_context:
+        ctx_opts = {}
+        if "max_chars" in kv:
+            ctx_opts["max_chars"] = _to_int(kv["max_chars"], 6000)
+        if "per_section_max" in kv:
+            ctx_opts["per_section_max"] = _to_int(kv["per_section_max"], 1200)
+        if "strategy" in kv:
+            ctx_opts["strategy"] = kv["strategy"]
+        # Extended context toggles
+        if "include_deps" in kv:
+            ctx_opts["include_deps"] = _to_bool(kv["include_deps"], True)
+        if "include_plan" in kv:
+            ctx_opts["include_plan"] = _to_bool(kv["include_plan"], True)
+        if "include_ancestors" in kv:
+            ctx_opts["include_ancestors"] = _to_bool(kv["include_ancestors"], False)
+        if "include_siblings" in kv:
+            ctx_opts["include_siblings"] = _to_bool(kv["include_siblings"], False)
+        if "semantic_k" in kv:
+            try:
+                ctx_opts["semantic_k"] = int(kv["semantic_k"])
+            except Exception:
+                ctx_opts["semantic_k"] = 5
+        if "min_similarity" in kv:
+            try:
+                ctx_opts["min_similarity"] = float(kv["min_similarity"])
+            except Exception:
+                ctx_opts["min_similarity"] = 0.1
+
+    total_score = 0.0
+    total_iters = 0
+    total_time = 0.0
+    count = 0
+    failures = 0
+    dim_sums: Dict[str, float] = {}
+
+    # Collect sections for per-config markdown export
+    collected_sections: List[Tuple[str, str]] = []
+
+    for tid in task_ids:
+        task = default_repo.get_task_info(tid)
+        if not task:
+            failures += 1
+            continue
+        try:
+            result = execute_task_with_llm_evaluation(
+                task=task,
+                repo=default_repo,
+                max_iterations=max_iters,
+                quality_threshold=quality_threshold,
+                use_context=use_context,
+                context_options=ctx_opts,
+            )
+            if result.evaluation:
+                total_score += float(result.evaluation.overall_score)
+                _accumulate_dimensions(dim_sums, result.evaluation.dimensions)
+            if isinstance(result.iterations, int):
+                total_iters += result.iterations
+            if isinstance(result.execution_time, (int, float)):
+                total_time += float(result.execution_time)
+            count += 1
+            # Capture content for export
+            try:
+                sec_title = str(task.get("name", f"Section {tid}"))
+                sec_content = str(result.content or "")
+                collected_sections.append((sec_title, sec_content))
+            except Exception:
+                pass
+        except Exception:
+            failures += 1
+
+    avg_score = (total_score / count) if count else 0.0
+    avg_iters = (total_iters / count) if count else 0.0
+    avg_time = (total_time / count) if count else 0.0
+    dim_avgs = _avg_dimensions(dim_sums, count)
+
+    # Write per-config markdown file if requested
+    file_path: Optional[str] = None
+    if outdir and collected_sections:
+        safe_name = "".join(c for c in name if c.isalnum() or c in ("-", "_")).strip() or name
+        md_path = os.path.join(outdir, f"{safe_name}.md")
+        file_path = md_path
+        try:
+            with open(md_path, "w", encoding="utf-8") as f:
+                f.write(f"# {topic} ({name})\n\n")
+                for sec_title, sec_content in collected_sections:
+                    # Drop topic prefix for cleaner display.
+                    display_title = (
+                        sec_title.split("] ", 1)[-1]
+                        if sec_title.startswith("[") and "] " in sec_title
+                        else sec_title
+                    )
+                    f.write(f"## {display_title}\n\n{sec_content}\n\n")
+        except Exception:
+            pass
+
+    return name, {
+        "params": kv,
+        "avg_score": round(avg_score, 3),
+        "avg_iters": round(avg_iters, 2),
+        "avg_time": round(avg_time, 2),
+        "failures": failures,
+        "count": count,
+        "dimensions_avg": dim_avgs,
+        "file_path": file_path,
+        "seed": config_seed,
+    }
+
+
 def run_benchmark(
     topic: str,
     config_specs: List[str],
     sections: int = 5,
     outdir: Optional[str] = None,
     csv_path: Optional[str] = None,
+    workers: int = 1,
+    seed: int = 0,
 ) -> Dict[str, Any]:
     """Run benchmark for given topic and config specs.
 
+    With ``workers > 1`` the configs run concurrently in worker processes.
+    Every config evaluates its own set of report tasks and is seeded from
+    ``seed`` and its name, so results do not depend on scheduling or worker
+    count.
+
     Returns dict with metrics per config and markdown summary.
     """
     init_db()
 
-    # Prepare tasks
-    task_ids = _create_report_tasks(topic, sections)
-
     configs: List[Tuple[str, Dict[str, str]]] = [_parse_config_string(c) for c in config_specs]
     results: Dict[str, Dict[str, Any]] = {}
     files: Dict[str, str] = {}
@@ -103,119 +259,22 @@ def run_benchmark(
         except Exception:
             pass
 
-    for name, kv in configs:
-        use_context = _to_bool(kv.get("use_context", "false"), default=False)
-        max_iters = _to_int(kv.get("max_iterations", "3"), 3)
-        try:
-            quality_threshold = float(kv.get("quality_threshold", "0.8"))
-        except Exception:
-            quality_threshold = 0.8
-
-        ctx_opts = None
-        if use_context:
-            ctx_opts = {}
-            if "max_chars" in kv:
-                ctx_opts["max_chars"] = _to_int(kv["max_chars"], 6000)
-            if "per_section_max" in kv:
-                ctx_opts["per_section_max"] = _to_int(kv["per_section_max"], 1200)
-            if "strategy" in kv:
-                ctx_opts["strategy"] = kv["strategy"]
-            # Extended context toggles
-            if "include_deps" in kv:
-                ctx_opts["include_deps"] = _to_bool(kv["include_deps"], True)
-            if "include_plan" in kv:
-                ctx_opts["include_plan"] = _to_bool(kv["include_plan"], True)
-            if "include_ancestors" in kv:
-                ctx_opts["include_ancestors"] = _to_bool(kv["include_ancestors"], False)
-            if "include_siblings" in kv:
-                ctx_opts["include_siblings"] = _to_bool(kv["include_siblings"], False)
-            if "semantic_k" in kv:
-                try:
-                    ctx_opts["semantic_k"] = int(kv["semantic_k"])
-                except Exception:
-                    ctx_opts["semantic_k"] = 5
-            if "min_similarity" in kv:
-                try:
-                    ctx_opts["min_similarity"] = float(kv["min_similarity"])
-                except Exception:
-                    ctx_opts["min_similarity"] = 0.1
-
-        total_score = 0.0
-        total_iters = 0
-        total_time = 0.0
-        count = 0
-        failures = 0
-        dim_sums: Dict[str, float] = {}
-
-        # Collect sections for per-config markdown export
-        collected_sections: List[Tuple[str, str]] = []
-
-        for tid in task_ids:
-            task = default_repo.get_task_info(tid)
-            if not task:
-                failures += 1
-                continue
-            try:
-                result = execute_task_with_llm_evaluation(
-                    task=task,
-                    repo=default_repo,
-                    max_iterations=max_iters,
-                    quality_threshold=quality_threshold,
-                    use_context=use_context,
-                    context_options=ctx_opts,
-                )
-                if result.evaluation:
-                    total_score += float(result.evaluation.overall_score)
-                    _accumulate_dimensions(dim_sums, result.evaluation.dimensions)
-                if isinstance(result.iterations, int):
-                    total_iters += result.iterations
-                if isinstance(result.execution_time, (int, float)):
-                    total_time += float(result.execution_time)
-                count += 1
-                # Capture content for export
-                try:
-                    sec_title = str(task.get("name", f"Section {tid}"))
-                    sec_content = str(result.content or "")
-                    collected_sections.append((sec_title, sec_content))
-                except Exception:
-                    pass
-            except Exception:
-                failures += 1
-
-        avg_score = (total_score / count) if count else 0.0
-        avg_iters = (total_iters / count) if count else 0.0
-        avg_time = (total_time / count) if count else 0.0
-        dim_avgs = _avg_dimensions(dim_sums, count)
-
-        # Write per-config markdown file if requested
-        if outdir and collected_sections:
-            safe_name = "".join(c for c in name if c.isalnum() or c in ("-", "_")).strip() or name
-            md_path = os.path.join(outdir, f"{safe_name}.md")
-            try:
-                with open(md_path, "w", encoding="utf-8") as f:
-                    f.write(f"# {topic} ({name})\n\n")
-                    for sec_title, sec_content in collected_sections:
-                        # Drop topic prefix for cleaner display.
-                        display_title = (
-                            sec_title.split("] ", 1)[-1]
-                            if sec_title.startswith("[") and "] " in sec_title
-                            else sec_title
-                        )
-                        f.write(f"## {display_title}\n\n{sec_content}\n\n")
-                files[name] = md_path
-            except Exception:
-                files[name] = md_path
-
-        results[name] = {
-            "params": kv,
-            "avg_score": round(avg_score, 3),
-            "avg_iters": round(avg_iters, 2),
-            "avg_time": round(avg_time, 2),
-            "failures": failures,
-            "count": count,
-            "dimensions_avg": dim_avgs,
-            "file_path": files.get(name),
-        }
+    # Each config evaluates its own copy of the report tasks, so no config
+    # reads another's task outputs as context, serially or concurrently.
+    jobs = [
+        (name, kv, _create_report_tasks(topic, sections), topic, outdir, _config_seed(seed, name))
+        for name, kv in configs
+    ]
+    if workers > 1 and len(jobs) > 1:
+        with _process_pool(min(workers, len(jobs))) as pool:
+            outcomes = list(pool.map(_run_config, jobs))
+    else:
+        outcomes = [_run_config(job) for job in jobs]
+
+    for name, metrics in outcomes:
+        results[name] = metrics
+        if metrics.get("file_path"):
+            files[name] = metrics["file_path"]
 
     # Render summary markdown
     lines: List[str] = []
@@ -11,7 +11,6 @@ import logging
 import sqlite3
 import threading
 import time
-from dataclasses import asdict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -386,7 +385,7 @@ class EvaluationCache:
 
         result_dict = {
             "overall_score": result.overall_score,
-            "dimensions": asdict(result.dimensions),
+            "dimensions": result.dimensions.model_dump(),
             "suggestions": result.suggestions,
             "needs_revision": result.needs_revision,
             "iteration": result.iteration,
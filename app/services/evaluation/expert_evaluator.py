@@ -4,6 +4,7 @@ Multi-Expert LLM Evaluator System.
 Implements multiple expert perspectives for comprehensive content evaluation
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime
@@ -11,8 +12,11 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from ...models import EvaluationConfig, EvaluationDimensions, EvaluationResult
 from ...prompts import prompt_manager
+from ...utils import run_async
 from .base_evaluator import LLMBasedEvaluator
+from .evaluation_cache import EvaluationCache, get_evaluation_cache
 from app.services.llm.llm_cache import get_llm_cache
+from app.services.llm.llm_service import LLMService
 
 logger = logging.getLogger(__name__)
 
@@ -82,9 +86,28 @@ Please return in JSON format:
 class MultiExpertEvaluator(LLMBasedEvaluator):
     """Multi-expert evaluation system with specialized roles"""
 
-    def __init__(self, config: Optional[EvaluationConfig] = None, use_cache: bool = True):
+    def __init__(
+        self,
+        config: Optional[EvaluationConfig] = None,
+        use_cache: bool = True,
+        evaluation_cache: Optional[EvaluationCache] = None,
+        max_concurrent_experts: int = 5,
+        expert_timeout: Optional[float] = 120.0,
+        expert_quorum: Optional[int] = None,
+    ):
         super().__init__(config)
         self.cache = get_llm_cache() if use_cache else None
+        if evaluation_cache is None and use_cache:
+            evaluation_cache = get_evaluation_cache()
+        self.evaluation_cache = evaluation_cache
+        # Expert calls are independent, so they run concurrently.  With an
+        # ``expert_quorum`` the remaining experts are cancelled as soon as that
+        # many have answered; without one every expert is awaited.  Once the
+        # timeout expires, stragglers are cancelled and the consensus is built
+        # from the experts that answered.
+        self.max_concurrent_experts = max(1, int(max_concurrent_experts))
+        self.expert_timeout = expert_timeout
+        self.expert_quorum = None if expert_quorum is None else max(1, int(expert_quorum))
         self.experts = self._initialize_experts()
 
     def get_evaluation_method_name(self) -> str:
@@ -173,30 +196,44 @@ class MultiExpertEvaluator(LLMBasedEvaluator):
 
         logger.info(f"Evaluating with {len(experts_to_use)} experts: {list(experts_to_use.keys())}")
 
-        # Collect expert evaluations
+        # Collect expert evaluations, skipping experts with a cached verdict
         expert_evaluations = {}
         expert_weights = {}
-        successful_evaluations = 0
+        pending: List[Tuple[str, ExpertRole]] = []
 
         for expert_name, expert_role in experts_to_use.items():
-            try:
-                evaluation = self._evaluate_with_single_expert(expert_role, content, task_context)
-                if evaluation:
-                    expert_evaluations[expert_name] = evaluation
-                    expert_weights[expert_name] = expert_role.weight
-                    successful_evaluations += 1
-                    logger.debug(f"Expert {expert_name} evaluation successful")
-                else:
-                    logger.warning(f"Expert {expert_name} evaluation returned None")
-
-            except Exception as e:
-                logger.error(f"Expert {expert_name} evaluation failed: {e}")
+            cached = self._get_cached_expert_evaluation(expert_name, expert_role, content, task_context)
+            if cached is not None:
+                expert_evaluations[expert_name] = cached
+                expert_weights[expert_name] = expert_role.weight
+                logger.debug(f"Expert {expert_name} evaluation served from cache")
                 continue
-
+            pending.append((expert_name, expert_role))
+
+        cached_experts = len(expert_evaluations)
+        quorum = min(self.expert_quorum or len(experts_to_use), len(experts_to_use))
+        needed = quorum - cached_experts
+        if pending and needed > 0:
+            fresh = run_async(self._collect_expert_evaluations(pending, content, task_context, needed))
+            for expert_name, expert_role in pending:
+                evaluation = fresh.get(expert_name)
+                if evaluation is None:
+                    continue
+                expert_evaluations[expert_name] = evaluation
+                expert_weights[expert_name] = expert_role.weight
+                self._cache_expert_evaluation(expert_name, expert_role, content, task_context, evaluation)
+
+        successful_evaluations = len(expert_evaluations)
         if successful_evaluations == 0:
             logger.error("All expert evaluations failed")
             return self._create_error_multi_expert_result(iteration, "All expert evaluations failed")
 
+        if self.expert_quorum is not None and successful_evaluations < quorum:
+            logger.error(f"Expert quorum not reached: {successful_evaluations}/{quorum}")
+            return self._create_error_multi_expert_result(
+                iteration, f"Expert quorum not reached ({successful_evaluations}/{quorum})"
+            )
+
         # Generate consensus evaluation
         consensus = self._generate_expert_consensus(expert_evaluations, expert_weights)
 
@@ -209,6 +246,7 @@ class MultiExpertEvaluator(LLMBasedEvaluator):
             "disagreements": disagreements,
             "metadata": {
                 "successful_experts": successful_evaluations,
+                "cached_experts": cached_experts,
                 "total_experts": len(experts_to_use),
                 "evaluation_method": "multi_expert_llm",
                 "iteration": iteration,
@@ -222,45 +260,139 @@ class MultiExpertEvaluator(LLMBasedEvaluator):
 
         return result
 
-    def _evaluate_with_single_expert(
-        self, expert_role: ExpertRole, content: str, task_context: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """Evaluate content from single expert perspective"""
+    async def _collect_expert_evaluations(
+        self,
+        experts: List[Tuple[str, ExpertRole]],
+        content: str,
+        task_context: Dict[str, Any],
+        needed: int,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Query experts concurrently until ``needed`` succeed or the timeout expires.
 
+        Evaluations are checked as each expert returns; experts still running
+        once enough have answered (or the deadline passes) are cancelled.
+        """
+        service = LLMService(self.llm_client)
+        semaphore = asyncio.Semaphore(self.max_concurrent_experts)
+
+        async def consult(expert_role: ExpertRole) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self._evaluate_with_single_expert(
+                    expert_role, content, task_context, service=service
+                )
+
+        loop = asyncio.get_running_loop()
+        deadline = None if self.expert_timeout is None else loop.time() + self.expert_timeout
+        names = {asyncio.ensure_future(consult(role)): name for name, role in experts}
+        running = set(names)
+        evaluations: Dict[str, Dict[str, Any]] = {}
         try:
-            prompt = expert_role.get_evaluation_prompt(content, task_context)
-
-            response = self.llm_client.chat([{"role": "user", "content": prompt}])
-
-            result_text = response.get("content", "").strip()
-
-            # Parse JSON response
-            json_start = result_text.find("{")
-            json_end = result_text.rfind("}") + 1
+            while running and len(evaluations) < needed:
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                done, running = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.warning(
+                        f"Experts timed out after {self.expert_timeout}s: "
+                        f"{sorted(names[task] for task in running)}"
+                    )
+                    break
+                for task in done:
+                    expert_name = names[task]
+                    try:
+                        evaluation = task.result()
+                    except Exception as e:
+                        logger.error(f"Expert {expert_name} evaluation failed: {e}")
+                        continue
+                    if evaluation:
+                        evaluations[expert_name] = evaluation
+                        logger.debug(f"Expert {expert_name} evaluation successful")
+                    else:
+                        logger.warning(f"Expert {expert_name} evaluation returned None")
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        return evaluations
+
+    def _expert_cache_method(self, expert_name: str) -> str:
+        return f"{self.get_evaluation_method_name()}:{expert_name}"
+
+    def _model_version(self) -> Optional[str]:
+        model = getattr(self.llm_client, "model", None)
+        return str(model) if model else None
+
+    def _get_cached_expert_evaluation(
+        self, expert_name: str, expert_role: ExpertRole, content: str, task_context: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        if self.evaluation_cache is None:
+            return None
+        cached = self.evaluation_cache.get_cached_evaluation(
+            content,
+            task_context,
+            self._expert_cache_method(expert_name),
+            config_params={"weight": expert_role.weight, "focus_areas": expert_role.focus_areas},
+            model_version=self._model_version(),
+        )
+        if cached is None or not isinstance(cached.metadata, dict):
+            return None
+        evaluation = cached.metadata.get("expert_evaluation")
+        return evaluation if isinstance(evaluation, dict) else None
 
-            if json_start >= 0 and json_end > json_start:
-                json_text = result_text[json_start:json_end]
-                evaluation_data = json.loads(json_text)
+    def _cache_expert_evaluation(
+        self,
+        expert_name: str,
+        expert_role: ExpertRole,
+        content: str,
+        task_context: Dict[str, Any],
+        evaluation: Dict[str, Any],
+    ) -> None:
+        if self.evaluation_cache is None:
+            return
+        try:
+            result = EvaluationResult(
+                overall_score=float(evaluation.get("overall_score", 0.0)),
+                dimensions=EvaluationDimensions(
+                    relevance=float(evaluation.get("relevance", 0.0)),
+                    completeness=float(evaluation.get("completeness", 0.0)),
+                    accuracy=float(evaluation.get("accuracy", 0.0)),
+                ),
+                timestamp=datetime.now(),
+                metadata={"expert_evaluation": evaluation},
+            )
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Skipping cache for expert {expert_name}: {e}")
+            return
+        self.evaluation_cache.cache_evaluation_result(
+            content,
+            task_context,
+            self._expert_cache_method(expert_name),
+            result,
+            config_params={"weight": expert_role.weight, "focus_areas": expert_role.focus_areas},
+            model_version=self._model_version(),
+        )
 
-                # Validate required fields
-                required_fields = ["relevance", "completeness", "accuracy", "overall_score"]
-                if all(field in evaluation_data for field in required_fields):
-                    return evaluation_data
-                else:
-                    logger.warning(f"Expert evaluation missing required fields: {required_fields}")
-                    return None
-            else:
-                logger.warning(f"Could not parse expert evaluation JSON from: {result_text[:200]}")
-                return None
+    async def _evaluate_with_single_expert(
+        self,
+        expert_role: ExpertRole,
+        content: str,
+        task_context: Dict[str, Any],
+        *,
+        service: Optional[LLMService] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Evaluate content from single expert perspective"""
 
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parsing error in expert evaluation: {e}")
-            return None
+        service = service or LLMService(self.llm_client)
+        try:
+            response = await service.chat_async(expert_role.get_evaluation_prompt(content, task_context))
         except Exception as e:
             logger.error(f"Expert evaluation error: {e}")
             raise RuntimeError(
                 f"Expert evaluation failed for role={expert_role.name}: {e}"
             ) from e
+        return self._parse_expert_response(response.strip())
 
     def _fallback_expert_evaluation(
         self, expert_role: ExpertRole, content: str, task_context: Dict[str, Any]
@@ -0,0 +1,432 @@
+"""
+Performance regression suite for the service's own hot paths.
+
+Each case builds synthetic inputs (plans, embeddings, events) against an
+isolated SQLite root, runs the hot path with LLM calls replaced by
+deterministic stubs and external services by in-process stand-ins, and
+records wall-clock samples.  ``run_perf_suite`` returns a JSON-serialisable
+report; ``compare_perf_reports`` diffs two reports (e.g. from two commits)
+and flags cases whose median slowed down beyond a configurable threshold.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+PERF_REPORT_SCHEMA_VERSION = 1
+DEFAULT_REGRESSION_THRESHOLD = 0.15
+
+
+@dataclass
+class PerfContext:
+    """Inputs handed to a case's setup function."""
+
+    rng: random.Random
+    scale: float
+    workdir: Path
+
+    def size(self, base: int, minimum: int = 1) -> int:
+        return max(minimum, int(base * self.scale))
+
+
+CaseSetup = Callable[[PerfContext], Tuple[Any, Callable[[Any], int]]]
+
+
+@dataclass
+class PerfCase:
+    """A named hot path; ``setup`` returns ``(state, run)`` where ``run(state)`` returns an op count."""
+
+    name: str
+    description: str
+    setup: CaseSetup
+
+
+PERF_CASES: Dict[str, PerfCase] = {}
+
+
+def _perf_case(name: str, description: str) -> Callable[[CaseSetup], CaseSetup]:
+    def decorator(setup: CaseSetup) -> CaseSetup:
+        PERF_CASES[name] = PerfCase(name=name, description=description, setup=setup)
+        return setup
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Fixtures: isolated storage, synthetic plans and stub services
+# ---------------------------------------------------------------------------
+
+
+def _reset_storage_singletons() -> None:
+    from app.config.database_config import reset_database_config
+    from app.database_pool import close_connection_pool
+
+    close_connection_pool()
+    reset_database_config()
+
+
+@contextmanager
+def _isolated_storage(root: Path) -> Iterator[None]:
+    """Point every database at ``root`` for the duration of the suite."""
+    saved = os.environ.get("DB_ROOT")
+    os.environ["DB_ROOT"] = str(root / "databases")
+    _reset_storage_singletons()
+    try:
+        from app.database import init_db
+
+        init_db()
+        yield
+    finally:
+        _reset_storage_singletons()
+        if saved is None:
+            os.environ.pop("DB_ROOT", None)
+        else:
+            os.environ["DB_ROOT"] = saved
+
+
+def _build_synthetic_plan(repo: Any, ctx: PerfContext, *, tasks: int, title: str) -> int:
+    """Create a plan shaped like real decompositions: a few roots, bounded fan-out, sibling deps."""
+    plan = repo.create_plan(title, description="synthetic perf plan")
+    created: List[int] = []
+    parents: List[Optional[int]] = [None]
+    children: Dict[Optional[int], List[int]] = {}
+    while len(created) < tasks:
+        parent_id = parents[ctx.rng.randrange(len(parents))]
+        siblings = children.get(parent_id, [])[-4:]
+        deps = [ctx.rng.choice(siblings)] if siblings and ctx.rng.random() < 0.4 else None
+        node = repo.create_task(
+            plan.id,
+            name=f"Task {len(created) + 1}",
+            instruction=f"Synthetic instruction {len(created) + 1} " + "x" * ctx.rng.randint(40, 400),
+            parent_id=parent_id,
+            dependencies=deps,
+            metadata={"perf": True, "index": len(created)},
+        )
+        created.append(node.id)
+        children.setdefault(parent_id, []).append(node.id)
+        if len(parents) < max(4, tasks // 6):
+            parents.append(node.id)
+    return plan.id
+
+
+class _StubDecompositionLLM:
+    """Stands in for LLMService: answers every decomposition prompt with fixed children."""
+
+    def __init__(self, children: int) -> None:
+        self._payload = json.dumps(
+            {
+                "target_node_id": None,
+                "mode": "plan_bfs",
+                "should_stop": False,
+                "children": [
+                    {
+                        "name": f"Generated step {index + 1}",
+                        "instruction": f"Carry out generated step {index + 1} and save its outputs.",
+                        "dependencies": [index - 1] if index else [],
+                        "leaf": False,
+                    }
+                    for index in range(children)
+                ],
+            }
+        )
+        self.calls = 0
+
+    def chat(self, prompt: str, **_: Any) -> str:
+        self.calls += 1
+        return self._payload
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+
+@_perf_case("plan_tree_load", "PlanRepository.get_plan_tree on a synthetic plan")
+def _plan_tree_load(ctx: PerfContext) -> Any:
+    from app.repository.plan_repository import PlanRepository
+
+    repo = PlanRepository()
+    plan_id = _build_synthetic_plan(repo, ctx, tasks=ctx.size(300), title="perf tree")
+
+    def run(state: Any) -> int:
+        return len(repo.get_plan_tree(state).nodes)
+
+    return plan_id, run
+
+
+@_perf_case("plan_listing", "PlanRepository.list_plans across many small plans")
+def _plan_listing(ctx: PerfContext) -> Any:
+    from app.repository.plan_repository import PlanRepository
+
+    repo = PlanRepository()
+    for index in range(ctx.size(60)):
+        _build_synthetic_plan(repo, ctx, tasks=5, title=f"perf listing {index}")
+
+    def run(state: Any) -> int:
+        return len(repo.list_plans())
+
+    return None, run
+
+
+@_perf_case("plan_decomposition", "PlanDecomposer.run_plan with a stub LLM (BFS, depth 2)")
+def _plan_decomposition(ctx: PerfContext) -> Any:
+    from app.config.decomposer_config import DecomposerSettings
+    from app.repository.plan_repository import PlanRepository
+    from app.services.llm.decomposer_service import PlanDecomposerLLMService
+    from app.services.plans.plan_decomposer import PlanDecomposer
+
+    repo = PlanRepository()
+    settings = DecomposerSettings(
+        max_depth=2,
+        min_children=2,
+        max_children=4,
+        total_node_budget=ctx.size(40),
+        enable_simplification=False,
+    )
+    decomposer = PlanDecomposer(
+        repo=repo,
+        llm_service=PlanDecomposerLLMService(llm=_StubDecompositionLLM(children=4), settings=settings),
+        settings=settings,
+    )
+
+    def run(state: Any) -> int:
+        plan = repo.create_plan("perf decomposition", description="synthetic perf plan")
+        result = decomposer.run_plan(plan.id)
+        return len(result.created_tasks)
+
+    return None, run
+
+
+@_perf_case("executor_scheduling", "PlanExecutor execution ordering over a dependency-heavy tree")
+def _executor_scheduling(ctx: PerfContext) -> Any:
+    from app.repository.plan_repository import PlanRepository
+    from app.services.plans.plan_executor import PlanExecutor
+
+    repo = PlanRepository()
+    plan_id = _build_synthetic_plan(repo, ctx, tasks=ctx.size(300), title="perf scheduling")
+    tree = repo.get_plan_tree(plan_id)
+    # Ordering is pure graph work; skip the tool/LLM wiring of __init__.
+    executor = PlanExecutor.__new__(PlanExecutor)
+
+    def run(state: Any) -> int:
+        return len(list(executor._execution_order(state)))
+
+    return tree, run
+
+
+@_perf_case("sse_fanout", "InMemoryRealtimeBus run-event fan-out to concurrent SSE subscribers")
+def _sse_fanout(ctx: PerfContext) -> Any:
+    from app.services.realtime_bus import InMemoryRealtimeBus
+
+    subscribers = ctx.size(25)
+    events = ctx.size(200)
+    payload = {"type": "delta", "content": "token " * 8}
+
+    async def _fanout() -> int:
+        bus = InMemoryRealtimeBus()
+        subs = [await bus.subscribe_run_events("perf-run") for _ in range(subscribers)]
+        for seq in range(events):
+            await bus.publish_run_event("perf-run", seq, payload)
+        delivered = 0
+        for sub in subs:
+            for _ in range(events):
+                await sub.get(timeout=1.0)
+                delivered += 1
+            await sub.close()
+        await bus.close()
+        return delivered
+
+    def run(state: Any) -> int:
+        return asyncio.run(_fanout())
+
+    return None, run
+
+
+@_perf_case("embedding_search", "SimilarityCalculator top-k search over synthetic embeddings")
+def _embedding_search(ctx: PerfContext) -> Any:
+    from app.services.embeddings.similarity_calculator import SimilarityCalculator
+
+    dim = 256
+    candidates = [
+        {"id": index, "embedding": [ctx.rng.uniform(-1.0, 1.0) for _ in range(dim)]}
+        for index in range(ctx.size(2000))
+    ]
+    queries = [[ctx.rng.uniform(-1.0, 1.0) for _ in range(dim)] for _ in range(5)]
+    calculator = SimilarityCalculator()
+
+    def run(state: Any) -> int:
+        for query in queries:
+            calculator.find_most_similar(query, candidates, k=10)
+        return len(queries) * len(candidates)
+
+    return None, run
+
+
+@_perf_case("tool_cache_throughput", "ToolCache set/get throughput with a realistic hit ratio")
+def _tool_cache_throughput(ctx: PerfContext) -> Any:
+    from tool_box.cache import ToolCache
+
+    keys = ctx.size(500)
+    lookups = ctx.size(2000)
+    params = [{"query": f"synthetic query {index}", "limit": index % 7, "filters": {"k": index}} for index in range(keys)]
+    lookup_order = [ctx.rng.randrange(int(keys * 1.25)) for _ in range(lookups)]
+
+    async def _exercise() -> int:
+        cache = ToolCache(max_size=keys * 2)
+        for index, item in enumerate(params):
+            await cache.set("web_search", item, {"result": index})
+        for index in lookup_order:
+            item = params[index] if index < keys else {"query": f"miss {index}"}
+            await cache.get("web_search", item)
+        return keys + lookups
+
+    def run(state: Any) -> int:
+        return asyncio.run(_exercise())
+
+    return None, run
+
+
+# ---------------------------------------------------------------------------
+# Runner and comparison
+# ---------------------------------------------------------------------------
+
+
+def _case_seed(seed: int, name: str) -> int:
+    digest = hashlib.sha256(f"{seed}:{name}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if completed.returncode != 0:
+        return None
+    return completed.stdout.strip() or None
+
+
+def _summarize_samples(samples: Sequence[float], ops: int) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+    p95 = ordered[max(0, int(round(len(ordered) * 0.95)) - 1)]
+    return {
+        "median_ms": round(median * 1000, 4),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "p95_ms": round(p95 * 1000, 4),
+        "ops": ops,
+        "ops_per_sec": round(ops / median, 2) if median > 0 else None,
+        "samples_ms": [round(sample * 1000, 4) for sample in samples],
+    }
+
+
+def run_perf_suite(
+    cases: Optional[Sequence[str]] = None,
+    *,
+    repeat: int = 5,
+    warmup: int = 1,
+    scale: float = 1.0,
+    seed: int = 0,
+    workdir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run the selected perf cases (default: all) and return a JSON-serialisable report."""
+    selected = list(cases) if cases else list(PERF_CASES)
+    unknown = [name for name in selected if name not in PERF_CASES]
+    if unknown:
+        raise ValueError(f"Unknown perf cases: {', '.join(unknown)}")
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="perf_suite_", dir=workdir) as tmp:
+        root = Path(tmp)
+        with _isolated_storage(root):
+            for name in selected:
+                case = PERF_CASES[name]
+                ctx = PerfContext(rng=random.Random(_case_seed(seed, name)), scale=scale, workdir=root)
+                state, run = case.setup(ctx)
+                for _ in range(max(0, warmup)):
+                    run(state)
+                samples: List[float] = []
+                ops = 0
+                for _ in range(max(1, repeat)):
+                    started = time.perf_counter()
+                    ops = run(state)
+                    samples.append(time.perf_counter() - started)
+                results[name] = {"description": case.description, **_summarize_samples(samples, ops)}
+
+    return {
+        "suite": "perf",
+        "schema_version": PERF_REPORT_SCHEMA_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "scale": scale,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare_perf_reports(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    *,
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+    case_thresholds: Optional[Mapping[str, float]] = None,
+    metric: str = "median_ms",
+) -> Dict[str, Any]:
+    """Compare two perf reports; a case regresses when ``current/baseline - 1`` exceeds its threshold."""
+    base_results = baseline.get("results") or {}
+    current_results = current.get("results") or {}
+    overrides = dict(case_thresholds or {})
+    rows: List[Dict[str, Any]] = []
+
+    for name in sorted(set(base_results) | set(current_results)):
+        limit = float(overrides.get(name, threshold))
+        row: Dict[str, Any] = {"case": name, "threshold": limit}
+        before = (base_results.get(name) or {}).get(metric)
+        after = (current_results.get(name) or {}).get(metric)
+        row["baseline"] = before
+        row["current"] = after
+        if before is None or after is None:
+            row["status"] = "new" if before is None else "missing"
+            row["change"] = None
+        else:
+            change = (float(after) / float(before) - 1.0) if before else 0.0
+            row["change"] = round(change, 4)
+            if change > limit:
+                row["status"] = "regression"
+            elif change < -limit:
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+
+    return {
+        "metric": metric,
+        "baseline_commit": baseline.get("git_commit"),
+        "current_commit": current.get("git_commit"),
+        "ok": not any(row["status"] == "regression" for row in rows),
+        "cases": rows,
+    }
@@ -1,10 +1,15 @@
-"""AsyncToolExecutor — concurrent-safe tool execution with order-preserving segmentation.
+"""AsyncToolExecutor — concurrent tool execution scheduled by resource conflicts.
 
-Walks through tool calls in original index order and groups consecutive
-concurrent-safe calls for parallel execution.  When a non-safe call is
-encountered, the preceding safe batch is awaited first, then the unsafe
-call runs alone.  This preserves causal dependencies within a single
-LLM turn (e.g. write-then-read sequences).
+Each tool call carries the resources it reads and writes (file paths, plan
+IDs, session directories), derived from its arguments by the tool's
+``resource_access`` declaration.  Two calls conflict when one writes a
+resource the other reads or writes; a call waits only for the earlier calls
+it conflicts with, so unrelated reads and writes in one LLM turn run in
+parallel while causal order (e.g. write-then-read of the same file) is kept.
+
+Calls without declared resources fall back to the registry's
+``is_concurrent_safe`` flag: safe calls may read anything, unsafe calls are
+treated as writing everything and therefore run alone, in order.
 
 Phase 2.1 of the architecture evolution (see docs/architecture-evolution.md).
 """
@@ -13,11 +18,130 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import time
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from ..foundation.metrics import histogram
 
 logger = logging.getLogger(__name__)
 
+_TOOL_SECONDS = histogram(
+    "tool_execution_seconds",
+    "Wall time of tool calls run by the AsyncToolExecutor.",
+    ("tool", "outcome"),
+)
+
+ALL_RESOURCES = "*"
+
+
+# Relative paths under these prefixes resolve against the repository root
+# (see tool_box/path_resolution.py); every other relative path resolves inside
+# the calling session's workspace.
+_REPO_ROOT_PREFIXES = {"runtime", "data"}
+
+
+def _session_dir(session_id: str) -> Optional[str]:
+    try:
+        from app.services.session_paths import get_runtime_session_dir
+
+        return str(get_runtime_session_dir(session_id))
+    except Exception:
+        return None
+
+
+def path_resource(value: Any, context: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Canonical ``path:`` resource for a tool path argument.
+
+    Paths are resolved the way file tools see them, so ``foo.csv`` and
+    ``<session>/workspace/foo.csv`` name the same resource.
+    """
+    text = str(value or "").strip()
+    if not text:
+        return None
+    candidate = Path(text).expanduser()
+    if not candidate.is_absolute():
+        session_id = str((context or {}).get("session_id") or "").strip()
+        session_dir = _session_dir(session_id) if session_id else None
+        if session_dir and candidate.parts[0] not in _REPO_ROOT_PREFIXES:
+            candidate = Path(session_dir) / "workspace" / candidate
+        else:
+            candidate = Path(os.getcwd()) / candidate
+    return "path:" + os.path.normpath(str(candidate.resolve(strict=False)))
+
+
+def plan_resource(plan_id: Any) -> Optional[str]:
+    if plan_id is None or str(plan_id).strip() == "":
+        return None
+    return f"plan:{str(plan_id).strip()}"
+
+
+def session_resource(session_id: Any) -> Optional[str]:
+    text = str(session_id or "").strip()
+    return f"session:{text}" if text else None
+
+
+def _split(resource: str) -> tuple[str, str]:
+    kind, _, value = resource.partition(":")
+    return kind, value
+
+
+def _path_contains(directory: str, path: str) -> bool:
+    # A directory overlaps everything beneath it.
+    return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
+
+
+def _resources_overlap(left: str, right: str) -> bool:
+    if left == ALL_RESOURCES or right == ALL_RESOURCES or left == right:
+        return True
+    left_kind, left_value = _split(left)
+    right_kind, right_value = _split(right)
+    if left_kind == right_kind == "path":
+        return _path_contains(left_value, right_value) or _path_contains(right_value, left_value)
+    # A session resource covers every path inside the session directory.
+    if {left_kind, right_kind} == {"path", "session"}:
+        path_value, session_id = (left_value, right_value) if left_kind == "path" else (right_value, left_value)
+        session_dir = _session_dir(session_id)
+        return session_dir is not None and _path_contains(session_dir, path_value)
+    return False
+
+
+def _any_overlap(left: Iterable[str], right: Iterable[str]) -> bool:
+    right = tuple(right)
+    return any(_resources_overlap(a, b) for a in left for b in right)
+
+
+@dataclass(frozen=True)
+class ToolResources:
+    """Resources a single tool call reads and writes."""
+
+    reads: FrozenSet[str] = frozenset()
+    writes: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def of(
+        cls,
+        *,
+        reads: Iterable[Optional[str]] = (),
+        writes: Iterable[Optional[str]] = (),
+    ) -> "ToolResources":
+        return cls(
+            reads=frozenset(r for r in reads if r),
+            writes=frozenset(w for w in writes if w),
+        )
+
+    def conflicts_with(self, other: "ToolResources") -> bool:
+        return _any_overlap(self.writes, other.reads | other.writes) or _any_overlap(
+            other.writes, self.reads
+        )
+
+
+# Footprint for calls whose resources cannot be worked out: runs alone.
+UNKNOWN_RESOURCES = ToolResources(writes=frozenset({ALL_RESOURCES}))
+_UNDECLARED_SAFE = ToolResources(reads=frozenset({ALL_RESOURCES}))
+
 
 @dataclass
 class PendingToolCall:
@@ -28,12 +152,23 @@ class PendingToolCall:
     coroutine_factory: Callable[[], Awaitable[Dict[str, Any]]]
     is_concurrent_safe: bool = False
     result: Optional[Dict[str, Any]] = None
+    resources: Optional[ToolResources] = None
+
+    @property
+    def effective_resources(self) -> ToolResources:
+        if self.resources is not None:
+            return self.resources
+        return _UNDECLARED_SAFE if self.is_concurrent_safe else UNKNOWN_RESOURCES
 
 
 async def _run_one(call: PendingToolCall) -> None:
     """Execute a single PendingToolCall and store its result."""
+    started = time.perf_counter()
+    outcome = "error"
     try:
         call.result = await call.coroutine_factory()
+        ok = not isinstance(call.result, dict) or call.result.get("success", True) is not False
+        outcome = "ok" if ok else "failed"
     except Exception as exc:
         logger.warning(
             "[AsyncToolExecutor] Tool %s raised: %s", call.tool_name, exc,
@@ -43,22 +178,35 @@ async def _run_one(call: PendingToolCall) -> None:
             "error": str(exc),
             "summary": f"{call.tool_name} failed: {exc}",
         }
+    finally:
+        _TOOL_SECONDS.labels(call.tool_name, outcome).observe(time.perf_counter() - started)
+
+
+def build_conflict_graph(calls: List[PendingToolCall]) -> Dict[int, List[int]]:
+    """Map each call index to the indices of earlier calls it must wait for."""
+    ordered = sorted(calls, key=lambda c: c.index)
+    graph: Dict[int, List[int]] = {}
+    for position, call in enumerate(ordered):
+        resources = call.effective_resources
+        graph[call.index] = [
+            earlier.index
+            for earlier in ordered[:position]
+            if resources.conflicts_with(earlier.effective_resources)
+        ]
+    return graph
 
 
 async def execute_with_concurrency(
     calls: List[PendingToolCall],
 ) -> List[Dict[str, Any]]:
-    """Execute tool calls with order-preserving concurrency.
-
-    Walks through *calls* in index order and segments them into runs of
-    consecutive concurrent-safe tools.  Each safe run executes in parallel;
-    each unsafe call executes alone after the preceding batch completes.
+    """Execute tool calls concurrently unless their resources conflict.
 
-    Example ordering for ``[safe, safe, unsafe, safe]``::
+    A call starts once every earlier call it conflicts with has finished.
+    For ``[read a, write b, read b, unsafe]``::
 
-        asyncio.gather(safe_0, safe_1)   # parallel batch
-        await unsafe_2                    # sequential
-        await safe_3                      # single item, no gather overhead
+        read a, write b        # start immediately, in parallel
+        read b                 # after write b
+        unsafe                 # after all of the above
 
     Results are returned in the original ``index`` order.
     """
@@ -69,45 +217,28 @@ async def execute_with_concurrency(
         await _run_one(calls[0])
         return [calls[0].result]
 
-    # Segment into consecutive runs: [(is_safe, [call, ...]), ...]
-    segments: List[tuple[bool, List[PendingToolCall]]] = []
-    for call in calls:
-        if segments and segments[-1][0] == call.is_concurrent_safe:
-            segments[-1][1].append(call)
-        else:
-            segments.append((call.is_concurrent_safe, [call]))
+    graph = build_conflict_graph(calls)
+    tasks: Dict[int, asyncio.Task] = {}
 
-    for is_safe, segment in segments:
-        if is_safe and len(segment) > 1:
+    async def _run_after(call: PendingToolCall, waits_for: List[int]) -> None:
+        if waits_for:
+            await asyncio.wait([tasks[index] for index in waits_for])
             logger.debug(
-                "[AsyncToolExecutor] Running %d concurrent-safe tool(s) in parallel: %s",
-                len(segment),
-                [c.tool_name for c in segment],
-            )
-            results = await asyncio.gather(
-                *[c.coroutine_factory() for c in segment],
-                return_exceptions=True,
+                "[AsyncToolExecutor] Running %s after conflicting call(s) %s",
+                call.tool_name,
+                waits_for,
             )
-            for call, result in zip(segment, results):
-                if isinstance(result, BaseException):
-                    logger.warning(
-                        "[AsyncToolExecutor] Concurrent tool %s raised: %s",
-                        call.tool_name, result,
-                    )
-                    call.result = {
-                        "success": False,
-                        "error": str(result),
-                        "summary": f"{call.tool_name} failed: {result}",
-                    }
-                else:
-                    call.result = result
-        else:
-            for call in segment:
-                logger.debug(
-                    "[AsyncToolExecutor] Running tool sequentially: %s",
-                    call.tool_name,
-                )
-                await _run_one(call)
+        await _run_one(call)
+
+    for call in sorted(calls, key=lambda c: c.index):
+        tasks[call.index] = asyncio.ensure_future(_run_after(call, graph[call.index]))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "[AsyncToolExecutor] Scheduled %d tool(s); %d start immediately",
+            len(calls),
+            sum(1 for waits in graph.values() if not waits),
+        )
+    await asyncio.gather(*tasks.values())
 
     calls.sort(key=lambda c: c.index)
     return [c.result for c in calls]
@@ -126,3 +257,28 @@ def classify_tool_concurrency(tool_name: str) -> bool:
     if tool_def is None:
         return False
     return bool(tool_def.is_concurrent_safe)
+
+
+def classify_tool_resources(
+    tool_name: str,
+    arguments: Optional[Dict[str, Any]],
+    *,
+    context: Optional[Dict[str, Any]] = None,
+) -> Optional[ToolResources]:
+    """Derive the resources a call touches from the tool's ``resource_access``.
+
+    Returns None when the tool is unregistered, declares no resource access,
+    or its declaration cannot interpret the arguments; the executor then
+    falls back to ``is_concurrent_safe``.
+    """
+    from tool_box.tools import get_tool_registry
+
+    tool_def = get_tool_registry().get_tool(tool_name)
+    resource_access = getattr(tool_def, "resource_access", None)
+    if resource_access is None:
+        return None
+    try:
+        return resource_access(dict(arguments or {}), dict(context or {}))
+    except Exception as exc:
+        logger.debug("[AsyncToolExecutor] resource_access for %s failed: %s", tool_name, exc)
+        return None
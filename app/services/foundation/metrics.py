@@ -0,0 +1,343 @@
+"""In-process metrics: counters and HDR-style latency histograms.
+
+Every sample is written to a shard owned by the recording thread (keyed by
+``threading.get_ident()``), so the hot path takes no lock: a counter
+increment is one dict lookup plus an add, a histogram observation also maps
+the value to a log-linear bucket with :func:`math.frexp`.  Shards are only
+merged when the registry is rendered, for the Prometheus ``/metrics``
+endpoint or the JSON summary.
+
+Histogram buckets split each power of two into ``SUB_BUCKETS`` linear
+steps, which keeps the relative error of reported quantiles within 12.5%
+from 1µs up to roughly an hour.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+SUB_BUCKETS = 8
+_MIN_EXP = -19  # first bucket starts at 2**-20 s ~= 1µs
+_MAX_EXP = 12  # 2**12 s ~= 68 minutes
+_MIN_VALUE = 2.0 ** (_MIN_EXP - 1)
+_OVERFLOW_INDEX = (_MAX_EXP - _MIN_EXP + 1) * SUB_BUCKETS
+
+# Cumulative ``le`` bounds used for the Prometheus exposition.
+EXPORT_BOUNDS: Tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0,
+)
+SUMMARY_QUANTILES: Tuple[float, ...] = (0.5, 0.9, 0.99)
+
+_get_ident = threading.get_ident
+
+
+def _bucket_index(value: float) -> int:
+    if value <= _MIN_VALUE:
+        return 0
+    mantissa, exponent = math.frexp(value)
+    if exponent > _MAX_EXP:
+        return _OVERFLOW_INDEX
+    return (exponent - _MIN_EXP) * SUB_BUCKETS + int((mantissa - 0.5) * (2 * SUB_BUCKETS))
+
+
+def _bucket_upper_bound(index: int) -> float:
+    if index >= _OVERFLOW_INDEX:
+        return math.inf
+    exponent, step = divmod(index, SUB_BUCKETS)
+    return (0.5 + (step + 1) / (2 * SUB_BUCKETS)) * 2.0 ** (exponent + _MIN_EXP)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class CounterChild:
+    """One labelled counter series."""
+
+    __slots__ = ("_shards", "_lock")
+
+    def __init__(self) -> None:
+        self._shards: Dict[int, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def _new_shard(self) -> List[float]:
+        with self._lock:
+            return self._shards.setdefault(_get_ident(), [0.0])
+
+    def inc(self, amount: float = 1.0) -> None:
+        shard = self._shards.get(_get_ident()) or self._new_shard()
+        shard[0] += amount
+
+    @property
+    def value(self) -> float:
+        return sum(shard[0] for shard in list(self._shards.values()))
+
+
+class HistogramChild:
+    """One labelled histogram series."""
+
+    __slots__ = ("_shards", "_lock")
+
+    def __init__(self) -> None:
+        # thread id -> (bucket counts, [sum, max])
+        self._shards: Dict[int, Tuple[Dict[int, int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _new_shard(self) -> Tuple[Dict[int, int], List[float]]:
+        with self._lock:
+            return self._shards.setdefault(_get_ident(), ({}, [0.0, 0.0]))
+
+    def observe(self, value: float, _frexp: Callable[[float], Tuple[float, int]] = math.frexp) -> None:
+        # Inlined _bucket_index: this is the per-sample hot path.
+        buckets, totals = self._shards.get(_get_ident()) or self._new_shard()
+        if value > _MIN_VALUE:
+            mantissa, exponent = _frexp(value)
+            if exponent > _MAX_EXP:
+                index = _OVERFLOW_INDEX
+            else:
+                index = (exponent - _MIN_EXP) * SUB_BUCKETS + int((mantissa - 0.5) * (2 * SUB_BUCKETS))
+        else:
+            index = 0
+        buckets[index] = buckets.get(index, 0) + 1
+        totals[0] += value
+        if value > totals[1]:
+            totals[1] = value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def merged(self) -> Tuple[Dict[int, int], int, float, float]:
+        """``(buckets, count, sum, max)`` across all thread shards."""
+        buckets: Dict[int, int] = {}
+        count = 0
+        total = 0.0
+        maximum = 0.0
+        for shard_buckets, totals in list(self._shards.values()):
+            for index, hits in shard_buckets.copy().items():
+                buckets[index] = buckets.get(index, 0) + hits
+                count += hits
+            total += totals[0]
+            maximum = max(maximum, totals[1])
+        return buckets, count, total, maximum
+
+    def quantile(self, q: float) -> float:
+        buckets, count, _, maximum = self.merged()
+        return _quantile(buckets, count, maximum, q)
+
+
+def _quantile(buckets: Dict[int, int], count: int, maximum: float, q: float) -> float:
+    if count == 0:
+        return 0.0
+    rank = max(1, math.ceil(q * count))
+    seen = 0
+    for index in sorted(buckets):
+        seen += buckets[index]
+        if seen >= rank:
+            return min(_bucket_upper_bound(index), maximum)
+    return maximum
+
+
+class _Metric:
+    kind = ""
+    child_class: type = object
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: Any, **labels: Any) -> Any:
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self.child_class())
+        return child
+
+    def series(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        return sorted(self._children.items())
+
+
+class Counter(_Metric):
+    kind = "counter"
+    child_class = CounterChild
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+    child_class = HistogramChild
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+
+class MetricsRegistry:
+    """Named counters and histograms with Prometheus and JSON rendering."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, documentation: str, labelnames: Sequence[str]) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames)
+                self._metrics[name] = metric
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames)
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for values, child in metric.series():
+                if isinstance(child, CounterChild):
+                    labels = _label_text(metric.labelnames, values)
+                    lines.append(f"{metric.name}{labels} {_format_value(child.value)}")
+                    continue
+                buckets, count, total, _ = child.merged()
+                ordered = sorted(buckets.items())
+                position = 0
+                cumulative = 0
+                for bound in EXPORT_BOUNDS:
+                    while position < len(ordered) and _bucket_upper_bound(ordered[position][0]) <= bound:
+                        cumulative += ordered[position][1]
+                        position += 1
+                    labels = _label_text(metric.labelnames, values, f'le="{_format_value(bound)}"')
+                    lines.append(f"{metric.name}_bucket{labels} {cumulative}")
+                labels = _label_text(metric.labelnames, values, 'le="+Inf"')
+                lines.append(f"{metric.name}_bucket{labels} {count}")
+                labels = _label_text(metric.labelnames, values)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{metric.name}_count{labels} {count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {}
+        for metric in self.metrics():
+            series: List[Dict[str, Any]] = []
+            for values, child in metric.series():
+                entry: Dict[str, Any] = {"labels": dict(zip(metric.labelnames, values))}
+                if isinstance(child, CounterChild):
+                    entry["value"] = child.value
+                else:
+                    buckets, count, total, maximum = child.merged()
+                    entry.update(
+                        count=count,
+                        sum=total,
+                        mean=total / count if count else 0.0,
+                        max=maximum,
+                    )
+                    for q in SUMMARY_QUANTILES:
+                        entry[f"p{int(q * 100)}"] = _quantile(buckets, count, maximum, q)
+                series.append(entry)
+            payload[metric.name] = {
+                "type": metric.kind,
+                "help": metric.documentation,
+                "series": series,
+            }
+        return payload
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return get_metrics_registry().counter(name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Histogram:
+    return get_metrics_registry().histogram(name, documentation, labelnames)
+
+
+def timed(metric: Histogram, **labels: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator recording the wall time of each call into ``metric``."""
+
+    child = metric.labels(**labels)
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    child.observe(time.perf_counter() - started)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
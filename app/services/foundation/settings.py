@@ -128,6 +128,8 @@ if _USE_PYDANTIC:
         semantic_intent_high_threshold: float = Field(default=0.72, env="SEMANTIC_INTENT_HIGH_THRESHOLD")
         semantic_intent_low_threshold: float = Field(default=0.58, env="SEMANTIC_INTENT_LOW_THRESHOLD")
         semantic_intent_min_gap: float = Field(default=0.08, env="SEMANTIC_INTENT_MIN_GAP")
+        semantic_intent_latency_budget_ms: float = Field(default=300.0, env="SEMANTIC_INTENT_LATENCY_BUDGET_MS")
+        semantic_intent_batch_window_ms: float = Field(default=5.0, env="SEMANTIC_INTENT_BATCH_WINDOW_MS")
 
         ctx_debug: bool = Field(default=False, env=["CTX_DEBUG", "CONTEXT_DEBUG"])
         budget_debug: bool = Field(default=False, env="BUDGET_DEBUG")
@@ -337,6 +339,14 @@ else:
                 self.semantic_intent_min_gap = float(os.getenv("SEMANTIC_INTENT_MIN_GAP", "0.08"))
             except Exception:
                 self.semantic_intent_min_gap = 0.08
+            try:
+                self.semantic_intent_latency_budget_ms = float(os.getenv("SEMANTIC_INTENT_LATENCY_BUDGET_MS", "300"))
+            except Exception:
+                self.semantic_intent_latency_budget_ms = 300.0
+            try:
+                self.semantic_intent_batch_window_ms = float(os.getenv("SEMANTIC_INTENT_BATCH_WINDOW_MS", "5"))
+            except Exception:
+                self.semantic_intent_batch_window_ms = 5.0
 
             def _truthy(v: str) -> bool:
                 return str(v).strip().lower() in {"1", "true", "yes", "on"}
@@ -7,12 +7,28 @@ fails to match any phrase list and would otherwise return ``"chat"``.
 
 The classifier is **disabled by default** (``SEMANTIC_INTENT_ENABLED=False``)
 and can be enabled via environment variable for gradual rollout.
+
+Centroids are cached on disk keyed by the embedding model and a hash of the
+anchor sentences, so a warm startup makes no embedding API calls.  Message
+embeddings are cached by normalized text, and concurrent ``classify`` calls
+are micro-batched into a single embedding request.  When the embedding does
+not arrive within the latency budget the classifier abstains, and the caller
+keeps the deterministic router's decision.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
-from typing import Dict, List, Optional, Tuple
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -22,6 +38,106 @@ from .anchor_definitions import INTENT_ANCHORS
 
 logger = logging.getLogger(__name__)
 
+MESSAGE_CACHE_SIZE = 2048
+MAX_BATCH_SIZE = 32
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_message(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", str(text or "")).strip().casefold()
+
+
+def _embedding_model_name() -> str:
+    try:
+        from app.services.foundation.settings import get_settings
+
+        settings = get_settings()
+        provider = str(getattr(settings, "embedding_provider", "") or "qwen").lower()
+        if provider == "qwen":
+            model = settings.qwen_embedding_model
+        else:
+            model = settings.glm_embedding_model
+        return f"{provider}:{model}"
+    except Exception:
+        return "unknown"
+
+
+def _anchor_hash(anchors: Dict[str, List[str]]) -> str:
+    payload = json.dumps(anchors, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _default_centroid_cache_dir() -> Path:
+    from app.services.session_paths import get_runtime_root
+
+    return get_runtime_root() / "_cache" / "intent_centroids"
+
+
+def _embed_many(texts: Sequence[str]) -> List[List[float]]:
+    from app.services.embeddings import get_embeddings_service
+
+    svc = get_embeddings_service()
+    if hasattr(svc, "get_embeddings"):
+        return list(svc.get_embeddings(list(texts)))
+    return [svc.get_single_embedding(text) for text in texts]
+
+
+class _EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into one call per window."""
+
+    def __init__(
+        self,
+        embed_many: Callable[[Sequence[str]], List[List[float]]],
+        *,
+        window_seconds: float,
+        max_batch: int = MAX_BATCH_SIZE,
+    ) -> None:
+        self._embed_many = embed_many
+        self._window = max(0.0, window_seconds)
+        self._max_batch = max(1, max_batch)
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[str, Future]" = OrderedDict()
+        self._flush_scheduled = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="intent-embed")
+        self.calls = 0
+
+    def submit(self, text: str) -> Future:
+        with self._lock:
+            future = self._pending.get(text)
+            if future is not None:
+                return future
+            future = Future()
+            self._pending[text] = future
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                self._executor.submit(self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._window:
+            time.sleep(self._window)
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._flush_scheduled = False
+                    return
+                batch = []
+                while self._pending and len(batch) < self._max_batch:
+                    batch.append(self._pending.popitem(last=False))
+            texts = [text for text, _ in batch]
+            try:
+                self.calls += 1
+                vectors = self._embed_many(texts)
+                if len(vectors) != len(texts):
+                    raise ValueError(f"embedding count mismatch ({len(vectors)} vs {len(texts)})")
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+
 class SemanticIntentClassifier:
     """Embedding-based intent classifier with dual-threshold + gap logic.
 
@@ -38,10 +154,22 @@ class SemanticIntentClassifier:
         high_threshold: float = 0.72,
         low_threshold: float = 0.58,
         min_gap: float = 0.08,
+        latency_budget_ms: Optional[float] = 300.0,
+        batch_window_ms: float = 5.0,
+        centroid_cache_dir: Optional[Path] = None,
+        embed_many: Optional[Callable[[Sequence[str]], List[List[float]]]] = None,
     ) -> None:
         self._high_threshold = high_threshold
         self._low_threshold = low_threshold
         self._min_gap = min_gap
+        self._latency_budget = (
+            None if latency_budget_ms is None or latency_budget_ms <= 0 else latency_budget_ms / 1000.0
+        )
+        self._centroid_cache_dir = centroid_cache_dir
+        self._embed_many = embed_many or _embed_many
+        self._batcher = _EmbeddingBatcher(self._embed_many, window_seconds=batch_window_ms / 1000.0)
+        self._message_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._message_cache_lock = threading.Lock()
 
         # Populated by initialize()
         self._centroids: Dict[str, np.ndarray] = {}
@@ -54,21 +182,18 @@ class SemanticIntentClassifier:
     # ------------------------------------------------------------------
 
     def initialize(self) -> None:
-        """Embed all anchor sentences and compute per-intent centroids.
+        """Compute per-intent centroids, from the disk cache when possible.
 
-        Uses the project's existing ``GLMEmbeddingsService`` which routes
-        through the Qwen embedding API (with LRU + SQLite cache) so repeated
-        startups are essentially free.
+        On a cache miss the anchors are embedded through the project's
+        embedding service and the centroids are written back, keyed by the
+        embedding model and the anchor text hash.
         """
         if self._initialized:
             return
 
-        try:
-            from app.services.embeddings import get_embeddings_service
-
-            svc = get_embeddings_service()
-        except Exception as exc:
-            logger.warning("SemanticIntentClassifier: embedding service unavailable, skipping init: %s", exc)
+        cache_path = self._centroid_cache_path()
+        if cache_path is not None and self._load_centroids(cache_path):
+            logger.info("SemanticIntentClassifier loaded cached centroids from %s", cache_path)
             return
 
         all_sentences: List[str] = []
@@ -81,7 +206,7 @@ class SemanticIntentClassifier:
             intent_ranges.append((intent, start, offset))
 
         try:
-            all_vectors = svc.get_embeddings(all_sentences)
+            all_vectors = self._embed_many(all_sentences)
         except Exception as exc:
             logger.warning("SemanticIntentClassifier: failed to embed anchors: %s", exc)
             return
@@ -94,7 +219,7 @@ class SemanticIntentClassifier:
             )
             return
 
-        self._intent_order = []
+        intent_order: List[str] = []
         centroid_list: List[np.ndarray] = []
         for intent, start, end in intent_ranges:
             vecs = np.array(all_vectors[start:end], dtype=np.float32)
@@ -102,12 +227,12 @@ class SemanticIntentClassifier:
             norm = np.linalg.norm(centroid)
             if norm > 0:
                 centroid = centroid / norm
-            self._centroids[intent] = centroid
-            self._intent_order.append(intent)
+            intent_order.append(intent)
             centroid_list.append(centroid)
 
-        self._centroid_matrix = np.stack(centroid_list)  # (n_intents, dim)
-        self._initialized = True
+        self._set_centroids(intent_order, np.stack(centroid_list))
+        if cache_path is not None:
+            self._save_centroids(cache_path)
 
         logger.info(
             "SemanticIntentClassifier initialized: %d intents, dim=%d",
@@ -115,6 +240,46 @@ class SemanticIntentClassifier:
             self._centroid_matrix.shape[1],
         )
 
+    def _set_centroids(self, intent_order: List[str], matrix: np.ndarray) -> None:
+        self._intent_order = list(intent_order)
+        self._centroids = {intent: matrix[i] for i, intent in enumerate(intent_order)}
+        self._centroid_matrix = matrix  # (n_intents, dim)
+        self._initialized = True
+
+    def _centroid_cache_path(self) -> Optional[Path]:
+        try:
+            cache_dir = self._centroid_cache_dir or _default_centroid_cache_dir()
+        except Exception:
+            return None
+        key = hashlib.sha1(
+            f"{_embedding_model_name()}|{_anchor_hash(INTENT_ANCHORS)}".encode("utf-8")
+        ).hexdigest()
+        return Path(cache_dir) / f"{key}.npz"
+
+    def _load_centroids(self, path: Path) -> bool:
+        if not path.exists():
+            return False
+        try:
+            with np.load(path, allow_pickle=False) as payload:
+                intent_order = [str(item) for item in payload["intents"]]
+                matrix = np.asarray(payload["centroids"], dtype=np.float32)
+        except Exception as exc:
+            logger.debug("SemanticIntentClassifier: ignoring unreadable centroid cache %s: %s", path, exc)
+            return False
+        if intent_order != list(INTENT_ANCHORS) or matrix.ndim != 2 or matrix.shape[0] != len(intent_order):
+            return False
+        self._set_centroids(intent_order, matrix)
+        return True
+
+    def _save_centroids(self, path: Path) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp.npz")
+            np.savez(tmp_path, intents=np.array(self._intent_order), centroids=self._centroid_matrix)
+            tmp_path.replace(path)
+        except Exception as exc:
+            logger.debug("SemanticIntentClassifier: could not write centroid cache %s: %s", path, exc)
+
     # ------------------------------------------------------------------
     # Classification
     # ------------------------------------------------------------------
@@ -132,22 +297,24 @@ class SemanticIntentClassifier:
         if not self._initialized or self._centroid_matrix is None:
             return None, 0.0, ["semantic_not_initialized"]
 
-        try:
-            from app.services.embeddings import get_embeddings_service
-
-            svc = get_embeddings_service()
-            msg_vec = svc.get_single_embedding(message)
-        except Exception as exc:
-            logger.debug("SemanticIntentClassifier: embedding failed for message: %s", exc)
-            return None, 0.0, ["semantic_embedding_error"]
-
-        if not msg_vec:
-            return None, 0.0, ["semantic_empty_embedding"]
-
-        vec = np.array(msg_vec, dtype=np.float32)
-        norm = np.linalg.norm(vec)
-        if norm > 0:
-            vec = vec / norm
+        key = _normalize_message(message)
+        vec = self._cached_message_vector(key)
+        if vec is None:
+            future = self._batcher.submit(key)
+            try:
+                msg_vec = future.result(timeout=self._latency_budget)
+            except FutureTimeoutError:
+                # The batch keeps running and fills the cache for next time.
+                future.add_done_callback(lambda done: self._remember_future(key, done))
+                return None, 0.0, ["semantic_latency_budget_exceeded"]
+            except Exception as exc:
+                logger.debug("SemanticIntentClassifier: embedding failed for message: %s", exc)
+                return None, 0.0, ["semantic_embedding_error"]
+
+            if msg_vec is None or len(msg_vec) == 0:
+                return None, 0.0, ["semantic_empty_embedding"]
+
+            vec = self._remember(key, msg_vec)
 
         # Cosine similarity with all centroids at once
         scores = self._centroid_matrix @ vec  # (n_intents,)
@@ -174,6 +341,32 @@ class SemanticIntentClassifier:
         reasons.append("semantic_below_threshold")
         return None, best_score, reasons
 
+    def _cached_message_vector(self, key: str) -> Optional[np.ndarray]:
+        with self._message_cache_lock:
+            vec = self._message_cache.get(key)
+            if vec is not None:
+                self._message_cache.move_to_end(key)
+            return vec
+
+    def _remember(self, key: str, raw_vector: Any) -> np.ndarray:
+        vec = np.array(raw_vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec = vec / norm
+        with self._message_cache_lock:
+            self._message_cache[key] = vec
+            self._message_cache.move_to_end(key)
+            while len(self._message_cache) > MESSAGE_CACHE_SIZE:
+                self._message_cache.popitem(last=False)
+        return vec
+
+    def _remember_future(self, key: str, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if result is not None and len(result):
+            self._remember(key, result)
+
     @property
     def is_initialized(self) -> bool:
         return self._initialized
@@ -197,5 +390,7 @@ def get_semantic_intent_classifier() -> SemanticIntentClassifier:
             high_threshold=settings.semantic_intent_high_threshold,
             low_threshold=settings.semantic_intent_low_threshold,
             min_gap=settings.semantic_intent_min_gap,
+            latency_budget_ms=settings.semantic_intent_latency_budget_ms,
+            batch_window_ms=settings.semantic_intent_batch_window_ms,
         )
     return _classifier_instance
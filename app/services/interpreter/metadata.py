@@ -4,8 +4,14 @@ Dataset Metadata Processing Module
 , support CSV, TSV, MAT, NPY . 
 """
 
+import hashlib
+import json
+import logging
 import os
-from typing import List, Any, Optional
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import numpy as np
 import pandas as pd
@@ -23,24 +29,399 @@ try:
 except ImportError:
     HAS_H5PY = False
 
+try:
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import openpyxl
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+logger = logging.getLogger(__name__)
+
+# Streaming profile limits: rows are parsed in chunks of CHUNK_ROWS, at most
+# MAX_SCAN_ROWS rows are parsed, and RESERVOIR_ROWS rows are kept as a uniform
+# sample. Unique counts are exact up to UNIQUE_LIMIT distinct values.
+CHUNK_ROWS = 50_000
+MAX_SCAN_ROWS = 2_000_000
+RESERVOIR_ROWS = 5_000
+UNIQUE_LIMIT = 10_000
+_NEWLINE_SCAN_BYTES = 1 << 20
+
 
 class ColumnMetadata(BaseModel):
-    """"""
+    """Column statistics.
+
+    ``unique_count`` is an exact distinct count, or None when it was not
+    counted; ``unique_count_at_least`` then holds a lower bound if one is known.
+    """
     name: str
     dtype: str
     sample_values: List[Any]
     null_count: int
-    unique_count: int
+    unique_count: Optional[int] = None
+    unique_count_at_least: Optional[int] = None
 
 
 class DatasetMetadata(BaseModel):
-    """"""
+    """Dataset summary.
+
+    When ``stats_truncated`` is set, column statistics cover only the first
+    ``rows_profiled`` of ``total_rows`` rows: null counts are partial and
+    distinct counts are reported as ``unique_count_at_least``.
+    """
     filename: str
     file_format: str
     file_size_bytes: int
     total_rows: int
     total_columns: int
     columns: List[ColumnMetadata]
+    sampled: bool = False
+    sample_rows: Optional[int] = None
+    stats_truncated: bool = False
+    rows_profiled: Optional[int] = None
+
+
+def _to_python(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def count_data_lines(file_path: str, *, header_lines: int = 1) -> int:
+    """Count rows of a delimited text file by scanning raw bytes for newlines.
+
+    Quoted fields containing newlines are counted as extra rows, so this is
+    an estimate for such files.
+    """
+    lines = 0
+    last = b"\n"
+    with open(file_path, "rb") as handle:
+        while True:
+            block = handle.read(_NEWLINE_SCAN_BYTES)
+            if not block:
+                break
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return max(0, lines - header_lines)
+
+
+class _StreamingProfile:
+    """Accumulates column statistics over DataFrame chunks in bounded memory."""
+
+    def __init__(self, *, reservoir_rows: Optional[int] = None, seed: int = 0) -> None:
+        self.columns: List[str] = []
+        self.rows_seen = 0
+        self._reservoir_rows = RESERVOIR_ROWS if reservoir_rows is None else reservoir_rows
+        self._reservoir: List[Tuple[Any, ...]] = []
+        self._rng = np.random.default_rng(seed)
+        self._dtypes: Dict[str, List[str]] = {}
+        self._nulls: Dict[str, int] = {}
+        self._uniques: Dict[str, Optional[set]] = {}
+        # Columns whose distinct values exceeded UNIQUE_LIMIT.
+        self._unique_overflow: Set[str] = set()
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        if not self.columns:
+            self.columns = [str(col) for col in chunk.columns]
+            for col in self.columns:
+                self._dtypes[col] = []
+                self._nulls[col] = 0
+                self._uniques[col] = set()
+        chunk = chunk.set_axis(self.columns[: len(chunk.columns)], axis=1)
+        for col in chunk.columns:
+            series = chunk[col]
+            dtype = str(series.dtype)
+            if dtype not in self._dtypes[col]:
+                self._dtypes[col].append(dtype)
+            self._nulls[col] += int(series.isnull().sum())
+            seen = self._uniques[col]
+            if seen is not None:
+                try:
+                    seen.update(series.dropna().unique().tolist())
+                except TypeError:
+                    seen = None
+                if seen is not None and len(seen) > UNIQUE_LIMIT:
+                    self._unique_overflow.add(col)
+                    seen = None
+                self._uniques[col] = seen
+        self._sample(chunk)
+        self.rows_seen += len(chunk)
+
+    def _sample(self, chunk: pd.DataFrame) -> None:
+        """Reservoir-sample (algorithm R) the rows of ``chunk``."""
+        n = len(chunk)
+        k = self._reservoir_rows
+        take = min(max(k - len(self._reservoir), 0), n)
+        if take:
+            self._reservoir.extend(chunk.iloc[:take].itertuples(index=False, name=None))
+        if take >= n:
+            return
+        positions = np.arange(self.rows_seen + take, self.rows_seen + n)
+        slots = self._rng.integers(0, positions + 1)
+        hits = np.nonzero(slots < k)[0]
+        if not hits.size:
+            return
+        rows = chunk.iloc[take + hits].itertuples(index=False, name=None)
+        for slot, row in zip(slots[hits], rows):
+            self._reservoir[int(slot)] = row
+
+    def _dtype(self, col: str) -> str:
+        dtypes = self._dtypes.get(col) or ["object"]
+        if len(dtypes) == 1:
+            return dtypes[0]
+        if all(d.startswith(("int", "float")) for d in dtypes):
+            return "float64"
+        return "object"
+
+    def column_metadata(self, *, truncated: bool = False) -> List[ColumnMetadata]:
+        """Per-column stats; with ``truncated`` distinct counts become lower bounds."""
+        columns: List[ColumnMetadata] = []
+        for position, col in enumerate(self.columns):
+            samples: List[Any] = []
+            for row in self._reservoir:
+                value = row[position] if position < len(row) else None
+                if value is None or (isinstance(value, float) and np.isnan(value)):
+                    continue
+                samples.append(_to_python(value))
+                if len(samples) == 5:
+                    break
+            uniques = self._uniques.get(col)
+            unique_count = len(uniques) if uniques is not None else None
+            at_least = UNIQUE_LIMIT + 1 if col in self._unique_overflow else None
+            if truncated and unique_count is not None:
+                unique_count, at_least = None, unique_count
+            columns.append(ColumnMetadata(
+                name=col,
+                dtype=self._dtype(col),
+                sample_values=samples,
+                null_count=self._nulls.get(col, 0),
+                unique_count=unique_count,
+                unique_count_at_least=at_least,
+            ))
+        return columns
+
+    def to_metadata(
+        self,
+        file_path: str,
+        file_format: str,
+        *,
+        total_rows: Optional[int] = None,
+        truncated: Optional[bool] = None,
+    ) -> DatasetMetadata:
+        """Summarise the profile; ``truncated`` defaults to rows beyond those profiled."""
+        rows = self.rows_seen if total_rows is None else max(total_rows, self.rows_seen)
+        if truncated is None:
+            truncated = rows > self.rows_seen
+        return DatasetMetadata(
+            filename=os.path.basename(file_path),
+            file_format=file_format,
+            file_size_bytes=os.path.getsize(file_path),
+            total_rows=rows,
+            total_columns=len(self.columns),
+            columns=self.column_metadata(truncated=truncated),
+            sampled=rows > len(self._reservoir),
+            sample_rows=len(self._reservoir),
+            stats_truncated=truncated,
+            rows_profiled=self.rows_seen if truncated else None,
+        )
+
+
+def _profile_chunks(
+    chunks: Iterable[pd.DataFrame],
+    *,
+    max_rows: Optional[int] = None,
+) -> Tuple[_StreamingProfile, bool]:
+    """Feed ``chunks`` into a profile; returns whether the row cap was reached."""
+    max_rows = MAX_SCAN_ROWS if max_rows is None else max_rows
+    profile = _StreamingProfile()
+    for chunk in chunks:
+        room = max_rows - profile.rows_seen
+        if room <= 0:
+            return profile, True
+        profile.add(chunk.iloc[:room] if len(chunk) > room else chunk)
+    return profile, profile.rows_seen >= max_rows
+
+
+def _xlsx_chunks(file_path: str) -> Iterator[pd.DataFrame]:
+    chunk_rows = CHUNK_ROWS
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            str(name) if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)
+        ]
+        batch: List[Tuple[Any, ...]] = []
+        for row in rows:
+            batch.append(tuple(row[: len(columns)]))
+            if len(batch) >= chunk_rows:
+                yield pd.DataFrame(batch, columns=columns).infer_objects()
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns).infer_objects()
+    finally:
+        workbook.close()
+
+
+def _xlsx_row_count(file_path: str) -> Optional[int]:
+    workbook = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        max_row = workbook.worksheets[0].max_row
+    finally:
+        workbook.close()
+    return max(0, max_row - 1) if max_row else None
+
+
+class _MetadataCache:
+    """LRU of dataset metadata keyed by ``(path, size, mtime_ns)``, persisted as JSON.
+
+    The on-disk copy is bounded too: file mtimes record last use, and once
+    there are more than ``max_disk_entries`` files the least recently used
+    are removed down to three quarters of the limit.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path],
+        *,
+        max_entries: int = 256,
+        max_disk_entries: int = 2048,
+    ) -> None:
+        self.root = root
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[Tuple[str, int, int], DatasetMetadata]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_entries: Optional[int] = None  # counted lazily on first write
+
+    @staticmethod
+    def key_for(file_path: str) -> Tuple[str, int, int]:
+        stat = os.stat(file_path)
+        return os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns
+
+    def _disk_path(self, key: Tuple[str, int, int]) -> Optional[Path]:
+        if self.root is None:
+            return None
+        digest = hashlib.sha1(json.dumps(list(key)).encode("utf-8")).hexdigest()
+        return self.root / f"{digest}.json"
+
+    def get(self, key: Tuple[str, int, int]) -> Optional[DatasetMetadata]:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None:
+                self._entries.move_to_end(key)
+                return hit
+        disk_path = self._disk_path(key)
+        if disk_path is None or not disk_path.exists():
+            return None
+        try:
+            payload = json.loads(disk_path.read_text(encoding="utf-8"))
+            if tuple(payload.get("key") or ()) != key:
+                return None
+            metadata = DatasetMetadata.model_validate(payload["metadata"])
+        except Exception:
+            logger.debug("Ignoring unreadable metadata cache entry %s", disk_path, exc_info=True)
+            return None
+        try:
+            os.utime(disk_path)
+        except OSError:
+            pass
+        self._remember(key, metadata)
+        return metadata
+
+    def put(self, key: Tuple[str, int, int], metadata: DatasetMetadata) -> None:
+        self._remember(key, metadata)
+        disk_path = self._disk_path(key)
+        if disk_path is None:
+            return
+        try:
+            disk_path.parent.mkdir(parents=True, exist_ok=True)
+            is_new = not disk_path.exists()
+            tmp_path = disk_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps({"key": list(key), "metadata": metadata.model_dump(mode="json")}, default=str),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, disk_path)
+        except Exception:
+            logger.debug("Failed to persist metadata cache entry %s", disk_path, exc_info=True)
+            return
+        with self._lock:
+            if self._disk_entries is None:
+                self._disk_entries = sum(1 for _ in self.root.glob("*.json"))
+            elif is_new:
+                self._disk_entries += 1
+            over_limit = self._disk_entries > self.max_disk_entries
+        if over_limit:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        entries: List[Tuple[int, Path]] = []
+        for path in self.root.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                continue
+        entries.sort()
+        excess = max(0, len(entries) - self.max_disk_entries * 3 // 4)
+        for _, path in entries[:excess]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_entries = len(entries) - excess
+
+    def _remember(self, key: Tuple[str, int, int], metadata: DatasetMetadata) -> None:
+        with self._lock:
+            self._entries[key] = metadata
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_metadata_cache: Optional[_MetadataCache] = None
+_metadata_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> Optional[_MetadataCache]:
+    """Return the process-wide metadata cache, or None when disabled.
+
+    ``DATASET_METADATA_CACHE=0`` disables caching; ``DATASET_METADATA_CACHE_DIR``
+    overrides the on-disk location (default: ``<runtime root>/_cache/dataset_metadata``).
+    """
+    global _metadata_cache
+    if (os.getenv("DATASET_METADATA_CACHE", "1") or "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    if _metadata_cache is None:
+        with _metadata_cache_lock:
+            if _metadata_cache is None:
+                root = (os.getenv("DATASET_METADATA_CACHE_DIR") or "").strip()
+                if root:
+                    cache_root = Path(root).expanduser()
+                else:
+                    from app.services.session_paths import get_runtime_root
+
+                    cache_root = get_runtime_root() / "_cache" / "dataset_metadata"
+                _metadata_cache = _MetadataCache(cache_root)
+    return _metadata_cache
+
+
+def reset_metadata_cache() -> None:
+    global _metadata_cache
+    with _metadata_cache_lock:
+        _metadata_cache = None
 
 
 class DataProcessor:
@@ -65,7 +446,7 @@ class DataProcessor:
                 if np.issubdtype(field_data.dtype, np.number):
                     null_count = int(np.isnan(field_data).sum()) if field_data.size > 0 else 0
 
-                unique_count = len(np.unique(flat)) if flat.size < 10000 else -1
+                unique_count = len(np.unique(flat)) if flat.size < 10000 else None
 
                 columns_metadata.append(ColumnMetadata(
                     name=name,
@@ -81,7 +462,7 @@ class DataProcessor:
                 flat = data.flatten()
                 sample_vals = [x.item() if isinstance(x, np.generic) else x for x in flat[:5]]
                 null_count = int(np.isnan(data).sum()) if np.issubdtype(data.dtype, np.number) else 0
-                unique_count = len(np.unique(flat)) if flat.size < 10000 else -1
+                unique_count = len(np.unique(flat)) if flat.size < 10000 else None
 
                 columns_metadata.append(ColumnMetadata(
                     name='data',
@@ -97,7 +478,7 @@ class DataProcessor:
                     col_data = data[:, i]
                     sample_vals = [x.item() if isinstance(x, np.generic) else x for x in col_data[:5]]
                     null_count = int(np.isnan(col_data).sum()) if np.issubdtype(data.dtype, np.number) else 0
-                    unique_count = len(np.unique(col_data)) if col_data.size < 10000 else -1
+                    unique_count = len(np.unique(col_data)) if col_data.size < 10000 else None
 
                     columns_metadata.append(ColumnMetadata(
                         name=f'col_{i}',
@@ -111,7 +492,7 @@ class DataProcessor:
                 flat = data.flatten()
                 sample_vals = [x.item() if isinstance(x, np.generic) else x for x in flat[:5]]
                 null_count = int(np.isnan(data).sum()) if np.issubdtype(data.dtype, np.number) else 0
-                unique_count = len(np.unique(flat)) if flat.size < 10000 else -1
+                unique_count = len(np.unique(flat)) if flat.size < 10000 else None
 
                 columns_metadata.append(ColumnMetadata(
                     name=f'data (shape: {data.shape})',
@@ -148,7 +529,7 @@ class DataProcessor:
         for key, value in data.items():
             sample_vals = []
             null_count = 0
-            unique_count = 0
+            unique_count: Optional[int] = 0
             dtype_str = 'unknown'
 
             if isinstance(value, np.ndarray):
@@ -170,7 +551,7 @@ class DataProcessor:
                     if value.size < 10000:
                         unique_count = len(np.unique(flat))
                     else:
-                        unique_count = -1
+                        unique_count = None
             else:
                 dtype_str = type(value).__name__
                 sample_vals = [str(value)[:50]]
@@ -243,7 +624,7 @@ class DataProcessor:
                     dtype="category",
                     sample_values=[],
                     null_count=0,
-                    unique_count=-1,
+                    unique_count=None,
                 ))
 
             # --- var (gene annotations) ---
@@ -264,7 +645,7 @@ class DataProcessor:
                     dtype="annotation",
                     sample_values=[],
                     null_count=0,
-                    unique_count=-1,
+                    unique_count=None,
                 ))
 
             # --- obsm (embeddings like PCA, UMAP) ---
@@ -277,7 +658,7 @@ class DataProcessor:
                     dtype="embedding",
                     sample_values=[],
                     null_count=0,
-                    unique_count=-1,
+                    unique_count=None,
                 ))
 
         return DatasetMetadata(
@@ -290,12 +671,82 @@ class DataProcessor:
         )
 
     @staticmethod
-    def get_metadata(file_path: str) -> DatasetMetadata:
+    def _process_delimited_file(file_path: str, file_ext: str) -> DatasetMetadata:
+        """Profile CSV/TSV/TXT in chunks; rows past the scan cap are counted by newline."""
+        if file_ext == '.tsv':
+            reader = pd.read_csv(file_path, sep='\t', chunksize=CHUNK_ROWS)
+        elif file_ext == '.txt':
+            reader = pd.read_csv(file_path, sep=None, engine='python', chunksize=CHUNK_ROWS)
+        else:
+            reader = pd.read_csv(file_path, chunksize=CHUNK_ROWS)
+        with reader:
+            profile, capped = _profile_chunks(reader)
+        total_rows = count_data_lines(file_path) if capped else None
+        return profile.to_metadata(file_path, file_ext.lstrip('.'), total_rows=total_rows)
+
+    @staticmethod
+    def _process_excel_file(file_path: str, file_ext: str) -> DatasetMetadata:
+        """Profile the first sheet; .xlsx/.xlsm are streamed in read-only mode."""
+        if HAS_OPENPYXL and file_ext in ('.xlsx', '.xlsm'):
+            profile, capped = _profile_chunks(_xlsx_chunks(file_path))
+            total_rows = _xlsx_row_count(file_path) if capped else None
+        else:
+            profile, capped = _profile_chunks([pd.read_excel(file_path, nrows=MAX_SCAN_ROWS)])
+            # The sheet's real length is unknown once nrows is reached.
+            return profile.to_metadata(file_path, file_ext.lstrip('.'), truncated=capped)
+        return profile.to_metadata(file_path, file_ext.lstrip('.'), total_rows=total_rows)
+
+    @staticmethod
+    def _process_parquet_file(file_path: str) -> DatasetMetadata:
+        """Describe a parquet file from its footer metadata and first few rows."""
+        if not HAS_PYARROW:
+            df = pd.read_parquet(file_path)
+            profile, _ = _profile_chunks([df])
+            return profile.to_metadata(file_path, 'parquet', total_rows=len(df))
+
+        parquet = pq.ParquetFile(file_path)
+        meta = parquet.metadata
+        schema = parquet.schema_arrow
+        head = next(parquet.iter_batches(batch_size=5), None)
+        head_rows = head.to_pylist() if head is not None else []
+
+        columns_metadata = []
+        for index, field in enumerate(schema):
+            null_count = 0
+            for group in range(meta.num_row_groups):
+                stats = meta.row_group(group).column(index).statistics
+                if stats is not None and stats.has_null_count:
+                    null_count += int(stats.null_count)
+            columns_metadata.append(ColumnMetadata(
+                name=field.name,
+                dtype=str(field.type),
+                sample_values=[row[field.name] for row in head_rows if row.get(field.name) is not None],
+                null_count=null_count,
+                unique_count=None,
+            ))
+
+        return DatasetMetadata(
+            filename=os.path.basename(file_path),
+            file_format='parquet',
+            file_size_bytes=os.path.getsize(file_path),
+            total_rows=int(meta.num_rows),
+            total_columns=len(columns_metadata),
+            columns=columns_metadata,
+            sampled=True,
+            sample_rows=len(head_rows),
+        )
+
+    @staticmethod
+    def get_metadata(file_path: str, *, use_cache: bool = True) -> DatasetMetadata:
         """
         Extract metadata from supported dataset files.
 
+        Results are cached under ``(path, size, mtime_ns)`` in memory and on
+        disk, so an unchanged file is only profiled once.
+
         Args:
             file_path: Dataset file path.
+            use_cache: Set to False to always re-profile the file.
 
         Returns:
             Parsed dataset metadata.
@@ -307,6 +758,19 @@ class DataProcessor:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
+        cache = get_metadata_cache() if use_cache else None
+        if cache is None:
+            return DataProcessor._extract_metadata(file_path)
+        key = cache.key_for(file_path)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+        metadata = DataProcessor._extract_metadata(file_path)
+        cache.put(key, metadata)
+        return metadata.model_copy(deep=True)
+
+    @staticmethod
+    def _extract_metadata(file_path: str) -> DatasetMetadata:
         file_ext = os.path.splitext(file_path)[1].lower()
 
         if file_ext == '.mat':
@@ -319,24 +783,22 @@ class DataProcessor:
             return DataProcessor._process_h5ad_file(file_path)
 
         try:
-            if file_ext == '.tsv':
-                df = pd.read_csv(file_path, sep='\t')
-            elif file_ext == '.csv':
-                df = pd.read_csv(file_path)
-            elif file_ext in ('.xlsx', '.xls', '.xlsm', '.ods'):
-                df = pd.read_excel(file_path)
-            elif file_ext == '.json':
+            if file_ext in ('.csv', '.tsv', '.txt'):
+                return DataProcessor._process_delimited_file(file_path, file_ext)
+            if file_ext in ('.xlsx', '.xls', '.xlsm', '.ods'):
+                return DataProcessor._process_excel_file(file_path, file_ext)
+            if file_ext == '.parquet':
+                return DataProcessor._process_parquet_file(file_path)
+            if file_ext in ('.jsonl', '.ndjson'):
+                with pd.read_json(file_path, lines=True, chunksize=CHUNK_ROWS) as reader:
+                    profile, _ = _profile_chunks(reader)
+                return profile.to_metadata(file_path, file_ext.lstrip('.'))
+            if file_ext == '.json':
                 df = pd.read_json(file_path)
-            elif file_ext in ('.jsonl', '.ndjson'):
-                df = pd.read_json(file_path, lines=True)
-            elif file_ext == '.parquet':
-                df = pd.read_parquet(file_path)
             elif file_ext == '.feather':
                 df = pd.read_feather(file_path)
             elif file_ext in ('.pickle', '.pkl'):
                 df = pd.read_pickle(file_path)
-            elif file_ext == '.txt':
-                df = pd.read_csv(file_path, sep=None, engine='python')
             elif file_ext == '.sas7bdat':
                 df = pd.read_sas(file_path)
             elif file_ext == '.sav':
@@ -355,24 +817,5 @@ class DataProcessor:
         except Exception as e:
             raise ValueError(f"Failed to read file: {e}")
 
-        columns_metadata = []
-        for col in df.columns:
-            # Get a sample of non-null values
-            sample_vals = df[col].dropna().head(5).tolist()
-
-            columns_metadata.append(ColumnMetadata(
-                name=str(col),
-                dtype=str(df[col].dtype),
-                sample_values=sample_vals,
-                null_count=int(df[col].isnull().sum()),
-                unique_count=int(df[col].nunique())
-            ))
-
-        return DatasetMetadata(
-            filename=os.path.basename(file_path),
-            file_format=file_ext.lstrip('.'),
-            file_size_bytes=os.path.getsize(file_path),
-            total_rows=len(df),
-            total_columns=len(df.columns),
-            columns=columns_metadata
-        )
+        profile, _ = _profile_chunks([df])
+        return profile.to_metadata(file_path, file_ext.lstrip('.'), total_rows=len(df))
@@ -16,8 +16,16 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional, Tuple
 
+from ..foundation.metrics import counter
+
 logger = logging.getLogger(__name__)
 
+_CACHE_REQUESTS = counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result.",
+    ("cache", "result"),
+)
+
 
 class LRUCache:
     """Thread-safe LRU cache implementation for in-memory caching."""
@@ -204,6 +212,7 @@ class LLMCache:
             if time.time() - cached["timestamp"] < self.ttl_seconds:
                 logger.debug(f"L1 cache hit for key {cache_key[:8]}...")
                 self.total_saved_calls += 1
+                _CACHE_REQUESTS.labels("llm_response", "hit_memory").inc()
                 return cached["response"]
 
         # Check L2 persistent cache
@@ -214,9 +223,11 @@ class LLMCache:
                 self.memory_cache.set(cache_key, {"response": cached, "timestamp": time.time()})
                 logger.debug(f"L2 cache hit for key {cache_key[:8]}...")
                 self.total_saved_calls += 1
+                _CACHE_REQUESTS.labels("llm_response", "hit_persistent").inc()
                 return cached
 
         logger.debug(f"Cache miss for key {cache_key[:8]}...")
+        _CACHE_REQUESTS.labels("llm_response", "miss").inc()
         return None
 
     def _get_from_persistent(self, cache_key: str) -> Optional[str]:
@@ -17,6 +17,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Union
 
+from ..cache.lru_store import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 
@@ -113,6 +115,7 @@ class UnifiedCache:
 
         # Thread safety
         self.lock = threading.RLock()
+        self._flights = SingleFlight()
 
         # Statistics
         self.stats = defaultdict(int)
@@ -360,13 +363,23 @@ class UnifiedCache:
         if value is not None:
             return value
 
-        # Compute value
-        value = compute_func(**kwargs)
+        def _compute() -> Any:
+            # A concurrent caller may have filled the key while we waited.
+            cache_key = self._generate_key(namespace, key)
+            with self.lock:
+                entry = self.l1_cache.get(cache_key) or self.l2_cache.get(cache_key)
+                if entry is not None and not entry.is_expired():
+                    return entry.value
+
+            # Compute value
+            computed = compute_func(**kwargs)
 
-        # Cache the result
-        self.set(key, value, namespace, ttl)
+            # Cache the result
+            self.set(key, computed, namespace, ttl)
+            return computed
 
-        return value
+        # Concurrent misses on the same key share one computation
+        return self._flights.do((namespace, key), _compute)
 
     def invalidate(self, key: str, namespace: str = "default"):
         """
@@ -6,7 +6,7 @@ from .artifact_preflight import (
     ArtifactPreflightService,
     TaskArtifactContractSnapshot,
 )
-from .status_resolver import PlanStatusResolver
+from .status_resolver import IncrementalPlanStatusResolver, PlanStatusResolver
 from .plan_models import PlanNode, PlanTree, PlanSummary
 from .plan_executor import (
     ExecutionConfig,
@@ -20,6 +20,7 @@ from .similarity_matcher import (
     SimpleSimilarityMatcher,
     LLMSimilarityMatcher,
     CachedSimilarityMatcher,
+    EmbeddingSimilarityMatcher,
 )
 from .tree_simplifier import TreeSimplifier, simplify_plan, visualize_plan
 
@@ -33,6 +34,7 @@ __all__ = [
     "ArtifactPreflightService",
     "TaskArtifactContractSnapshot",
     "PlanStatusResolver",
+    "IncrementalPlanStatusResolver",
     # Executor
     "PlanExecutor",
     "ExecutionConfig",
@@ -46,6 +48,7 @@ __all__ = [
     "SimpleSimilarityMatcher",
     "LLMSimilarityMatcher",
     "CachedSimilarityMatcher",
+    "EmbeddingSimilarityMatcher",
     "simplify_plan",
     "visualize_plan",
 ]
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import atexit
 import json
+import logging
 import os
 import re
 import shutil
 import tempfile
+import threading
 import time
 import uuid
 import fcntl
@@ -16,6 +19,8 @@ from .artifact_validation import artifact_entry_is_valid, validate_artifact
 
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
 _ARTIFACT_SPECS: Dict[str, tuple[str, str]] = {
     "general.evidence_md": ("general", "evidence.md"),
     "general.references_bib": ("general", "references.bib"),
@@ -242,23 +247,168 @@ def artifact_manifest_path(plan_id: int, session_id: Optional[str] = None) -> Pa
     return canonical_plan_root(plan_id, session_id) / "artifacts_manifest.json"
 
 
+_MANIFEST_RESERVED_KEYS = frozenset({"plan_id", "artifacts", "version"})
+_export_lock = threading.Lock()
+_exported_versions: Dict[str, int] = {}
+# JSON exports owed by save_artifact_manifest: path -> (plan_id, session_id).
+_pending_exports: Dict[str, tuple[int, Optional[str]]] = {}
+
+
+def _manifest_session_key(session_id: Optional[str]) -> str:
+    return str(session_id or "")
+
+
+def _read_manifest_json(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def _split_manifest(payload: Dict[str, Any]) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    fields = {k: v for k, v in payload.items() if k not in _MANIFEST_RESERVED_KEYS}
+    artifacts = payload.get("artifacts")
+    return fields, artifacts if isinstance(artifacts, dict) else {}
+
+
+def _write_manifest_json(path: Path, payload: Dict[str, Any], *, fsync: bool) -> None:
+    tmp_name = f".{path.name}.{uuid.uuid4().hex}.tmp"
+    fd, tmp_path = tempfile.mkstemp(prefix=tmp_name, dir=str(path.parent), text=True)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            json.dump(payload, tmp_file, ensure_ascii=False, indent=2)
+            tmp_file.write("\n")
+            if fsync:
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        try:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
 def load_artifact_manifest(plan_id: int, session_id: Optional[str] = None) -> Dict[str, Any]:
+    """Load the artifact manifest of a plan.
+
+    Plans with a database keep the manifest there, one row per alias; a
+    legacy ``artifacts_manifest.json`` is imported the first time it is read.
+    Plans without a database fall back to the JSON file alone.
+    """
+    from app.repository.plan_storage import load_artifact_manifest_record, upsert_artifact_manifest
+
+    key = _manifest_session_key(session_id)
+    record = load_artifact_manifest_record(plan_id, key)
     path = artifact_manifest_path(plan_id, session_id)
-    if path.exists():
-        try:
-            payload = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            payload = {}
-    else:
-        payload = {}
-    if not isinstance(payload, dict):
-        payload = {}
-    payload.setdefault("plan_id", plan_id)
-    payload.setdefault("artifacts", {})
+    if record is not None and record["version"] == 0 and path.exists():
+        upsert_artifact_manifest(plan_id, key, legacy=lambda: _split_manifest(_read_manifest_json(path)))
+        record = load_artifact_manifest_record(plan_id, key)
+    if record is None:
+        payload = _read_manifest_json(path)
+        payload.setdefault("plan_id", plan_id)
+        payload.setdefault("artifacts", {})
+        return payload
+    payload = dict(record["fields"])
+    payload["plan_id"] = plan_id
+    payload["artifacts"] = record["artifacts"]
+    payload["version"] = record["version"]
     return payload
 
 
+def artifact_manifest_version(plan_id: int, session_id: Optional[str] = None) -> int:
+    """Monotonic manifest version; 0 when nothing is stored in the plan database."""
+    from app.repository.plan_storage import get_artifact_manifest_version
+
+    return get_artifact_manifest_version(plan_id, _manifest_session_key(session_id)) or 0
+
+
+def artifact_manifest_is_current(
+    plan_id: int, manifest: Dict[str, Any], session_id: Optional[str] = None
+) -> bool:
+    """Whether ``manifest`` still carries the stored version (a one-row lookup)."""
+    return artifact_manifest_version(plan_id, session_id) == int(manifest.get("version") or 0)
+
+
+def export_artifact_manifest(plan_id: int, session_id: Optional[str] = None) -> Path:
+    """Mirror the stored manifest to ``artifacts_manifest.json``.
+
+    Agents and older tooling read the JSON file; it is rewritten only when
+    this process has not already exported the same or a newer version.
+    """
+    path = artifact_manifest_path(plan_id, session_id)
+    manifest = load_artifact_manifest(plan_id, session_id)
+    version = int(manifest.get("version") or 0)
+    with _export_lock:
+        if version and _exported_versions.get(str(path), 0) >= version and path.exists():
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_manifest_json(path, manifest, fsync=False)
+        _exported_versions[str(path)] = version
+    return path
+
+
+def flush_artifact_manifest_exports(plan_id: Optional[int] = None) -> List[Path]:
+    """Write the JSON exports deferred by :func:`save_artifact_manifest`.
+
+    Limited to ``plan_id`` when given.  Several saves between flushes cost a
+    single export of the latest version.
+    """
+    with _export_lock:
+        due = [
+            (path, target)
+            for path, target in _pending_exports.items()
+            if plan_id is None or target[0] == plan_id
+        ]
+        for path, _target in due:
+            _pending_exports.pop(path, None)
+    exported: List[Path] = []
+    for _path, (pid, sid) in due:
+        try:
+            exported.append(export_artifact_manifest(pid, sid))
+        except Exception as exc:
+            # The database copy stays authoritative; the mirror is best effort.
+            logger.warning("Failed to export artifact manifest of plan %s: %s", pid, exc)
+    return exported
+
+
+atexit.register(flush_artifact_manifest_exports)
+
+
 def save_artifact_manifest(plan_id: int, manifest: Dict[str, Any], session_id: Optional[str] = None) -> Path:
+    """Merge ``manifest`` into the stored manifest and schedule the JSON export.
+
+    Only artifact entries that changed are written.  The resulting version is
+    stored back into ``manifest["version"]``.  The JSON mirror is written by
+    the next :func:`flush_artifact_manifest_exports`, so a burst of saves is
+    exported once.
+    """
+    from app.repository.plan_storage import upsert_artifact_manifest
+
+    path = artifact_manifest_path(plan_id, session_id)
+    fields, artifacts = _split_manifest(manifest)
+    result = upsert_artifact_manifest(
+        plan_id,
+        _manifest_session_key(session_id),
+        fields=fields,
+        artifacts=artifacts,
+        legacy=lambda: _split_manifest(_read_manifest_json(path)),
+    )
+    if result is None:
+        return _save_manifest_json(plan_id, manifest, session_id)
+    version, changed = result
+    manifest["version"] = version
+    if changed or not path.exists():
+        with _export_lock:
+            _pending_exports[str(path)] = (plan_id, session_id)
+    return path
+
+
+def _save_manifest_json(plan_id: int, manifest: Dict[str, Any], session_id: Optional[str]) -> Path:
     path = artifact_manifest_path(plan_id, session_id)
     path.parent.mkdir(parents=True, exist_ok=True)
     lock_path = path.with_suffix(path.suffix + ".lock")
@@ -268,31 +418,10 @@ def save_artifact_manifest(plan_id: int, manifest: Dict[str, Any], session_id: O
             existing = load_artifact_manifest(plan_id, session_id)
             merged = dict(existing)
             merged.update({k: v for k, v in manifest.items() if k != "artifacts"})
-            raw_existing_artifacts = existing.get("artifacts")
-            raw_incoming_artifacts = manifest.get("artifacts")
-            existing_artifacts: Dict[str, Any] = (
-                raw_existing_artifacts if isinstance(raw_existing_artifacts, dict) else {}
-            )
-            incoming_artifacts: Dict[str, Any] = (
-                raw_incoming_artifacts if isinstance(raw_incoming_artifacts, dict) else {}
-            )
+            existing_artifacts = _split_manifest(existing)[1]
+            incoming_artifacts = _split_manifest(manifest)[1]
             merged["artifacts"] = {**existing_artifacts, **incoming_artifacts}
-
-            tmp_name = f".{path.name}.{uuid.uuid4().hex}.tmp"
-            fd, tmp_path = tempfile.mkstemp(prefix=tmp_name, dir=str(path.parent), text=True)
-            try:
-                with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
-                    json.dump(merged, tmp_file, ensure_ascii=False, indent=2)
-                    tmp_file.write("\n")
-                    tmp_file.flush()
-                    os.fsync(tmp_file.fileno())
-                os.replace(tmp_path, path)
-            finally:
-                try:
-                    if os.path.exists(tmp_path):
-                        os.unlink(tmp_path)
-                except OSError:
-                    pass
+            _write_manifest_json(path, merged, fsync=True)
         finally:
             fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
     return path
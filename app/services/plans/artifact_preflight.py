@@ -69,6 +69,9 @@ class ArtifactPreflightResult(BaseModel):
         return f"Artifact preflight failed for plan #{self.plan_id}: {'; '.join(messages)}{suffix}"
 
 
+ContractWithIssues = Tuple[TaskArtifactContractSnapshot, List[ArtifactPreflightIssue]]
+
+
 class ArtifactPreflightService:
     def validate_plan(
         self,
@@ -79,18 +82,46 @@ class ArtifactPreflightService:
         manifest: Optional[Dict[str, Any]] = None,
         session_id: Optional[str] = None,
     ) -> ArtifactPreflightResult:
-        selected_task_ids = self._select_task_ids(tree, task_ids)
         manifest = manifest if isinstance(manifest, dict) else load_artifact_manifest(plan_id, session_id)
+        contracts = self.build_task_contracts(plan_id, tree, task_ids=task_ids, session_id=session_id)
+        return self.validate_contracts(plan_id, contracts, manifest=manifest, session_id=session_id)
+
+    def build_task_contracts(
+        self,
+        plan_id: int,
+        tree: PlanTree,
+        *,
+        task_ids: Optional[Iterable[int]] = None,
+        session_id: Optional[str] = None,
+    ) -> List[ContractWithIssues]:
+        """Per-task contract snapshots; these do not depend on the manifest."""
+        return [
+            self._build_contract_snapshot(plan_id, tree.nodes[task_id], session_id)
+            for task_id in self._select_task_ids(tree, task_ids)
+        ]
+
+    def validate_contracts(
+        self,
+        plan_id: int,
+        contracts: Iterable[ContractWithIssues],
+        *,
+        manifest: Dict[str, Any],
+        session_id: Optional[str] = None,
+        manifest_resolved: Optional[Dict[str, str]] = None,
+    ) -> ArtifactPreflightResult:
+        """Cross-task checks over prebuilt contracts.
 
+        ``manifest_resolved`` lets callers that track manifest changes pass
+        alias resolutions they already hold instead of re-resolving (and
+        re-validating) every alias against the manifest.
+        """
         task_contracts: List[TaskArtifactContractSnapshot] = []
         errors: List[ArtifactPreflightIssue] = []
         warnings: List[ArtifactPreflightIssue] = []
         publisher_map: Dict[str, List[int]] = {}
         consumer_map: Dict[str, List[int]] = {}
-        selected_nodes = [tree.nodes[task_id] for task_id in selected_task_ids]
 
-        for node in selected_nodes:
-            snapshot, snapshot_issues = self._build_contract_snapshot(plan_id, node, session_id)
+        for snapshot, snapshot_issues in contracts:
             task_contracts.append(snapshot)
             for issue in snapshot_issues:
                 if issue.severity == "error":
@@ -98,12 +129,13 @@ class ArtifactPreflightService:
                 else:
                     warnings.append(issue)
             for alias in snapshot.requires:
-                consumer_map.setdefault(alias, []).append(node.id)
+                consumer_map.setdefault(alias, []).append(snapshot.task_id)
             for alias in snapshot.publishes:
-                publisher_map.setdefault(alias, []).append(node.id)
+                publisher_map.setdefault(alias, []).append(snapshot.task_id)
 
-        aliases_to_resolve = set(consumer_map) | set(publisher_map)
-        manifest_resolved = resolve_manifest_aliases(manifest, aliases_to_resolve)
+        if manifest_resolved is None:
+            aliases_to_resolve = set(consumer_map) | set(publisher_map)
+            manifest_resolved = resolve_manifest_aliases(manifest, aliases_to_resolve)
 
         for alias, publishers in sorted(publisher_map.items()):
             if len(publishers) <= 1:
@@ -12,6 +12,7 @@ from app.repository.plan_repository import PlanRepository
 from .artifact_contracts import (
     artifact_path_matches_alias,
     canonical_plan_root,
+    flush_artifact_manifest_exports,
     load_artifact_manifest,
     publish_artifact,
     save_artifact_manifest,
@@ -428,6 +429,7 @@ class AuditRepairLoopService:
         if not published:
             return
         save_artifact_manifest(plan_id, manifest, effective_session_id)
+        flush_artifact_manifest_exports(plan_id)
         metadata = self._payload_metadata(payload)
         metadata["repair_manifest_publish"] = [
             {"alias": entry.get("alias"), "path": entry.get("path"), "producer_task_id": entry.get("producer_task_id")}
@@ -162,31 +162,92 @@ def _extract_artifacts_from_instruction(text: str) -> Tuple[List[str], List[str]
     return requires, publishes
 
 
-def _would_create_cycle(tree: PlanTree, producer_id: int, consumer_id: int) -> bool:
-    """Check if adding consumer -> producer dependency would create a cycle.
+class _DependencyReachability:
+    """Transitive dependency reachability, kept as one bitset per task.
 
-    Returns True if *consumer_id* is reachable from *producer_id* via existing
-    dependencies (meaning producer already depends on consumer, directly or
-    transitively).
+    Bit ``j`` of ``_reach[i]`` is set when task ``j`` depends, directly or
+    transitively, on task ``i``; every task reaches itself.  The index is
+    built once per enrichment pass with a single reverse-topological sweep
+    and updated in place as edges are injected.
     """
-    visited: Set[int] = set()
-    stack = [producer_id]
-
-    while stack:
-        current = stack.pop()
-        if current == consumer_id:
-            return True
-        if current in visited:
-            continue
-        visited.add(current)
-        node = tree.nodes.get(current)
-        if node is None:
-            continue
-        for dep_id in (node.dependencies or []):
-            if dep_id not in visited:
-                stack.append(dep_id)
 
-    return False
+    def __init__(self, tree: PlanTree) -> None:
+        self._bit: Dict[int, int] = {task_id: 1 << index for index, task_id in enumerate(tree.nodes)}
+        dependents: Dict[int, Set[int]] = {task_id: set() for task_id in tree.nodes}
+        for node in tree.iter_nodes():
+            for dep_id in node.dependencies or []:
+                if dep_id in dependents:
+                    dependents[dep_id].add(node.id)
+
+        indegree: Dict[int, int] = {task_id: 0 for task_id in tree.nodes}
+        for consumers in dependents.values():
+            for consumer_id in consumers:
+                indegree[consumer_id] += 1
+        order = [task_id for task_id, degree in indegree.items() if degree == 0]
+        for task_id in order:  # grows while iterating (Kahn's algorithm)
+            for consumer_id in dependents[task_id]:
+                indegree[consumer_id] -= 1
+                if indegree[consumer_id] == 0:
+                    order.append(consumer_id)
+
+        self._reach: Dict[int, int] = {}
+        if len(order) < len(indegree):
+            # Tasks on or below a dependency cycle never reach in-degree
+            # zero; their descendants are all such tasks too, so walk each.
+            ordered = set(order)
+            for task_id in indegree:
+                if task_id not in ordered:
+                    self._reach[task_id] = self._walk(task_id, dependents)
+        for task_id in reversed(order):
+            reach = self._bit[task_id]
+            for consumer_id in dependents[task_id]:
+                reach |= self._reach[consumer_id]
+            self._reach[task_id] = reach
+
+    def _walk(self, start: int, dependents: Dict[int, Set[int]]) -> int:
+        reach = 0
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            bit = self._bit[current]
+            if reach & bit:
+                continue
+            reach |= bit
+            stack.extend(dependents[current])
+        return reach
+
+    def reaches(self, src: int, dst: int) -> bool:
+        """True if ``dst`` depends on ``src``, directly or transitively."""
+        return bool(self._reach.get(src, 0) & self._bit.get(dst, 0))
+
+    def would_create_cycle(self, producer_id: int, consumer_id: int) -> bool:
+        """Whether making *consumer_id* depend on *producer_id* closes a cycle.
+
+        That is the case when the producer already depends on the consumer,
+        directly or transitively.
+        """
+        return producer_id == consumer_id or self.reaches(consumer_id, producer_id)
+
+    def add_dependency(self, consumer_id: int, producer_id: int) -> None:
+        """Record the edge *consumer_id* -> *producer_id* just injected."""
+        producer_bit = self._bit.get(producer_id)
+        gained = self._reach.get(consumer_id)
+        if producer_bit is None or gained is None:
+            return
+        for task_id, reach in self._reach.items():
+            if reach & producer_bit:
+                self._reach[task_id] = reach | gained
+
+    def frontier(self, task_ids: List[int]) -> List[int]:
+        """Members of *task_ids* that no other member depends on."""
+        mask = 0
+        for task_id in task_ids:
+            mask |= self._bit.get(task_id, 0)
+        return [
+            task_id
+            for task_id in task_ids
+            if not self._reach.get(task_id, 0) & mask & ~self._bit.get(task_id, 0)
+        ]
 
 
 def _strip_namespace(alias: str) -> str:
@@ -404,6 +465,7 @@ def _enrich_impl(tree: PlanTree) -> EnrichmentResult:
     _resolve_fuzzy_aliases(tree, producer_map, consumer_map, ambiguous)
 
     # Step 2: Inject missing dependency edges
+    reachability = _DependencyReachability(tree)
     for alias, consumers in consumer_map.items():
         if alias in ambiguous or alias not in producer_map:
             continue
@@ -419,7 +481,7 @@ def _enrich_impl(tree: PlanTree) -> EnrichmentResult:
                 continue  # Already exists — idempotent
 
             # Cycle check: verify consumer is not reachable from producer
-            if _would_create_cycle(tree, producer_id, consumer_id):
+            if reachability.would_create_cycle(producer_id, consumer_id):
                 edge = EnrichmentEdge(consumer_id, producer_id, alias)
                 result.skipped_cycle_edges.append(edge)
                 logger.info(
@@ -432,6 +494,7 @@ def _enrich_impl(tree: PlanTree) -> EnrichmentResult:
 
             # Inject the edge
             consumer_node.dependencies.append(producer_id)
+            reachability.add_dependency(consumer_id, producer_id)
             edge = EnrichmentEdge(consumer_id, producer_id, alias)
             result.added_edges.append(edge)
             logger.info(
@@ -444,7 +507,7 @@ def _enrich_impl(tree: PlanTree) -> EnrichmentResult:
     # Step 3: Role-based structural enrichment — identify task roles
     # (PARALLEL_SHARD, AGGREGATOR, FINISHER, PIPELINE_STEP) and inject
     # missing dependency edges based on sibling frontier analysis.
-    _enrich_structural(tree, result)
+    _enrich_structural(tree, result, reachability)
 
     if not result.added_edges:
         logger.info("No implicit dependencies found during enrichment.")
@@ -477,8 +540,12 @@ _SCOPE_GLOBAL_KWS = ("全文", "全局", "整体", "最终版", "full text", "gl
 _SCOPE_PARENT_KWS = ("统一", "整合各章节", "当前部分", "本节", "this section")
 
 
-def _infer_role(node: PlanNode, siblings: List[PlanNode]) -> str:
-    """Infer a task's structural role from its title and instruction."""
+def _infer_role(node: PlanNode, shared_action_words: Set[str]) -> str:
+    """Infer a task's structural role from its title and instruction.
+
+    *shared_action_words* are the action words found in the titles of at
+    least two siblings (see :func:`_shared_action_words`).
+    """
     text = (node.name or "") + " " + (node.instruction or "")[:300]
 
     if any(kw in text for kw in _FINISHER_KWS):
@@ -487,7 +554,8 @@ def _infer_role(node: PlanNode, siblings: List[PlanNode]) -> str:
         return "AGGREGATOR"
 
     # Parallel shard detection: same action template as siblings, different topic
-    if siblings and _looks_like_parallel_shard(node, siblings):
+    title = node.name or ""
+    if any(word in title for word in shared_action_words):
         return "PARALLEL_SHARD"
 
     return "UNKNOWN"
@@ -503,65 +571,48 @@ def _infer_scope(node: PlanNode) -> str:
     return "LOCAL"
 
 
-def _looks_like_parallel_shard(node: PlanNode, siblings: List[PlanNode]) -> bool:
-    """Check if node shares an action template with siblings (different topic)."""
-    title = node.name or ""
-    matching = 0
-    for sib in siblings:
-        sib_title = sib.name or ""
-        if any(w in title and w in sib_title for w in _PARALLEL_ACTION_WORDS):
-            matching += 1
-    return matching >= 1
+def _shared_action_words(siblings: List[PlanNode]) -> Set[str]:
+    """Action words appearing in the titles of two or more siblings.
+
+    A task whose title contains one of them shares an action template with
+    a sibling (different topic), which marks it as a parallel shard.
+    """
+    seen: Set[str] = set()
+    shared: Set[str] = set()
+    for sibling in siblings:
+        title = sibling.name or ""
+        for word in _PARALLEL_ACTION_WORDS:
+            if word in title:
+                if word in seen:
+                    shared.add(word)
+                seen.add(word)
+    return shared
 
 
 def _sibling_frontier(
     node: PlanNode,
     siblings: List[PlanNode],
-    tree: PlanTree,
+    reachability: _DependencyReachability,
 ) -> List[PlanNode]:
     """Compute the frontier: preceding siblings not dominated by another preceding sibling.
 
     A sibling A is "dominated" if there exists another preceding sibling B
     such that A → B is reachable (A's output flows through B).
     """
-    prev = [s for s in siblings if (getattr(s, "position", 0) or 0) < (getattr(node, "position", 0) or 0)]
+    position = getattr(node, "position", 0) or 0
+    prev = [s for s in siblings if (getattr(s, "position", 0) or 0) < position]
     if not prev:
         return []
 
-    prev_ids = {s.id for s in prev}
-    frontier = []
-    for a in prev:
-        dominated = False
-        for b in prev:
-            if a.id == b.id:
-                continue
-            if _has_path(tree, a.id, b.id):
-                dominated = True
-                break
-        if not dominated:
-            frontier.append(a)
-    return frontier
-
-
-def _has_path(tree: PlanTree, src: int, dst: int) -> bool:
-    """BFS check: is dst reachable from src via dependencies?"""
-    visited: Set[int] = set()
-    queue = [src]
-    while queue:
-        current = queue.pop(0)
-        if current == dst:
-            return True
-        if current in visited:
-            continue
-        visited.add(current)
-        # Follow forward edges: find nodes that depend on current
-        for node in tree.iter_nodes():
-            if current in (node.dependencies or []) and node.id not in visited:
-                queue.append(node.id)
-    return False
+    frontier_ids = set(reachability.frontier([s.id for s in prev]))
+    return [s for s in prev if s.id in frontier_ids]
 
 
-def _enrich_structural(tree: PlanTree, result: EnrichmentResult) -> None:
+def _enrich_structural(
+    tree: PlanTree,
+    result: EnrichmentResult,
+    reachability: Optional[_DependencyReachability] = None,
+) -> None:
     """Role-based structural enrichment using frontier analysis.
 
     1. Group leaf tasks by parent
@@ -570,6 +621,9 @@ def _enrich_structural(tree: PlanTree, result: EnrichmentResult) -> None:
     4. For FINISHER tasks: inject deps on the frontier (typically the preceding sibling)
     5. Parallel shards are never wired to each other
     """
+    if reachability is None:
+        reachability = _DependencyReachability(tree)
+
     # Group leaf children by parent
     parent_children: Dict[Optional[int], List[PlanNode]] = {}
     for node in tree.iter_nodes():
@@ -584,10 +638,10 @@ def _enrich_structural(tree: PlanTree, result: EnrichmentResult) -> None:
         children.sort(key=lambda n: (getattr(n, "position", 0) or 0, n.id))
 
         # Infer roles
-        roles: Dict[int, str] = {}
-        for child in children:
-            siblings = [c for c in children if c.id != child.id]
-            roles[child.id] = _infer_role(child, siblings)
+        shared_action_words = _shared_action_words(children)
+        roles: Dict[int, str] = {
+            child.id: _infer_role(child, shared_action_words) for child in children
+        }
 
         sibling_ids = {n.id for n in children}
 
@@ -605,7 +659,7 @@ def _enrich_structural(tree: PlanTree, result: EnrichmentResult) -> None:
             if has_sibling_dep:
                 continue  # Already has at least one sibling dependency
 
-            frontier = _sibling_frontier(child, children, tree)
+            frontier = _sibling_frontier(child, children, reachability)
             if not frontier:
                 continue
 
@@ -622,10 +676,11 @@ def _enrich_structural(tree: PlanTree, result: EnrichmentResult) -> None:
                     if has_aggregator_in_frontier:
                         continue
 
-                if _would_create_cycle(tree, upstream.id, child.id):
+                if reachability.would_create_cycle(upstream.id, child.id):
                     continue
 
                 child.dependencies.append(upstream.id)
+                reachability.add_dependency(child.id, upstream.id)
                 alias = f"__structural_{role.lower()}__"
                 edge = EnrichmentEdge(child.id, upstream.id, alias)
                 result.added_edges.append(edge)
@@ -16,6 +16,7 @@ from pydantic import BaseModel, Field, ValidationError
 
 from ...config.executor_config import ExecutorSettings, get_executor_settings
 from ...llm import LLMClient, NativeStreamResult, close_current_loop_async_client
+from ..background_loop import get_background_loop
 from ..tool_schemas import build_executor_tool_schemas, EXECUTOR_AVAILABLE_TOOLS
 from app.services.resources.resource_registry import resolve_resources
 from ..deep_think_agent import (
@@ -27,17 +28,20 @@ from ..deep_think_agent import (
 )
 from ..deliverables import get_deliverable_publisher
 from ..execution.tool_executor import ToolExecutionContext, UnifiedToolExecutor
+from ..foundation.metrics import histogram, timed
 from ..llm.llm_service import LLMService
 from ..skills import get_skills_loader
 from .artifact_contracts import (
     aliases_for_file_name,
     aliases_for_path_text,
+    artifact_manifest_is_current,
     artifact_manifest_path,
     canonical_artifact_path,
     canonicalize_artifact_alias,
     extend_contract_with_runtime_candidates,
     find_candidate_source_for_alias,
     find_runtime_candidates,
+    flush_artifact_manifest_exports,
     infer_artifact_contract,
     infer_artifact_namespace,
     load_artifact_manifest,
@@ -54,43 +58,54 @@ from .dependency_validation import (
     normalize_plan_dependencies,
 )
 from .plan_models import PlanNode, PlanTree
-from .status_resolver import PlanStatusResolver
+from .status_resolver import IncrementalPlanStatusResolver, PlanStatusResolver
 from .task_delegate_executor import CodeAgentTaskDelegateExecutor, TaskDelegationSpec
 from .task_verification import TaskVerificationService, VerificationFinalization
 
 logger = logging.getLogger(__name__)
 
+_STAGE_SECONDS = histogram(
+    "plan_executor_stage_seconds",
+    "Wall time of PlanExecutor stages.",
+    ("stage",),
+)
+
+
+# Bound on a bridged LLM call when the executor settings set no timeout.
+_DEFAULT_LLM_BRIDGE_TIMEOUT = 600.0
+
 
-def _run_coroutine_sync(coro: Any) -> Any:
-    """Run an async coroutine synchronously, handling nested event loops.
+def _run_coroutine_sync(coro: Any, *, timeout: Optional[float] = _DEFAULT_LLM_BRIDGE_TIMEOUT) -> Any:
+    """Run an async coroutine synchronously on the shared background loop.
 
-    When called from a thread that already has a running event loop (e.g. via
-    asyncio.to_thread), this spawns a new thread with its own event loop to
-    avoid "cannot run nested event loop" errors.  Any async LLM HTTP client
-    created inside that temporary loop is closed before ``asyncio.run`` closes
-    the loop, avoiding cross-loop reuse of httpx/anyio primitives.
+    The background loop lives for the whole process, so its LLM HTTP client
+    keeps connections alive across calls.  Coroutines that are themselves
+    running on that loop cannot block on it; for those nested calls a
+    temporary loop is used in a worker thread, and any async LLM client it
+    created is closed before ``asyncio.run`` closes the loop, avoiding
+    cross-loop reuse of httpx/anyio primitives.
+
+    Either way the coroutine is cancelled and ``TimeoutError`` raised once
+    ``timeout`` seconds pass, so a hung call cannot block the executor forever.
     """
     import contextvars
 
+    background = get_background_loop()
+    if not background.in_loop_thread():
+        return background.run(coro, timeout=timeout)
+
     async def _run_and_cleanup() -> Any:
         try:
-            return await coro
+            return await asyncio.wait_for(coro, timeout)
         finally:
             try:
                 await close_current_loop_async_client()
             except Exception as exc:
                 logger.warning("Failed to close temporary loop LLM client: %s", exc)
 
-    try:
-        running_loop = asyncio.get_running_loop()
-    except RuntimeError:
-        running_loop = None
-
-    if running_loop and running_loop.is_running():
-        ctx = contextvars.copy_context()
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            return executor.submit(lambda: ctx.run(asyncio.run, _run_and_cleanup())).result()
-    return asyncio.run(_run_and_cleanup())
+    ctx = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(lambda: ctx.run(asyncio.run, _run_and_cleanup())).result()
 
 
 def _log_job(level: str, message: str, metadata: Optional[Dict[str, Any]] = None) -> None:
@@ -934,7 +949,9 @@ class PlanExecutorLLMService:
             )
 
         # Bridge async → sync using the module-level helper.
-        result: NativeStreamResult = _run_coroutine_sync(_call())
+        result: NativeStreamResult = _run_coroutine_sync(
+            _call(), timeout=self._settings.timeout or _DEFAULT_LLM_BRIDGE_TIMEOUT
+        )
 
         # Convert NativeStreamResult → ExecutionResponse
         if result.tool_calls:
@@ -1045,6 +1062,20 @@ class PlanExecutor:
         plan_id: int,
         *,
         config: Optional[ExecutionConfig] = None,
+    ) -> ExecutionSummary:
+        self._await_plan_recovery(plan_id)
+        try:
+            return self._execute_plan(plan_id, config=config)
+        finally:
+            flush_artifact_manifest_exports(plan_id)
+            self._release_plan_recovery_mark(plan_id)
+
+    @timed(_STAGE_SECONDS, stage="execute_plan")
+    def _execute_plan(
+        self,
+        plan_id: int,
+        *,
+        config: Optional[ExecutionConfig] = None,
     ) -> ExecutionSummary:
         self._ensure_runtime_helpers()
         cfg = config or ExecutionConfig.from_settings(self._settings)
@@ -1123,6 +1154,13 @@ class PlanExecutor:
         _failed_or_skipped: set[int] = set()
         cfg.session_context["_artifact_registry"] = artifact_registry
         cfg.session_context["_artifact_manifest"] = self._get_artifact_manifest(plan_id, cfg.session_context)
+        # Resolve the whole plan once; later lookups only re-resolve the tasks
+        # touched by each completed task or manifest update.
+        cfg.session_context["_plan_state_resolver"] = self._status_resolver.incremental(
+            plan_id,
+            tree,
+            manifest=cfg.session_context["_artifact_manifest"],
+        )
 
         # Layer 3: Recovery attempt tracker per task
         recovery_attempts: Dict[int, int] = {}
@@ -1167,11 +1205,7 @@ class PlanExecutor:
         total_tasks = len(order)
         for idx, node in enumerate(order):
             # --- Layer 1: skip already-completed tasks (resume support) ---
-            plan_state_by_task = self._status_resolver.resolve_plan_states(
-                plan_id,
-                tree,
-                manifest=self._get_artifact_manifest(plan_id, cfg.session_context),
-            )
+            plan_state_by_task = self._resolve_plan_states(plan_id, tree, cfg.session_context)
             node_effective_status = str(
                 (plan_state_by_task.get(node.id) or {}).get("effective_status") or ""
             ).strip().lower()
@@ -1407,6 +1441,7 @@ class PlanExecutor:
                 except Exception as cb_err:
                     logger.warning("on_task_complete callback error: %s", cb_err)
 
+        cfg.session_context.pop("_plan_state_resolver", None)
         summary.finished_at = time.time()
 
         if summary.executed_task_ids:
@@ -1455,12 +1490,33 @@ class PlanExecutor:
         if task_id not in tree.nodes:
             raise ValueError(f"Task {task_id} not found in plan {plan_id}")
         node = tree.get_node(task_id)
-        return self._run_task(plan_id, node, tree, cfg)
+        self._await_plan_recovery(plan_id)
+        try:
+            return self._run_task(plan_id, node, tree, cfg)
+        finally:
+            flush_artifact_manifest_exports(plan_id)
+            self._release_plan_recovery_mark(plan_id)
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _await_plan_recovery(plan_id: int) -> None:
+        """Finish startup recovery of ``plan_id`` before its tasks are touched."""
+        from .plan_recovery import ensure_plan_recovered
+
+        ensure_plan_recovered(plan_id)
+
+    def _release_plan_recovery_mark(self, plan_id: int) -> None:
+        from ...repository.plan_repository import PlanRepository
+        from ...repository.plan_storage import clear_plan_recovery_if_idle
+
+        # Only the persistent repository marks plans in the recovery registry.
+        if isinstance(self._repo, PlanRepository):
+            clear_plan_recovery_if_idle(plan_id)
+
+    @timed(_STAGE_SECONDS, stage="run_task")
     def _run_task(
         self,
         plan_id: int,
@@ -1479,14 +1535,13 @@ class PlanExecutor:
             call_purpose="plan_task_execution",
         )
         try:
+            # Agents read artifacts_manifest.json; bring it up to date with
+            # the saves of earlier tasks before this one starts.
+            flush_artifact_manifest_exports(plan_id)
 
             parent = tree.nodes.get(node.parent_id) if node.parent_id else None
             dependencies = self._resolve_dependencies(tree, node)
-            plan_state_by_task = self._status_resolver.resolve_plan_states(
-                plan_id,
-                tree,
-                manifest=self._get_artifact_manifest(plan_id, config.session_context),
-            )
+            plan_state_by_task = self._resolve_plan_states(plan_id, tree, config.session_context)
 
             incomplete_deps = []
             dep_status_by_id: Dict[int, str] = {}
@@ -2404,6 +2459,7 @@ class PlanExecutor:
             getattr(self._settings, "plan_task_execution_backend", "internal") or "internal"
         ).strip().lower() == "external_agent"
 
+    @timed(_STAGE_SECONDS, stage="delegate")
     def _run_task_with_external_delegate(
         self,
         *,
@@ -2621,6 +2677,7 @@ class PlanExecutor:
             )
         return lines
 
+    @timed(_STAGE_SECONDS, stage="deep_think")
     def _run_task_with_deep_think(
         self,
         *,
@@ -3037,7 +3094,8 @@ class PlanExecutor:
                     user_query,
                     context=session_context,
                     task_context=task_context,
-                )
+                ),
+                task=True,
             )
 
             fallback_result = None
@@ -3226,8 +3284,13 @@ class PlanExecutor:
                 except Exception:  # pragma: no cover - defensive
                     pass
 
-    def _run_coroutine_sync(self, coro: Any) -> Any:
-        return _run_coroutine_sync(coro)
+    def _run_coroutine_sync(self, coro: Any, *, task: bool = False) -> Any:
+        """Bridge ``coro`` with the LLM-call timeout, or the agent-run one for ``task``."""
+        if task:
+            timeout = getattr(self._settings, "task_timeout", None) or ExecutorSettings.task_timeout
+        else:
+            timeout = getattr(self._settings, "timeout", None) or _DEFAULT_LLM_BRIDGE_TIMEOUT
+        return _run_coroutine_sync(coro, timeout=timeout)
 
     @staticmethod
     def _is_leaf_task(node: PlanNode, tree: PlanTree) -> bool:
@@ -3329,7 +3392,7 @@ class PlanExecutor:
                 draft_only=False,
             )
             if asyncio.iscoroutine(raw_result):
-                result = self._run_coroutine_sync(raw_result)
+                result = self._run_coroutine_sync(raw_result, task=True)
             else:
                 result = raw_result
 
@@ -3399,7 +3462,8 @@ class PlanExecutor:
                         repair_query,
                         context=repair_context,
                         task_context=task_context,
-                    )
+                    ),
+                    task=True,
                 )
             except Exception as exc:
                 logger.warning("Contract repair attempt failed for task %s: %s", node.id, exc)
@@ -3491,6 +3555,7 @@ class PlanExecutor:
         lines.append("Completion requires passing verification; similar filenames or prose claims are insufficient.")
         return "\n".join(lines)
 
+    @timed(_STAGE_SECONDS, stage="persist")
     def _persist_execution(
         self,
         plan_id: int,
@@ -3704,6 +3769,7 @@ class PlanExecutor:
 
         return normalized_payload
 
+    @timed(_STAGE_SECONDS, stage="materialize")
     def _materialize_finalization(
         self,
         plan_id: int,
@@ -3739,6 +3805,7 @@ class PlanExecutor:
         )
         return finalization, raw_response
 
+    @timed(_STAGE_SECONDS, stage="verify")
     def _finalize_task_execution(
         self,
         plan_id: int,
@@ -3864,17 +3931,38 @@ class PlanExecutor:
         session_context: Optional[Dict[str, Any]],
     ) -> Dict[str, Any]:
         manifest = None
+        session_id = session_context.get("session_id") if isinstance(session_context, dict) else None
         if isinstance(session_context, dict):
             manifest = session_context.get("_artifact_manifest")
-        if isinstance(manifest, dict) and int(manifest.get("plan_id") or plan_id) == plan_id:
+        if (
+            isinstance(manifest, dict)
+            and int(manifest.get("plan_id") or plan_id) == plan_id
+            and artifact_manifest_is_current(plan_id, manifest, session_id)
+        ):
+            # Only the version row is read while nobody else wrote the manifest.
             manifest.setdefault("artifacts", {})
             return manifest
-        session_id = session_context.get("session_id") if isinstance(session_context, dict) else None
         manifest = load_artifact_manifest(plan_id, session_id)
         if isinstance(session_context, dict):
             session_context["_artifact_manifest"] = manifest
         return manifest
 
+    def _resolve_plan_states(
+        self,
+        plan_id: int,
+        tree: PlanTree,
+        session_context: Optional[Dict[str, Any]],
+    ) -> Dict[int, Dict[str, Any]]:
+        manifest = self._get_artifact_manifest(plan_id, session_context)
+        incremental = session_context.get("_plan_state_resolver") if isinstance(session_context, dict) else None
+        if (
+            isinstance(incremental, IncrementalPlanStatusResolver)
+            and incremental.plan_id == plan_id
+            and incremental.tree is tree
+        ):
+            return incremental.states(manifest=manifest)
+        return self._status_resolver.resolve_plan_states(plan_id, tree, manifest=manifest)
+
     def _save_artifact_manifest(
         self,
         plan_id: int,
@@ -3882,7 +3970,11 @@ class PlanExecutor:
         session_context: Optional[Dict[str, Any]],
     ) -> None:
         session_id = session_context.get("session_id") if isinstance(session_context, dict) else None
+        previous_version = int(manifest.get("version") or 0)
         save_artifact_manifest(plan_id, manifest, session_id)
+        if int(manifest.get("version") or 0) > previous_version + 1:
+            # Another writer saved in between; its entries are only in the store.
+            manifest = load_artifact_manifest(plan_id, session_id)
         if isinstance(session_context, dict):
             session_context["_artifact_manifest"] = manifest
 
@@ -3905,11 +3997,7 @@ class PlanExecutor:
         allow_publish_contract_backfill: bool = False,
     ) -> bool:
         if state_by_task is None and tree is not None:
-            state_by_task = self._status_resolver.resolve_plan_states(
-                plan_id,
-                tree,
-                manifest=self._get_artifact_manifest(plan_id, session_context),
-            )
+            state_by_task = self._resolve_plan_states(plan_id, tree, session_context)
         if isinstance(state_by_task, dict):
             state = state_by_task.get(node.id) or {}
             effective_status = str(
@@ -4869,6 +4957,7 @@ class PlanExecutor:
                 directories.append(directory)
         return directories[:20]
 
+    @timed(_STAGE_SECONDS, stage="summary")
     def _generate_plan_summary(
         self,
         plan_id: int,
@@ -4931,6 +5020,7 @@ class PlanExecutor:
         except Exception as exc:
             raise RuntimeError("LLM plan summary generation failed.") from exc
 
+    @timed(_STAGE_SECONDS, stage="tool_call")
     def _execute_tool_call(
         self,
         tool_call: ToolCallRequest,
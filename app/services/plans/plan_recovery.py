@@ -0,0 +1,145 @@
+"""Background recovery of plans interrupted by a server restart.
+
+Only plans listed in the main-DB recovery registry (plans that had running
+jobs or in-progress tasks) are visited. Recovery runs off the event loop with
+bounded concurrency; request handlers touching a plan that is still pending
+recover it inline or wait briefly via :func:`ensure_plan_recovered`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from app.repository.plan_repository import recover_interrupted_plan
+from app.repository.plan_storage import list_plans_needing_recovery
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RECOVERY_CONCURRENCY = 4
+
+
+class PlanRecoveryPending(RuntimeError):
+    """Raised when a plan is still being recovered by another worker."""
+
+    def __init__(self, plan_id: int) -> None:
+        super().__init__(f"Plan {plan_id} is still being recovered after restart")
+        self.plan_id = plan_id
+
+
+class PlanRecoveryTracker:
+    """Tracks which plans still await startup recovery."""
+
+    def __init__(self, recover: Optional[Callable[[int], int]] = None) -> None:
+        self._recover = recover or recover_interrupted_plan
+        self._lock = threading.Lock()
+        self._pending: Dict[int, threading.Event] = {}
+        self._claimed: Set[int] = set()
+        self.recovered_tasks = 0
+        self.failed_plan_ids: List[int] = []
+
+    def schedule(self, plan_ids: Iterable[int]) -> None:
+        with self._lock:
+            for plan_id in plan_ids:
+                self._pending.setdefault(int(plan_id), threading.Event())
+
+    def pending_plan_ids(self) -> List[int]:
+        with self._lock:
+            return sorted(self._pending)
+
+    def is_recovered(self, plan_id: int) -> bool:
+        with self._lock:
+            return plan_id not in self._pending
+
+    def recover(self, plan_id: int) -> bool:
+        """Recover ``plan_id`` in the calling thread unless another worker has claimed it.
+
+        Returns True when the plan is recovered on return.
+        """
+        with self._lock:
+            event = self._pending.get(plan_id)
+            if event is None:
+                return True
+            if plan_id in self._claimed:
+                return False
+            self._claimed.add(plan_id)
+        try:
+            recovered = self._recover(plan_id)
+            if recovered:
+                logger.info(
+                    "Recovered %d interrupted task status(es) for plan %s after restart",
+                    recovered,
+                    plan_id,
+                )
+            with self._lock:
+                self.recovered_tasks += int(recovered or 0)
+        except Exception:
+            # The registry row is kept, so the next startup retries this plan;
+            # blocking its endpoints for the rest of this run would not help.
+            logger.warning("Failed to recover plan %s after restart", plan_id, exc_info=True)
+            with self._lock:
+                self.failed_plan_ids.append(plan_id)
+        finally:
+            with self._lock:
+                self._pending.pop(plan_id, None)
+                self._claimed.discard(plan_id)
+            event.set()
+        return True
+
+    def wait(self, plan_id: int, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            event = self._pending.get(plan_id)
+        if event is None:
+            return True
+        if self.recover(plan_id):
+            return True
+        return event.wait(timeout)
+
+    async def run(self, *, max_concurrency: int = DEFAULT_RECOVERY_CONCURRENCY) -> int:
+        """Recover every scheduled plan, at most ``max_concurrency`` at a time."""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _recover_one(plan_id: int) -> None:
+            async with semaphore:
+                if not self.is_recovered(plan_id):
+                    await asyncio.to_thread(self.recover, plan_id)
+
+        await asyncio.gather(*(_recover_one(plan_id) for plan_id in self.pending_plan_ids()))
+        return self.recovered_tasks
+
+
+_tracker: Optional[PlanRecoveryTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_plan_recovery_tracker() -> PlanRecoveryTracker:
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = PlanRecoveryTracker()
+    return _tracker
+
+
+def start_plan_recovery(
+    *, max_concurrency: int = DEFAULT_RECOVERY_CONCURRENCY
+) -> Optional["asyncio.Task[int]"]:
+    """Schedule registered plans and start recovering them in the background."""
+    tracker = get_plan_recovery_tracker()
+    plan_ids = list_plans_needing_recovery()
+    if not plan_ids:
+        return None
+    tracker.schedule(plan_ids)
+    logger.info("Recovering %d plan(s) with interrupted work in the background", len(plan_ids))
+    return asyncio.get_running_loop().create_task(
+        tracker.run(max_concurrency=max_concurrency),
+        name="plan-startup-recovery",
+    )
+
+
+def ensure_plan_recovered(plan_id: int, *, timeout: Optional[float] = None) -> None:
+    """Block until ``plan_id`` is recovered; raise :class:`PlanRecoveryPending` on timeout."""
+    if not get_plan_recovery_tracker().wait(plan_id, timeout):
+        raise PlanRecoveryPending(plan_id)
@@ -70,3 +70,29 @@ Return your decision in JSON:
 }}
 
 Return JSON only. Do not add extra text."""
+
+
+# =============================================================================
+# Batched Merge Decision (ambiguous candidate pairs)
+# =============================================================================
+
+BATCH_MERGE_DECISION_SYSTEM = """You are a task-planning expert. For each candidate pair of task nodes, decide whether the two tasks should be merged into one.
+
+Merge conditions:
+1. The two tasks are semantically identical or equivalent.
+2. No important information is lost after merging.
+3. Merging will not affect execution correctness.
+
+Be conservative. Only truly similar tasks should be merged. Judge every pair independently."""
+
+BATCH_MERGE_DECISION_USER = """Decide for each of the following candidate pairs whether the two nodes can be merged:
+
+{pairs_text}
+
+Return a JSON array with one decision per pair:
+[
+    {{"id1": <NODE_ID_1>, "id2": <NODE_ID_2>, "can_merge": true/false, "similarity": <0.0-1.0>, "reason": "<RATIONALE>"}},
+    ...
+]
+
+Return JSON only. Do not add extra text."""
@@ -6,11 +6,12 @@ LLM , task.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import re
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from .dag_models import DAGNode
 
@@ -284,11 +285,13 @@ class CachedSimilarityMatcher(SimilarityMatcher):
                     uncached_nodes.append(key)
 
         if uncached_nodes:
+            seen = {(p[0], p[1]) for p in cached_pairs}
             new_pairs = self.matcher.find_similar_pairs(nodes)
             for id1, id2, sim in new_pairs:
                 key = self._cache_key(id1, id2)
                 self._pair_cache[key] = sim
-                if key not in [self._cache_key(p[0], p[1]) for p in cached_pairs]:
+                if key not in seen:
+                    seen.add(key)
                     cached_pairs.append((id1, id2, sim))
 
         if len(self._pair_cache) > self.cache_size:
@@ -318,3 +321,223 @@ class CachedSimilarityMatcher(SimilarityMatcher):
                 del self._merge_cache[key]
 
         return result
+
+
+EmbedFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+class EmbeddingSimilarityMatcher(LLMSimilarityMatcher):
+    """
+    Embedding-blocked matcher that only asks the LLM about ambiguous pairs.
+
+    Name and instruction embeddings are computed once per distinct node
+    content (through the embeddings service, which has its own text cache).
+    Candidate pairs come from a thresholded product of the normalized
+    embedding matrix; pairs scoring at least ``accept_threshold`` are merged
+    without an LLM call and the remaining candidates are decided together in
+    one batched prompt.  Decisions are cached by the normalized content
+    hashes of both nodes, so after a merge only pairs involving the changed
+    node are looked at again.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        *,
+        accept_threshold: float = 0.95,
+        name_weight: float = 0.5,
+        embed: Optional[EmbedFn] = None,
+        use_llm: bool = True,
+        max_llm_pairs: int = 40,
+        block_size: int = 512,
+        cache_size: int = 10000,
+    ):
+        super().__init__(threshold=threshold)
+        self.accept_threshold = accept_threshold
+        self.name_weight = min(max(name_weight, 0.0), 1.0)
+        self.use_llm = use_llm
+        self.max_llm_pairs = max(1, max_llm_pairs)
+        self.block_size = max(1, block_size)
+        self.cache_size = cache_size
+        self._embed = embed
+        self._vectors: Dict[str, Any] = {}
+        self._decisions: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+
+    @staticmethod
+    def content_hash(node: DAGNode) -> str:
+        """Hash of the whitespace- and case-normalized name and instruction."""
+        name = " ".join((node.name or "").lower().split())
+        instruction = " ".join((node.instruction or "").lower().split())
+        return hashlib.sha1(f"{name}\n{instruction}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _decision_key(hash1: str, hash2: str) -> Tuple[str, str]:
+        return (hash1, hash2) if hash1 <= hash2 else (hash2, hash1)
+
+    def embed(self, texts: List[str]) -> Sequence[Sequence[float]]:
+        if self._embed is None:
+            from ..embeddings import get_embeddings_service
+
+            self._embed = get_embeddings_service().get_embeddings
+        return self._embed(texts)
+
+    def find_similar_pairs(
+        self, nodes: List[DAGNode]
+    ) -> List[Tuple[int, int, float]]:
+        """Embedding candidates, auto-accepted or decided by one batched LLM call."""
+        if len(nodes) < 2:
+            return []
+
+        hashes = [self.content_hash(node) for node in nodes]
+        try:
+            matrix = self._node_matrix(nodes, hashes)
+        except Exception as e:
+            logger.warning(f"Embedding similarity unavailable, falling back to name overlap: {e}")
+            return SimpleSimilarityMatcher(self.threshold).find_similar_pairs(nodes)
+
+        pending: List[Tuple[int, int, float]] = []
+        pairs: List[Tuple[int, int, float]] = []
+        for i, j, score in self._candidate_pairs(matrix):
+            key = self._decision_key(hashes[i], hashes[j])
+            decision = self._decisions.get(key)
+            if decision is None:
+                if hashes[i] == hashes[j] or score >= self.accept_threshold or not self.use_llm:
+                    decision = self._remember(key, True, score)
+                else:
+                    pending.append((i, j, score))
+                    continue
+            if decision[0]:
+                pairs.append((nodes[i].id, nodes[j].id, decision[1]))
+
+        for start in range(0, len(pending), self.max_llm_pairs):
+            chunk = pending[start : start + self.max_llm_pairs]
+            verdicts = self._decide_with_llm(nodes, chunk)
+            for i, j, score in chunk:
+                verdict = verdicts.get(self._cache_key(nodes[i].id, nodes[j].id))
+                if verdict is None:
+                    # Undecided pairs are not cached and will be asked again.
+                    continue
+                can_merge, similarity = verdict
+                decision = self._remember(
+                    self._decision_key(hashes[i], hashes[j]),
+                    can_merge and similarity >= self.threshold,
+                    similarity,
+                )
+                if decision[0]:
+                    pairs.append((nodes[i].id, nodes[j].id, decision[1]))
+
+        return pairs
+
+    def should_merge(self, node1: DAGNode, node2: DAGNode) -> bool:
+        """Cached decision for the pair; computed on demand when missing."""
+        key = self._decision_key(self.content_hash(node1), self.content_hash(node2))
+        decision = self._decisions.get(key)
+        if decision is None:
+            self.find_similar_pairs([node1, node2])
+            decision = self._decisions.get(key)
+        return bool(decision and decision[0])
+
+    @staticmethod
+    def _cache_key(id1: int, id2: int) -> Tuple[int, int]:
+        return (min(id1, id2), max(id1, id2))
+
+    def _remember(self, key: Tuple[str, str], can_merge: bool, score: float) -> Tuple[bool, float]:
+        decision = (bool(can_merge), float(score))
+        self._decisions[key] = decision
+        if len(self._decisions) > self.cache_size:
+            for stale in list(self._decisions)[: len(self._decisions) - self.cache_size]:
+                del self._decisions[stale]
+        return decision
+
+    def _node_matrix(self, nodes: List[DAGNode], hashes: List[str]) -> Any:
+        """Row-normalized ``[sqrt(w) * name | sqrt(1 - w) * instruction]`` vectors."""
+        import numpy as np
+
+        missing: Dict[str, DAGNode] = {}
+        for node, content_hash in zip(nodes, hashes):
+            if content_hash not in self._vectors:
+                missing.setdefault(content_hash, node)
+
+        if missing:
+            names = [node.name or "" for node in missing.values()]
+            instructions = [node.instruction or node.name or "" for node in missing.values()]
+            vectors = np.asarray(self.embed(names + instructions), dtype=np.float32)
+            if vectors.ndim != 2 or vectors.shape[0] != 2 * len(missing):
+                raise ValueError(f"expected {2 * len(missing)} embeddings, got shape {vectors.shape}")
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms > 0, norms, 1.0)
+            count = len(missing)
+            combined = np.hstack(
+                (
+                    vectors[:count] * np.sqrt(self.name_weight),
+                    vectors[count:] * np.sqrt(1.0 - self.name_weight),
+                )
+            )
+            for content_hash, row in zip(missing, combined):
+                self._vectors[content_hash] = row
+            if len(self._vectors) > self.cache_size:
+                for stale in list(self._vectors)[: len(self._vectors) - self.cache_size]:
+                    del self._vectors[stale]
+
+        return np.stack([self._vectors[content_hash] for content_hash in hashes])
+
+    def _candidate_pairs(self, matrix: Any) -> List[Tuple[int, int, float]]:
+        """Upper-triangle pairs whose weighted cosine is at least ``threshold``."""
+        import numpy as np
+
+        candidates: List[Tuple[int, int, float]] = []
+        count = matrix.shape[0]
+        for start in range(0, count, self.block_size):
+            scores = matrix[start : start + self.block_size] @ matrix.T
+            rows, cols = np.nonzero(scores >= self.threshold)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                i = start + row
+                if col > i:
+                    candidates.append((i, col, min(1.0, float(scores[row, col]))))
+        candidates.sort(key=lambda item: item[2], reverse=True)
+        return candidates
+
+    def _decide_with_llm(
+        self, nodes: List[DAGNode], pairs: List[Tuple[int, int, float]]
+    ) -> Dict[Tuple[int, int], Tuple[bool, float]]:
+        """Ask the LLM about ``pairs`` in one prompt; returns verdicts by id pair."""
+        from .prompts.merge_similarity import (
+            BATCH_MERGE_DECISION_SYSTEM,
+            BATCH_MERGE_DECISION_USER,
+        )
+
+        blocks = []
+        for i, j, score in pairs:
+            node1, node2 = nodes[i], nodes[j]
+            blocks.append(
+                f"Pair [{node1.id}] vs [{node2.id}] (embedding similarity {score:.2f})\n"
+                f"- [{node1.id}] {node1.name}: {(node1.instruction or '()')[:300]}\n"
+                f"- [{node2.id}] {node2.name}: {(node2.instruction or '()')[:300]}"
+            )
+        prompt = (
+            BATCH_MERGE_DECISION_SYSTEM
+            + "\n\n"
+            + BATCH_MERGE_DECISION_USER.format(pairs_text="\n\n".join(blocks))
+        )
+
+        verdicts: Dict[Tuple[int, int], Tuple[bool, float]] = {}
+        try:
+            result = self._parse_json(self.llm.chat(prompt))
+        except Exception as e:
+            logger.warning(f"LLM batched merge decision failed: {e}")
+            return verdicts
+
+        if not isinstance(result, list):
+            return verdicts
+        for item in result:
+            if not isinstance(item, dict):
+                continue
+            try:
+                id1, id2 = int(item["id1"]), int(item["id2"])
+                sim_val = item.get("similarity")
+                similarity = float(sim_val) if sim_val is not None else 0.0
+            except (KeyError, ValueError, TypeError) as e:
+                logger.debug(f"Skipping malformed merge decision {item}: {e}")
+                continue
+            verdicts[self._cache_key(id1, id2)] = (bool(item.get("can_merge", False)), similarity)
+        return verdicts
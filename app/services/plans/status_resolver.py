@@ -1,10 +1,24 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import json
-from typing import Any, Dict, List, Optional, Set
-
-from .artifact_contracts import canonical_artifact_path, load_artifact_manifest
-from .artifact_preflight import ArtifactPreflightIssue, ArtifactPreflightService
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .artifact_contracts import (
+    artifact_manifest_is_current,
+    canonical_artifact_path,
+    canonicalize_artifact_alias,
+    load_artifact_manifest,
+    resolve_manifest_aliases,
+)
+from .artifact_preflight import (
+    ArtifactPreflightIssue,
+    ArtifactPreflightService,
+    ContractWithIssues,
+    TaskArtifactContractSnapshot,
+)
 from .plan_models import PlanTree
 from .task_verification import TaskVerificationService
 
@@ -120,9 +134,53 @@ def _looks_like_success_text(value: Any) -> bool:
     return any(token in text for token in tokens)
 
 
+@dataclass
+class _ResolutionContext:
+    """Plan-wide inputs shared by every per-task resolution."""
+
+    plan_id: int
+    session_id: Optional[str]
+    contract_by_task: Dict[int, TaskArtifactContractSnapshot]
+    blocking_issue_map: Dict[int, List[ArtifactPreflightIssue]]
+    manifest_resolved_aliases: Dict[str, str]
+    manifest_artifacts: Dict[str, Any]
+    active_task_ids: Set[int] = field(default_factory=set)
+
+
+def _active_task_ids(snapshot: Optional[Dict[str, Any]]) -> Set[int]:
+    active_task_ids: Set[int] = set()
+    for x in (snapshot or {}).get("active_task_ids") or set():
+        try:
+            active_task_ids.add(int(x))
+        except (TypeError, ValueError):
+            pass
+    return active_task_ids
+
+
+def _manifest_artifacts(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    artifacts = manifest.get("artifacts")
+    return artifacts if isinstance(artifacts, dict) else {}
+
+
 class PlanStatusResolver:
     def __init__(self) -> None:
         self._artifact_preflight = ArtifactPreflightService()
+        # Stored manifests by (plan_id, session_id), reused while their
+        # version is current so repeated reads skip the full row load.
+        self._manifests: Dict[Tuple[int, Optional[str]], Dict[str, Any]] = {}
+
+    def _load_manifest(self, plan_id: int, session_id: Optional[str]) -> Dict[str, Any]:
+        key = (plan_id, session_id)
+        cached = self._manifests.get(key)
+        if cached is not None and artifact_manifest_is_current(plan_id, cached, session_id):
+            return cached
+        manifest = load_artifact_manifest(plan_id, session_id)
+        if manifest.get("version"):
+            self._manifests[key] = manifest
+        else:
+            # JSON-only manifests carry no version to validate a cached copy.
+            self._manifests.pop(key, None)
+        return manifest
 
     def resolve_plan_states(
         self,
@@ -133,24 +191,59 @@ class PlanStatusResolver:
         manifest: Optional[Dict[str, Any]] = None,
         session_id: Optional[str] = None,
     ) -> Dict[int, Dict[str, Any]]:
-        manifest_payload = manifest if isinstance(manifest, dict) else load_artifact_manifest(plan_id, session_id)
+        manifest_payload = manifest if isinstance(manifest, dict) else self._load_manifest(plan_id, session_id)
         preflight = self._artifact_preflight.validate_plan(
             plan_id,
             tree,
             manifest=manifest_payload,
             session_id=session_id,
         )
-        contract_by_task = {snapshot.task_id: snapshot for snapshot in preflight.task_contracts}
-        blocking_issue_map = self._group_blocking_issues(preflight.errors)
-        active_task_ids: Set[int] = set()
-        for x in (snapshot or {}).get("active_task_ids") or set():
-            try:
-                active_task_ids.add(int(x))
-            except (TypeError, ValueError):
-                pass
-        manifest_artifacts = manifest_payload.get("artifacts") if isinstance(manifest_payload.get("artifacts"), dict) else {}
-        artifact_tracking_active = bool(manifest_artifacts)
+        context = _ResolutionContext(
+            plan_id=plan_id,
+            session_id=session_id,
+            contract_by_task={contract.task_id: contract for contract in preflight.task_contracts},
+            blocking_issue_map=self._group_blocking_issues(preflight.errors),
+            manifest_resolved_aliases=preflight.manifest_resolved_aliases,
+            manifest_artifacts=_manifest_artifacts(manifest_payload),
+            active_task_ids=_active_task_ids(snapshot),
+        )
         memo: Dict[int, Dict[str, Any]] = {}
+        self._resolve_tasks(tree, context, sorted(tree.nodes), memo)
+        return memo
+
+    def incremental(
+        self,
+        plan_id: int,
+        tree: PlanTree,
+        *,
+        manifest: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> "IncrementalPlanStatusResolver":
+        """Resolver for one execution run that only re-resolves what changed."""
+        return IncrementalPlanStatusResolver(
+            self,
+            plan_id,
+            tree,
+            manifest=manifest,
+            session_id=session_id,
+        )
+
+    @staticmethod
+    def _resolve_tasks(
+        tree: PlanTree,
+        context: _ResolutionContext,
+        task_ids: Iterable[int],
+        memo: Dict[int, Dict[str, Any]],
+    ) -> None:
+        """Resolve ``task_ids`` into ``memo``, reusing states already in it."""
+        plan_id = context.plan_id
+        session_id = context.session_id
+        contract_by_task = context.contract_by_task
+        blocking_issue_map = context.blocking_issue_map
+        manifest_resolved_aliases = context.manifest_resolved_aliases
+        active_task_ids = context.active_task_ids
+        manifest_artifacts = context.manifest_artifacts
+        artifact_tracking_active = bool(manifest_artifacts)
         visiting: Set[int] = set()
 
         def _dependency_block_reason(task_id: int, incomplete_dependencies: List[int]) -> str:
@@ -324,14 +417,14 @@ class PlanStatusResolver:
             missing_required_aliases = [
                 alias
                 for alias in canonical_required_aliases
-                if alias not in preflight.manifest_resolved_aliases
+                if alias not in manifest_resolved_aliases
             ]
             published_aliases: List[str] = []
             missing_publish_aliases: List[str] = []
             for alias in canonical_publish_aliases:
                 entry = manifest_artifacts.get(alias) if isinstance(manifest_artifacts, dict) else None
                 producer_task_id = int(entry.get("producer_task_id") or -1) if isinstance(entry, dict) else -1
-                if alias in preflight.manifest_resolved_aliases and producer_task_id == task_id:
+                if alias in manifest_resolved_aliases and producer_task_id == task_id:
                     published_aliases.append(alias)
                 else:
                     missing_publish_aliases.append(alias)
@@ -529,9 +622,8 @@ class PlanStatusResolver:
             visiting.remove(task_id)
             return state
 
-        for task_id in sorted(tree.nodes):
+        for task_id in task_ids:
             _resolve(task_id)
-        return memo
 
     @staticmethod
     def _group_blocking_issues(
@@ -547,4 +639,239 @@ class PlanStatusResolver:
         return grouped
 
 
-__all__ = ["PlanStatusResolver"]
+def _stable_digest(value: Any) -> str:
+    text = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _node_fingerprint(node: Any) -> Tuple[Any, ...]:
+    # Built from values, not the node: the executor edits nodes in place.
+    # The trailing (parent_id, dependencies) pair is the plan structure.
+    return (
+        getattr(node, "name", None),
+        getattr(node, "instruction", None),
+        _stable_digest(getattr(node, "metadata", None)),
+        getattr(node, "status", None),
+        _stable_digest(getattr(node, "execution_result", None)),
+        getattr(node, "parent_id", None),
+        tuple(getattr(node, "dependencies", None) or ()),
+    )
+
+
+def _contract_key(contract: ContractWithIssues) -> Tuple[Any, ...]:
+    snapshot, issues = contract
+    return (
+        snapshot.model_dump(exclude={"raw_status"}),
+        [issue.model_dump() for issue in issues],
+    )
+
+
+def _is_contract_bypass_entry(key: str, entry: Any) -> bool:
+    # Mirrors ``_resolve_contract_bypass_alias``: these entries can satisfy
+    # any registered alias, so a change to one invalidates every resolution.
+    return str(key).startswith("contract:") or (
+        isinstance(entry, dict) and entry.get("source") == "contract_artifacts"
+    )
+
+
+class IncrementalPlanStatusResolver:
+    """Keeps the task states of one plan current across an execution run.
+
+    The whole plan is resolved once.  Each :meth:`states` call then diffs the
+    tree nodes and the artifact manifest against what was last resolved, and
+    re-resolves only the changed tasks, their ancestors (composite roll-up)
+    and their transitive dependents.  Artifact contracts are rebuilt only for
+    changed tasks and manifest aliases are re-resolved only for changed
+    manifest entries; the cross-task preflight checks are re-run on the
+    cached contracts when either of those actually moves.
+    """
+
+    def __init__(
+        self,
+        resolver: PlanStatusResolver,
+        plan_id: int,
+        tree: PlanTree,
+        *,
+        manifest: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> None:
+        self._resolver = resolver
+        self._preflight = resolver._artifact_preflight
+        self.plan_id = plan_id
+        self.tree = tree
+        self.session_id = session_id
+        self.full_resolutions = 0
+        self.last_resolved_task_ids: List[int] = []
+        # A manifest loaded here (rather than supplied) is refreshed by states().
+        self._owns_manifest = not isinstance(manifest, dict)
+        self._manifest = (
+            manifest if isinstance(manifest, dict) else resolver._load_manifest(plan_id, session_id)
+        )
+        self._rebuild()
+
+    def states(self, *, manifest: Optional[Dict[str, Any]] = None) -> Dict[int, Dict[str, Any]]:
+        """Current per-task states; the returned mapping must not be mutated."""
+        if isinstance(manifest, dict):
+            self._manifest = manifest
+        elif self._owns_manifest:
+            self._manifest = self._resolver._load_manifest(self.plan_id, self.session_id)
+        nodes = self.tree.nodes
+        if nodes.keys() != self._fingerprints.keys():
+            self._rebuild()
+            return self._states
+
+        changed_task_ids: List[int] = []
+        for task_id, node in nodes.items():
+            fingerprint = _node_fingerprint(node)
+            previous = self._fingerprints[task_id]
+            if fingerprint == previous:
+                continue
+            if fingerprint[-2:] != previous[-2:]:
+                # Re-parented or re-wired: the dependent index is stale.
+                self._rebuild()
+                return self._states
+            self._fingerprints[task_id] = fingerprint
+            changed_task_ids.append(task_id)
+
+        stale: Set[int] = set(changed_task_ids)
+        contracts_changed = False
+        for task_id in changed_task_ids:
+            (contract,) = self._preflight.build_task_contracts(
+                self.plan_id, self.tree, task_ids=[task_id], session_id=self.session_id
+            )
+            if _contract_key(contract) != _contract_key(self._contracts[task_id]):
+                contracts_changed = True
+            self._contracts[task_id] = contract
+        if contracts_changed:
+            self._index_aliases()
+
+        context = self._context
+        artifacts = _manifest_artifacts(self._manifest)
+        changed_keys = {
+            key
+            for key in artifacts.keys() | self._seen_artifacts.keys()
+            if artifacts.get(key) != self._seen_artifacts.get(key)
+        }
+        targets: Set[str] = set()
+        if contracts_changed:
+            targets.update(alias for alias in self._tasks_by_alias if alias not in context.manifest_resolved_aliases)
+        if changed_keys:
+            for key in changed_keys:
+                # Producer ownership is read straight from the entry.
+                for alias in self._aliases_by_key.get(key, ()):
+                    targets.add(alias)
+                    stale.update(self._tasks_by_alias[alias])
+            if any(
+                _is_contract_bypass_entry(key, artifacts.get(key))
+                or _is_contract_bypass_entry(key, self._seen_artifacts.get(key))
+                for key in changed_keys
+            ):
+                targets.update(self._tasks_by_alias)
+            for key in changed_keys:
+                if key in artifacts:
+                    self._seen_artifacts[key] = copy.deepcopy(artifacts[key])
+                else:
+                    self._seen_artifacts.pop(key, None)
+
+        resolved = context.manifest_resolved_aliases
+        if targets or contracts_changed:
+            resolved = {
+                alias: path
+                for alias, path in resolved.items()
+                if alias not in targets and alias in self._tasks_by_alias
+            }
+            resolved.update(resolve_manifest_aliases(self._manifest, targets))
+            for alias in targets:
+                if resolved.get(alias) != context.manifest_resolved_aliases.get(alias):
+                    stale.update(self._tasks_by_alias.get(alias, ()))
+
+        if bool(artifacts) != bool(context.manifest_artifacts):
+            # Publish-contract checks only apply once artifacts are tracked.
+            stale.update(nodes)
+        if contracts_changed or resolved != context.manifest_resolved_aliases:
+            previous_issues = context.blocking_issue_map
+            context = self._validate(resolved)
+            for task_id in previous_issues.keys() | context.blocking_issue_map.keys():
+                if previous_issues.get(task_id) != context.blocking_issue_map.get(task_id):
+                    stale.add(task_id)
+        context.manifest_artifacts = artifacts
+
+        if stale:
+            affected = self._with_ancestors_and_dependents(stale)
+            for task_id in affected:
+                self._states.pop(task_id, None)
+            self.last_resolved_task_ids = sorted(affected)
+            PlanStatusResolver._resolve_tasks(self.tree, context, self.last_resolved_task_ids, self._states)
+        else:
+            self.last_resolved_task_ids = []
+        return self._states
+
+    def _rebuild(self) -> None:
+        nodes = self.tree.nodes
+        self._fingerprints = {task_id: _node_fingerprint(node) for task_id, node in nodes.items()}
+        self._contracts: Dict[int, ContractWithIssues] = {
+            contract[0].task_id: contract
+            for contract in self._preflight.build_task_contracts(
+                self.plan_id, self.tree, session_id=self.session_id
+            )
+        }
+        self._index_aliases()
+        self._dependents: Dict[int, Set[int]] = {}
+        for task_id, node in nodes.items():
+            for dep_id in getattr(node, "dependencies", None) or ():
+                if dep_id in nodes:
+                    self._dependents.setdefault(dep_id, set()).add(task_id)
+        artifacts = _manifest_artifacts(self._manifest)
+        self._seen_artifacts = copy.deepcopy(artifacts)
+        self._context = self._validate(resolve_manifest_aliases(self._manifest, self._tasks_by_alias))
+        self._states: Dict[int, Dict[str, Any]] = {}
+        self.last_resolved_task_ids = sorted(nodes)
+        PlanStatusResolver._resolve_tasks(self.tree, self._context, self.last_resolved_task_ids, self._states)
+        self.full_resolutions += 1
+
+    def _index_aliases(self) -> None:
+        self._tasks_by_alias: Dict[str, Set[int]] = {}
+        self._aliases_by_key: Dict[str, Set[str]] = {}
+        for snapshot, _issues in self._contracts.values():
+            for alias in (*snapshot.requires, *snapshot.publishes):
+                self._tasks_by_alias.setdefault(alias, set()).add(snapshot.task_id)
+        for alias in self._tasks_by_alias:
+            self._aliases_by_key.setdefault(alias, set()).add(alias)
+            self._aliases_by_key.setdefault(canonicalize_artifact_alias(alias), set()).add(alias)
+
+    def _validate(self, manifest_resolved: Dict[str, str]) -> _ResolutionContext:
+        preflight = self._preflight.validate_contracts(
+            self.plan_id,
+            [self._contracts[task_id] for task_id in sorted(self._contracts)],
+            manifest=self._manifest,
+            session_id=self.session_id,
+            manifest_resolved=manifest_resolved,
+        )
+        self._context = _ResolutionContext(
+            plan_id=self.plan_id,
+            session_id=self.session_id,
+            contract_by_task={contract.task_id: contract for contract in preflight.task_contracts},
+            blocking_issue_map=PlanStatusResolver._group_blocking_issues(preflight.errors),
+            manifest_resolved_aliases=preflight.manifest_resolved_aliases,
+            manifest_artifacts=_manifest_artifacts(self._manifest),
+        )
+        return self._context
+
+    def _with_ancestors_and_dependents(self, task_ids: Iterable[int]) -> Set[int]:
+        nodes = self.tree.nodes
+        affected: Set[int] = set()
+        pending = list(task_ids)
+        while pending:
+            task_id = pending.pop()
+            if task_id in affected:
+                continue
+            affected.add(task_id)
+            node = nodes.get(task_id)
+            parent_id = getattr(node, "parent_id", None)
+            if parent_id is not None and parent_id in nodes:
+                pending.append(parent_id)
+            pending.extend(self._dependents.get(task_id, ()))
+        return affected
+
+
+__all__ = ["IncrementalPlanStatusResolver", "PlanStatusResolver"]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import contextvars
 import copy
 import csv
 import fnmatch
@@ -10,10 +11,11 @@ import logging
 import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from .acceptance_criteria import (
     derive_acceptance_criteria_from_text,
@@ -40,10 +42,21 @@ from .model_metric_schema import (
     missing_required_model_metrics,
 )
 from .plan_models import PlanNode
+from .verification_snapshot import (
+    glob_paths,
+    invalidate_snapshot_path,
+    json_document_memo,
+    pdf_inspection_memo,
+    tabular_row_count_memo,
+    verification_snapshot,
+)
 
 logger = logging.getLogger(__name__)
 
 _COMPLETED_LIKE = {"completed", "done", "success"}
+# Threads used by ``verify_tasks`` to read distinct artifact files up front.
+_BATCH_PREFETCH_WORKERS = 8
+_PREFETCH_CHECK_TYPES = {"json_field_equals", "json_field_at_least", "pdf_valid"}
 _FAILED_LIKE = {"failed", "failure", "error"}
 _PATH_KEYS = {
     "path",
@@ -296,6 +309,22 @@ class TaskVerificationService:
         *,
         execution_status: Optional[str] = None,
         trigger: str = "auto",
+    ) -> VerificationFinalization:
+        with verification_snapshot():
+            return self._finalize_payload(
+                node,
+                payload,
+                execution_status=execution_status,
+                trigger=trigger,
+            )
+
+    def _finalize_payload(
+        self,
+        node: PlanNode,
+        payload: Dict[str, Any],
+        *,
+        execution_status: Optional[str],
+        trigger: str,
     ) -> VerificationFinalization:
         payload_metadata = payload.get("metadata") if isinstance(payload, dict) else None
         normalized_execution_status = self._normalize_status(
@@ -821,8 +850,105 @@ class TaskVerificationService:
         tree = repo.get_plan_tree(plan_id)
         if not tree.has_node(task_id):
             raise ValueError(f"Task {task_id} not found in plan {plan_id}")
-        node = tree.get_node(task_id)
+        return self._verify_node(
+            repo,
+            plan_id=plan_id,
+            node=tree.get_node(task_id),
+            trigger=trigger,
+            override_criteria=override_criteria,
+            dry_run=dry_run,
+            session_id=session_id,
+        )
+
+    def verify_tasks(
+        self,
+        repo: Any,
+        *,
+        plan_id: int,
+        task_ids: Optional[Sequence[int]] = None,
+        trigger: str = "manual",
+        dry_run: bool = False,
+        session_id: Optional[str] = None,
+        max_workers: int = _BATCH_PREFETCH_WORKERS,
+    ) -> Dict[int, VerificationFinalization]:
+        """Verify many tasks of one plan in a single batched pass.
+
+        The plan tree and artifact manifest are loaded once.  File content
+        checks (tabular row counts, JSON documents, PDF inspection) are first
+        collected across all tasks, deduplicated by file and read on a
+        bounded thread pool; each task is then finalized against those
+        memoized results.  Tasks without an execution result are left out.
+        """
+        tree = repo.get_plan_tree(plan_id)
+        if task_ids is None:
+            nodes = list(tree.ordered_nodes())
+        else:
+            nodes = []
+            for task_id in task_ids:
+                if not tree.has_node(int(task_id)):
+                    raise ValueError(f"Task {task_id} not found in plan {plan_id}")
+                nodes.append(tree.get_node(int(task_id)))
+        with verification_snapshot():
+            return self._verify_nodes(
+                repo,
+                plan_id=plan_id,
+                nodes=[node for node in nodes if node.execution_result],
+                trigger=trigger,
+                dry_run=dry_run,
+                session_id=session_id,
+                max_workers=max_workers,
+            )
+
+    def _verify_nodes(
+        self,
+        repo: Any,
+        *,
+        plan_id: int,
+        nodes: Sequence[PlanNode],
+        trigger: str,
+        dry_run: bool,
+        session_id: Optional[str],
+        max_workers: int = _BATCH_PREFETCH_WORKERS,
+    ) -> Dict[int, VerificationFinalization]:
+        if not nodes:
+            return {}
+        raw_payloads = {
+            node.id: self._parse_execution_result(node.execution_result, fallback_status=node.status)
+            for node in nodes
+        }
+        self._prefetch_content_checks(
+            [(node, raw_payloads[node.id]) for node in nodes],
+            max_workers=max_workers,
+        )
+        manifest = load_artifact_manifest(plan_id, session_id)
+        return {
+            node.id: self._verify_node(
+                repo,
+                plan_id=plan_id,
+                node=node,
+                trigger=trigger,
+                dry_run=dry_run,
+                session_id=session_id,
+                raw_payload=raw_payloads[node.id],
+                manifest=manifest,
+            )
+            for node in nodes
+        }
 
+    def _verify_node(
+        self,
+        repo: Any,
+        *,
+        plan_id: int,
+        node: PlanNode,
+        trigger: str,
+        override_criteria: Optional[Dict[str, Any]] = None,
+        dry_run: bool = False,
+        session_id: Optional[str] = None,
+        raw_payload: Optional[Dict[str, Any]] = None,
+        manifest: Optional[Dict[str, Any]] = None,
+    ) -> VerificationFinalization:
+        task_id = node.id
         # If override criteria are provided, inject them unconditionally so
         # that finalize_payload uses the caller's rules instead of stale ones.
         if override_criteria and self._has_checks(override_criteria):
@@ -835,10 +961,11 @@ class TaskVerificationService:
                 len(override_criteria.get("checks", [])),
             )
 
-        raw_payload = self._parse_execution_result(
-            node.execution_result,
-            fallback_status=node.status,
-        )
+        if raw_payload is None:
+            raw_payload = self._parse_execution_result(
+                node.execution_result,
+                fallback_status=node.status,
+            )
         finalization = self.finalize_payload(
             node,
             raw_payload,
@@ -851,6 +978,7 @@ class TaskVerificationService:
             plan_id,
             node,
             finalization,
+            manifest=manifest,
             session_id=session_id,
         )
 
@@ -871,15 +999,119 @@ class TaskVerificationService:
             )
         return finalization
 
+    def _prefetch_content_checks(
+        self,
+        entries: Sequence[Tuple[PlanNode, Dict[str, Any]]],
+        *,
+        max_workers: int = _BATCH_PREFETCH_WORKERS,
+    ) -> int:
+        """Warm the content memos for every distinct file the checks will read.
+
+        Path resolution here mirrors the first pass of ``_finalize_payload``;
+        a file it misses is simply read later by the check itself.  Returns
+        the number of distinct file reads scheduled.
+        """
+        jobs: Dict[Tuple[str, str, Any], Path] = {}
+        for node, raw_payload in entries:
+            try:
+                for kind, path, variant in self._content_prefetch_jobs(node, raw_payload):
+                    jobs.setdefault((kind, str(path), variant), path)
+            except Exception as exc:
+                logger.debug("Skipping verification prefetch for task %s: %s", node.id, exc)
+        if not jobs:
+            return 0
+        workers = max(1, min(int(max_workers), len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="verify-prefetch") as pool:
+            # Each job runs in a copy of this context so it sees the active snapshot.
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._warm_content_check, kind, path, variant)
+                for (kind, _, variant), path in jobs.items()
+            ]
+            for future in futures:
+                future.result()
+        return len(jobs)
+
+    def _content_prefetch_jobs(
+        self,
+        node: PlanNode,
+        raw_payload: Dict[str, Any],
+    ) -> Iterator[Tuple[str, Path, Any]]:
+        criteria, _ = self._effective_acceptance_criteria(node)
+        if not self._has_checks(criteria):
+            return
+        payload = self._coerce_payload(raw_payload, fallback_status=node.status)
+        artifact_paths = self._normalize_artifact_paths(self._extract_artifact_paths(payload), payload=payload)
+        base_dir = self._resolve_base_dir(criteria, artifact_paths, payload=payload, node=node)
+        for raw_check in (criteria or {}).get("checks") or []:
+            if not isinstance(raw_check, dict):
+                continue
+            check = self._normalize_check(raw_check)
+            check_type = str(check.get("type") or "").strip()
+            if check_type not in _PREFETCH_CHECK_TYPES or not self._has_nonempty_string(check.get("path")):
+                continue
+            path = self._select_path_for_check(check.get("path"), base_dir, artifact_paths, mode="exists")
+            if not path.is_file():
+                continue
+            if check_type == "pdf_valid":
+                min_pages = int(check.get("min_pages") or 1)
+                min_text_chars = int(check.get("min_text_chars") or 0)
+                if min_pages > 0 or min_text_chars > 0:
+                    yield "pdf", path, min_text_chars > 0
+            elif self._looks_like_tabular_row_count_check(path, self._coerce_json_key_path(check)):
+                yield "tabular_rows", path, None
+            else:
+                yield "json", path, None
+
+    @classmethod
+    def _warm_content_check(cls, kind: str, path: Path, variant: Any) -> None:
+        try:
+            if kind == "tabular_rows":
+                cls._read_tabular_row_count(path)
+            elif kind == "json":
+                cls._read_json_document(path)
+            elif kind == "pdf":
+                pdf_inspection_memo.get_or_compute(
+                    path,
+                    lambda: cls._inspect_pdf(path, with_text=bool(variant)),
+                    variant=bool(variant),
+                )
+        except Exception:
+            # Not memoized; the check itself re-reads the file and reports the error.
+            pass
+
     def dry_run_reverify_plan(
         self,
         repo: Any,
         *,
         plan_id: int,
         task_ids: Optional[Sequence[int]] = None,
+    ) -> Dict[str, Any]:
+        # One snapshot for the whole sweep: sibling tasks mostly share roots.
+        with verification_snapshot():
+            return self._dry_run_reverify_plan(repo, plan_id=plan_id, task_ids=task_ids)
+
+    def _dry_run_reverify_plan(
+        self,
+        repo: Any,
+        *,
+        plan_id: int,
+        task_ids: Optional[Sequence[int]],
     ) -> Dict[str, Any]:
         tree = repo.get_plan_tree(plan_id)
         selected = set(int(task_id) for task_id in task_ids) if task_ids is not None else None
+        nodes = [
+            node
+            for node in tree.ordered_nodes()
+            if selected is None or node.id in selected
+        ]
+        finalizations = self._verify_nodes(
+            repo,
+            plan_id=plan_id,
+            nodes=[node for node in nodes if node.execution_result],
+            trigger="dry_run",
+            dry_run=True,
+            session_id=None,
+        )
         items: List[Dict[str, Any]] = []
         summary = {
             "total": 0,
@@ -890,9 +1122,7 @@ class TaskVerificationService:
             "would_change_status": 0,
             "unverifiable": 0,
         }
-        for node in tree.ordered_nodes():
-            if selected is not None and node.id not in selected:
-                continue
+        for node in nodes:
             summary["total"] += 1
             if not node.execution_result:
                 summary["unverifiable"] += 1
@@ -907,13 +1137,7 @@ class TaskVerificationService:
                     "diagnostics": None,
                 })
                 continue
-            finalization = self.verify_task(
-                repo,
-                plan_id=plan_id,
-                task_id=node.id,
-                trigger="dry_run",
-                dry_run=True,
-            )
+            finalization = finalizations[node.id]
             metadata = finalization.payload.get("metadata") if isinstance(finalization.payload, dict) else {}
             if not isinstance(metadata, dict):
                 metadata = {}
@@ -1797,8 +2021,7 @@ class TaskVerificationService:
                 if self._looks_like_tabular_row_count_check(path, key_path):
                     actual = self._read_tabular_row_count(path)
                 else:
-                    payload = json.loads(path.read_text(encoding="utf-8"))
-                    actual = self._get_json_value(payload, key_path)
+                    actual = self._get_json_value(self._read_json_document(path), key_path)
                 if check_type == "json_field_equals":
                     expected = self._coerce_json_expected(raw_check)
                     # Smart type coercion: if expected is a string but actual is
@@ -2113,7 +2336,7 @@ class TaskVerificationService:
         matched: List[str] = []
         seen: set[str] = set()
         for pattern in patterns:
-            for item in glob.glob(pattern, recursive=True):
+            for item in glob_paths(pattern):
                 if item in seen:
                     continue
                 seen.add(item)
@@ -2185,7 +2408,7 @@ class TaskVerificationService:
             if isinstance(raw_glob, str) and raw_glob.strip():
                 try:
                     pattern = self._resolve_glob(raw_glob, base_dir)
-                    matches = glob.glob(pattern, recursive=True)
+                    matches = glob_paths(pattern)
                     item.update({
                         "raw_glob": raw_glob,
                         "resolved_glob": pattern,
@@ -2841,6 +3064,20 @@ class TaskVerificationService:
 
     @staticmethod
     def _read_tabular_row_count(path: Path) -> int:
+        return tabular_row_count_memo.get_or_compute(
+            path,
+            lambda: TaskVerificationService._count_tabular_rows(path),
+        )
+
+    @staticmethod
+    def _read_json_document(path: Path) -> Any:
+        return json_document_memo.get_or_compute(
+            path,
+            lambda: json.loads(path.read_text(encoding="utf-8")),
+        )
+
+    @staticmethod
+    def _count_tabular_rows(path: Path) -> int:
         delimiter = "\t" if path.suffix.lower() == ".tsv" else ","
         with path.open("r", encoding="utf-8", errors="ignore", newline="") as handle:
             reader = csv.reader(handle, delimiter=delimiter)
@@ -2882,24 +3119,21 @@ class TaskVerificationService:
         pages: Optional[int] = None
         text_chars: Optional[int] = None
         if min_pages > 0 or min_text_chars > 0:
-            try:
-                pypdf = importlib.import_module("pypdf")
-
-                with path.open("rb") as handle:
-                    reader = pypdf.PdfReader(handle)
-                    pages = len(reader.pages)
-                    if min_text_chars > 0:
-                        extracted: List[str] = []
-                        for page in reader.pages[:20]:
-                            extracted.append(page.extract_text() or "")
-                        text_chars = len("\n".join(extracted).strip())
-            except Exception as exc:
+            with_text = min_text_chars > 0
+            inspection = pdf_inspection_memo.get_or_compute(
+                path,
+                lambda: TaskVerificationService._inspect_pdf(path, with_text=with_text),
+                variant=with_text,
+            )
+            if "error" in inspection:
                 return TaskVerificationService._check_result(
                     "pdf_valid",
                     False,
                     path=path,
-                    message=f"Unable to parse PDF: {exc}",
+                    message=f"Unable to parse PDF: {inspection['error']}",
                 )
+            pages = inspection.get("pages")
+            text_chars = inspection.get("text_chars")
 
         if pages is not None and pages < min_pages:
             return TaskVerificationService._check_result(
@@ -2925,6 +3159,24 @@ class TaskVerificationService:
             extra={"pages": pages, "text_chars": text_chars},
         )
 
+    @staticmethod
+    def _inspect_pdf(path: Path, *, with_text: bool) -> Dict[str, Any]:
+        try:
+            pypdf = importlib.import_module("pypdf")
+
+            with path.open("rb") as handle:
+                reader = pypdf.PdfReader(handle)
+                pages = len(reader.pages)
+                text_chars: Optional[int] = None
+                if with_text:
+                    extracted: List[str] = []
+                    for page in reader.pages[:20]:
+                        extracted.append(page.extract_text() or "")
+                    text_chars = len("\n".join(extracted).strip())
+        except Exception as exc:
+            return {"error": exc}
+        return {"pages": pages, "text_chars": text_chars}
+
     @staticmethod
     def _model_metrics_valid_result(path: Path) -> Dict[str, Any]:
         if not path.exists() or not path.is_file() or path.stat().st_size <= 0:
@@ -3405,6 +3657,7 @@ class TaskVerificationService:
             try:
                 if candidate.resolve() != target.resolve():
                     shutil.copy2(candidate, target)
+                    invalidate_snapshot_path(target)
             except Exception as exc:
                 logger.warning(
                     "Failed to materialize semantic deliverable %s from %s for task %s: %s",
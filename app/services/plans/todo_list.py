@@ -15,6 +15,7 @@ from __future__ import annotations
 
 import heapq
 import re
+import weakref
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Optional, Set, Tuple
 
@@ -180,24 +181,90 @@ class TodoList:
 # Core algorithm
 # ---------------------------------------------------------------------------
 
-def _collect_leaf_ids(tree: PlanTree, task_ids: List[int]) -> List[int]:
-    """Expand composite tasks to their atomic (leaf) descendants via DFS."""
-    leaves: List[int] = []
-    seen: Set[int] = set()
-    stack = list(reversed(task_ids))
-    while stack:
-        tid = stack.pop()
-        if tid in seen:
+LeafIndex = Dict[int, Tuple[int, ...]]
+
+
+@dataclass
+class _LeafIndexEntry:
+    tree_ref: "weakref.ReferenceType[PlanTree]"
+    adjacency: Dict[Optional[int], List[int]]
+    node_count: int
+    leaves: LeafIndex
+
+
+_leaf_index_cache: Dict[int, _LeafIndexEntry] = {}
+
+
+def _build_leaf_index(tree: PlanTree) -> LeafIndex:
+    """Leaf descendants of every task, computed in one post-order pass."""
+    index: LeafIndex = {}
+    children_of: Dict[int, List[int]] = {}
+    on_path: Set[int] = set()
+    for root_id in list(tree.nodes):
+        if root_id in index:
             continue
-        seen.add(tid)
-        children = tree.children_ids(tid)
-        if children:
-            stack.extend(reversed(children))
-        else:
-            leaves.append(tid)
+        stack: List[Tuple[int, bool]] = [(root_id, False)]
+        while stack:
+            tid, expanded = stack.pop()
+            if expanded:
+                on_path.discard(tid)
+                children = children_of.pop(tid)
+                if not children:
+                    index[tid] = (tid,)
+                else:
+                    # Children left out by a cycle in the hierarchy contribute nothing.
+                    index[tid] = tuple(
+                        dict.fromkeys(leaf for child_id in children for leaf in index.get(child_id, ()))
+                    )
+                continue
+            if tid in index or tid in on_path:
+                continue
+            on_path.add(tid)
+            children = children_of[tid] = tree.children_ids(tid)
+            stack.append((tid, True))
+            stack.extend((child_id, False) for child_id in reversed(children))
+    return index
+
+
+def composite_leaf_index(tree: PlanTree) -> LeafIndex:
+    """Map each task id to its atomic (leaf) descendants in DFS order.
+
+    Leaves map to themselves.  The index is cached per tree and rebuilt when
+    the tree's adjacency is replaced (see ``PlanTree.rebuild_adjacency``) or
+    its node count changes.  Callers must not mutate it.
+    """
+    adjacency = getattr(tree, "adjacency", None)
+    if adjacency is None:
+        return _build_leaf_index(tree)
+    key = id(tree)
+    entry = _leaf_index_cache.get(key)
+    if (
+        entry is not None
+        and entry.tree_ref() is tree
+        and entry.adjacency is adjacency
+        and entry.node_count == len(tree.nodes)
+    ):
+        return entry.leaves
+    leaves = _build_leaf_index(tree)
+    _leaf_index_cache[key] = _LeafIndexEntry(
+        tree_ref=weakref.ref(tree, lambda _ref, key=key: _leaf_index_cache.pop(key, None)),
+        adjacency=adjacency,
+        node_count=len(tree.nodes),
+        leaves=leaves,
+    )
     return leaves
 
 
+def _collect_leaf_ids(
+    tree: PlanTree,
+    task_ids: List[int],
+    leaf_index: Optional[LeafIndex] = None,
+) -> List[int]:
+    """Expand composite tasks to their atomic (leaf) descendants."""
+    index = composite_leaf_index(tree) if leaf_index is None else leaf_index
+    return list(dict.fromkeys(leaf for tid in task_ids for leaf in index.get(tid, (tid,))))
+
+
 def _compute_phase_layers(
     task_ids: Set[int],
     deps_map: Dict[int, List[int]],
@@ -248,39 +315,47 @@ def _compute_phase_layers(
     return phase_of
 
 
+def _scoped_candidates(
+    tree: PlanTree,
+    task_id: int,
+    *,
+    subgraph_ids: Set[int],
+    leaf_index: Optional[LeafIndex],
+) -> Iterable[int]:
+    """In-scope ids standing for *task_id*: itself, or its in-scope leaves."""
+    if task_id in subgraph_ids:
+        return (task_id,)
+    if leaf_index is not None and task_id in tree.nodes:
+        return (leaf_id for leaf_id in leaf_index.get(task_id, (task_id,)) if leaf_id in subgraph_ids)
+    return ()
+
+
 def _resolve_expanded_dependencies(
     tree: PlanTree,
     task_id: int,
     *,
     subgraph_ids: Set[int],
     expand_composites: bool,
+    leaf_index: Optional[LeafIndex] = None,
 ) -> List[int]:
     """Resolve a task's in-scope dependencies, expanding composite deps to leaves."""
     node = tree.nodes.get(task_id)
     if node is None:
         return []
+    if expand_composites and leaf_index is None:
+        leaf_index = composite_leaf_index(tree)
 
-    resolved: List[int] = []
+    resolved: Dict[int, None] = {}
     for dep_id in getattr(node, "dependencies", []) or []:
-        candidate_ids: List[int]
-        if dep_id in subgraph_ids:
-            candidate_ids = [dep_id]
-        elif expand_composites and dep_id in tree.nodes:
-            candidate_ids = [
-                leaf_id
-                for leaf_id in _collect_leaf_ids(tree, [dep_id])
-                if leaf_id in subgraph_ids
-            ]
-        else:
-            candidate_ids = []
-
-        for candidate_id in candidate_ids:
-            if candidate_id == task_id:
-                continue
-            if candidate_id not in resolved:
-                resolved.append(candidate_id)
-
-    return resolved
+        for candidate_id in _scoped_candidates(
+            tree,
+            dep_id,
+            subgraph_ids=subgraph_ids,
+            leaf_index=leaf_index if expand_composites else None,
+        ):
+            if candidate_id != task_id:
+                resolved.setdefault(candidate_id)
+    return list(resolved)
 
 
 def _build_scoped_dependency_map(
@@ -289,36 +364,34 @@ def _build_scoped_dependency_map(
     subgraph_ids: Set[int],
     expand_composites: bool,
     include_child_dependencies: bool = False,
+    leaf_index: Optional[LeafIndex] = None,
 ) -> Dict[int, List[int]]:
     """Build dependency map for phase layering and item rendering."""
+    if expand_composites and leaf_index is None:
+        leaf_index = composite_leaf_index(tree)
+    scoped_index = leaf_index if expand_composites else None
     deps_map: Dict[int, List[int]] = {}
     for tid in subgraph_ids:
-        resolved = _resolve_expanded_dependencies(
-            tree,
-            tid,
-            subgraph_ids=subgraph_ids,
-            expand_composites=expand_composites,
+        resolved = dict.fromkeys(
+            _resolve_expanded_dependencies(
+                tree,
+                tid,
+                subgraph_ids=subgraph_ids,
+                expand_composites=expand_composites,
+                leaf_index=scoped_index,
+            )
         )
         if include_child_dependencies:
             for child_id in tree.children_ids(tid):
-                candidate_ids: List[int]
-                if child_id in subgraph_ids:
-                    candidate_ids = [child_id]
-                elif expand_composites and child_id in tree.nodes:
-                    candidate_ids = [
-                        leaf_id
-                        for leaf_id in _collect_leaf_ids(tree, [child_id])
-                        if leaf_id in subgraph_ids
-                    ]
-                else:
-                    candidate_ids = []
-
-                for candidate_id in candidate_ids:
-                    if candidate_id == tid:
-                        continue
-                    if candidate_id not in resolved:
-                        resolved.append(candidate_id)
-        deps_map[tid] = resolved
+                for candidate_id in _scoped_candidates(
+                    tree,
+                    child_id,
+                    subgraph_ids=subgraph_ids,
+                    leaf_index=scoped_index,
+                ):
+                    if candidate_id != tid:
+                        resolved.setdefault(candidate_id)
+        deps_map[tid] = list(resolved)
     return deps_map
 
 
@@ -638,8 +711,9 @@ def build_todo_list(
         subgraph_ids.add(target_task_id)
 
     # 2. Optionally expand composites to leaves
-    if expand_composites:
-        expanded = _collect_leaf_ids(tree, sorted(subgraph_ids))
+    leaf_index = composite_leaf_index(tree) if expand_composites else None
+    if leaf_index is not None:
+        expanded = _collect_leaf_ids(tree, sorted(subgraph_ids), leaf_index)
         subgraph_ids = set(expanded)
 
     if not subgraph_ids:
@@ -650,6 +724,7 @@ def build_todo_list(
         tree,
         subgraph_ids=subgraph_ids,
         expand_composites=expand_composites,
+        leaf_index=leaf_index,
     )
 
     # 4. Compute phase layers
@@ -702,6 +777,7 @@ def build_full_plan_todo_list(
     expand_composites: bool = True,
     ordering_mode: str = "dependency_phase",
     phase_labels: Optional[Dict[int, str]] = None,
+    leaf_index: Optional[LeafIndex] = None,
 ) -> TodoList:
     """Build a phased TodoList covering the *entire* plan tree.
 
@@ -721,6 +797,9 @@ def build_full_plan_todo_list(
         Retained for API compatibility. Full-plan execution always preserves
         composite tasks and enforces parent-after-child ordering so synthesis
         nodes are not dropped from the runnable queue.
+    leaf_index : LeafIndex, optional
+        Precomputed :func:`composite_leaf_index` of *tree*; looked up from
+        the per-tree cache when omitted.
 
     Returns
     -------
@@ -737,6 +816,7 @@ def build_full_plan_todo_list(
         subgraph_ids=subgraph_ids,
         expand_composites=expand_composites,
         include_child_dependencies=True,
+        leaf_index=leaf_index,
     )
 
     normalized_mode = str(ordering_mode or "structure").strip().lower()
@@ -784,6 +864,8 @@ __all__ = [
     "TodoList",
     "build_todo_list",
     "build_full_plan_todo_list",
+    "composite_leaf_index",
+    "LeafIndex",
     "assign_phase_labels",
     "build_workflow_sections",
     "attach_workflow_sections",
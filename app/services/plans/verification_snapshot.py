@@ -0,0 +1,320 @@
+"""Per-pass filesystem snapshot and content memos for task verification.
+
+A verification pass (one ``finalize_payload`` call, or a whole
+``dry_run_reverify_plan`` sweep) evaluates many glob patterns against the
+same few search roots.  :class:`FilesystemSnapshot` lists every directory at
+most once per pass into a path trie, keeping the ``os.DirEntry`` objects so
+their stat results are cached, and matches glob patterns against it with
+compiled :func:`fnmatch.translate` expressions instead of re-walking the
+tree with :func:`glob.glob` for each pattern.
+
+Expensive content checks (tabular row counts, parsed JSON documents, PDF
+parsing) are memoized across passes by ``(path, size, mtime)``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import fnmatch
+import glob
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+_MEMO_MAX_ENTRIES = 1024
+
+_active_snapshot: contextvars.ContextVar[Optional["FilesystemSnapshot"]] = contextvars.ContextVar(
+    "verification_filesystem_snapshot",
+    default=None,
+)
+
+
+@lru_cache(maxsize=512)
+def _compile_component(component: str) -> "re.Pattern[str]":
+    return re.compile(fnmatch.translate(component))
+
+
+class _DirNode:
+    """One directory of the snapshot trie, listed on first access."""
+
+    __slots__ = ("path", "_entries", "_children")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._entries: Optional[Dict[str, os.DirEntry]] = None
+        self._children: Dict[str, "_DirNode"] = {}
+
+    def entries(self) -> Dict[str, os.DirEntry]:
+        if self._entries is None:
+            entries: Dict[str, os.DirEntry] = {}
+            try:
+                with os.scandir(self.path) as iterator:
+                    for entry in iterator:
+                        entries[entry.name] = entry
+            except OSError:
+                pass
+            self._entries = entries
+        return self._entries
+
+    def child(self, name: str) -> Optional["_DirNode"]:
+        node = self._children.get(name)
+        if node is not None:
+            return node
+        entry = self.entries().get(name)
+        if entry is None or not _is_dir(entry):
+            return None
+        node = _DirNode(os.path.join(self.path, name))
+        self._children[name] = node
+        return node
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _is_hidden(name: str) -> bool:
+    return name.startswith(".")
+
+
+def _links_to_ancestor(node: "_DirNode", entry: os.DirEntry) -> bool:
+    """True for a symlink back onto ``node`` or one of its parents (a ``**`` cycle)."""
+    try:
+        if not entry.is_symlink():
+            return False
+        target = os.path.realpath(entry.path)
+        here = os.path.realpath(node.path)
+    except OSError:
+        return True
+    return here == target or here.startswith(target.rstrip(os.sep) + os.sep)
+
+
+class FilesystemSnapshot:
+    """Lazily listed view of the filesystem, valid for one verification pass."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._roots: Dict[str, _DirNode] = {}
+        self.scandir_calls = 0
+
+    # -- trie navigation ---------------------------------------------------
+
+    def _root(self, anchor: str) -> _DirNode:
+        node = self._roots.get(anchor)
+        if node is None:
+            node = _DirNode(anchor)
+            self._roots[anchor] = node
+        return node
+
+    def _entries(self, node: _DirNode) -> Dict[str, os.DirEntry]:
+        if node._entries is None:
+            self.scandir_calls += 1
+        return node.entries()
+
+    def _directory(self, path: str) -> Optional[_DirNode]:
+        drive, rest = os.path.splitdrive(os.path.abspath(path))
+        anchor = drive + os.sep
+        node: Optional[_DirNode] = self._root(anchor)
+        for part in rest.split(os.sep):
+            if not part:
+                continue
+            if node is None:
+                return None
+            self._entries(node)
+            node = node.child(part)
+        return node
+
+    def _entry(self, path: str) -> Optional[os.DirEntry]:
+        parent, name = os.path.split(os.path.abspath(path))
+        node = self._directory(parent)
+        if node is None or not name:
+            return None
+        return self._entries(node).get(name)
+
+    # -- public API --------------------------------------------------------
+
+    def stat(self, path: str) -> Optional[os.stat_result]:
+        """Return the (cached) stat result of ``path``, or None if it is missing."""
+        with self._lock:
+            entry = self._entry(path)
+        if entry is None:
+            return None
+        try:
+            return entry.stat()
+        except OSError:
+            return None
+
+    def invalidate(self, path: str) -> None:
+        """Forget cached listings along ``path`` after the pass wrote to it."""
+        drive, rest = os.path.splitdrive(os.path.abspath(path))
+        with self._lock:
+            node = self._roots.get(drive + os.sep)
+            for part in rest.split(os.sep):
+                if node is None:
+                    return
+                node._entries = None
+                if part:
+                    node = node._children.get(part)
+
+    def glob(self, pattern: str) -> List[str]:
+        """Equivalent of ``glob.glob(pattern, recursive=True)`` for absolute patterns."""
+        if not os.path.isabs(pattern):
+            return glob.glob(pattern, recursive=True)
+        if not glob.has_magic(pattern):
+            with self._lock:
+                exists = self._entry(pattern) is not None or self._directory(pattern) is not None
+            return [pattern] if exists else []
+        parts = pattern.split(os.sep)
+        fixed: List[str] = []
+        while parts and not glob.has_magic(parts[0]):
+            fixed.append(parts.pop(0))
+        base = os.sep.join(fixed) or os.sep
+        with self._lock:
+            start = self._directory(base)
+            if start is None:
+                return []
+            results: List[str] = []
+            self._match(start, base, parts, results)
+        return results
+
+    def _match(
+        self,
+        node: _DirNode,
+        prefix: str,
+        parts: List[str],
+        results: List[str],
+    ) -> None:
+        component, rest = parts[0], parts[1:]
+        entries = self._entries(node)
+        if component == "**":
+            if not rest:
+                # Mirrors glob: "dir/**" yields "dir/" itself, then everything below.
+                results.append(os.path.join(prefix, ""))
+                self._descend_all(node, prefix, results)
+                return
+            self._match(node, prefix, rest, results)
+            for name, entry in entries.items():
+                if _is_hidden(name) or not _is_dir(entry) or _links_to_ancestor(node, entry):
+                    continue
+                child = node.child(name)
+                if child is not None:
+                    self._match(child, os.path.join(prefix, name), parts, results)
+            return
+        if not glob.has_magic(component):
+            entry = entries.get(component)
+            if entry is None:
+                return
+            names = [component]
+        else:
+            regex = _compile_component(component)
+            names = [
+                name
+                for name in entries
+                if regex.match(name) and (not _is_hidden(name) or _is_hidden(component))
+            ]
+        for name in names:
+            path = os.path.join(prefix, name)
+            if not rest:
+                results.append(path)
+                continue
+            child = node.child(name)
+            if child is not None:
+                self._match(child, path, rest, results)
+
+    def _descend_all(self, node: _DirNode, prefix: str, results: List[str]) -> None:
+        for name, entry in self._entries(node).items():
+            if _is_hidden(name):
+                continue
+            path = os.path.join(prefix, name)
+            results.append(path)
+            if _is_dir(entry) and not _links_to_ancestor(node, entry):
+                child = node.child(name)
+                if child is not None:
+                    self._descend_all(child, path, results)
+
+
+def active_snapshot() -> Optional[FilesystemSnapshot]:
+    return _active_snapshot.get()
+
+
+@contextmanager
+def verification_snapshot() -> Iterator[FilesystemSnapshot]:
+    """Activate a snapshot for the enclosed pass, reusing an enclosing one."""
+    current = _active_snapshot.get()
+    if current is not None:
+        yield current
+        return
+    snapshot = FilesystemSnapshot()
+    token = _active_snapshot.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _active_snapshot.reset(token)
+
+
+def glob_paths(pattern: str) -> List[str]:
+    """``glob.glob(pattern, recursive=True)``, served from the active snapshot if any."""
+    snapshot = _active_snapshot.get()
+    if snapshot is None:
+        return glob.glob(pattern, recursive=True)
+    return snapshot.glob(pattern)
+
+
+def invalidate_snapshot_path(path: Any) -> None:
+    snapshot = _active_snapshot.get()
+    if snapshot is not None:
+        snapshot.invalidate(str(path))
+
+
+def file_signature(path: Any) -> Optional[Tuple[str, int, int]]:
+    """``(path, size, mtime_ns)`` of a regular file, or None when it is missing."""
+    text = os.path.abspath(str(path))
+    snapshot = _active_snapshot.get()
+    stat = snapshot.stat(text) if snapshot is not None else None
+    if stat is None:
+        try:
+            stat = os.stat(text)
+        except OSError:
+            return None
+    return text, int(stat.st_size), int(stat.st_mtime_ns)
+
+
+class ContentMemo:
+    """Bounded LRU of values computed from file contents, keyed by file signature."""
+
+    def __init__(self, max_entries: int = _MEMO_MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+
+    def get_or_compute(self, path: Any, compute: Callable[[], Any], *, variant: Any = None) -> Any:
+        signature = file_signature(path)
+        if signature is None:
+            return compute()
+        key = (*signature, variant)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+tabular_row_count_memo = ContentMemo()
+json_document_memo = ContentMemo(max_entries=256)
+pdf_inspection_memo = ContentMemo()
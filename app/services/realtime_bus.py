@@ -7,14 +7,28 @@ import logging
 import os
 import socket
 import threading
+import time
 import uuid
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any, AsyncIterator, Awaitable, Callable, DefaultDict, Dict, List, Optional, Tuple
 
+from .foundation.metrics import counter, histogram
+
 logger = logging.getLogger(__name__)
 
+_PUBLISH_SECONDS = histogram(
+    "realtime_publish_seconds",
+    "Time to publish one realtime event, including in-process fan-out.",
+    ("backend", "channel"),
+)
+_DELIVERIES = counter(
+    "realtime_deliveries_total",
+    "Events handed to in-process subscriber queues.",
+    ("backend", "channel"),
+)
+
 OWNER_TTL_SECONDS = 60
 OWNER_RENEW_INTERVAL_SECONDS = 20
 
@@ -100,10 +114,13 @@ class InMemoryRealtimeBus(RealtimeBus):
         return self._lock
 
     async def publish_run_event(self, run_id: str, seq: int, payload: Dict[str, Any]) -> None:
+        started = time.perf_counter()
         async with self._get_lock():
             queues = list(self._run_subscribers.get(run_id, []))
         for queue in queues:
             await self._safe_put(queue, (seq, payload))
+        _DELIVERIES.labels("memory", "run").inc(len(queues))
+        _PUBLISH_SECONDS.labels("memory", "run").observe(time.perf_counter() - started)
 
     async def subscribe_run_events(self, run_id: str) -> EventSubscription:
         queue: asyncio.Queue = asyncio.Queue()
@@ -121,10 +138,13 @@ class InMemoryRealtimeBus(RealtimeBus):
         return AsyncQueueSubscription(queue, close_cb=_close)
 
     async def publish_job_event(self, job_id: str, payload: Dict[str, Any]) -> None:
+        started = time.perf_counter()
         async with self._get_lock():
             queues = list(self._job_subscribers.get(job_id, []))
         for queue in queues:
             await self._safe_put(queue, payload)
+        _DELIVERIES.labels("memory", "job").inc(len(queues))
+        _PUBLISH_SECONDS.labels("memory", "job").observe(time.perf_counter() - started)
 
     async def subscribe_job_events(self, job_id: str) -> EventSubscription:
         queue: asyncio.Queue = asyncio.Queue()
@@ -285,11 +305,13 @@ class RedisRealtimeBus(RealtimeBus):
         return f"rt:worker:{worker_id}:control"
 
     async def publish_run_event(self, run_id: str, seq: int, payload: Dict[str, Any]) -> None:
+        started = time.perf_counter()
         client = await self._client()
         await client.publish(
             self._run_channel(run_id),
             json.dumps({"seq": seq, "payload": payload}, ensure_ascii=False),
         )
+        _PUBLISH_SECONDS.labels("redis", "run").observe(time.perf_counter() - started)
 
     async def subscribe_run_events(self, run_id: str) -> EventSubscription:
         client = await self._client()
@@ -301,11 +323,13 @@ class RedisRealtimeBus(RealtimeBus):
         )
 
     async def publish_job_event(self, job_id: str, payload: Dict[str, Any]) -> None:
+        started = time.perf_counter()
         client = await self._client()
         await client.publish(
             self._job_channel(job_id),
             json.dumps(payload, ensure_ascii=False),
         )
+        _PUBLISH_SECONDS.labels("redis", "job").observe(time.perf_counter() - started)
 
     async def subscribe_job_events(self, job_id: str) -> EventSubscription:
         client = await self._client()
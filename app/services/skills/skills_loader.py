@@ -5,7 +5,11 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import math
+import os
+import re
 import shutil
+import threading
 import time
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
@@ -67,6 +71,84 @@ class SkillInjectionResult:
     injected_chars: int = 0
 
 
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_LEXICAL_STOPWORDS = frozenset(
+    {
+        "the", "and", "for", "with", "from", "this", "that", "into", "use", "using",
+        "when", "are", "all", "any", "its", "via", "per", "data", "task", "file", "files",
+    }
+)
+_LEXICAL_POOL_SIZE = 5
+
+
+def _index_refresh_interval() -> Optional[float]:
+    """Seconds between on-disk change checks; ``None`` disables refreshing."""
+    raw = os.getenv("SKILLS_INDEX_REFRESH_SECONDS", "").strip()
+    if not raw:
+        return 2.0
+    try:
+        value = float(raw)
+    except ValueError:
+        return 2.0
+    return value if value >= 0 else None
+
+
+def _lexical_tokens(text: str) -> List[str]:
+    return [
+        token
+        for token in _TOKEN_RE.findall(str(text or "").lower())
+        if len(token) > 2 and token not in _LEXICAL_STOPWORDS
+    ]
+
+
+class _LexicalIndex:
+    """BM25-style scorer over skill names, descriptions and selection keywords."""
+
+    _K1 = 1.2
+    _B = 0.75
+
+    def __init__(self, skills: Sequence[SkillSpec]) -> None:
+        self._term_freqs: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        document_freq: Dict[str, int] = {}
+        for skill in skills:
+            tokens = _lexical_tokens(
+                " ".join(
+                    [
+                        skill.name.replace("-", " "),
+                        skill.description,
+                        " ".join(skill.selection.keywords),
+                        " ".join(skill.selection.tool_hints),
+                    ]
+                )
+            )
+            freqs: Dict[str, int] = {}
+            for token in tokens:
+                freqs[token] = freqs.get(token, 0) + 1
+            self._term_freqs[skill.name] = freqs
+            self._lengths[skill.name] = len(tokens)
+            for token in freqs:
+                document_freq[token] = document_freq.get(token, 0) + 1
+        count = max(len(self._term_freqs), 1)
+        self._avg_length = (sum(self._lengths.values()) / count) or 1.0
+        self._idf = {
+            token: math.log(1 + (count - freq + 0.5) / (freq + 0.5))
+            for token, freq in document_freq.items()
+        }
+
+    def score(self, skill_name: str, query_tokens: Sequence[str]) -> float:
+        freqs = self._term_freqs.get(skill_name)
+        if not freqs:
+            return 0.0
+        norm = self._K1 * (1 - self._B + self._B * self._lengths[skill_name] / self._avg_length)
+        total = 0.0
+        for token in set(query_tokens):
+            tf = freqs.get(token)
+            if tf:
+                total += self._idf.get(token, 0.0) * tf * (self._K1 + 1) / (tf + norm)
+        return total
+
+
 class SkillsLoader:
     """Load skills from disk and provide selection/injection helpers."""
 
@@ -91,6 +173,12 @@ class SkillsLoader:
         self._loaded_skills: Set[str] = set()
         self._available_skills: Dict[str, SkillSpec] = {}
         self._validation_errors: Dict[str, List[str]] = {}
+        self._parsed_skill_dirs: Dict[str, Tuple[Tuple[Any, ...], Optional[SkillSpec], List[str]]] = {}
+        self._index_signature: Tuple[Any, ...] = ()
+        self._index_checked_at = 0.0
+        self._index_lock = threading.Lock()
+        self._lexical_index: Optional[Tuple[Dict[str, SkillSpec], _LexicalIndex]] = None
+        self._refresh_interval = _index_refresh_interval()
 
         logger.info("SkillsLoader initialized:")
         logger.info("  Project skills dir: %s", self.project_skills_dir)
@@ -134,14 +222,20 @@ class SkillsLoader:
             return False
 
     def _scan_skills(self) -> None:
-        self._available_skills.clear()
-        self._validation_errors.clear()
+        """Rebuild the skill index, re-parsing only skills whose files changed."""
+        self._index_signature = self._skills_dir_signature()
+        self._index_checked_at = time.monotonic()
+        # Built aside and swapped in, so concurrent readers never see a half-built index.
+        available: Dict[str, SkillSpec] = {}
+        validation_errors: Dict[str, List[str]] = {}
 
         if not self.skills_dir.exists():
             logger.warning("Skills directory not found: %s", self.skills_dir)
+            self._publish_index(available, validation_errors, {})
             return
 
         discovered_names: Set[str] = set()
+        parsed: Dict[str, Tuple[Tuple[Any, ...], Optional[SkillSpec], List[str]]] = {}
         for item in self.skills_dir.iterdir():
             if not item.is_dir():
                 continue
@@ -150,61 +244,132 @@ class SkillsLoader:
             if not skill_file.exists():
                 continue
 
-            try:
-                content = skill_file.read_text(encoding="utf-8")
-            except Exception as exc:
-                self._validation_errors[item.name] = [f"Failed to read SKILL.md: {exc}"]
-                logger.warning("Failed to read skill %s: %s", item.name, exc)
-                continue
+            signature = self._skill_files_signature(item)
+            cached = self._parsed_skill_dirs.get(item.name)
+            if cached is not None and cached[0] == signature:
+                spec, load_errors = cached[1], cached[2]
+            else:
+                spec, load_errors = self._load_skill_dir(item)
+            parsed[item.name] = (signature, spec, load_errors)
 
-            metadata = self._extract_frontmatter(content)
-            skill_name = str(metadata.get("name") or item.name).strip() or item.name
-            description = self._extract_description(content, metadata)
-
-            errors: List[str] = []
-            if skill_name in discovered_names:
-                errors.append(f"Duplicate skill name: {skill_name}")
-
-            config_path = item / "config.json"
-            config_payload: Dict[str, Any] = {}
-            has_config = config_path.exists()
-            if has_config:
-                try:
-                    raw_payload = json.loads(config_path.read_text(encoding="utf-8"))
-                    if not isinstance(raw_payload, dict):
-                        errors.append("config.json must contain a JSON object")
-                    else:
-                        config_payload = raw_payload
-                except Exception as exc:
-                    errors.append(f"Failed to parse config.json: {exc}")
-
-            references_dir = item / "references"
-            has_references_dir = references_dir.exists() and references_dir.is_dir()
-            spec, config_errors = self._build_skill_spec(
-                skill_name=skill_name,
-                description=description,
-                content=content,
-                skill_dir=item,
-                config_payload=config_payload,
-                has_config=has_config,
-                has_references_dir=has_references_dir,
-            )
-            errors.extend(config_errors)
+            errors = list(load_errors)
+            if spec is not None and spec.name in discovered_names:
+                errors.insert(0, f"Duplicate skill name: {spec.name}")
 
-            if errors:
-                self._validation_errors[item.name] = errors
+            if errors or spec is None:
+                validation_errors[item.name] = errors
                 logger.warning("Skipping invalid skill %s: %s", item.name, "; ".join(errors))
                 continue
 
-            self._available_skills[spec.name] = spec
+            available[spec.name] = spec
             discovered_names.add(spec.name)
 
-        if self._validation_errors:
+        self._publish_index(available, validation_errors, parsed)
+        if validation_errors:
             logger.warning(
                 "Skills validation completed with %d invalid skill(s)",
-                len(self._validation_errors),
+                len(validation_errors),
             )
-        logger.info("Total skills available: %d", len(self._available_skills))
+        logger.info("Total skills available: %d", len(available))
+
+    def _publish_index(
+        self,
+        available: Dict[str, SkillSpec],
+        validation_errors: Dict[str, List[str]],
+        parsed: Dict[str, Tuple[Tuple[Any, ...], Optional[SkillSpec], List[str]]],
+    ) -> None:
+        self._available_skills = available
+        self._validation_errors = validation_errors
+        self._parsed_skill_dirs = parsed
+        self._lexical_index = None
+
+    def _load_skill_dir(self, item: Path) -> Tuple[Optional[SkillSpec], List[str]]:
+        skill_file = item / "SKILL.md"
+        try:
+            content = skill_file.read_text(encoding="utf-8")
+        except Exception as exc:
+            logger.warning("Failed to read skill %s: %s", item.name, exc)
+            return None, [f"Failed to read SKILL.md: {exc}"]
+
+        metadata = self._extract_frontmatter(content)
+        skill_name = str(metadata.get("name") or item.name).strip() or item.name
+        description = self._extract_description(content, metadata)
+
+        errors: List[str] = []
+        config_path = item / "config.json"
+        config_payload: Dict[str, Any] = {}
+        has_config = config_path.exists()
+        if has_config:
+            try:
+                raw_payload = json.loads(config_path.read_text(encoding="utf-8"))
+                if not isinstance(raw_payload, dict):
+                    errors.append("config.json must contain a JSON object")
+                else:
+                    config_payload = raw_payload
+            except Exception as exc:
+                errors.append(f"Failed to parse config.json: {exc}")
+
+        references_dir = item / "references"
+        has_references_dir = references_dir.exists() and references_dir.is_dir()
+        spec, config_errors = self._build_skill_spec(
+            skill_name=skill_name,
+            description=description,
+            content=content,
+            skill_dir=item,
+            config_payload=config_payload,
+            has_config=has_config,
+            has_references_dir=has_references_dir,
+        )
+        errors.extend(config_errors)
+        return spec, errors
+
+    @staticmethod
+    def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _skill_files_signature(self, skill_dir: Path) -> Tuple[Any, ...]:
+        return (
+            self._stat_key(skill_dir),
+            self._stat_key(skill_dir / "SKILL.md"),
+            self._stat_key(skill_dir / "config.json"),
+            self._stat_key(skill_dir / "references"),
+            self._stat_key(skill_dir / "scripts"),
+        )
+
+    def _skills_dir_signature(self) -> Tuple[Any, ...]:
+        root = self._stat_key(self.skills_dir)
+        if root is None:
+            return (None,)
+        entries: List[Tuple[Any, ...]] = []
+        try:
+            with os.scandir(self.skills_dir) as iterator:
+                for entry in iterator:
+                    if entry.is_dir():
+                        entries.append((entry.name, *self._skill_files_signature(Path(entry.path))))
+        except OSError:
+            pass
+        return (root, tuple(sorted(entries)))
+
+    def _ensure_index_fresh(self) -> None:
+        """Rescan when the skills directory (or any skill's files) changed on disk."""
+        if self._refresh_interval is None:
+            return
+        now = time.monotonic()
+        if now - self._index_checked_at < self._refresh_interval:
+            return
+        with self._index_lock:
+            if now - self._index_checked_at < self._refresh_interval:
+                return
+            signature = self._skills_dir_signature()
+            self._index_checked_at = time.monotonic()
+            if signature == self._index_signature:
+                return
+            logger.info("Skills directory changed; refreshing skill index")
+            self._scan_skills()
 
     def _build_skill_spec(
         self,
@@ -427,6 +592,7 @@ class SkillsLoader:
         return "No description available"
 
     def list_skills(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        self._ensure_index_fresh()
         skills_info: List[Dict[str, Any]] = []
         for skill in sorted(self._available_skills.values(), key=lambda item: item.name):
             if category and skill.category != category:
@@ -437,6 +603,7 @@ class SkillsLoader:
         return skills_info
 
     def validate_skills(self) -> Dict[str, Any]:
+        self._ensure_index_fresh()
         return {
             "valid_skills": sorted(self._available_skills.keys()),
             "invalid_skills": {
@@ -448,9 +615,11 @@ class SkillsLoader:
         return skill_name in self._loaded_skills
 
     def get_skill(self, skill_name: str) -> Optional[SkillSpec]:
+        self._ensure_index_fresh()
         return self._available_skills.get(skill_name)
 
     def load_skill(self, skill_name: str) -> Optional[str]:
+        self._ensure_index_fresh()
         if skill_name in self._loaded_skills:
             logger.info("Skill %s already loaded, skipping", skill_name)
             return None
@@ -490,11 +659,9 @@ class SkillsLoader:
         if not skill_names or max_chars <= 0:
             return SkillInjectionResult()
 
-        selected_specs = [
-            self._available_skills[name]
-            for name in skill_names
-            if name in self._available_skills
-        ]
+        self._ensure_index_fresh()
+        available = self._available_skills
+        selected_specs = [available[name] for name in skill_names if name in available]
         selected_specs.sort(key=lambda item: (-item.priority, item.name))
 
         parts: List[str] = []
@@ -642,6 +809,7 @@ class SkillsLoader:
         return constraints
 
     def _eligible_skills(self, scope: str) -> List[SkillSpec]:
+        self._ensure_index_fresh()
         if scope == "plan":
             allowed_scopes = {"plan", "both"}
         elif scope == "task":
@@ -717,7 +885,15 @@ class SkillsLoader:
         selection_mode: str = "hybrid",
         max_skills: int = 3,
         scope: str = "task",
+        prefilter: str = "lexical",
     ) -> SkillSelectionResult:
+        """Select skills for a task.
+
+        ``prefilter`` controls which skills reach the LLM ranker when no
+        deterministic rule matches: ``"lexical"`` sends the best BM25 matches
+        of the task text (ties broken by priority), ``"priority"`` the
+        highest-priority skills.
+        """
         started = time.perf_counter()
         if max_skills <= 0:
             return SkillSelectionResult(selection_source="disabled")
@@ -734,7 +910,12 @@ class SkillsLoader:
         source = "disabled"
 
         if selection_mode == "llm_only":
-            llm_pool = self._sort_by_priority(eligible)[:5] or self._sort_by_priority(eligible)
+            llm_pool = self._llm_candidate_pool(
+                eligible,
+                task_title=task_title,
+                task_description=task_description,
+                prefilter=prefilter,
+            )
             candidate_ids = [skill.name for skill in llm_pool]
             selected_ids, source = await self._llm_rank_skills(
                 llm_service=llm_service,
@@ -761,7 +942,12 @@ class SkillsLoader:
                 source = "deterministic"
                 selected_ids = deterministic_ids[:max_skills]
             else:
-                llm_pool = self._sort_by_priority(eligible)[:5] or self._sort_by_priority(eligible)
+                llm_pool = self._llm_candidate_pool(
+                    eligible,
+                    task_title=task_title,
+                    task_description=task_description,
+                    prefilter=prefilter,
+                )
                 fallback_candidates = []
                 candidate_ids = [skill.name for skill in llm_pool]
 
@@ -872,6 +1058,29 @@ Tool hints: {tool_summary}
             ]
             return fallback, "llm_fallback"
 
+    def _llm_candidate_pool(
+        self,
+        eligible: Sequence[SkillSpec],
+        *,
+        task_title: str,
+        task_description: str,
+        prefilter: str,
+    ) -> List[SkillSpec]:
+        by_priority = self._sort_by_priority(eligible)
+        if prefilter != "lexical":
+            return by_priority[:_LEXICAL_POOL_SIZE]
+        available = self._available_skills
+        cached = self._lexical_index
+        if cached is not None and cached[0] is available:
+            index = cached[1]
+        else:
+            index = _LexicalIndex(list(available.values()))
+            self._lexical_index = (available, index)
+        query = _lexical_tokens(f"{task_title}\n{task_description}")
+        scores = {skill.name: index.score(skill.name, query) for skill in by_priority}
+        ranked = sorted(by_priority, key=lambda skill: -scores[skill.name])
+        return ranked[:_LEXICAL_POOL_SIZE]
+
     def _sort_by_priority(self, skills: Sequence[SkillSpec]) -> List[SkillSpec]:
         return sorted(skills, key=lambda item: (-item.priority, item.name))
 
@@ -911,6 +1120,7 @@ Tool hints: {tool_summary}
         logger.info("Reset loaded skills")
 
     def get_skills_summary_for_llm(self) -> str:
+        self._ensure_index_fresh()
         if not self._available_skills:
             return "No skills available"
 
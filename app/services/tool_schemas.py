@@ -9,8 +9,10 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -101,15 +103,130 @@ def _build_bio_tools_schema_description() -> str:
     )
 
 
+def _read_only(self: Any, *args: Any, **kwargs: Any) -> None:
+    raise TypeError("cached tool schemas are read-only; copy.deepcopy() one to modify it")
+
+
+class _FrozenDict(dict):
+    """dict that rejects mutation; copies and pickles come back as plain dicts."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return _thaw(self)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (dict, (_thaw(self),))
+
+
+class _FrozenList(list):
+    """list that rejects mutation; copies and pickles come back as plain lists."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> List[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        return _thaw(self)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (list, (_thaw(self),))
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return _FrozenList(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class ToolSchemaList(list):
+    """Tool schema list that also carries its pre-serialized JSON.
+
+    The JSON array is built once per tool set and reused across requests so
+    LLM clients can splice it into the request body instead of encoding the
+    (large, unchanging) tool definitions on every turn.  The schemas are
+    read-only snapshots taken when the JSON was built, so they cannot drift
+    from it; the list itself may still be edited.
+    """
+
+    _serialized: str = ""
+    _serialized_ids: Tuple[int, ...] = ()
+
+    def serialized_json(self) -> str:
+        # Callers may append or replace entries; only trust the cached JSON
+        # while the list still holds exactly the schemas it was built from.
+        if self._serialized and tuple(map(id, self)) == self._serialized_ids:
+            return self._serialized
+        return json.dumps(list(self), ensure_ascii=False)
+
+
+_SCHEMA_CACHE_SIZE = 64
+_schema_registry_version = 0
+_schema_cache: "OrderedDict[Tuple[Any, ...], Tuple[List[Dict[str, Any]], str]]" = OrderedDict()
+_schema_cache_lock = threading.Lock()
+
+
+def invalidate_tool_schema_cache() -> None:
+    """Bump the registry version after mutating a registry schema in place."""
+    global _schema_registry_version
+    with _schema_cache_lock:
+        _schema_registry_version += 1
+        _schema_cache.clear()
+
+
+def _cached_schema_list(
+    names: Sequence[str],
+    *,
+    include_final_answer: bool,
+) -> ToolSchemaList:
+    selected = [(name, TOOL_REGISTRY.get(name)) for name in names]
+    # Schema identities are part of the key so replacing a registry entry
+    # is picked up without an explicit invalidation.
+    key = (
+        _schema_registry_version,
+        include_final_answer,
+        tuple((name, id(schema)) for name, schema in selected if schema is not None),
+    )
+    with _schema_cache_lock:
+        cached = _schema_cache.get(key)
+        if cached is not None:
+            _schema_cache.move_to_end(key)
+    if cached is None:
+        schemas = [_freeze(schema) for _, schema in selected if schema is not None]
+        if include_final_answer:
+            schemas.append(_freeze(SUBMIT_FINAL_ANSWER_SCHEMA))
+        cached = (schemas, json.dumps(schemas, ensure_ascii=False))
+        with _schema_cache_lock:
+            _schema_cache[key] = cached
+            while len(_schema_cache) > _SCHEMA_CACHE_SIZE:
+                _schema_cache.popitem(last=False)
+    result = ToolSchemaList(cached[0])
+    result._serialized = cached[1]
+    result._serialized_ids = tuple(map(id, cached[0]))
+    return result
+
+
 def build_tool_schemas(available_tools: List[str]) -> List[Dict[str, Any]]:
     """Build the tools payload for native tool calling from available tool names."""
-    schemas = []
-    for name in available_tools:
-        schema = TOOL_REGISTRY.get(name)
-        if schema is not None:
-            schemas.append(schema)
-    schemas.append(SUBMIT_FINAL_ANSWER_SCHEMA)
-    return schemas
+    return _cached_schema_list(available_tools, include_final_answer=True)
 
 
 # Tools available to PlanExecutor for task execution.
@@ -144,12 +261,7 @@ def build_executor_tool_schemas(available_tools: Optional[List[str]] = None) ->
     to the plan execution loop.
     """
     tools = available_tools if available_tools is not None else EXECUTOR_AVAILABLE_TOOLS
-    schemas = []
-    for name in tools:
-        schema = TOOL_REGISTRY.get(name)
-        if schema is not None:
-            schemas.append(schema)
-    return schemas
+    return _cached_schema_list(tools, include_final_answer=False)
 
 
 SUBMIT_FINAL_ANSWER_SCHEMA: Dict[str, Any] = {
@@ -520,6 +632,13 @@ TOOL_REGISTRY: Dict[str, Dict[str, Any]] = {
                         "type": "string",
                         "description": "Background job id used with operation='job_status'.",
                     },
+                    "force": {
+                        "type": "boolean",
+                        "description": (
+                            "If true, re-run even when an identical run (same inputs, params "
+                            "and container image) is cached. Default false reuses cached results."
+                        ),
+                    },
                 },
                 "required": ["tool_name", "operation"],
             },
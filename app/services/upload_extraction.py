@@ -0,0 +1,381 @@
+"""Background extraction of uploaded archives.
+
+Uploads return as soon as the archive is on disk; extraction runs in a small
+worker pool and streams every member to disk while enforcing zip-bomb limits
+(total bytes, member count, expansion ratio) on the bytes actually written
+rather than on header claims.  Progress is recorded as events on an
+:class:`ExtractionJob`, which the upload routes expose for polling and SSE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import tarfile
+import threading
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COPY_BUFFER_SIZE = 1024 * 1024
+DEFAULT_MAX_EXTRACTED_BYTES = 100 * 1024 * 1024 * 1024  # 100GB
+DEFAULT_MAX_MEMBERS = 100_000
+DEFAULT_MAX_RATIO = 200
+# Expansion below this size is never treated as a bomb, whatever the ratio.
+RATIO_FLOOR_BYTES = 64 * 1024 * 1024
+PROGRESS_INTERVAL_SECONDS = 0.5
+MAX_RETAINED_JOBS = 256
+
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+
+class ArchiveRejected(ValueError):
+    """The archive is unsafe or exceeds the extraction limits."""
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        value = int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+@dataclass(frozen=True)
+class ExtractionLimits:
+    max_bytes: int = DEFAULT_MAX_EXTRACTED_BYTES
+    max_members: int = DEFAULT_MAX_MEMBERS
+    max_ratio: int = DEFAULT_MAX_RATIO
+
+    @classmethod
+    def from_env(cls) -> "ExtractionLimits":
+        return cls(
+            max_bytes=_env_int("UPLOAD_EXTRACT_MAX_BYTES", DEFAULT_MAX_EXTRACTED_BYTES),
+            max_members=_env_int("UPLOAD_EXTRACT_MAX_FILES", DEFAULT_MAX_MEMBERS),
+            max_ratio=_env_int("UPLOAD_EXTRACT_MAX_RATIO", DEFAULT_MAX_RATIO),
+        )
+
+
+def detect_archive_format(path: Path) -> Optional[str]:
+    if zipfile.is_zipfile(path):
+        return "zip"
+    if tarfile.is_tarfile(path):
+        return "tar"
+    return None
+
+
+def _is_within_directory(base_dir: Path, target_path: Path) -> bool:
+    base_dir = base_dir.resolve()
+    target_path = target_path.resolve()
+    return os.path.commonpath([str(base_dir), str(target_path)]) == str(base_dir)
+
+
+class _ExtractionBudget:
+    """Counts written bytes and members against :class:`ExtractionLimits`."""
+
+    def __init__(
+        self,
+        limits: ExtractionLimits,
+        archive_size: int,
+        progress: Optional[Callable[[int, int], None]],
+    ) -> None:
+        self.limits = limits
+        self.archive_size = max(archive_size, 1)
+        self.progress = progress
+        self.files = 0
+        self.bytes = 0
+        self._last_report = 0.0
+
+    def add_member(self) -> None:
+        self.files += 1
+        if self.files > self.limits.max_members:
+            raise ArchiveRejected(f"Archive has more than {self.limits.max_members} entries")
+
+    def add_bytes(self, count: int) -> None:
+        self.bytes += count
+        if self.bytes > self.limits.max_bytes:
+            raise ArchiveRejected(f"Archive expands beyond {self.limits.max_bytes} bytes")
+        if self.bytes > RATIO_FLOOR_BYTES and self.bytes > self.archive_size * self.limits.max_ratio:
+            raise ArchiveRejected(
+                f"Archive expands more than {self.limits.max_ratio}x its compressed size"
+            )
+        self.report()
+
+    def report(self, *, force: bool = False) -> None:
+        if self.progress is None:
+            return
+        now = time.monotonic()
+        if force or now - self._last_report >= PROGRESS_INTERVAL_SECONDS:
+            self._last_report = now
+            self.progress(self.files, self.bytes)
+
+
+def _member_target(dest_dir: Path, name: str) -> Path:
+    target = dest_dir / name
+    if not _is_within_directory(dest_dir, target):
+        raise ArchiveRejected("Archive entry escapes destination directory")
+    return target
+
+
+def _copy_member(source: Any, target: Path, budget: _ExtractionBudget) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "wb") as handle:
+        while chunk := source.read(COPY_BUFFER_SIZE):
+            budget.add_bytes(len(chunk))
+            handle.write(chunk)
+
+
+def _extract_zip(path: Path, dest_dir: Path, budget: _ExtractionBudget) -> None:
+    with zipfile.ZipFile(path) as archive:
+        members = archive.infolist()
+        for member in members:
+            _member_target(dest_dir, member.filename)
+        for member in members:
+            target = _member_target(dest_dir, member.filename)
+            if member.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            budget.add_member()
+            with archive.open(member) as source:
+                _copy_member(source, target, budget)
+
+
+def _extract_tar(path: Path, dest_dir: Path, budget: _ExtractionBudget) -> None:
+    with tarfile.open(path) as archive:
+        # Streamed iteration: compressed tarballs are decompressed once.
+        for member in archive:
+            if member.islnk() or member.issym():
+                raise ArchiveRejected("Archive links are not allowed for security reasons")
+            target = _member_target(dest_dir, member.name)
+            if member.isdir():
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            if not member.isfile():
+                continue
+            budget.add_member()
+            source = archive.extractfile(member)
+            if source is None:
+                continue
+            with source:
+                _copy_member(source, target, budget)
+
+
+def extract_archive(
+    path: Path,
+    dest_dir: Path,
+    *,
+    limits: Optional[ExtractionLimits] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """Extract ``path`` into ``dest_dir`` and return the number of files written."""
+    archive_format = detect_archive_format(path)
+    if archive_format is None:
+        raise ArchiveRejected("Unsupported archive format. Only .zip and .tar are allowed")
+    budget = _ExtractionBudget(limits or ExtractionLimits.from_env(), path.stat().st_size, progress)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    if archive_format == "zip":
+        _extract_zip(path, dest_dir, budget)
+    else:
+        _extract_tar(path, dest_dir, budget)
+    budget.report(force=True)
+    return budget.files
+
+
+@dataclass
+class ExtractionJob:
+    extraction_id: str
+    session_id: str
+    archive_path: str
+    extracted_path: str
+    status: str = "queued"
+    extracted_files: int = 0
+    extracted_bytes: int = 0
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    _changed: threading.Condition = field(default_factory=threading.Condition, repr=False)
+    # Async watchers, woken on their own loop so none holds a worker thread.
+    _watchers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = field(
+        default_factory=list, repr=False
+    )
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def _record(self, event_type: str, **fields: Any) -> None:
+        with self._changed:
+            for key, value in fields.items():
+                setattr(self, key, value)
+            self.events.append({"type": event_type, **self.to_dict(include_events=False)})
+            self._changed.notify_all()
+            watchers = list(self._watchers)
+        for loop, wake in watchers:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:  # the watcher's loop has closed
+                pass
+
+    async def events_after(self, index: int, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Events from position ``index`` on, waiting up to ``timeout`` for new ones."""
+        watcher = (asyncio.get_running_loop(), asyncio.Event())
+        with self._changed:
+            if len(self.events) > index or self.done:
+                return list(self.events[index:])
+            self._watchers.append(watcher)
+        try:
+            await asyncio.wait_for(watcher[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._changed:
+                self._watchers.remove(watcher)
+        with self._changed:
+            return list(self.events[index:])
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while not self.done:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def to_dict(self, *, include_events: bool = True) -> Dict[str, Any]:
+        payload = {
+            "extraction_id": self.extraction_id,
+            "session_id": self.session_id,
+            "archive_path": self.archive_path,
+            "extracted_path": self.extracted_path,
+            "status": self.status,
+            "extracted_files": self.extracted_files,
+            "extracted_bytes": self.extracted_bytes,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+        if include_events:
+            payload["events"] = list(self.events)
+        return payload
+
+
+class ArchiveExtractionManager:
+    """Runs archive extractions on a bounded thread pool and tracks their jobs."""
+
+    def __init__(self, max_workers: int = 2, limits: Optional[ExtractionLimits] = None) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="archive-extract")
+        self._limits = limits
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, ExtractionJob]" = OrderedDict()
+
+    def submit(self, *, session_id: str, archive_path: Path, dest_dir: Path) -> ExtractionJob:
+        job = ExtractionJob(
+            extraction_id=uuid.uuid4().hex[:12],
+            session_id=session_id,
+            archive_path=str(archive_path),
+            extracted_path=str(dest_dir),
+        )
+        job._record("queued")
+        with self._lock:
+            self._jobs[job.extraction_id] = job
+            self._prune()
+        self._executor.submit(self._run, job, Path(archive_path), Path(dest_dir))
+        return job
+
+    def get(self, extraction_id: str) -> Optional[ExtractionJob]:
+        with self._lock:
+            return self._jobs.get(extraction_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _prune(self) -> None:
+        finished = [key for key, job in self._jobs.items() if job.done]
+        for key in finished[: max(0, len(self._jobs) - MAX_RETAINED_JOBS)]:
+            self._jobs.pop(key, None)
+
+    def _run(self, job: ExtractionJob, archive_path: Path, dest_dir: Path) -> None:
+        job._record("started", status="running")
+
+        def _progress(files: int, written: int) -> None:
+            job._record("progress", extracted_files=files, extracted_bytes=written)
+
+        try:
+            files = extract_archive(
+                archive_path,
+                dest_dir,
+                limits=self._limits or ExtractionLimits.from_env(),
+                progress=_progress,
+            )
+        except Exception as exc:
+            shutil.rmtree(dest_dir, ignore_errors=True)
+            if not isinstance(exc, ArchiveRejected):
+                logger.error("Archive extraction failed for %s: %s", archive_path, exc)
+            job._record("failed", status="failed", error=str(exc), finished_at=time.time())
+            return
+        job._record("completed", status="completed", extracted_files=files, finished_at=time.time())
+
+
+def describe_attachment_extraction(attachment: Dict[str, Any]) -> Optional[str]:
+    """Prompt note for an attachment's extracted archive, or None if it has none.
+
+    The extracted path is only handed to the agent once extraction has
+    completed; until then the directory may be partial, and a failed
+    extraction removes it.  The live job status wins over the status the
+    client last saw.
+    """
+    extracted_path = str(attachment.get("extracted_path") or "").strip()
+    extraction_id = str(attachment.get("extraction_id") or "").strip()
+    if not extracted_path and not extraction_id:
+        return None
+    status = attachment.get("extraction_status")
+    error = attachment.get("extraction_error")
+    job = get_archive_extraction_manager().get(extraction_id) if extraction_id else None
+    if job is not None:
+        status, error = job.status, job.error
+    elif status in (None, "completed"):
+        # Legacy synchronous extraction, or a job that is no longer tracked.
+        status = "completed" if extracted_path and Path(extracted_path).is_dir() else "missing"
+    if status == "completed":
+        return f"extracted: {extracted_path}"
+    if status in ("queued", "running"):
+        return "extraction still in progress; extracted files are not available yet"
+    if status == "failed":
+        reason = f" ({error})" if error else ""
+        return f"extraction failed{reason}; extracted files are not available"
+    return "extracted files are not available"
+
+
+_manager: Optional[ArchiveExtractionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_archive_extraction_manager() -> ArchiveExtractionManager:
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ArchiveExtractionManager(
+                    max_workers=_env_int("UPLOAD_EXTRACT_WORKERS", 2),
+                )
+    return _manager
+
+
+def shutdown_archive_extraction_manager() -> None:
+    global _manager
+    with _manager_lock:
+        manager, _manager = _manager, None
+    if manager is not None:
+        manager.shutdown()
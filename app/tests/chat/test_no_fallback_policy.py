@@ -1983,10 +1983,12 @@ def test_expert_evaluator_raises_instead_of_fallback(
     expert_role = next(iter(evaluator.experts.values()))
 
     with pytest.raises(RuntimeError, match="Expert evaluation failed"):
-        evaluator._evaluate_with_single_expert(
-            expert_role=expert_role,
-            content="content",
-            task_context={"name": "task"},
+        asyncio.run(
+            evaluator._evaluate_with_single_expert(
+                expert_role=expert_role,
+                content="content",
+                task_context={"name": "task"},
+            )
         )
 
 
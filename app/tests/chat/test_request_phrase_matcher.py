@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+from app.routers.chat import phrase_matcher as phrase_matcher_module
+from app.routers.chat import request_routing
+from app.routers.chat.phrase_matcher import PhraseMatcher
+
+
+def _substring_categories(tables, text):
+    return {name for name, phrases in tables.items() if any(p.lower() in text for p in phrases)}
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "你好",
+        "帮我创建一个研究计划，然后开始执行",
+        "please review the current plan and optimize dependencies",
+        "任务 123456 的状态怎么样了",
+        "不要创建计划，直接回答",
+        "unzip data/raw/archive.zip and delete the zip afterwards",
+        "",
+    ],
+)
+def test_routing_automaton_matches_substring_scan(message: str) -> None:
+    lowered = message.lower()
+    tables = request_routing._PHRASE_TABLES
+
+    assert set(request_routing._PHRASE_MATCHER.categories_in(lowered)) == _substring_categories(
+        tables, lowered
+    )
+
+
+def test_pure_python_automaton_handles_overlapping_phrases(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(phrase_matcher_module, "ahocorasick", None)
+    tables = {
+        "a": ("he", "she"),
+        "b": ("his", "hers"),
+        "c": ("继续执行", "执行"),
+        "d": ("ushers",),
+    }
+    matcher = PhraseMatcher(tables)
+    assert matcher.backend == "python"
+
+    rng = random.Random(7)
+    alphabet = "hersiu继续执行 "
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 24)))
+        assert set(matcher.categories_in(text)) == _substring_categories(tables, text)
+
+
+def test_contains_any_falls_back_for_unregistered_sequences() -> None:
+    assert request_routing._contains_any("Please UPDATE it", ("update", "更新")) is True
+    assert request_routing._contains_any("nothing here", ("update",)) is False
+    assert request_routing._contains_any("Search the web", request_routing._RESEARCH_PHRASES) is True
+
+
+def test_every_phrase_category_used_by_routing_is_registered() -> None:
+    source = Path(request_routing.__file__).read_text(encoding="utf-8")
+    used = set(re.findall(r'_has_phrase(?:_lowered)?\([^()]*?,\s*"([a-z_]+)"\)', source))
+    assert used
+    assert used <= set(request_routing._PHRASE_TABLES)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from app.database import init_db, plan_db_connection
+from app.repository import plan_storage
+from app.repository.plan_repository import PlanRepository
+from app.repository.plan_storage import get_plan_db_path
+from app.services.plans import artifact_contracts
+from app.services.plans.artifact_contracts import (
+    artifact_manifest_is_current,
+    artifact_manifest_path,
+    artifact_manifest_version,
+    flush_artifact_manifest_exports,
+    load_artifact_manifest,
+    save_artifact_manifest,
+)
+from app.services.plans.status_resolver import PlanStatusResolver
+
+
+@pytest.fixture
+def plan_id(isolated_app_env: Dict[str, Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> int:
+    monkeypatch.chdir(tmp_path)
+    init_db()
+    return PlanRepository().create_plan("manifest").id
+
+
+def _entry(alias: str, task_id: int, path: str) -> Dict[str, object]:
+    return {"alias": alias, "path": path, "producer_task_id": task_id, "validated": True}
+
+
+def _row_versions(plan_id: int) -> Dict[str, int]:
+    with plan_db_connection(get_plan_db_path(plan_id)) as conn:
+        rows = conn.execute("SELECT alias, version FROM artifact_manifest WHERE session_key=''").fetchall()
+    return {row["alias"]: row["version"] for row in rows}
+
+
+def test_manifest_rows_are_upserted_per_alias_and_versioned(plan_id: int) -> None:
+    save_artifact_manifest(plan_id, {"artifacts": {"a": _entry("a", 1, "/x/a.csv")}})
+    manifest = {"artifacts": {"b": _entry("b", 2, "/x/b.csv")}, "note": "first"}
+    save_artifact_manifest(plan_id, manifest)
+
+    assert manifest["version"] == 2
+    assert artifact_manifest_version(plan_id) == 2
+    assert _row_versions(plan_id) == {"a": 1, "b": 2}
+
+    # Re-saving the full manifest only touches the entry that changed.
+    loaded = load_artifact_manifest(plan_id)
+    assert loaded["note"] == "first" and set(loaded["artifacts"]) == {"a", "b"}
+    loaded["artifacts"]["b"] = _entry("b", 2, "/x/b_v2.csv")
+    save_artifact_manifest(plan_id, loaded)
+    assert _row_versions(plan_id) == {"a": 1, "b": 3}
+
+    save_artifact_manifest(plan_id, load_artifact_manifest(plan_id))
+    assert artifact_manifest_version(plan_id) == 3
+
+    flush_artifact_manifest_exports(plan_id)
+    exported = json.loads(artifact_manifest_path(plan_id).read_text(encoding="utf-8"))
+    assert exported["version"] == 3
+    assert exported["artifacts"]["b"]["path"] == "/x/b_v2.csv"
+
+
+def test_legacy_json_manifest_is_imported_once(plan_id: int) -> None:
+    path = artifact_manifest_path(plan_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({"plan_id": plan_id, "artifacts": {"legacy": _entry("legacy", 4, "/x/l.txt")}}),
+        encoding="utf-8",
+    )
+
+    assert set(load_artifact_manifest(plan_id)["artifacts"]) == {"legacy"}
+    assert artifact_manifest_version(plan_id) == 1
+
+    path.write_text(json.dumps({"plan_id": plan_id, "artifacts": {}}), encoding="utf-8")
+    save_artifact_manifest(plan_id, {"artifacts": {"new": _entry("new", 5, "/x/n.txt")}})
+    assert set(load_artifact_manifest(plan_id)["artifacts"]) == {"legacy", "new"}
+
+
+def test_sessions_keep_separate_manifests(plan_id: int) -> None:
+    save_artifact_manifest(plan_id, {"artifacts": {"a": _entry("a", 1, "/x/a.csv")}})
+    save_artifact_manifest(plan_id, {"artifacts": {"s": _entry("s", 1, "/x/s.csv")}}, "sess-1")
+
+    assert set(load_artifact_manifest(plan_id)["artifacts"]) == {"a"}
+    assert set(load_artifact_manifest(plan_id, "sess-1")["artifacts"]) == {"s"}
+    flush_artifact_manifest_exports(plan_id)
+    assert artifact_manifest_path(plan_id, "sess-1").exists()
+
+
+def test_json_export_is_deferred_and_coalesced(plan_id: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    writes = []
+    original = artifact_contracts._write_manifest_json
+
+    def _counting(path, payload, *, fsync):
+        writes.append(payload["version"])
+        original(path, payload, fsync=fsync)
+
+    monkeypatch.setattr(artifact_contracts, "_write_manifest_json", _counting)
+    for index in range(3):
+        save_artifact_manifest(plan_id, {"artifacts": {f"a{index}": _entry(f"a{index}", 1, f"/x/{index}")}})
+
+    assert writes == []
+    assert not artifact_manifest_path(plan_id).exists()
+    flush_artifact_manifest_exports(plan_id)
+    flush_artifact_manifest_exports(plan_id)
+
+    assert writes == [3]
+    exported = json.loads(artifact_manifest_path(plan_id).read_text(encoding="utf-8"))
+    assert set(exported["artifacts"]) == {"a0", "a1", "a2"}
+
+
+def test_unchanged_manifest_is_not_reloaded(plan_id: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    save_artifact_manifest(plan_id, {"artifacts": {"a": _entry("a", 1, "/x/a.csv")}})
+    loads = []
+    original = plan_storage.load_artifact_manifest_record
+
+    def _counting(*args, **kwargs):
+        loads.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(plan_storage, "load_artifact_manifest_record", _counting)
+    monkeypatch.setattr(
+        plan_storage,
+        "_ensure_artifact_manifest_tables",
+        lambda conn: pytest.fail("manifest tables are created at plan database init"),
+    )
+    resolver = PlanStatusResolver()
+    tree = PlanRepository().get_plan_tree(plan_id)
+
+    first = resolver._load_manifest(plan_id, None)
+    assert resolver._load_manifest(plan_id, None) is first
+    assert artifact_manifest_is_current(plan_id, first)
+    assert len(loads) == 1
+
+    save_artifact_manifest(plan_id, {"artifacts": {"b": _entry("b", 2, "/x/b.csv")}})
+    assert not artifact_manifest_is_current(plan_id, first)
+    resolver.resolve_plan_states(plan_id, tree)
+    assert set(resolver._load_manifest(plan_id, None)["artifacts"]) == {"a", "b"}
+    assert len(loads) == 2
+
+
+def test_plans_without_database_keep_json_manifest(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DB_ROOT", str(tmp_path / "db"))
+    from app.config.database_config import reset_database_config
+
+    reset_database_config()
+    try:
+        path = save_artifact_manifest(987, {"artifacts": {"a": _entry("a", 1, "/x/a.csv")}})
+        save_artifact_manifest(987, {"artifacts": {"b": _entry("b", 2, "/x/b.csv")}})
+
+        assert set(json.loads(path.read_text(encoding="utf-8"))["artifacts"]) == {"a", "b"}
+        assert "version" not in load_artifact_manifest(987)
+        assert artifact_manifest_version(987) == 0
+        assert not get_plan_db_path(987).exists()
+    finally:
+        reset_database_config()
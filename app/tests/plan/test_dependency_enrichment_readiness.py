@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import json
+import random
+import time
 
 from app.services.plans.dependency_enrichment import (
+    _DependencyReachability,
     check_artifact_readiness,
     enrich_plan_dependencies,
 )
@@ -220,3 +223,83 @@ def test_fuzzy_match_prefers_higher_similarity() -> None:
 
     assert 41 in consumer.dependencies
     assert 40 not in consumer.dependencies
+
+
+def _naive_reaches(tree: PlanTree, src: int, dst: int) -> bool:
+    seen = set()
+    stack = [src]
+    while stack:
+        current = stack.pop()
+        if current == dst:
+            return True
+        if current in seen:
+            continue
+        seen.add(current)
+        stack.extend(node.id for node in tree.iter_nodes() if current in node.dependencies)
+    return False
+
+
+def test_reachability_index_matches_graph_search_as_edges_are_added() -> None:
+    rng = random.Random(7)
+    nodes = [PlanNode(id=i, plan_id=700, name=f"Task {i}") for i in range(1, 31)]
+    for node in nodes:
+        node.dependencies = sorted(rng.sample(range(1, node.id), min(node.id - 1, rng.randint(0, 2))))
+    nodes[3].dependencies.append(20)  # cycle 4 -> 20 -> ... -> 4 region
+    nodes[19].dependencies.append(4)
+    tree = _tree(700, *nodes)
+    index = _DependencyReachability(tree)
+
+    for _ in range(15):
+        consumer, producer = rng.sample(range(1, 31), 2)
+        if not index.would_create_cycle(producer, consumer):
+            tree.nodes[consumer].dependencies.append(producer)
+            index.add_dependency(consumer, producer)
+
+    for src in range(1, 31):
+        for dst in range(1, 31):
+            assert index.reaches(src, dst) == _naive_reaches(tree, src, dst), (src, dst)
+
+
+def test_structural_enrichment_wires_aggregator_to_sibling_frontier() -> None:
+    parent = PlanNode(id=1, plan_id=701, name="Survey")
+    collect_a = PlanNode(id=2, plan_id=701, name="collect papers on A", parent_id=1, position=0)
+    collect_b = PlanNode(id=3, plan_id=701, name="collect papers on B", parent_id=1, position=1)
+    summary_b = PlanNode(id=4, plan_id=701, name="notes for B", parent_id=1, position=2, dependencies=[3])
+    merge = PlanNode(id=5, plan_id=701, name="merge all notes", parent_id=1, position=3)
+    tree = _tree(701, parent, collect_a, collect_b, summary_b, merge)
+
+    result = enrich_plan_dependencies(tree)
+
+    assert sorted(merge.dependencies) == [2, 4]
+    assert collect_a.dependencies == [] and collect_b.dependencies == []
+    assert {edge.producer_task_id for edge in result.added_edges} == {2, 4}
+
+
+def test_structural_enrichment_scales_to_large_plans() -> None:
+    nodes = [PlanNode(id=1, plan_id=702, name="Root")]
+    for section in range(40):
+        section_id = 2 + section * 51
+        nodes.append(PlanNode(id=section_id, plan_id=702, name=f"Section {section}", parent_id=1))
+        for offset in range(1, 51):
+            task_id = section_id + offset
+            name = "merge section drafts" if offset == 50 else f"write part {offset}"
+            deps = [task_id - 1] if offset % 10 else []
+            nodes.append(
+                PlanNode(
+                    id=task_id,
+                    plan_id=702,
+                    name=name,
+                    parent_id=section_id,
+                    position=offset,
+                    dependencies=deps,
+                )
+            )
+    tree = _tree(702, *nodes)
+
+    started = time.perf_counter()
+    result = enrich_plan_dependencies(tree)
+    elapsed = time.perf_counter() - started
+
+    assert result.error is None
+    assert len(result.added_edges) == 40 * 5
+    assert elapsed < 2.0
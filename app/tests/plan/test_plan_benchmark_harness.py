@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import pytest
+
+from app.services.evaluation import benchmark
+from app.services.evaluation.perf_suite import compare_perf_reports, run_perf_suite
+
+
+class _FakeTaskRepo:
+    def __init__(self) -> None:
+        self.tasks: Dict[int, Dict[str, Any]] = {}
+
+    def create_task(self, *, name: str, **_: Any) -> int:
+        task_id = len(self.tasks) + 1
+        self.tasks[task_id] = {"id": task_id, "name": name}
+        return task_id
+
+    def upsert_task_input(self, task_id: int, prompt: str) -> None:
+        self.tasks[task_id]["prompt"] = prompt
+
+    def get_task_info(self, task_id: int) -> Dict[str, Any]:
+        return self.tasks.get(task_id)
+
+
+def _fake_execute(**_: Any) -> SimpleNamespace:
+    score = random.random()
+    return SimpleNamespace(
+        evaluation=SimpleNamespace(overall_score=score, dimensions=SimpleNamespace(relevance=score)),
+        iterations=1,
+        execution_time=0.0,
+        content=f"section scored {score:.6f}",
+    )
+
+
+@pytest.fixture
+def fake_benchmark_env(monkeypatch: pytest.MonkeyPatch) -> _FakeTaskRepo:
+    repo = _FakeTaskRepo()
+    monkeypatch.setattr(benchmark, "init_db", lambda: None)
+    monkeypatch.setattr(benchmark, "default_repo", repo)
+    monkeypatch.setattr(benchmark, "execute_task_with_llm_evaluation", _fake_execute)
+    return repo
+
+
+def test_benchmark_configs_are_seeded_independently_of_workers(
+    fake_benchmark_env: _FakeTaskRepo,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    configs = ["base,use_context=false", "ctx,use_context=true,max_chars=3000"]
+
+    sequential = benchmark.run_benchmark("phage", configs, sections=3, seed=7)
+    # One task set per config, and no unused up-front set.
+    assert len(fake_benchmark_env.tasks) == 2 * 3
+    repeated = benchmark.run_benchmark("phage", configs, sections=3, seed=7)
+
+    monkeypatch.setattr(benchmark, "_process_pool", lambda workers: ThreadPoolExecutor(max_workers=1))
+    created = len(fake_benchmark_env.tasks)
+    parallel = benchmark.run_benchmark("phage", configs, sections=3, seed=7, workers=2)
+    assert len(fake_benchmark_env.tasks) - created == 2 * 3
+
+    assert sequential["metrics"] == repeated["metrics"]
+    assert parallel["metrics"] == sequential["metrics"]
+    assert list(parallel["metrics"]) == ["base", "ctx"]
+    assert parallel["metrics"]["base"]["seed"] != parallel["metrics"]["ctx"]["seed"]
+    assert benchmark.run_benchmark("phage", configs, sections=3, seed=8)["metrics"] != sequential["metrics"]
+
+
+def test_perf_suite_emits_report_in_isolated_storage(tmp_path: Path) -> None:
+    db_root_before = os.environ.get("DB_ROOT")
+
+    report = run_perf_suite(
+        ["plan_tree_load", "executor_scheduling", "tool_cache_throughput"],
+        repeat=2,
+        warmup=0,
+        scale=0.05,
+        workdir=str(tmp_path),
+    )
+
+    assert os.environ.get("DB_ROOT") == db_root_before
+    assert report["suite"] == "perf"
+    assert set(report["results"]) == {"plan_tree_load", "executor_scheduling", "tool_cache_throughput"}
+    for result in report["results"].values():
+        assert result["ops"] > 0
+        assert len(result["samples_ms"]) == 2
+        assert result["median_ms"] >= result["min_ms"]
+
+    with pytest.raises(ValueError, match="Unknown perf cases"):
+        run_perf_suite(["no_such_case"], workdir=str(tmp_path))
+
+
+def test_perf_comparison_applies_per_case_thresholds() -> None:
+    baseline = {"results": {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}, "gone": {"median_ms": 1.0}}}
+    current = {"results": {"a": {"median_ms": 12.0}, "b": {"median_ms": 12.0}, "new": {"median_ms": 1.0}}}
+
+    comparison = compare_perf_reports(baseline, current, threshold=0.1, case_thresholds={"b": 0.25})
+
+    statuses = {row["case"]: row["status"] for row in comparison["cases"]}
+    assert statuses == {"a": "regression", "b": "ok", "gone": "missing", "new": "new"}
+    assert comparison["ok"] is False
+    assert compare_perf_reports(baseline, current, threshold=0.5)["ok"] is True
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from app.database import init_db
+from app.database_pool import get_db
+from app.repository import plan_storage
+from app.repository.plan_repository import PlanRepository, recover_interrupted_plan
+from app.services.plans.plan_recovery import (
+    PlanRecoveryPending,
+    PlanRecoveryTracker,
+)
+
+
+@pytest.fixture
+def repo(isolated_app_env: Dict[str, Path]) -> PlanRepository:
+    init_db()
+    return PlanRepository()
+
+
+def test_registry_tracks_active_tasks_and_jobs(repo: PlanRepository) -> None:
+    busy = repo.create_plan("busy", owner="alice")
+    idle = repo.create_plan("idle", owner="alice")
+    task = repo.create_task(busy.id, name="step")
+    repo.create_task(idle.id, name="step")
+    assert plan_storage.list_plans_needing_recovery() == []
+
+    repo.update_task(busy.id, task.id, status="running")
+    plan_storage.record_decomposition_job(
+        busy.id,
+        job_id="job-1",
+        job_type="plan_decompose",
+        mode="single",
+        target_task_id=None,
+        owner_id="alice",
+        session_id=None,
+        status="running",
+    )
+    assert plan_storage.list_plans_needing_recovery() == [busy.id]
+
+    repo.update_task(busy.id, task.id, status="completed")
+    assert plan_storage.clear_plan_recovery_if_idle(busy.id) is False
+
+    plan_storage.update_decomposition_job_status(busy.id, job_id="job-1", status="succeeded")
+    assert plan_storage.list_plans_needing_recovery() == []
+
+
+def test_recovery_resets_interrupted_work_and_clears_mark(repo: PlanRepository) -> None:
+    plan = repo.create_plan("interrupted", owner="alice")
+    task = repo.create_task(plan.id, name="step")
+    repo.update_task(plan.id, task.id, status="running", execution_result="")
+    plan_storage.record_decomposition_job(
+        plan.id,
+        job_id="job-2",
+        job_type="plan_execute",
+        mode="full",
+        target_task_id=None,
+        owner_id="alice",
+        session_id=None,
+        status="queued",
+    )
+
+    assert recover_interrupted_plan(plan.id) == 1
+
+    assert repo.get_plan_tree(plan.id).nodes[task.id].status == "pending"
+    assert plan_storage.load_decomposition_job(plan.id, "job-2")["status"] == "failed"
+    assert plan_storage.list_plans_needing_recovery() == []
+
+
+def test_registry_backfills_existing_plans_once(repo: PlanRepository) -> None:
+    plan = repo.create_plan("legacy", owner="alice")
+    with get_db() as conn:
+        conn.execute("DROP TABLE plan_recovery_registry")
+
+    init_db()
+    assert plan_storage.list_plans_needing_recovery() == [plan.id]
+
+    recover_interrupted_plan(plan.id)
+    init_db()
+    assert plan_storage.list_plans_needing_recovery() == []
+
+
+def test_tracker_recovers_in_background_with_bounded_concurrency() -> None:
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+    visited: List[int] = []
+
+    def _recover(plan_id: int) -> int:
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+            visited.append(plan_id)
+        return 1
+
+    tracker = PlanRecoveryTracker(recover=_recover)
+    tracker.schedule(range(1, 9))
+
+    assert asyncio.run(tracker.run(max_concurrency=3)) == 8
+    assert sorted(visited) == list(range(1, 9))
+    assert state["peak"] == 3
+    assert tracker.pending_plan_ids() == []
+
+
+def test_tracker_gate_recovers_inline_or_reports_pending() -> None:
+    release = threading.Event()
+    calls: List[int] = []
+
+    def _recover(plan_id: int) -> int:
+        calls.append(plan_id)
+        if plan_id == 1:
+            release.wait(5)
+        return 0
+
+    tracker = PlanRecoveryTracker(recover=_recover)
+    tracker.schedule([1, 2])
+
+    assert tracker.wait(99, timeout=0) is True
+    assert tracker.wait(2, timeout=0) is True
+    assert calls == [2]
+
+    worker = threading.Thread(target=tracker.recover, args=(1,))
+    worker.start()
+    while 1 not in calls:
+        time.sleep(0.01)
+    assert tracker.wait(1, timeout=0.05) is False
+    release.set()
+    worker.join()
+    assert tracker.wait(1, timeout=0) is True
+    assert calls == [2, 1]
+
+
+def test_plan_endpoint_answers_503_while_plan_is_recovering(
+    app_client_factory,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import app.routers.plan_routes as plan_routes
+    from app.services.plans import plan_recovery
+
+    tracker = PlanRecoveryTracker(recover=lambda _plan_id: 0)
+    monkeypatch.setattr(plan_recovery, "_tracker", tracker)
+    monkeypatch.setattr(plan_routes, "_PLAN_RECOVERY_WAIT_SECONDS", 0.05)
+
+    with app_client_factory() as client:
+        plan = PlanRepository().create_plan("gated")
+        tracker.schedule([plan.id])
+        tracker._claimed.add(plan.id)
+
+        response = client.get(f"/plans/{plan.id}/tree")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert client.get("/plans").status_code == 200
+
+        with pytest.raises(PlanRecoveryPending):
+            plan_recovery.ensure_plan_recovered(plan.id, timeout=0)
+
+        tracker._claimed.discard(plan.id)
+        assert client.get(f"/plans/{plan.id}/tree").status_code == 200
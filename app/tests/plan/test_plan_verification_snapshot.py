@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from app.services.plans import verification_snapshot
+from app.services.plans.plan_models import PlanNode, PlanTree
+from app.services.plans.task_verification import TaskVerificationService
+from app.services.plans.verification_snapshot import (
+    FilesystemSnapshot,
+    json_document_memo,
+    tabular_row_count_memo,
+    verification_snapshot as snapshot_context,
+)
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    root = tmp_path / "run"
+    for rel in (
+        "results/a.csv",
+        "results/b.tsv",
+        "results/nested/c.csv",
+        "results/nested/deep/d.csv",
+        "results/.hidden/e.csv",
+        "results/.dot.csv",
+        "figures/plot.png",
+        "figures/sub/plot2.png",
+        "notes.txt",
+    ):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x\n", encoding="utf-8")
+    os.symlink(root / "results", root / "results" / "nested" / "loop")
+    return root
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "*.txt",
+        "results/*.csv",
+        "results/**/*.csv",
+        "results/**",
+        "**/*.png",
+        "**/sub/*.png",
+        "results/.*.csv",
+        "*/nested/*",
+        "results/[ab].*",
+        "results/a.csv",
+        "missing/**/*.csv",
+    ],
+)
+def test_snapshot_glob_matches_stdlib_glob(tree: Path, pattern: str) -> None:
+    absolute = str(tree / pattern)
+    expected = glob.glob(absolute, recursive=True)
+    if "**" in pattern:
+        # Stdlib follows the symlink cycle until ELOOP; the snapshot stops at it.
+        expected = [item for item in expected if "loop" not in Path(item).parts[:-1]]
+
+    assert sorted(FilesystemSnapshot().glob(absolute)) == sorted(expected)
+
+
+def test_one_pass_lists_each_directory_once(tree: Path) -> None:
+    service = TaskVerificationService()
+    with snapshot_context() as snapshot:
+        for _ in range(5):
+            for pattern in ("results/**/*.csv", "figures/*.png", "results/*.tsv"):
+                patterns = service._resolve_glob_patterns(pattern, tree, ())
+                assert service._glob_matches(patterns)
+        listed = snapshot.scandir_calls
+    # Root anchor plus each ancestor of the tree and every directory below it.
+    directories = sum(1 for _ in tree.rglob("*") if _.is_dir() and not _.is_symlink()) + 1
+    assert listed <= len(tree.parts) + directories
+
+
+def test_snapshot_sees_files_materialized_during_the_pass(tmp_path: Path) -> None:
+    with snapshot_context():
+        assert verification_snapshot.glob_paths(str(tmp_path / "out" / "*.csv")) == []
+        target = tmp_path / "out" / "table.csv"
+        target.parent.mkdir()
+        target.write_text("a\n1\n", encoding="utf-8")
+        verification_snapshot.invalidate_snapshot_path(target)
+        assert verification_snapshot.glob_paths(str(tmp_path / "out" / "*.csv")) == [str(target)]
+
+
+def test_tabular_row_count_is_memoized_by_size_and_mtime(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    tabular_row_count_memo.clear()
+    path = tmp_path / "table.csv"
+    path.write_text("a,b\n1,2\n3,4\n", encoding="utf-8")
+    calls: List[Path] = []
+    original = TaskVerificationService._count_tabular_rows
+
+    def _counting(target: Path) -> int:
+        calls.append(target)
+        return original(target)
+
+    monkeypatch.setattr(TaskVerificationService, "_count_tabular_rows", staticmethod(_counting))
+
+    assert TaskVerificationService._read_tabular_row_count(path) == 2
+    assert TaskVerificationService._read_tabular_row_count(path) == 2
+    assert len(calls) == 1
+
+    path.write_text("a,b\n1,2\n3,4\n5,6\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert TaskVerificationService._read_tabular_row_count(path) == 3
+    assert len(calls) == 2
+
+
+def test_glob_checks_resolve_through_the_snapshot(tree: Path) -> None:
+    node = PlanNode(
+        id=1,
+        plan_id=7,
+        name="Collect results",
+        metadata={
+            "acceptance_criteria": {
+                "category": "file_data",
+                "blocking": True,
+                "checks": [
+                    {"type": "glob_count_at_least", "glob": "results/**/*.csv", "min_count": 3},
+                    {"type": "glob_nonempty", "glob": "figures/*.png"},
+                ],
+            }
+        },
+    )
+    finalization = TaskVerificationService().finalize_payload(
+        node,
+        {
+            "status": "success",
+            "content": "done",
+            "metadata": {"task_directory_full": str(tree)},
+        },
+        execution_status="completed",
+    )
+
+    verification = finalization.payload["metadata"]["verification"]
+    assert verification["status"] == "passed"
+    assert verification_snapshot.active_snapshot() is None
+
+
+class _BatchRepo:
+    def __init__(self, tree: PlanTree) -> None:
+        self.tree = tree
+        self.tree_loads = 0
+        self.updates: List[int] = []
+
+    def get_plan_tree(self, plan_id: int) -> PlanTree:
+        self.tree_loads += 1
+        return self.tree
+
+    def update_task(self, plan_id: int, task_id: int, **_: object) -> None:
+        self.updates.append(task_id)
+
+
+def _row_count_tree(root: Path, task_count: int) -> PlanTree:
+    nodes = {}
+    for task_id in range(1, task_count + 1):
+        nodes[task_id] = PlanNode(
+            id=task_id,
+            plan_id=7,
+            name=f"Summarize shard {task_id}",
+            status="completed",
+            execution_result=json.dumps({
+                "status": "success",
+                "content": "done",
+                "metadata": {"task_directory_full": str(root)},
+            }),
+            metadata={
+                "acceptance_criteria": {
+                    "category": "file_data",
+                    "blocking": True,
+                    "checks": [
+                        {"type": "json_field_at_least", "path": "results/table.csv", "key_path": "row_count", "min_value": 2},
+                        {"type": "json_field_equals", "path": f"results/summary_{task_id % 3}.json", "key_path": "ok", "expected": True},
+                    ],
+                }
+            },
+        )
+    nodes[task_count + 1] = PlanNode(id=task_count + 1, plan_id=7, name="Not run yet")
+    tree = PlanTree(id=7, title="batch", nodes=nodes)
+    tree.rebuild_adjacency()
+    return tree
+
+
+def test_batch_verification_reads_each_distinct_file_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    tabular_row_count_memo.clear()
+    json_document_memo.clear()
+    results = tmp_path / "run" / "results"
+    results.mkdir(parents=True)
+    (results / "table.csv").write_text("a,b\n1,2\n3,4\n", encoding="utf-8")
+    for index in range(3):
+        (results / f"summary_{index}.json").write_text('{"ok": true}', encoding="utf-8")
+    repo = _BatchRepo(_row_count_tree(tmp_path / "run", 30))
+
+    counted: List[str] = []
+    original = TaskVerificationService._count_tabular_rows
+
+    def _counting(target: Path) -> int:
+        counted.append(threading.current_thread().name)
+        return original(target)
+
+    monkeypatch.setattr(TaskVerificationService, "_count_tabular_rows", staticmethod(_counting))
+    service = TaskVerificationService()
+    prefetched: List[int] = []
+    original_prefetch = service._prefetch_content_checks
+
+    def _recording_prefetch(entries, **kwargs):
+        prefetched.append(original_prefetch(entries, **kwargs))
+        return prefetched[-1]
+
+    monkeypatch.setattr(service, "_prefetch_content_checks", _recording_prefetch)
+
+    finalizations = service.verify_tasks(repo, plan_id=7, dry_run=True, max_workers=4)
+
+    assert sorted(finalizations) == list(range(1, 31))
+    assert all(item.payload["metadata"]["verification"]["status"] == "passed" for item in finalizations.values())
+    assert repo.tree_loads == 1 and repo.updates == []
+    assert prefetched == [4]
+    assert len(counted) == 1 and counted[0].startswith("verify-prefetch")
+
+    report = service.dry_run_reverify_plan(repo, plan_id=7)
+    assert report["summary"]["would_pass"] == 30
+    assert report["summary"]["unverifiable"] == 1
+    assert len(counted) == 1
+
+    with pytest.raises(ValueError, match="not found"):
+        service.verify_tasks(repo, plan_id=7, task_ids=[999])
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 
 from app.services.plans.artifact_contracts import canonical_artifact_path, save_artifact_manifest
+from app.services.plans.artifact_preflight import ArtifactPreflightService
 from app.services.plans.plan_models import PlanNode, PlanTree
 from app.services.plans.status_resolver import PlanStatusResolver
 from app.services.plans.task_verification import TaskVerificationService, VerificationFinalization
@@ -474,3 +475,109 @@ def test_task_verifier_keeps_manually_accepted_publish_gap_completed(monkeypatch
     assert finalization.final_status == "completed"
     assert finalization.payload["status"] == "completed"
     assert finalization.payload["metadata"]["artifact_authority"]["status"] == "failed"
+
+
+def test_incremental_resolver_only_re_resolves_affected_tasks(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    alias = "general.evidence_md"
+    tree = _tree(
+        40,
+        PlanNode(id=1, plan_id=40, name="Composite stage"),
+        PlanNode(
+            id=2,
+            plan_id=40,
+            name="Produce evidence",
+            parent_id=1,
+            metadata={"artifact_contract": {"publishes": [alias]}},
+        ),
+        PlanNode(
+            id=3,
+            plan_id=40,
+            name="Consume evidence",
+            parent_id=1,
+            dependencies=[2],
+            metadata={"artifact_contract": {"requires": [alias]}},
+        ),
+        PlanNode(id=4, plan_id=40, name="Report", dependencies=[1]),
+        PlanNode(id=5, plan_id=40, name="Unrelated"),
+    )
+    manifest = {"plan_id": 40, "artifacts": {}}
+    resolver = PlanStatusResolver()
+    incremental = resolver.incremental(40, tree, manifest=manifest)
+    assert incremental.states() == resolver.resolve_plan_states(40, tree, manifest=manifest)
+    assert incremental.last_resolved_task_ids == []
+
+    contract_builds = []
+    original = ArtifactPreflightService._build_contract_snapshot
+
+    def _counting(self, plan_id, node, session_id=None):
+        contract_builds.append(node.id)
+        return original(self, plan_id, node, session_id)
+
+    monkeypatch.setattr(ArtifactPreflightService, "_build_contract_snapshot", _counting)
+
+    canonical = canonical_artifact_path(40, alias)
+    canonical.parent.mkdir(parents=True, exist_ok=True)
+    canonical.write_text("evidence", encoding="utf-8")
+    tree.nodes[2].status = "completed"
+    tree.nodes[2].execution_result = json.dumps({"status": "completed", "content": "ok"})
+    manifest["artifacts"][alias] = {
+        "alias": alias,
+        "path": str(canonical.resolve()),
+        "producer_task_id": 2,
+        "source_path": str(canonical.resolve()),
+    }
+
+    states = incremental.states(manifest=manifest)
+
+    assert contract_builds == [2]
+    assert incremental.last_resolved_task_ids == [1, 2, 3, 4]
+    assert incremental.full_resolutions == 1
+    assert states[2]["effective_status"] == "completed"
+    assert states[3]["effective_status"] == "pending"
+    assert states[1]["reason_code"] == "composite_partial"
+    monkeypatch.setattr(ArtifactPreflightService, "_build_contract_snapshot", original)
+    assert states == resolver.resolve_plan_states(40, tree, manifest=manifest)
+
+
+def test_incremental_resolver_rebuilds_when_plan_structure_changes(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    tree = _tree(
+        41,
+        PlanNode(id=1, plan_id=41, name="First"),
+        PlanNode(id=2, plan_id=41, name="Second"),
+    )
+    resolver = PlanStatusResolver()
+    incremental = resolver.incremental(41, tree, manifest={"plan_id": 41, "artifacts": {}})
+
+    tree.nodes[2].dependencies = [1]
+    states = incremental.states()
+
+    assert incremental.full_resolutions == 2
+    assert states[2]["effective_status"] == "blocked"
+    assert states[2]["incomplete_dependencies"] == [1]
+
+
+def test_incremental_resolver_detects_in_place_metadata_edits(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    alias = "general.evidence_md"
+    tree = _tree(
+        42,
+        PlanNode(id=1, plan_id=42, name="Produce evidence"),
+        PlanNode(id=2, plan_id=42, name="Consume evidence", dependencies=[1]),
+    )
+    manifest = {"plan_id": 42, "artifacts": {}}
+    resolver = PlanStatusResolver()
+    incremental = resolver.incremental(42, tree, manifest=manifest)
+
+    tree.nodes[2].metadata = {"artifact_contract": {"requires": [alias]}}
+    states = incremental.states()
+
+    assert incremental.last_resolved_task_ids == [2]
+    assert states == resolver.resolve_plan_states(42, tree, manifest=manifest)
+
+    tree.nodes[2].metadata["artifact_contract"]["requires"].append("general.report_md")
+    states = incremental.states()
+
+    assert incremental.last_resolved_task_ids == [2]
+    assert states == resolver.resolve_plan_states(42, tree, manifest=manifest)
@@ -24,7 +24,9 @@ from app.services.plans.todo_list import (
     _classify_task_label,
     _collect_leaf_ids,
     _compute_phase_layers,
+    composite_leaf_index,
 )
+from app.services.plans import todo_list as todo_list_module
 
 
 # ── Helpers ──────────────────────────────────────────────────────
@@ -218,6 +220,49 @@ class TestCollectLeafIds:
         leaves = _collect_leaf_ids(composite_tree, [1, 2, 4])
         assert len(leaves) == len(set(leaves))
 
+    def test_leaf_index_is_built_once_per_tree_structure(
+        self, composite_tree: PlanTree, monkeypatch: pytest.MonkeyPatch
+    ):
+        builds: List[int] = []
+        original = todo_list_module._build_leaf_index
+
+        def _counting(tree: PlanTree):
+            builds.append(tree.id)
+            return original(tree)
+
+        monkeypatch.setattr(todo_list_module, "_build_leaf_index", _counting)
+        index = composite_leaf_index(composite_tree)
+        assert index[1] == (4, 5, 3)
+        assert index[2] == (4, 5)
+        assert index[3] == (3,)
+        assert _collect_leaf_ids(composite_tree, [2, 1]) == [4, 5, 3]
+        build_full_plan_todo_list(composite_tree)
+        assert builds == [1]
+
+        composite_tree.nodes[6] = _node(6, "Sub-step C", parent_id=2)
+        composite_tree.rebuild_adjacency()
+        assert composite_leaf_index(composite_tree)[1] == (4, 5, 6, 3)
+        assert builds == [1, 1]
+
+    def test_deep_composite_dependencies_expand_from_the_index(self):
+        """Composite-to-composite dependencies across a deep nest resolve to leaves."""
+        depth = 60
+        nodes = [_node(1, "outer", parent_id=None)]
+        for level in range(2, depth + 1):
+            nodes.append(_node(level, f"level {level}", parent_id=level - 1))
+        nodes.append(_node(1000, "sibling leaf", parent_id=depth - 1))
+        nodes.append(_node(2000, "consumer", deps=[1, 2, 3]))
+        tree = _tree(nodes)
+
+        todo = build_full_plan_todo_list(tree, ordering_mode="dependency_phase")
+        items = {item.task_id: item for phase in todo.phases for item in phase.items}
+        assert items[2000].dependencies == [1, 2, 3]
+
+        scoped = build_todo_list(tree, 2000)
+        scoped_items = {item.task_id: item for phase in scoped.phases for item in phase.items}
+        assert set(scoped_items) == {depth, 1000, 2000}
+        assert scoped_items[2000].dependencies == [depth, 1000]
+
 
 # ── Tests: build_todo_list ──────────────────────────────────────
 
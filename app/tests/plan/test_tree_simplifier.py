@@ -14,7 +14,10 @@ from copy import deepcopy
 from app.services.plans.dag_models import DAG, DAGNode
 from app.services.plans.plan_models import PlanNode, PlanTree
 from app.services.plans.tree_simplifier import TreeSimplifier
-from app.services.plans.similarity_matcher import SimpleSimilarityMatcher
+from app.services.plans.similarity_matcher import (
+    EmbeddingSimilarityMatcher,
+    SimpleSimilarityMatcher,
+)
 
 
 class TestDAGNode:
@@ -244,5 +247,95 @@ class TestSimpleSimilarityMatcher:
         assert matcher.should_merge(node1, node2) is False
 
 
+class _KeywordEmbedder:
+    """Embeds texts as keyword-count vectors and records every call."""
+
+    VOCAB = ("install", "dependencies", "build", "project", "test", "run", "deploy", "pip", "npm")
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(text.lower().count(word)) for word in self.VOCAB] + [0.01] for text in texts]
+
+
+class _FakeLLM:
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    def chat(self, prompt):
+        self.prompts.append(prompt)
+        return self.response
+
+
+class TestEmbeddingSimilarityMatcher:
+    """EmbeddingSimilarityMatcher"""
+
+    def _nodes(self):
+        return [
+            DAGNode(id=1, name="Install dependencies", instruction="pip install", source_node_ids=[1]),
+            DAGNode(id=2, name="Install dependencies", instruction="pip install", source_node_ids=[2]),
+            DAGNode(id=3, name="Install npm dependencies", instruction="npm install", source_node_ids=[3]),
+            DAGNode(id=4, name="Build project", instruction="run build", source_node_ids=[4]),
+        ]
+
+    def test_only_ambiguous_pairs_reach_the_llm_once(self):
+        embedder = _KeywordEmbedder()
+        llm = _FakeLLM('[{"id1": 1, "id2": 3, "can_merge": false, "similarity": 0.4},'
+                       ' {"id1": 2, "id2": 3, "can_merge": false, "similarity": 0.4}]')
+        matcher = EmbeddingSimilarityMatcher(threshold=0.5, accept_threshold=0.95, embed=embedder)
+        matcher._llm = llm
+        nodes = self._nodes()
+
+        pairs = matcher.find_similar_pairs(nodes)
+
+        assert [(a, b) for a, b, _ in pairs] == [(1, 2)]
+        assert len(llm.prompts) == 1
+        assert "[1] vs [3]" in llm.prompts[0] and "[2] vs [3]" in llm.prompts[0]
+        assert "Build project" not in llm.prompts[0]
+        # Identical content is embedded once: three distinct nodes, name + instruction each.
+        assert len(embedder.calls) == 1 and len(embedder.calls[0]) == 6
+
+        # Decisions and vectors are reused for unchanged content.
+        assert matcher.should_merge(nodes[0], nodes[1]) is True
+        assert matcher.should_merge(nodes[0], nodes[2]) is False
+        assert matcher.find_similar_pairs(nodes) == pairs
+        assert len(llm.prompts) == 1 and len(embedder.calls) == 1
+
+        # Editing a node only re-embeds that node.
+        nodes[3].instruction = "run build and test"
+        matcher.find_similar_pairs(nodes)
+        assert embedder.calls[-1] == ["Build project", "run build and test"]
+
+    def test_falls_back_to_name_overlap_when_embeddings_fail(self):
+        def _broken(texts):
+            raise RuntimeError("embedding backend down")
+
+        matcher = EmbeddingSimilarityMatcher(threshold=0.9, embed=_broken, use_llm=False)
+        pairs = matcher.find_similar_pairs(self._nodes())
+        assert [(a, b) for a, b, _ in pairs] == [(1, 2)]
+
+    def test_simplifier_merges_with_embedding_matcher(self):
+        matcher = EmbeddingSimilarityMatcher(threshold=0.99, embed=_KeywordEmbedder(), use_llm=False)
+        simplifier = TreeSimplifier(matcher=matcher)
+        tree = PlanTree(
+            id=1,
+            title="Test Plan",
+            nodes={
+                1: PlanNode(id=1, plan_id=1, name="Root", parent_id=None),
+                2: PlanNode(id=2, plan_id=1, name="Install dependencies", parent_id=1),
+                3: PlanNode(id=3, plan_id=1, name="Install dependencies", parent_id=1),
+                4: PlanNode(id=4, plan_id=1, name="Build project", parent_id=1),
+            },
+        )
+        tree.rebuild_adjacency()
+
+        dag = simplifier.simplify(tree)
+
+        assert dag.node_count() == 3
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
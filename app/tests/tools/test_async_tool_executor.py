@@ -7,6 +7,8 @@ Validates that:
 4. Results returned in original submission order
 5. Exceptions in one tool don't crash others
 6. classify_tool_concurrency respects registry metadata
+7. Declared read/write resources let unrelated reads and writes overlap
+8. Paths resolve like the file tools see them; unknown footprints run alone
 """
 
 from __future__ import annotations
@@ -16,8 +18,12 @@ import time
 import pytest
 
 from app.services.execution.async_tool_executor import (
+    UNKNOWN_RESOURCES,
     PendingToolCall,
+    ToolResources,
+    build_conflict_graph,
     classify_tool_concurrency,
+    classify_tool_resources,
     execute_with_concurrency,
 )
 from tool_box.tools import get_tool_registry, register_tool
@@ -235,3 +241,149 @@ class TestClassifyToolConcurrency:
         register_all_tools()
         assert classify_tool_concurrency("code_executor") is False
         assert classify_tool_concurrency("terminal_session") is False
+
+
+# ---------------------------------------------------------------------------
+# Resource-aware scheduling
+# ---------------------------------------------------------------------------
+
+def _resource_call(index, name, execution_order, *, reads=(), writes=(), delay=0.05):
+    async def _factory():
+        execution_order.append(f"start:{name}")
+        await asyncio.sleep(delay)
+        execution_order.append(f"end:{name}")
+        return {"tool": name, "success": True}
+
+    return PendingToolCall(
+        index=index,
+        tool_name=name,
+        coroutine_factory=_factory,
+        resources=ToolResources.of(reads=reads, writes=writes),
+    )
+
+
+class TestResourceConflictScheduling:
+    def test_conflict_graph_orders_only_overlapping_calls(self):
+        order = []
+        calls = [
+            _resource_call(0, "read_a", order, reads=["path:data/a.csv"]),
+            _resource_call(1, "write_dir", order, writes=["path:results"]),
+            _resource_call(2, "read_result", order, reads=["path:results/summary.md"]),
+            _resource_call(3, "plan_get", order, reads=["plan:7"]),
+            PendingToolCall(4, "code_executor", lambda: None, is_concurrent_safe=False),
+            PendingToolCall(5, "web_search", lambda: None, is_concurrent_safe=True),
+        ]
+
+        graph = build_conflict_graph(calls)
+
+        assert graph[0] == []
+        assert graph[1] == []
+        assert graph[2] == [1]
+        assert graph[3] == []
+        assert graph[4] == [0, 1, 2, 3]
+        assert graph[5] == [1, 4]  # undeclared safe tools may read anything
+
+    @pytest.mark.asyncio
+    async def test_unrelated_reads_and_writes_run_in_parallel(self):
+        order = []
+        calls = [
+            _resource_call(0, "read_a", order, reads=["path:data/a.csv"], delay=0.1),
+            _resource_call(1, "write_b", order, writes=["path:out/b.txt"], delay=0.1),
+            _resource_call(2, "read_c", order, reads=["path:data/c.csv"], delay=0.1),
+            _resource_call(3, "read_b", order, reads=["path:out/b.txt"], delay=0.01),
+        ]
+
+        t0 = time.monotonic()
+        results = await execute_with_concurrency(calls)
+        elapsed = time.monotonic() - t0
+
+        assert [r["tool"] for r in results] == ["read_a", "write_b", "read_c", "read_b"]
+        assert elapsed < 0.25, f"Expected one parallel wave, took {elapsed:.2f}s"
+        assert order.index("end:write_b") < order.index("start:read_b")
+        assert order.index("start:read_c") < order.index("end:write_b")
+
+    def test_registered_tools_declare_resources_from_arguments(self):
+        register_all_tools()
+        context = {"session_id": "s1", "plan_id": 3}
+
+        write = classify_tool_resources(
+            "file_operations", {"operation": "write", "path": "out/report.md"}, context=context
+        )
+        read = classify_tool_resources(
+            "document_reader", {"operation": "read_pdf", "file_path": "data/paper.pdf"}, context=context
+        )
+        plan_read = classify_tool_resources("plan_operation", {"operation": "get"}, context=context)
+        submit = classify_tool_resources("deliverable_submit", {}, context=context)
+
+        assert len(write.writes) == 1 and next(iter(write.writes)).endswith("/workspace/out/report.md")
+        assert not write.conflicts_with(read)
+        assert plan_read == ToolResources.of(reads=["plan:3"])
+        assert submit.conflicts_with(write)
+        assert classify_tool_resources("web_search", {"query": "x"}) == ToolResources()
+        assert classify_tool_resources("file_operations", {"operation": "chmod"}) is None
+        assert classify_tool_resources("code_executor", {"task": "x"}) is None
+
+    def test_relative_and_absolute_paths_to_one_file_conflict(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("APP_RUNTIME_ROOT", str(tmp_path))
+        register_all_tools()
+        context = {"session_id": "s1"}
+        absolute = tmp_path / "session_s1" / "workspace" / "foo.csv"
+
+        relative_write = classify_tool_resources(
+            "file_operations", {"operation": "write", "path": "foo.csv"}, context=context
+        )
+        absolute_write = classify_tool_resources(
+            "file_operations", {"operation": "write", "path": str(absolute)}, context=context
+        )
+        submit = classify_tool_resources(
+            "deliverable_submit", {"artifacts": [{"path": str(absolute)}]}, context={}
+        )
+        other_session = classify_tool_resources(
+            "deliverable_submit", {"artifacts": []}, context={"session_id": "s2"}
+        )
+
+        assert relative_write == absolute_write
+        assert absolute_write.conflicts_with(ToolResources.of(writes=["session:s1"]))
+        assert not absolute_write.conflicts_with(other_session)
+        assert submit == UNKNOWN_RESOURCES  # no session to publish into
+        published = classify_tool_resources(
+            "deliverable_submit", {"artifacts": [{"path": str(absolute)}]}, context={"session_id": "s2"}
+        )
+        assert published.conflicts_with(absolute_write)
+
+    def test_unresolvable_footprints_run_alone(self):
+        register_all_tools()
+
+        for name, arguments in [
+            ("file_operations", {"operation": "write"}),
+            ("file_operations", {"operation": "copy", "path": "a.txt"}),
+            ("document_reader", {}),
+            ("literature_pipeline", {"query": "phage"}),
+            ("deliverable_submit", {"artifacts": [{"module": "image_tabular"}]}),
+        ]:
+            resources = classify_tool_resources(name, arguments, context={"session_id": "s1"})
+            assert resources == UNKNOWN_RESOURCES, name
+            assert resources.conflicts_with(ToolResources.of(reads=["plan:1"]))
+
+    def test_sequence_fetch_calls_write_the_tool_output_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("APP_RUNTIME_ROOT", str(tmp_path))
+        register_all_tools()
+
+        unnamed = classify_tool_resources("sequence_fetch", {"accession": "NC_001416"})
+        other_unnamed = classify_tool_resources("sequence_fetch", {"accession": "NC_000913"})
+        named = classify_tool_resources(
+            "sequence_fetch", {"accession": "NC_001416", "output_name": "lambda"}
+        )
+        other_named = classify_tool_resources(
+            "sequence_fetch", {"accession": "NC_000913", "output_name": "ecoli"}
+        )
+
+        assert unnamed != UNKNOWN_RESOURCES and unnamed.conflicts_with(other_unnamed)
+        assert unnamed.conflicts_with(named)
+        assert next(iter(named.writes)).endswith("/lambda.fasta")
+        assert not named.conflicts_with(other_named)
+        in_session = classify_tool_resources(
+            "sequence_fetch", {"accession": "NC_001416", "session_id": "s1"}
+        )
+        assert next(iter(in_session.writes)).startswith(f"path:{tmp_path}")
+        assert not in_session.conflicts_with(unnamed)
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import os
+import stat
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from tool_box.bio_tools import result_cache
+
+bio_handler_module = importlib.import_module("tool_box.bio_tools.bio_tools_handler")
+
+_FAKE_DOCKER = """#!{python}
+import os, sys
+from pathlib import Path
+
+args = sys.argv[1:]
+log = Path(os.environ["FAKE_DOCKER_LOG"])
+if args[:2] == ["image", "inspect"]:
+    print(os.environ.get("FAKE_DOCKER_IMAGE_ID", "sha256:fakeimage"))
+    sys.exit(0)
+with log.open("a") as handle:
+    handle.write(" ".join(args) + "\\n")
+mounts = {{}}
+for index, arg in enumerate(args):
+    if arg == "-v":
+        host, _, rest = args[index + 1].partition(":")
+        mounts[rest.split(":")[0]] = host
+output = args[args.index("-o") + 1]
+source = args[args.index("-o") - 1]
+source_host = Path(mounts["/input"]) / Path(source).name
+(Path(mounts["/work"]) / output).write_text(source_host.read_text().upper())
+print("fake seqkit done")
+"""
+
+
+@pytest.fixture
+def fake_docker(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    shim = bin_dir / "docker"
+    shim.write_text(_FAKE_DOCKER.format(python=sys.executable), encoding="utf-8")
+    shim.chmod(shim.stat().st_mode | stat.S_IEXEC)
+    log_path = tmp_path / "docker_calls.log"
+    log_path.write_text("", encoding="utf-8")
+
+    runtime_dir = tmp_path / "runtime"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv("FAKE_DOCKER_LOG", str(log_path))
+    monkeypatch.setenv("BIO_TOOLS_RESULT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(bio_handler_module, "RUNTIME_BASE_DIR", str(runtime_dir))
+    monkeypatch.setattr(result_cache, "_image_digest_memo", {})
+    return log_path
+
+
+def _run_seq(input_file: Path, **kwargs: Any) -> Dict[str, Any]:
+    return asyncio.run(
+        bio_handler_module._execute_local_bio_tool(
+            tool_name="seqkit",
+            operation="seq",
+            input_file=str(input_file),
+            output_file=None,
+            params={"output": "out.fa"},
+            timeout=30,
+            **kwargs,
+        )
+    )
+
+
+def _docker_runs(log_path: Path) -> int:
+    return len([line for line in log_path.read_text().splitlines() if line.startswith("run")])
+
+
+def test_identical_local_run_is_served_from_result_cache(fake_docker: Path, tmp_path: Path) -> None:
+    input_file = tmp_path / "genome.fa"
+    input_file.write_text(">seq1\nacgt\n", encoding="utf-8")
+
+    first = _run_seq(input_file)
+    assert first["success"] is True
+    assert first["cache_hit"] is False
+    assert _docker_runs(fake_docker) == 1
+
+    output = tmp_path / "runtime" / "seqkit" / "out.fa"
+    output.unlink()
+
+    second = _run_seq(input_file)
+    assert second["success"] is True
+    assert second["cache_hit"] is True
+    assert second["cache_key"] == first["cache_key"]
+    assert second["stdout"] == first["stdout"]
+    assert _docker_runs(fake_docker) == 1
+    assert output.read_text() == ">SEQ1\nACGT\n"
+    assert str(output) in second["restored_files"]
+
+
+def test_changed_input_content_or_image_misses_cache(
+    fake_docker: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    input_file = tmp_path / "genome.fa"
+    input_file.write_text(">seq1\nacgt\n", encoding="utf-8")
+    _run_seq(input_file)
+
+    input_file.write_text(">seq1\nttttt\n", encoding="utf-8")
+    changed_input = _run_seq(input_file)
+    assert changed_input["cache_hit"] is False
+
+    monkeypatch.setenv("FAKE_DOCKER_IMAGE_ID", "sha256:rebuilt")
+    monkeypatch.setattr(result_cache, "_image_digest_memo", {})
+    changed_image = _run_seq(input_file)
+    assert changed_image["cache_hit"] is False
+    assert _docker_runs(fake_docker) == 3
+
+
+def test_blob_lost_before_restore_falls_back_to_a_real_run(
+    fake_docker: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    input_file = tmp_path / "genome.fa"
+    input_file.write_text(">seq1\nacgt\n", encoding="utf-8")
+    first = _run_seq(input_file)
+
+    original_lookup = result_cache.BioToolsResultCache.lookup
+
+    def _lookup_then_evict(self, key):
+        manifest = original_lookup(self, key)
+        for item in (manifest or {}).get("files", []):
+            self._object_path(item["sha256"]).unlink()
+        return manifest
+
+    monkeypatch.setattr(result_cache.BioToolsResultCache, "lookup", _lookup_then_evict)
+    second = _run_seq(input_file)
+
+    assert second["success"] is True
+    assert second["cache_hit"] is False
+    assert _docker_runs(fake_docker) == 2
+
+    # The stale entry was replaced by the fresh run's outputs.
+    monkeypatch.setattr(result_cache.BioToolsResultCache, "lookup", original_lookup)
+    third = _run_seq(input_file)
+    assert third["cache_hit"] is True
+    assert third["cache_key"] == first["cache_key"]
+    assert _docker_runs(fake_docker) == 2
+
+
+def test_force_flag_bypasses_cached_result(fake_docker: Path, tmp_path: Path) -> None:
+    input_file = tmp_path / "genome.fa"
+    input_file.write_text(">seq1\nacgt\n", encoding="utf-8")
+    _run_seq(input_file)
+
+    forced = _run_seq(input_file, force=True)
+    assert forced["cache_hit"] is False
+    assert _docker_runs(fake_docker) == 2
+
+
+def test_result_cache_evicts_least_recently_used_entries(
+    fake_docker: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("BIO_TOOLS_RESULT_CACHE_MAX_ENTRIES", "2")
+    inputs = []
+    for index in range(3):
+        path = tmp_path / f"genome_{index}.fa"
+        path.write_text(f">seq{index}\nacgt{'a' * index}\n", encoding="utf-8")
+        inputs.append(path)
+
+    keys = []
+    for path in inputs:
+        keys.append(_run_seq(path)["cache_key"])
+        # Distinct mtimes keep LRU ordering deterministic on coarse filesystems.
+        entry = tmp_path / "cache" / "entries" / f"{keys[-1]}.json"
+        os.utime(entry, (len(keys), len(keys)))
+
+    entries = sorted(p.stem for p in (tmp_path / "cache" / "entries").glob("*.json"))
+    assert entries == sorted(keys[1:])
+    blobs = list((tmp_path / "cache" / "objects").glob("*/*"))
+    assert len(blobs) == 2
+
+
+def test_handler_strips_force_from_tool_params(monkeypatch: pytest.MonkeyPatch) -> None:
+    captured: Dict[str, Any] = {}
+
+    async def _fake_local(**kwargs: Any) -> Dict[str, Any]:
+        captured.update(kwargs)
+        return {"success": True}
+
+    monkeypatch.setenv("BIO_TOOLS_EXECUTION_MODE", "local")
+    monkeypatch.setattr(bio_handler_module, "_execute_local_bio_tool", _fake_local)
+
+    result = asyncio.run(
+        bio_handler_module.bio_tools_handler(
+            tool_name="seqkit",
+            operation="stats",
+            sequence_text=">seq1\nACGT\n",
+            params={"force": "true"},
+            session_id="session_force_flag",
+        )
+    )
+
+    assert result["success"] is True
+    assert captured["force"] is True
+    assert "force" not in (captured.get("params") or {})
+
+
+def test_missing_inputs_make_runs_uncacheable(tmp_path: Path) -> None:
+    present = tmp_path / "genome.fa"
+    present.write_text(">seq1\nacgt\n", encoding="utf-8")
+    db_dir = tmp_path / "db"
+    db_dir.mkdir()
+    (db_dir / "nr.pin").write_bytes(b"index")
+
+    assert result_cache.fingerprint_input_paths(
+        [("input_file", str(present)), ("db[0]", str(tmp_path / "missing.fa"))]
+    ) is None
+    fingerprints = result_cache.fingerprint_input_paths(
+        [("input_file", str(present)), ("db[0]", str(db_dir / "nr"))]
+    )
+    assert fingerprints is not None and fingerprints["db[0]"].startswith("prefix:")
+
+
+def test_file_hash_memo_is_bounded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(result_cache, "_file_hash_memo", result_cache.OrderedDict())
+    monkeypatch.setattr(result_cache, "_FILE_HASH_MEMO_SIZE", 2)
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"f{index}.txt"
+        path.write_text(str(index), encoding="utf-8")
+        paths.append(path)
+        result_cache.hash_file_content(path)
+
+    assert [key[0] for key in result_cache._file_hash_memo] == [str(paths[1]), str(paths[2])]
+
+
+def test_overlapping_runs_in_one_tool_dir_are_not_cached(fake_docker: Path, tmp_path: Path) -> None:
+    tool_dir = tmp_path / "runtime" / "seqkit"
+    tool_dir.mkdir(parents=True)
+    first = result_cache.begin_output_capture(tool_dir)
+    second = result_cache.begin_output_capture(tool_dir)
+    other_dir = result_cache.begin_output_capture(tmp_path)
+    assert first.finish() is False and second.finish() is False
+    assert other_dir.finish() is True
+
+    # A concurrent run is still in flight while this one executes.
+    concurrent = result_cache.begin_output_capture(tool_dir)
+    input_file = tmp_path / "genome.fa"
+    input_file.write_text(">seq1\nacgt\n", encoding="utf-8")
+    try:
+        overlapped = _run_seq(input_file)
+    finally:
+        concurrent.finish()
+    assert overlapped["success"] is True and overlapped["cache_hit"] is False
+
+    assert _run_seq(input_file)["cache_hit"] is False
+    assert _run_seq(input_file)["cache_hit"] is True
+    assert _docker_runs(fake_docker) == 2
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from tool_box.bio_tools import remote_executor
+
+# Stub ssh: records argv, emulates the ControlMaster socket with a marker file
+# and runs the remote command locally so tar-over-ssh really extracts files.
+_FAKE_SSH = """#!{python}
+import json, os, subprocess, sys
+from pathlib import Path
+
+args = sys.argv[1:]
+with open(os.environ["FAKE_SSH_LOG"], "a") as handle:
+    handle.write(json.dumps(args) + "\\n")
+options = [args[i + 1] for i, arg in enumerate(args) if arg == "-o"]
+control_path = next((o.split("=", 1)[1] for o in options if o.startswith("ControlPath=")), None)
+if "-O" in args:
+    op = args[args.index("-O") + 1]
+    socket = Path(control_path)
+    if op == "check":
+        sys.exit(0 if socket.exists() else 255)
+    socket.unlink(missing_ok=True)
+    sys.exit(0)
+if "ControlMaster=yes" in options:
+    Path(control_path).write_text("master")
+    sys.exit(0)
+sys.exit(subprocess.run(["sh", "-c", args[-1]]).returncode)
+"""
+
+
+@pytest.fixture
+def fake_ssh(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    shim = bin_dir / "ssh"
+    shim.write_text(_FAKE_SSH.format(python=sys.executable), encoding="utf-8")
+    shim.chmod(shim.stat().st_mode | stat.S_IEXEC)
+    log_path = tmp_path / "ssh_calls.log"
+    log_path.write_text("", encoding="utf-8")
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv("FAKE_SSH_LOG", str(log_path))
+    monkeypatch.setattr(remote_executor, "_master_states", {})
+    return log_path
+
+
+def _config(tmp_path: Path) -> remote_executor.RemoteExecutionConfig:
+    key_path = tmp_path / "id_rsa"
+    key_path.write_text("dummy", encoding="utf-8")
+    return remote_executor.RemoteExecutionConfig(
+        host="example.test",
+        user="user",
+        port=22,
+        runtime_dir=str(tmp_path / "remote"),
+        local_artifact_root=str(tmp_path / "artifacts"),
+        ssh_key_path=str(key_path),
+        password=None,
+        sudo_policy="never",
+        connect_timeout=5,
+        control_dir=str(tmp_path / "mux"),
+    )
+
+
+def _calls(log_path: Path) -> List[List[str]]:
+    return [json.loads(line) for line in log_path.read_text().splitlines() if line]
+
+
+def _master_starts(calls: List[List[str]]) -> int:
+    return sum(1 for args in calls if "ControlMaster=yes" in args)
+
+
+def test_ssh_commands_reuse_one_control_master(fake_ssh: Path, tmp_path: Path) -> None:
+    config = _config(tmp_path)
+    auth = remote_executor.ResolvedAuth(mode="key", key_path=config.ssh_key_path)
+
+    async def _run() -> List[Dict[str, Any]]:
+        return [
+            await remote_executor._run_ssh_command(config, auth, "echo first", timeout=10),
+            await remote_executor._run_ssh_command(config, auth, "echo second", timeout=10),
+        ]
+
+    first, second = asyncio.run(_run())
+
+    assert first["stdout"].strip() == "first"
+    assert second["stdout"].strip() == "second"
+    calls = _calls(fake_ssh)
+    assert _master_starts(calls) == 1
+    command_calls = [args for args in calls if args[-1].startswith("bash -lc")]
+    assert len(command_calls) == 2
+    for args in command_calls:
+        assert f"ControlPath={config.control_path()}" in args
+        assert "ControlMaster=no" in args
+
+
+def test_dead_master_is_restarted_on_next_health_check(
+    fake_ssh: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config = _config(tmp_path)
+    auth = remote_executor.ResolvedAuth(mode="key", key_path=config.ssh_key_path)
+    monkeypatch.setattr(remote_executor, "_MASTER_RECHECK_SECONDS", 0.0)
+
+    asyncio.run(remote_executor._run_ssh_command(config, auth, "true", timeout=10))
+    Path(config.control_path()).unlink()
+    result = asyncio.run(remote_executor._run_ssh_command(config, auth, "echo ok", timeout=10))
+
+    assert result["success"] is True
+    assert _master_starts(_calls(fake_ssh)) == 2
+    assert Path(config.control_path()).exists()
+
+
+def test_multiple_uploads_are_batched_into_one_tar_stream(fake_ssh: Path, tmp_path: Path) -> None:
+    config = _config(tmp_path)
+    auth = remote_executor.ResolvedAuth(mode="key", key_path=config.ssh_key_path)
+    first = tmp_path / "reads_1.fq"
+    second = tmp_path / "contigs.fa"
+    first.write_text("@r1\nACGT\n+\nIIII\n", encoding="utf-8")
+    second.write_text(">c1\nGGCC\n", encoding="utf-8")
+    remote_input = tmp_path / "remote" / "run1" / "input"
+
+    results = asyncio.run(
+        remote_executor.upload_files(
+            config,
+            auth,
+            [
+                (str(first), str(remote_input / "reads_1.fq")),
+                (str(second), str(remote_input / "refs" / "contigs.fa")),
+            ],
+        )
+    )
+
+    assert [item["success"] for item in results] == [True, True]
+    assert all(item["batched"] for item in results)
+    assert (remote_input / "reads_1.fq").read_text() == first.read_text()
+    assert (remote_input / "refs" / "contigs.fa").read_text() == second.read_text()
+    transfer_calls = [args for args in _calls(fake_ssh) if "tar -xf -" in args[-1]]
+    assert len(transfer_calls) == 1
+
+
+def test_multiplexing_can_be_disabled(tmp_path: Path) -> None:
+    config = _config(tmp_path)
+    config.control_persist = 0
+    auth = remote_executor.ResolvedAuth(mode="key", key_path=config.ssh_key_path)
+
+    args = remote_executor._build_ssh_base(config, auth)
+
+    assert not any(arg.startswith("ControlPath=") for arg in args)
+    assert asyncio.run(remote_executor.ensure_master(config, auth)) is False
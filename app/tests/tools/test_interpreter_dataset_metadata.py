@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.context.data_profiler import DataProfiler
+from app.services.interpreter import metadata as metadata_module
+from app.services.interpreter.metadata import DataProcessor, count_data_lines
+
+
+@pytest.fixture
+def metadata_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    cache_dir = tmp_path / "metadata_cache"
+    monkeypatch.setenv("DATASET_METADATA_CACHE_DIR", str(cache_dir))
+    metadata_module.reset_metadata_cache()
+    yield cache_dir
+    metadata_module.reset_metadata_cache()
+
+
+def _write_csv(path: Path, rows: int) -> pd.DataFrame:
+    frame = pd.DataFrame(
+        {
+            "gene": [f"g{i % 40}" for i in range(rows)],
+            "count": np.arange(rows),
+            "score": np.where(np.arange(rows) % 5 == 0, np.nan, 0.5),
+        }
+    )
+    frame.to_csv(path, index=False)
+    return frame
+
+
+def test_streaming_profile_matches_full_read_for_small_files(
+    tmp_path: Path, metadata_cache_dir: Path
+) -> None:
+    path = tmp_path / "small.csv"
+    frame = _write_csv(path, 120)
+
+    metadata = DataProcessor.get_metadata(str(path), use_cache=False)
+
+    assert metadata.total_rows == len(frame)
+    assert metadata.sampled is False
+    assert metadata.stats_truncated is False
+    assert metadata.rows_profiled is None
+    columns = {column.name: column for column in metadata.columns}
+    assert columns["gene"].unique_count == 40
+    assert columns["score"].null_count == int(frame["score"].isnull().sum())
+    assert columns["count"].sample_values == [0, 1, 2, 3, 4]
+
+
+def test_scan_cap_falls_back_to_newline_count(
+    tmp_path: Path, metadata_cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "large.csv"
+    _write_csv(path, 5000)
+    monkeypatch.setattr(metadata_module, "CHUNK_ROWS", 300)
+    monkeypatch.setattr(metadata_module, "MAX_SCAN_ROWS", 1000)
+    monkeypatch.setattr(metadata_module, "RESERVOIR_ROWS", 50)
+
+    metadata = DataProcessor.get_metadata(str(path), use_cache=False)
+
+    assert count_data_lines(str(path)) == 5000
+    assert metadata.total_rows == 5000
+    assert metadata.sampled is True
+    assert metadata.sample_rows == 50
+    # Column stats only cover the profiled prefix, and say so.
+    assert metadata.stats_truncated is True
+    assert metadata.rows_profiled == 1000
+    columns = {c.name: c for c in metadata.columns}
+    assert columns["gene"].unique_count is None
+    assert columns["gene"].unique_count_at_least == 40
+    assert columns["score"].null_count == 200
+
+
+def test_unique_overflow_is_flagged_instead_of_a_sentinel(
+    tmp_path: Path, metadata_cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "wide.csv"
+    _write_csv(path, 100)
+    monkeypatch.setattr(metadata_module, "UNIQUE_LIMIT", 50)
+
+    columns = {c.name: c for c in DataProcessor.get_metadata(str(path), use_cache=False).columns}
+
+    assert columns["count"].unique_count is None
+    assert columns["count"].unique_count_at_least == 51
+    assert columns["gene"].unique_count == 40
+    assert columns["gene"].unique_count_at_least is None
+
+
+def test_metadata_cache_is_keyed_by_size_and_mtime(
+    tmp_path: Path, metadata_cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "data.csv"
+    _write_csv(path, 10)
+
+    first = DataProcessor.get_metadata(str(path))
+    assert list(metadata_cache_dir.glob("*.json"))
+
+    metadata_module.reset_metadata_cache()
+    calls = []
+    original = DataProcessor._extract_metadata
+
+    def _counting(file_path: str):
+        calls.append(file_path)
+        return original(file_path)
+
+    monkeypatch.setattr(DataProcessor, "_extract_metadata", staticmethod(_counting))
+    assert DataProcessor.get_metadata(str(path)) == first
+    assert calls == []
+
+    _write_csv(path, 25)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert DataProcessor.get_metadata(str(path)).total_rows == 25
+    assert len(calls) == 1
+
+
+def test_metadata_disk_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = metadata_module._MetadataCache(tmp_path / "cache", max_disk_entries=4)
+    metadata = metadata_module.DatasetMetadata(
+        filename="x.csv", file_format="csv", file_size_bytes=1, total_rows=1, total_columns=0, columns=[]
+    )
+    keys = [(f"/data/{index}.csv", 1, index) for index in range(6)]
+    for mtime, key in enumerate(keys[:4]):
+        cache.put(key, metadata)
+        os.utime(cache._disk_path(key), ns=(mtime, mtime))
+    os.utime(cache._disk_path(keys[0]), ns=(10, 10))  # keys[0] was used most recently
+
+    cache.put(keys[4], metadata)
+
+    remaining = sorted(path.name for path in (tmp_path / "cache").glob("*.json"))
+    assert remaining == sorted(cache._disk_path(key).name for key in (keys[0], keys[3], keys[4]))
+
+
+def test_data_profiler_invalidates_when_directory_changes(tmp_path: Path) -> None:
+    data_dir = tmp_path / "samples"
+    (data_dir / "s1").mkdir(parents=True)
+    (data_dir / "s1" / "filtered_s1.h5ad").write_bytes(b"x")
+    profiler = DataProfiler()
+
+    first = asyncio.run(profiler.profile(str(data_dir)))
+    assert asyncio.run(profiler.profile(str(data_dir))) is first
+
+    (data_dir / "s1" / "filtered_s2.h5ad").write_bytes(b"y")
+    stat = (data_dir / "s1").stat()
+    os.utime(data_dir / "s1", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    refreshed = asyncio.run(profiler.profile(str(data_dir)))
+    assert refreshed is not first
+    assert refreshed.total_files == 2
+
+    # Editing a file in place leaves its directory's mtime unchanged.
+    target = data_dir / "s1" / "filtered_s1.h5ad"
+    dir_stat = (data_dir / "s1").stat()
+    target.write_bytes(b"longer payload")
+    os.utime(data_dir / "s1", ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+    edited = asyncio.run(profiler.profile(str(data_dir)))
+    assert edited is not refreshed
+    assert edited.total_size_bytes == refreshed.total_size_bytes - 1 + len(b"longer payload")
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.llm import _encode_tool_payload
+from app.services import tool_schemas
+from app.services.skills import SkillsLoader
+
+
+def _write_skill(root: Path, name: str, description: str, *, keywords: list[str] | None = None) -> Path:
+    skill_dir = root / name
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    (skill_dir / "SKILL.md").write_text(
+        f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n\n{description}\n",
+        encoding="utf-8",
+    )
+    if keywords is not None:
+        (skill_dir / "config.json").write_text(
+            json.dumps({"selection": {"keywords": keywords}}),
+            encoding="utf-8",
+        )
+    return skill_dir
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_tool_schemas_are_serialized_once_per_tool_set() -> None:
+    first = tool_schemas.build_tool_schemas(["web_search", "bio_tools"])
+    second = tool_schemas.build_tool_schemas(["web_search", "bio_tools"])
+
+    assert second == first and second is not first
+    assert second.serialized_json() is first.serialized_json()
+    assert json.loads(first.serialized_json()) == list(first)
+    assert first[-1]["function"]["name"] == "submit_final_answer"
+
+    body = json.loads(_encode_tool_payload({"model": "m", "messages": [], "tools": first}))
+    assert body["tools"] == list(first)
+
+    # Mutating the returned list must not leak stale JSON into requests.
+    first.pop()
+    assert json.loads(first.serialized_json()) == list(first)
+    assert tool_schemas.build_tool_schemas(["web_search", "bio_tools"]) == second
+
+
+def test_replacing_a_registry_entry_invalidates_the_cached_payload(monkeypatch: pytest.MonkeyPatch) -> None:
+    before = tool_schemas.build_executor_tool_schemas(["web_search"])
+    replacement = {"type": "function", "function": {"name": "web_search", "description": "patched"}}
+    monkeypatch.setitem(tool_schemas.TOOL_REGISTRY, "web_search", replacement)
+
+    after = tool_schemas.build_executor_tool_schemas(["web_search"])
+
+    assert after != before
+    assert json.loads(after.serialized_json()) == [replacement]
+
+
+def test_cached_schemas_are_read_only_snapshots_in_a_bounded_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    schemas = tool_schemas.build_tool_schemas(["web_search"])
+
+    with pytest.raises(TypeError):
+        schemas[0]["function"]["description"] = "edited in place"
+    with pytest.raises(TypeError):
+        schemas[0]["function"]["parameters"]["required"].append("extra")
+    editable = copy.deepcopy(schemas[0])
+    editable["function"]["description"] = "edited copy"
+    assert json.loads(schemas.serialized_json()) == list(schemas)
+
+    monkeypatch.setattr(tool_schemas, "_SCHEMA_CACHE_SIZE", 2)
+    tool_schemas.invalidate_tool_schema_cache()
+    for names in (["web_search"], ["bio_tools"], ["web_search", "bio_tools"]):
+        tool_schemas.build_executor_tool_schemas(names)
+    assert len(tool_schemas._schema_cache) == 2
+
+
+def test_skill_index_refreshes_only_changed_skills(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SKILLS_INDEX_REFRESH_SECONDS", "0")
+    _write_skill(tmp_path, "alpha", "First skill")
+    beta_dir = _write_skill(tmp_path, "beta", "Second skill")
+    loader = SkillsLoader(skills_dir=str(tmp_path), project_skills_dir=str(tmp_path), auto_sync=False)
+    assert [skill["name"] for skill in loader.list_skills()] == ["alpha", "beta"]
+
+    loaded: list[str] = []
+    original = loader._load_skill_dir
+
+    def _counting(item: Path):
+        loaded.append(item.name)
+        return original(item)
+
+    monkeypatch.setattr(loader, "_load_skill_dir", _counting)
+    assert loader.get_skill("alpha") is not None
+    assert loaded == []
+
+    (beta_dir / "SKILL.md").write_text(
+        "---\nname: beta\ndescription: Rewritten skill\n---\n\nbody\n",
+        encoding="utf-8",
+    )
+    _bump_mtime(beta_dir / "SKILL.md")
+    _write_skill(tmp_path, "gamma", "Third skill")
+    _bump_mtime(tmp_path)
+
+    assert loader.get_skill("beta").description == "Rewritten skill"
+    assert sorted(loaded) == ["beta", "gamma"]
+    assert [skill["name"] for skill in loader.list_skills()] == ["alpha", "beta", "gamma"]
+
+
+def test_lexical_prefilter_sends_relevant_skills_to_the_llm(tmp_path: Path) -> None:
+    for index in range(6):
+        _write_skill(tmp_path, f"generic-{index}", "General purpose helper for routine work")
+    _write_skill(tmp_path, "phylogeny-builder", "Build phylogenetic trees from multiple sequence alignments")
+    loader = SkillsLoader(skills_dir=str(tmp_path), project_skills_dir=str(tmp_path), auto_sync=False)
+    llm = MagicMock()
+    llm.chat.return_value = '{"selected_skills": ["phylogeny-builder"]}'
+
+    result = asyncio.run(
+        loader.select_skills(
+            task_title="Reconstruct phylogenetic tree",
+            task_description="Infer a tree from the aligned sequences",
+            llm_service=llm,
+        )
+    )
+    assert result.candidate_skill_ids[0] == "phylogeny-builder"
+    assert result.selected_skill_ids == ["phylogeny-builder"]
+
+    by_priority = asyncio.run(
+        loader.select_skills(
+            task_title="Reconstruct phylogenetic tree",
+            task_description="Infer a tree from the aligned sequences",
+            llm_service=llm,
+            prefilter="priority",
+        )
+    )
+    assert "phylogeny-builder" not in by_priority.candidate_skill_ids
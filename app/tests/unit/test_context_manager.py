@@ -12,6 +12,7 @@ from __future__ import annotations
 
 import pytest
 
+from app.services.context import context_manager
 from app.services.context.context_manager import (
     ContextWindowManager,
     ContextUsage,
@@ -66,6 +67,47 @@ class TestTokenEstimation:
         total = estimate_messages_tokens(msgs)
         assert total > 15
 
+    def test_repeated_text_is_served_from_memo(self, monkeypatch):
+        calls = []
+        original = context_manager._estimate_tokens_uncached
+
+        def counting(text):
+            calls.append(text)
+            return original(text)
+
+        monkeypatch.setattr(context_manager, "_estimate_tokens_uncached", counting)
+        text = "memoized token estimate " * 20
+        first = estimate_tokens(text)
+        assert estimate_tokens(text) == first
+        assert len(calls) == 1
+        assert estimate_tokens(text + "!") >= first
+        assert len(calls) == 2
+
+    def test_manager_only_estimates_new_or_changed_messages(self, monkeypatch):
+        estimated = []
+        original = context_manager.estimate_message_tokens
+
+        def counting(message):
+            estimated.append(message)
+            return original(message)
+
+        monkeypatch.setattr(context_manager, "estimate_message_tokens", counting)
+        mgr = ContextWindowManager(max_context_tokens=10_000)
+        msgs = [{"role": "user", "content": f"turn {i}"} for i in range(5)]
+        first = mgr.check_usage(msgs).used_tokens
+        assert len(estimated) == 5
+
+        msgs.append({"role": "assistant", "content": "reply"})
+        second = mgr.check_usage(msgs).used_tokens
+        assert len(estimated) == 6
+        assert second == sum(original(m) for m in msgs) > first
+
+        msgs[0]["content"] = "turn 0 edited with a much longer body of text"
+        third = mgr.check_usage(msgs).used_tokens
+        assert len(estimated) == 7
+        assert estimated[-1] is msgs[0]
+        assert third == sum(original(m) for m in msgs)
+
 
 # ---------------------------------------------------------------------------
 # Model context window
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+import app.llm as llm_module
+from app.services import background_loop as background_loop_module
+from app.services.background_loop import BackgroundEventLoop
+from app.services.plans.plan_executor import _run_coroutine_sync
+
+_REQUEST_ID: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="unset")
+
+
+class _FakeAsyncClient:
+    instances: list["_FakeAsyncClient"] = []
+
+    def __init__(self, **_: object) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+        self.instances.append(self)
+
+    @property
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def loop_runner():
+    runner = BackgroundEventLoop(name="test-background-loop")
+    yield runner
+    runner.shutdown()
+
+
+def test_calls_share_one_loop_and_its_llm_client(loop_runner, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(llm_module.httpx, "AsyncClient", _FakeAsyncClient)
+    _FakeAsyncClient.instances.clear()
+
+    async def _client():
+        return asyncio.get_running_loop(), llm_module._get_shared_async_client()
+
+    first_loop, first_client = loop_runner.run(_client())
+    second_loop, second_client = loop_runner.run(_client())
+
+    assert first_loop is second_loop is loop_runner.loop
+    assert first_client is second_client
+    assert len(_FakeAsyncClient.instances) == 1
+
+    loop_runner.shutdown()
+    assert first_client.closed
+    assert not first_loop.is_running()
+
+    # The loop is restarted lazily after a shutdown.
+    restarted_loop, _ = loop_runner.run(_client())
+    assert restarted_loop is not first_loop
+
+
+def test_context_vars_propagate_without_leaking_back(loop_runner) -> None:
+    async def _read_and_set() -> str:
+        seen = _REQUEST_ID.get()
+        _REQUEST_ID.set("changed-on-loop")
+        return seen
+
+    token = _REQUEST_ID.set("req-42")
+    try:
+        assert loop_runner.run(_read_and_set()) == "req-42"
+        assert _REQUEST_ID.get() == "req-42"
+    finally:
+        _REQUEST_ID.reset(token)
+    assert loop_runner.run(_read_and_set()) == "unset"
+
+
+def test_timeout_cancels_the_task_on_the_loop(loop_runner) -> None:
+    cancelled = threading.Event()
+
+    async def _slow() -> None:
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        loop_runner.run(_slow(), timeout=0.05)
+    assert cancelled.wait(2)
+
+    async def _boom() -> None:
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError, match="bad"):
+        loop_runner.run(_boom())
+
+
+def test_executor_bridge_uses_shared_loop_and_handles_nested_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    runner = BackgroundEventLoop(name="test-shared-loop")
+    monkeypatch.setattr(background_loop_module, "_background_loop", runner)
+
+    async def _current_loop():
+        return asyncio.get_running_loop()
+
+    async def _nested():
+        # Sync code running on the shared loop must not block on that loop.
+        return _run_coroutine_sync(_current_loop())
+
+    try:
+        shared = _run_coroutine_sync(_current_loop())
+        assert shared is runner.loop
+        assert _run_coroutine_sync(_current_loop()) is shared
+        nested = _run_coroutine_sync(_nested())
+        assert nested is not shared
+    finally:
+        runner.shutdown()
+
+
+def test_bridged_coroutine_is_cancelled_after_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    runner = BackgroundEventLoop(name="test-timeout-loop")
+    monkeypatch.setattr(background_loop_module, "_background_loop", runner)
+    cancelled: list[str] = []
+
+    async def _hang(label: str) -> None:
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(label)
+            raise
+
+    async def _nested() -> None:
+        _run_coroutine_sync(_hang("nested"), timeout=0.2)
+
+    try:
+        with pytest.raises(TimeoutError):
+            _run_coroutine_sync(_hang("shared"), timeout=0.2)
+        with pytest.raises(TimeoutError):
+            _run_coroutine_sync(_nested(), timeout=5)
+    finally:
+        runner.shutdown()
+    assert cancelled == ["shared", "nested"]
@@ -15,6 +15,7 @@ _ALLOWED_UNIT_PREFIXES = {
     "layout",
     "llm",
     "memory",
+    "metrics",
     "protocol",
     "qwen",
     "realtime",
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from app.services.evaluation.evaluation_cache import EvaluationCache
+from app.services.evaluation.expert_evaluator import MultiExpertEvaluator
+
+
+class _SlowExpertClient:
+    """Async client that answers each expert after a fixed delay."""
+
+    def __init__(self, delay: float = 0.2, hang_on: str | None = None) -> None:
+        self.delay = delay
+        self.hang_on = hang_on
+        self.calls: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def chat_async(self, prompt: str, **_: Any) -> str:
+        self.calls.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.hang_on and self.hang_on in prompt:
+                await asyncio.sleep(30)
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return json.dumps(
+            {"relevance": 0.8, "completeness": 0.7, "accuracy": 0.9, "overall_score": 0.8}
+        )
+
+
+def _evaluator(client: _SlowExpertClient, tmp_path: Path, **kwargs: Any) -> MultiExpertEvaluator:
+    evaluator = MultiExpertEvaluator(
+        use_cache=False,
+        evaluation_cache=EvaluationCache(cache_db_path=str(tmp_path / "evaluation_cache.db")),
+        **kwargs,
+    )
+    evaluator.llm_client = client
+    return evaluator
+
+
+def test_experts_are_queried_concurrently(tmp_path: Path) -> None:
+    client = _SlowExpertClient(delay=0.3)
+    evaluator = _evaluator(client, tmp_path)
+    expert_count = len(evaluator.experts)
+
+    started = time.perf_counter()
+    result = evaluator.evaluate_with_multiple_experts("draft content", {"name": "task"})
+    elapsed = time.perf_counter() - started
+
+    assert result["metadata"]["successful_experts"] == expert_count
+    assert client.max_in_flight == min(expert_count, evaluator.max_concurrent_experts)
+    assert elapsed < 0.3 * expert_count - 0.2
+
+
+def test_cached_experts_skip_llm_calls(tmp_path: Path) -> None:
+    client = _SlowExpertClient(delay=0.0)
+    evaluator = _evaluator(client, tmp_path)
+    evaluator.evaluate_with_multiple_experts("draft content", {"name": "task"})
+    first_calls = len(client.calls)
+
+    again = evaluator.evaluate_with_multiple_experts("draft content", {"name": "task"})
+
+    assert len(client.calls) == first_calls
+    assert again["metadata"]["cached_experts"] == len(evaluator.experts)
+    assert again["consensus"]["overall_score"] == pytest.approx(0.8)
+
+
+def test_straggler_expert_is_dropped_after_timeout(tmp_path: Path) -> None:
+    client = _SlowExpertClient(delay=0.0)
+    evaluator = _evaluator(client, tmp_path, expert_timeout=0.5)
+    slow_name, slow_role = next(iter(evaluator.experts.items()))
+    client.hang_on = slow_role.description
+
+    started = time.perf_counter()
+    result = evaluator.evaluate_with_multiple_experts("draft content", {"name": "task"})
+
+    assert time.perf_counter() - started < 5
+    assert slow_name not in result["expert_evaluations"]
+    assert result["metadata"]["successful_experts"] == len(evaluator.experts) - 1
+
+
+def test_quorum_failure_returns_error_result(tmp_path: Path) -> None:
+    client = _SlowExpertClient(delay=0.0)
+    evaluator = _evaluator(client, tmp_path, expert_timeout=0.3)
+    evaluator.expert_quorum = len(evaluator.experts)
+    client.hang_on = next(iter(evaluator.experts.values())).description
+
+    result = evaluator.evaluate_with_multiple_experts("draft content", {"name": "task"})
+
+    assert result["expert_evaluations"] == {}
+    assert "quorum" in result["metadata"]["error"]
+
+
+def test_reached_quorum_cancels_remaining_experts(tmp_path: Path) -> None:
+    client = _SlowExpertClient(delay=0.0)
+    evaluator = _evaluator(client, tmp_path, expert_quorum=2)
+    client.hang_on = next(iter(evaluator.experts.values())).description
+
+    started = time.perf_counter()
+    result = evaluator.evaluate_with_multiple_experts("draft content", {"name": "task"})
+
+    assert time.perf_counter() - started < 5
+    assert result["metadata"]["successful_experts"] >= 2
+    assert client.in_flight == 0
@@ -143,7 +143,7 @@ def test_get_usage_summary_handles_empty_data(mock_db):
 
 
 def test_log_usage_function_calls_repository():
-    with patch("app.repository.llm_usage.log_llm_usage") as mock_log:
+    with patch("app.repository.llm_usage.queue_llm_usage") as mock_log:
         from app.llm import _log_usage
         _log_usage(
             provider="qwen",
@@ -174,7 +174,7 @@ def test_log_usage_propagates_context_from_contextvar():
         call_purpose="deep_think",
     )
     try:
-        with patch("app.repository.llm_usage.log_llm_usage") as mock_log:
+        with patch("app.repository.llm_usage.queue_llm_usage") as mock_log:
             _log_usage(
                 provider="qwen",
                 model="qwen-test",
@@ -199,7 +199,7 @@ def test_log_usage_propagates_context_from_contextvar():
 
 def test_log_usage_handles_repository_error():
     """_log_usage should not raise exceptions if repository fails."""
-    with patch("app.repository.llm_usage.log_llm_usage", side_effect=Exception("DB error")):
+    with patch("app.repository.llm_usage.queue_llm_usage", side_effect=Exception("DB error")):
         from app.llm import _log_usage
         _log_usage(
             provider="qwen",
@@ -388,3 +388,104 @@ def test_estimate_llm_cost_uses_default_qwen_code_rates():
     assert cost["output_cost"] > 0
     assert cost["estimated_cost"] == cost["input_cost"] + cost["output_cost"]
     assert cost["cost_currency"] == "CNY"
+
+
+@pytest.fixture
+def usage_db(isolated_app_env):
+    from app.database import init_db
+
+    init_db()
+    init_llm_usage_table()
+    yield isolated_app_env
+
+
+def _usage_rows(sql: str, params: tuple = ()) -> list:
+    from app.database import get_db
+
+    with get_db() as conn:
+        return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+
+def test_usage_writer_batches_records_and_maintains_minute_rollups(usage_db):
+    from app.repository.llm_usage import LLMUsageWriter, get_usage_summary
+
+    writer = LLMUsageWriter(flush_interval_seconds=60, batch_size=1000)
+    try:
+        for index in range(5):
+            writer.submit(
+                {
+                    "provider": "qwen",
+                    "model": "qwen-test" if index < 3 else "glm-test",
+                    "prompt_tokens": 10,
+                    "completion_tokens": 5,
+                    "total_tokens": 15,
+                    "call_purpose": "chat",
+                }
+            )
+        assert writer.pending == 5
+        assert _usage_rows("SELECT * FROM llm_usage_log") == []
+
+        assert writer.flush() == 5
+    finally:
+        writer.shutdown()
+
+    assert len(_usage_rows("SELECT * FROM llm_usage_log")) == 5
+    rollups = _usage_rows(
+        "SELECT model, call_count, total_tokens FROM llm_usage_rollup_minute ORDER BY model"
+    )
+    assert [(row["model"], row["call_count"], row["total_tokens"]) for row in rollups] == [
+        ("glm-test", 2, 30),
+        ("qwen-test", 3, 45),
+    ]
+    summary = get_usage_summary(hours=1)
+    assert summary["call_count"] == 5
+    assert summary["total_tokens"] == 75
+    assert summary["by_model"][0]["model"] == "qwen-test"
+
+
+def test_usage_writer_flushes_in_background_and_on_shutdown(usage_db):
+    import time
+
+    from app.repository.llm_usage import LLMUsageWriter
+
+    writer = LLMUsageWriter(flush_interval_seconds=0.01, batch_size=100)
+    writer.submit({"provider": "qwen", "model": "m", "prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2})
+    deadline = time.monotonic() + 5
+    while writer.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.pending == 0
+
+    slow = LLMUsageWriter(flush_interval_seconds=60, batch_size=100)
+    slow.submit({"provider": "qwen", "model": "m", "prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2})
+    slow.shutdown()
+    writer.shutdown()
+
+    rows = _usage_rows("SELECT call_count FROM llm_usage_rollup_minute")
+    assert sum(row["call_count"] for row in rows) == 2
+    assert len(_usage_rows("SELECT id FROM llm_usage_log")) == 2
+
+
+def test_usage_writer_bounds_its_buffer():
+    from app.repository.llm_usage import LLMUsageWriter
+
+    writer = LLMUsageWriter(flush_interval_seconds=60, batch_size=2, max_buffer=3)
+    with patch.object(writer, "_run", lambda: None):
+        for index in range(5):
+            writer.submit({"provider": "qwen", "model": str(index), "prompt_tokens": 0,
+                           "completion_tokens": 0, "total_tokens": 0})
+    assert writer.pending == 3
+    assert [fields["model"] for fields in writer._buffer] == ["2", "3", "4"]
+
+
+def test_rollups_are_backfilled_from_existing_raw_log(usage_db):
+    from app.database import get_db
+    from app.repository.llm_usage import get_usage_summary
+
+    log_llm_usage(provider="qwen", model="qwen-test", prompt_tokens=3, completion_tokens=2, total_tokens=5)
+    with get_db() as conn:
+        conn.execute("DROP TABLE llm_usage_rollup_minute")
+        conn.commit()
+
+    init_llm_usage_table()
+
+    assert get_usage_summary(hours=1)["total_tokens"] == 5
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.cache import BaseCache, LRUStore, SingleFlight
+from app.services.memory.unified_cache import UnifiedCache
+
+
+class _Cache(BaseCache):
+    def _generate_key(self, *args, **kwargs) -> str:
+        return ":".join(str(arg) for arg in args)
+
+
+def _cache(**kwargs) -> _Cache:
+    return _Cache("lru-test", enable_persistent=False, cleanup_interval=3600, **kwargs)
+
+
+def test_inserts_evict_least_recently_used_entry() -> None:
+    cache = _cache(max_size=3)
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper())
+    assert cache.get("a") == "A"  # "b" is now the least recently used
+
+    cache.set("d", "D")
+
+    assert cache.get("b") is None
+    assert sorted(cache._memory_cache.keys()) == ["a", "c", "d"]
+    stats = cache.get_stats()
+    assert stats["current_size"] == 3 and stats["evictions"] == 1
+
+
+def test_byte_budget_and_ttl_heap() -> None:
+    store = LRUStore(100, max_bytes=300, size_of=len)
+    store["a"] = "x" * 100
+    store["b"] = "y" * 150
+    store["a"]  # refresh "a"
+    store["c"] = "z" * 100
+    assert store.keys() == ["a", "c"]
+    assert store.memory_bytes == 200
+
+    # The newest entry is kept even when it alone exceeds the budget.
+    store["huge"] = "h" * 500
+    assert store.keys() == ["huge"] and store.evictions == 3
+
+    now = time.time()
+    timed = LRUStore(10)
+    timed.set("old", 1, deadline=now - 1)
+    timed.set("new", 2, deadline=now + 60)
+    timed.set("replaced", 3, deadline=now - 1)
+    timed.set("replaced", 4, deadline=now + 60)
+    assert timed.expire(now) == ["old"]
+    assert sorted(timed.keys()) == ["new", "replaced"]
+
+
+def test_background_cleanup_only_drops_expired_entries() -> None:
+    cache = _cache(max_size=10)
+    cache.set("short", 1, ttl=0)
+    cache.set("long", 2, ttl=3600)
+    time.sleep(0.01)
+
+    assert cache._cleanup_expired() == 1
+    assert "short" not in cache._memory_cache and cache.get("long") == 2
+
+
+def test_sharded_store_keeps_capacity_and_all_keys_reachable() -> None:
+    store = LRUStore(4096)
+    assert store.shard_count == 16
+    for index in range(5000):
+        store[f"k{index}"] = index
+    assert len(store) <= 4096 + store.shard_count
+    assert store.get("k4999") == 4999
+
+
+def _race(workers: int, target) -> list:
+    barrier = threading.Barrier(workers)
+    results: list = []
+
+    def _run() -> None:
+        barrier.wait()
+        results.append(target())
+
+    threads = [threading.Thread(target=_run) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_misses_compute_once() -> None:
+    cache = _cache(max_size=10)
+    calls = []
+
+    def _slow() -> str:
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = _race(8, lambda: cache.get_or_compute("key", _slow))
+
+    assert results == ["value"] * 8 and len(calls) == 1
+    assert cache.get_or_compute("key", _slow) == "value" and len(calls) == 1
+
+
+def test_unified_cache_single_flight(tmp_path: Path) -> None:
+    cache = UnifiedCache(db_path=str(tmp_path / "unified.db"), enable_disk=False)
+    calls = []
+
+    def _slow(item: str) -> str:
+        calls.append(item)
+        time.sleep(0.05)
+        return item * 2
+
+    results = _race(6, lambda: cache.get_or_compute("k", _slow, namespace="ns", item="ab"))
+
+    assert results == ["abab"] * 6 and calls == ["ab"]
+
+
+def test_single_flight_shares_errors_and_allows_reentry() -> None:
+    flights = SingleFlight()
+
+    def _boom() -> None:
+        time.sleep(0.05)
+        raise ValueError("bad")
+
+    outcomes = _race(4, lambda: pytest.raises(ValueError, flights.do, "k", _boom))
+    assert len(outcomes) == 4 and flights.in_flight() == 0
+
+    assert flights.do("outer", lambda: flights.do("outer", lambda: 7)) == 7
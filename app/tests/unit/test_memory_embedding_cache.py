@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import database_config
+from app.services.embeddings import cache as cache_module
+from app.services.embeddings import thread_safe_cache as thread_safe_cache_module
+from app.services.embeddings.cache import EmbeddingCache, get_embedding_vector_store
+from app.services.embeddings.thread_safe_cache import ThreadSafeEmbeddingCache
+
+MODEL = "test-embed"
+
+
+@pytest.fixture
+def cache_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "embedding_cache.db"
+    monkeypatch.setattr(database_config, "get_cache_database_path", lambda cache_type="embedding": str(path))
+    config = SimpleNamespace(embedding_model=MODEL)
+    monkeypatch.setattr(cache_module, "get_config", lambda: config)
+    monkeypatch.setattr(thread_safe_cache_module, "get_config", lambda: config)
+    yield path
+    store = cache_module._vector_stores.pop(str(path), None)
+    if store is not None:
+        store.close()
+
+
+def _row(path: Path, text_hash: str):
+    with sqlite3.connect(path) as conn:
+        return conn.execute(
+            "SELECT dim, vector, access_count FROM embedding_vectors WHERE text_hash = ?", (text_hash,)
+        ).fetchone()
+
+
+@pytest.mark.parametrize("cache_class", [EmbeddingCache, ThreadSafeEmbeddingCache])
+def test_vectors_are_stored_as_float32_and_batched(cache_db: Path, cache_class) -> None:
+    writer = cache_class(cache_size=10)
+    writer.put_batch(["alpha", "beta"], [[0.5, 0.25], [1.0, -2.0]], MODEL)
+
+    text_hash = writer._compute_text_hash("alpha", MODEL)
+    dim, blob, _ = _row(cache_db, text_hash)
+    assert dim == 2 and len(blob) == 8
+
+    reader = cache_class(cache_size=10)
+    store = get_embedding_vector_store(str(cache_db))
+    queries = []
+    original = store.get_many
+
+    def _counting(hashes, model):
+        queries.append(list(hashes))
+        return original(hashes, model)
+
+    store.get_many = _counting
+    try:
+        results, misses = reader.get_batch(["alpha", "gamma", "beta", "alpha"], MODEL)
+    finally:
+        del store.get_many
+
+    assert results == [[0.5, 0.25], None, [1.0, -2.0], [0.5, 0.25]]
+    assert misses == [1]
+    assert len(queries) == 1 and len(queries[0]) == 3
+
+    # Persistent hits are promoted to memory; statistics wait for a flush.
+    assert reader.get("beta", MODEL) == [1.0, -2.0]
+    assert _row(cache_db, text_hash)[2] == 1
+    store.flush()
+    assert _row(cache_db, text_hash)[2] == 2
+
+
+def test_legacy_json_rows_are_migrated(cache_db: Path) -> None:
+    text_hash = EmbeddingCache._compute_text_hash(None, "legacy", MODEL)
+    with sqlite3.connect(cache_db) as conn:
+        conn.execute(
+            "CREATE TABLE embedding_cache (text_hash TEXT PRIMARY KEY, embedding_json TEXT NOT NULL, "
+            "model TEXT NOT NULL, created_at REAL NOT NULL, access_count INTEGER DEFAULT 0, "
+            "last_accessed REAL DEFAULT 0.0)"
+        )
+        conn.execute(
+            "INSERT INTO embedding_cache VALUES (?, ?, ?, 0, 3, 0)",
+            (text_hash, json.dumps([0.125, 2.0, -1.5]), MODEL),
+        )
+
+    cache = EmbeddingCache(cache_size=10)
+
+    assert cache.get("legacy", MODEL) == [0.125, 2.0, -1.5]
+    assert cache.get_stats()["persistent_cache_size"] == 1
+    with sqlite3.connect(cache_db) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert tables == {"embedding_vectors"}
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.execution.async_tool_executor import PendingToolCall, execute_with_concurrency
+from app.services.foundation import metrics
+from app.services.foundation.metrics import MetricsRegistry, timed
+
+
+def test_histogram_merges_thread_shards_and_reports_quantiles() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("op_seconds", "Operation latency.", ("op",))
+    child = latency.labels(op="read")
+
+    def _record() -> None:
+        for value in (0.001, 0.002, 0.004, 0.1):
+            child.observe(value)
+
+    threads = [threading.Thread(target=_record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    buckets, count, total, maximum = child.merged()
+    assert count == 16 and sum(buckets.values()) == 16
+    assert total == pytest.approx(4 * 0.107)
+    assert maximum == 0.1
+    # Quantiles are bucket upper bounds: within one sub-bucket of the truth.
+    assert 0.002 <= child.quantile(0.5) <= 0.002 * 1.13
+    assert child.quantile(0.99) == 0.1
+
+    summary = registry.summary()["op_seconds"]["series"][0]
+    assert summary["labels"] == {"op": "read"} and summary["count"] == 16
+
+
+def test_prometheus_exposition_is_cumulative() -> None:
+    registry = MetricsRegistry()
+    registry.counter("calls_total", "Calls.", ("kind",)).labels(kind='a"b').inc(3)
+    latency = registry.histogram("wait_seconds", "Wait.")
+    for value in (0.0004, 0.02, 7.0):
+        latency.observe(value)
+
+    text = registry.render_prometheus()
+
+    assert '# TYPE calls_total counter' in text
+    assert 'calls_total{kind="a\\"b"} 3' in text
+    assert 'wait_seconds_bucket{le="0.0005"} 1' in text
+    assert 'wait_seconds_bucket{le="0.025"} 2' in text
+    assert 'wait_seconds_bucket{le="5"} 2' in text
+    assert 'wait_seconds_bucket{le="10"} 3' in text
+    assert 'wait_seconds_bucket{le="+Inf"} 3' in text
+    assert "wait_seconds_count 3" in text
+
+
+def test_registry_returns_existing_metric_and_rejects_conflicts() -> None:
+    registry = MetricsRegistry()
+    first = registry.counter("hits_total", "Hits.", ("cache",))
+    assert registry.counter("hits_total", "Hits.", ("cache",)) is first
+    with pytest.raises(ValueError):
+        registry.histogram("hits_total", "Hits.", ("cache",))
+    with pytest.raises(ValueError):
+        first.labels("a", "b")
+
+
+def test_timed_decorator_handles_sync_and_async_functions() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("call_seconds", "Call latency.", ("fn",))
+
+    @timed(latency, fn="sync")
+    def _sync() -> str:
+        return "ok"
+
+    @timed(latency, fn="async")
+    async def _async() -> str:
+        return "ok"
+
+    assert _sync() == "ok"
+    assert asyncio.run(_async()) == "ok"
+    assert latency.labels(fn="sync").merged()[1] == 1
+    assert latency.labels(fn="async").merged()[1] == 1
+
+
+def test_tool_executor_records_per_tool_outcomes() -> None:
+    latency = metrics.histogram("tool_execution_seconds", "", ("tool", "outcome"))
+    before_ok = latency.labels("metrics_probe", "ok").merged()[1]
+    before_error = latency.labels("metrics_probe", "error").merged()[1]
+
+    async def _ok():
+        return {"success": True}
+
+    async def _boom():
+        raise RuntimeError("boom")
+
+    asyncio.run(
+        execute_with_concurrency(
+            [
+                PendingToolCall(index=0, tool_name="metrics_probe", coroutine_factory=_ok, is_concurrent_safe=True),
+                PendingToolCall(index=1, tool_name="metrics_probe", coroutine_factory=_boom, is_concurrent_safe=True),
+            ]
+        )
+    )
+
+    assert latency.labels("metrics_probe", "ok").merged()[1] == before_ok + 1
+    assert latency.labels("metrics_probe", "error").merged()[1] == before_error + 1
+
+
+def test_metrics_endpoints_expose_registry(app_client_factory) -> None:
+    metrics.counter("metrics_endpoint_probe_total", "Probe.").inc()
+
+    with app_client_factory() as client:
+        text = client.get("/metrics")
+        summary = client.get("/metrics/summary")
+
+    assert text.status_code == 200
+    assert text.headers["content-type"].startswith("text/plain")
+    assert "metrics_endpoint_probe_total 1" in text.text
+    assert "# TYPE plan_repository_seconds histogram" in text.text
+    assert summary.status_code == 200
+    assert summary.json()["metrics_endpoint_probe_total"]["series"][0]["value"] == 1
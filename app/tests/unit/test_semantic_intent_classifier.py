@@ -279,3 +279,98 @@ class TestFeatureFlag:
         # research routing is handled by classify_request_tier instead.
         decision = resolve_request_routing(message="帮我搜索最新的文献")
         assert decision.request_tier == "research"
+
+
+# ---------------------------------------------------------------------------
+# Tests: Caching and micro-batching
+# ---------------------------------------------------------------------------
+
+class TestEmbeddingCaching:
+
+    def test_centroids_are_reused_from_disk_cache(self, tmp_path) -> None:
+        fake_svc = _fake_embeddings_service(32)
+        calls = []
+
+        def _embed(texts):
+            calls.append(list(texts))
+            return fake_svc.get_embeddings(texts)
+
+        first = SemanticIntentClassifier(centroid_cache_dir=tmp_path, embed_many=_embed)
+        first.initialize()
+        assert first.is_initialized and len(calls) == 1
+
+        def _fail(texts):
+            raise AssertionError("warm start must not embed anchors")
+
+        second = SemanticIntentClassifier(centroid_cache_dir=tmp_path, embed_many=_fail)
+        second.initialize()
+        assert second.is_initialized
+        assert second._intent_order == first._intent_order
+        np.testing.assert_allclose(second._centroid_matrix, first._centroid_matrix)
+
+    def test_message_embeddings_are_cached_by_normalized_text(self) -> None:
+        fake_svc = _fake_embeddings_service(64)
+        calls = []
+
+        def _embed(texts):
+            calls.append(list(texts))
+            return fake_svc.get_embeddings(texts)
+
+        clf = SemanticIntentClassifier(embed_many=_embed, batch_window_ms=0)
+        _init_with_fake(clf, 64)
+
+        first = clf.classify("Plot the  Results")
+        second = clf.classify("  plot the results ")
+        assert first == second
+        assert calls == [["plot the results"]]
+
+    def test_concurrent_requests_share_one_embedding_call(self) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        fake_svc = _fake_embeddings_service(64)
+        calls = []
+
+        def _embed(texts):
+            calls.append(list(texts))
+            return fake_svc.get_embeddings(texts)
+
+        clf = SemanticIntentClassifier(embed_many=_embed, batch_window_ms=100, latency_budget_ms=5000)
+        _init_with_fake(clf, 64)
+
+        messages = [f"message number {index}" for index in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(clf.classify, messages))
+
+        assert all(len(result) == 3 for result in results)
+        assert len(calls) == 1
+        assert sorted(calls[0]) == sorted(messages)
+
+    def test_latency_budget_falls_back_and_fills_cache(self) -> None:
+        import threading
+
+        fake_svc = _fake_embeddings_service(64)
+        release = threading.Event()
+        finished = threading.Event()
+
+        def _slow(texts):
+            release.wait(5)
+            try:
+                return fake_svc.get_embeddings(texts)
+            finally:
+                finished.set()
+
+        clf = SemanticIntentClassifier(embed_many=_slow, batch_window_ms=0, latency_budget_ms=20)
+        _init_with_fake(clf, 64)
+
+        intent, score, reasons = clf.classify("slow message")
+        assert intent is None and score == 0.0
+        assert reasons == ["semantic_latency_budget_exceeded"]
+
+        release.set()
+        assert finished.wait(5)
+        for _ in range(100):
+            if clf._cached_message_vector("slow message") is not None:
+                break
+            threading.Event().wait(0.01)
+        _, _, reasons = clf.classify("slow message")
+        assert "semantic_latency_budget_exceeded" not in reasons
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.services.context.graph_attention import GraphAttentionReranker
+from app.services.embeddings import similarity_kernels as kernels
+from app.services.embeddings.similarity_calculator import SimilarityCalculator
+
+
+def _naive_cosine(a, b) -> float:
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / norm) if norm else 0.0
+
+
+def test_matrix_kernel_matches_pairwise_cosine() -> None:
+    rng = np.random.default_rng(3)
+    queries = rng.standard_normal((4, 16))
+    targets = rng.standard_normal((25, 16))
+    targets[7] = 0.0
+
+    scores = kernels.cosine_similarity_matrix(queries.tolist(), targets)
+
+    assert scores.dtype == np.float32 and scores.shape == (4, 25)
+    expected = [[_naive_cosine(q, t) for t in targets] for q in queries]
+    np.testing.assert_allclose(scores, expected, atol=1e-5)
+    assert not scores[:, 7].any()
+
+    normalized = kernels.normalize_rows(targets)
+    assert normalized.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(
+        kernels.cosine_similarities(kernels.normalize_rows(queries[0]), normalized, normalized=True),
+        scores[0],
+        atol=1e-6,
+    )
+
+
+def test_top_k_uses_threshold_and_keeps_ties_in_index_order() -> None:
+    scores = np.array([0.1, 0.9, 0.5, 0.9, 0.3, 0.7], dtype=np.float32)
+
+    indices, values = kernels.top_k(scores, 3)
+    assert indices.tolist() == [1, 3, 5]
+    np.testing.assert_allclose(values, [0.9, 0.9, 0.7])
+
+    indices, _ = kernels.top_k(scores, 10, min_score=0.5)
+    assert indices.tolist() == [1, 3, 5, 2]
+    assert kernels.top_k(scores, 0)[0].size == 0
+
+
+def test_calculator_routes_through_kernels() -> None:
+    calculator = SimilarityCalculator()
+    query = [1.0, 0.0, 0.0]
+    candidates = [
+        {"id": "a", "embedding": [0.0, 1.0, 0.0]},
+        {"id": "b", "embedding": [1.0, 1.0, 0.0]},
+        {"id": "none", "embedding": []},
+        {"id": "c", "embedding": [2.0, 0.0, 0.0]},
+    ]
+
+    top = calculator.find_most_similar(query, candidates, k=2, min_similarity=0.1)
+    assert [c["id"] for c in top] == ["c", "b"]
+    assert top[1]["similarity"] == pytest.approx(2 ** -0.5, abs=1e-6)
+
+    # Mixed dimensions compare on the common prefix, as compute_similarity does.
+    ragged = [[1.0, 0.0], [0.0, 1.0, 0.0, 5.0], [1.0, 1.0, 0.0]]
+    assert calculator.compute_similarities(query, ragged) == pytest.approx(
+        [calculator.compute_similarity(query, target) for target in ragged], abs=1e-6
+    )
+
+    embeddings = [[1.0, 0.0], [1.0, 0.01], [0.0, 1.0], [0.0, 0.0]]
+    assert [(i, j) for i, j, _ in calculator.find_similar_pairs(embeddings, threshold=0.9)] == [(0, 1)]
+    pairwise = [_naive_cosine(a, b) for i, a in enumerate(embeddings) for b in embeddings[i + 1 :]]
+    assert calculator.compute_diversity_score(embeddings) == pytest.approx(1 - np.mean(pairwise), abs=1e-6)
+
+
+class _FakeTaskRepo:
+    def get_task_info(self, task_id):
+        return {"id": task_id, "parent_id": 100 if task_id != 1 else None, "status": "pending"}
+
+    def list_dependencies(self, task_id):
+        return [{"id": 3, "kind": "requires"}] if task_id == 1 else []
+
+
+def test_graph_attention_scores_match_pairwise_formula() -> None:
+    reranker = GraphAttentionReranker(repo=_FakeTaskRepo())
+    embeddings = {1: [1.0, 0.0, 0.0], 2: [0.9, 0.1, 0.0], 3: [0.0, 1.0, 0.0], 4: [0.0, 0.0, 0.0]}
+    subgraph = reranker._build_attention_subgraph([1, 2, 3, 4], embeddings)
+
+    scores = reranker._compute_attention_scores(1, subgraph)
+
+    features, adjacency = subgraph["node_features"], subgraph["adjacency"]
+    expected = {1: 1.0}
+    for index, task_id in enumerate([2, 3, 4], start=1):
+        expected[task_id] = reranker._compute_pairwise_attention(0, index, features, adjacency)
+    peak = max(expected.values())
+    assert scores == pytest.approx({task_id: value / peak for task_id, value in expected.items()}, abs=1e-6)
+
+    reranked = reranker.rerank_with_attention(
+        1, [{"id": 3, "similarity": 0.2}, {"id": 2, "similarity": 0.2}], embeddings
+    )
+    assert {c["id"]: c["attention_score"] for c in reranked} == pytest.approx(
+        {2: scores[2], 3: scores[3]}, abs=1e-6
+    )
+    assert reranked[0]["combined_score"] >= reranked[1]["combined_score"]
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import threading
+import time
+import json
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from app.database_pool import get_db
+from app.services import upload_extraction
+from app.services.request_principal import LEGACY_LOCAL_OWNER_ID
+from app.services.upload_extraction import (
+    ArchiveExtractionManager,
+    ArchiveRejected,
+    ExtractionJob,
+    ExtractionLimits,
+    describe_attachment_extraction,
+    extract_archive,
+)
+
+
+def _zip_bytes(members: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, payload in members.items():
+            archive.writestr(name, payload)
+    return buffer.getvalue()
+
+
+def test_extract_archive_streams_members_and_reports_progress(tmp_path: Path) -> None:
+    archive = tmp_path / "data.zip"
+    archive.write_bytes(_zip_bytes({"a.txt": b"alpha", "nested/b.txt": b"beta", "nested/": b""}))
+    progress: list[tuple[int, int]] = []
+
+    count = extract_archive(archive, tmp_path / "out", progress=lambda files, size: progress.append((files, size)))
+
+    assert count == 2
+    assert (tmp_path / "out" / "nested" / "b.txt").read_bytes() == b"beta"
+    assert progress[-1] == (2, 9)
+
+
+def test_extraction_limits_stop_zip_bombs_and_escapes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    bomb = tmp_path / "bomb.zip"
+    bomb.write_bytes(_zip_bytes({"zeros.bin": b"\0" * (4 * 1024 * 1024)}))
+    monkeypatch.setattr(upload_extraction, "RATIO_FLOOR_BYTES", 1024)
+
+    with pytest.raises(ArchiveRejected, match="expands more than"):
+        extract_archive(bomb, tmp_path / "bomb", limits=ExtractionLimits(max_ratio=50))
+    with pytest.raises(ArchiveRejected, match="beyond"):
+        extract_archive(bomb, tmp_path / "big", limits=ExtractionLimits(max_bytes=1024 * 1024, max_ratio=10_000))
+
+    escape = tmp_path / "escape.tar"
+    with tarfile.open(escape, "w") as archive:
+        info = tarfile.TarInfo("../outside.txt")
+        info.size = 1
+        archive.addfile(info, io.BytesIO(b"x"))
+    with pytest.raises(ArchiveRejected, match="escapes"):
+        extract_archive(escape, tmp_path / "escape")
+    assert not (tmp_path / "outside.txt").exists()
+
+
+def test_manager_runs_extraction_in_background_and_cleans_up_failures(tmp_path: Path) -> None:
+    manager = ArchiveExtractionManager(max_workers=1, limits=ExtractionLimits(max_members=1))
+    good = tmp_path / "good.zip"
+    good.write_bytes(_zip_bytes({"only.txt": b"ok"}))
+    bad = tmp_path / "bad.zip"
+    bad.write_bytes(_zip_bytes({"one.txt": b"1", "two.txt": b"2"}))
+    try:
+        ok_job = manager.submit(session_id="s", archive_path=good, dest_dir=tmp_path / "good")
+        bad_job = manager.submit(session_id="s", archive_path=bad, dest_dir=tmp_path / "bad")
+        assert ok_job.wait(5) and bad_job.wait(5)
+    finally:
+        manager.shutdown()
+
+    assert ok_job.status == "completed"
+    assert ok_job.extracted_files == 1
+    assert [event["type"] for event in ok_job.events][:2] == ["queued", "started"]
+    assert ok_job.events[-1]["type"] == "completed"
+    assert bad_job.status == "failed"
+    assert "more than 1 entries" in bad_job.error
+    assert not (tmp_path / "bad").exists()
+    assert manager.get(ok_job.extraction_id) is ok_job
+
+
+def test_shutdown_releases_the_shared_manager() -> None:
+    manager = upload_extraction.get_archive_extraction_manager()
+
+    upload_extraction.shutdown_archive_extraction_manager()
+
+    assert manager._executor._shutdown
+    assert upload_extraction.get_archive_extraction_manager() is not manager
+
+
+def test_event_watchers_wait_on_the_loop_not_in_worker_threads() -> None:
+    job = ExtractionJob("job1", "s", "a.zip", "out", status="running")
+
+    async def _watch() -> list:
+        # One worker thread: watchers parked in threads would queue behind it.
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+        first = await job.events_after(0, 0.05)
+        timer = threading.Timer(0.1, lambda: job._record("completed", status="completed"))
+        timer.start()
+        watchers = await asyncio.gather(*(job.events_after(0, 5.0) for _ in range(50)))
+        timer.join()
+        return [first, watchers]
+
+    started = time.monotonic()
+    first, watchers = asyncio.run(_watch())
+
+    assert time.monotonic() - started < 2
+    assert first == []
+    assert all([event["type"] for event in events] == ["completed"] for events in watchers)
+    assert job._watchers == []
+
+
+def test_attachment_prompt_only_names_completed_extractions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    job = ExtractionJob("job1", "s", "a.zip", str(tmp_path / "partial"), status="running")
+    jobs = {"job1": job}
+    monkeypatch.setattr(
+        upload_extraction,
+        "get_archive_extraction_manager",
+        lambda: type("Manager", (), {"get": staticmethod(jobs.get)})(),
+    )
+    attachment = {"extracted_path": job.extracted_path, "extraction_id": "job1", "extraction_status": "completed"}
+
+    assert "in progress" in describe_attachment_extraction(attachment)
+    job.status, job.error = "failed", "Archive has more than 1 entries"
+    assert describe_attachment_extraction(attachment) == (
+        "extraction failed (Archive has more than 1 entries); extracted files are not available"
+    )
+    job.status = "completed"
+    assert describe_attachment_extraction(attachment) == f"extracted: {job.extracted_path}"
+
+    # Untracked jobs (e.g. after a restart) count as done only if the directory exists.
+    untracked = {"extracted_path": str(tmp_path), "extraction_id": "gone", "extraction_status": "completed"}
+    assert describe_attachment_extraction(untracked) == f"extracted: {tmp_path}"
+    untracked["extracted_path"] = str(tmp_path / "missing")
+    assert describe_attachment_extraction(untracked) == "extracted files are not available"
+    assert describe_attachment_extraction({"path": "notes.txt"}) is None
+
+
+def test_upload_endpoint_returns_before_extraction_and_reports_status(app_client_factory) -> None:
+    payload = _zip_bytes({"table.csv": b"a,b\n1,2\n"})
+
+    with app_client_factory() as client:
+        with get_db() as conn:
+            conn.execute(
+                "INSERT INTO chat_sessions (id, owner_id) VALUES (?, ?)",
+                ("sess-upload", LEGACY_LOCAL_OWNER_ID),
+            )
+        response = client.post(
+            "/upload/file",
+            data={"session_id": "sess-upload"},
+            files={"file": ("data.zip", payload, "application/zip")},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["sha256"] == hashlib.sha256(payload).hexdigest()
+        assert body["extraction_status"] in {"queued", "running", "completed"}
+        assert body["extracted_files"] is None
+
+        job = upload_extraction.get_archive_extraction_manager().get(body["extraction_id"])
+        assert job is not None and job.wait(5)
+
+        status = client.get(
+            f"/upload/extractions/{body['extraction_id']}",
+            params={"session_id": "sess-upload"},
+        ).json()
+        assert status["status"] == "completed"
+        assert status["extracted_files"] == 1
+        assert (Path(body["extracted_path"]) / "table.csv").exists()
+
+        with client.stream(
+            "GET",
+            f"/upload/extractions/{body['extraction_id']}/events",
+            params={"session_id": "sess-upload"},
+        ) as stream:
+            events = [
+                json.loads(line[len("data: "):])
+                for line in stream.iter_lines()
+                if line.startswith("data: ")
+            ]
+        assert events[-1]["type"] == "completed"
+
+        missing = client.get(
+            f"/upload/extractions/{body['extraction_id']}",
+            params={"session_id": "other"},
+        )
+        assert missing.status_code == 404
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for chat request routing phrase matching.
+
+Compares the per-message cost of scanning every routing phrase table with
+substring loops against the compiled phrase automaton, and reports the
+end-to-end cost of the deterministic routing helpers.
+
+Usage:
+  python scripts/bench_request_routing.py
+  python scripts/bench_request_routing.py --rounds 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+CORPUS: Sequence[str] = (
+    "你好",
+    "thanks!",
+    "帮我创建一个噬菌体宿主预测的研究计划，然后开始执行",
+    "Please create a plan to analyze the phage genomes and run it afterwards",
+    "继续执行这个任务",
+    "What do you think about this direction?",
+    "search the latest papers on CRISPR anti-phage defense in 2025",
+    "帮我看看 /data/runs/run_01/results 目录里面有什么",
+    "把刚才那张图重新生成一下，颜色换成蓝色",
+    "review the current plan and optimize the dependencies between tasks",
+    "任务 123456 的状态怎么样了？还在跑吗",
+    "Unzip data/raw/archive.zip into the workspace and delete the zip afterwards",
+    "详细分析一下这个结果，展开说说每个 cluster 的含义",
+    "Run all remaining tasks in the entire plan without asking again",
+    "不要创建计划，直接回答：CheckV 的 completeness 是怎么计算的？",
+    (
+        "I uploaded three FASTQ files. Please run QC with fastp, assemble with "
+        "megahit, then annotate contigs with prokka and summarize the findings "
+        "in a short report with figures. Keep going until everything is done."
+    ),
+)
+
+
+def _time_per_message(fn: Callable[[str], object], messages: Sequence[str], rounds: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(rounds):
+        for message in messages:
+            start = time.perf_counter()
+            fn(message)
+            samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<42} mean={statistics.fmean(samples):8.2f}us  "
+        f"p50={statistics.median(samples):8.2f}us  p95={p95:8.2f}us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark chat request routing phrase matching.")
+    parser.add_argument("--rounds", type=int, default=200, help="Passes over the message corpus.")
+    args = parser.parse_args()
+
+    from app.routers.chat import request_routing as routing
+
+    tables = list(routing._PHRASE_TABLES.values())
+    matcher = routing._PHRASE_MATCHER
+
+    def substring_scan(message: str) -> List[bool]:
+        lowered = message.lower()
+        return [any(phrase in lowered for phrase in table) for table in tables]
+
+    def automaton_scan_cold(message: str) -> object:
+        matcher.categories_in.cache_clear()
+        return matcher.categories_in(message.lower())
+
+    def automaton_scan_warm(message: str) -> object:
+        return matcher.categories_in(message.lower())
+
+    def routing_helpers(message: str) -> object:
+        routing.classify_request_tier(message=message, plan_id=1)
+        return routing.resolve_plan_lifecycle_intent(message=message, plan_bound=True)
+
+    print(
+        f"{len(CORPUS)} messages x {args.rounds} rounds, {len(tables)} phrase tables, "
+        f"automaton backend={matcher.backend}"
+    )
+    _report("substring loops over all tables", _time_per_message(substring_scan, CORPUS, args.rounds))
+    _report("automaton, one pass (cold cache)", _time_per_message(automaton_scan_cold, CORPUS, args.rounds))
+    _report("automaton, repeated lookup (warm cache)", _time_per_message(automaton_scan_warm, CORPUS, args.rounds))
+    _report("classify tier + plan lifecycle intent", _time_per_message(routing_helpers, CORPUS, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
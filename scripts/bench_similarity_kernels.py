@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the vectorized cosine-similarity kernels.
+
+Compares the per-pair loop the similarity callers used to run
+(``SimilarityCalculator.compute_similarity`` over Python lists) against the
+matrix kernels in ``app.services.embeddings.similarity_kernels`` for a
+single query and a batch of queries against 10k targets, and reports the
+cost of ``argpartition`` top-k selection.
+
+The per-pair baseline is slow, so it only runs over the first
+``--baseline-queries`` queries of a batch. Its throughput is reported in
+pairs per second, which is directly comparable.
+
+Usage:
+  python scripts/bench_similarity_kernels.py
+  python scripts/bench_similarity_kernels.py --targets 20000 --dim 768 --rounds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def _time(fn: Callable[[], object], rounds: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _report(label: str, samples: List[float], pairs: int) -> float:
+    median = statistics.median(samples)
+    throughput = pairs / median if median > 0 else float("inf")
+    print(f"{label:<44} median={median * 1e3:10.3f}ms  pairs/s={throughput:14,.0f}")
+    return throughput
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cosine-similarity kernels.")
+    parser.add_argument("--targets", type=int, default=10_000, help="Number of target vectors.")
+    parser.add_argument("--dim", type=int, default=1024, help="Embedding dimension.")
+    parser.add_argument("--batch", type=int, default=100, help="Queries in the batched case.")
+    parser.add_argument("--k", type=int, default=10, help="Top-k size.")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed repetitions per case.")
+    parser.add_argument("--baseline-queries", type=int, default=1, help="Queries timed with the per-pair loop.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from app.services.embeddings import similarity_kernels as kernels
+    from app.services.embeddings.similarity_calculator import SimilarityCalculator
+
+    calculator = SimilarityCalculator()
+
+    rng = np.random.default_rng(args.seed)
+    targets = rng.standard_normal((args.targets, args.dim), dtype=np.float32)
+    queries = rng.standard_normal((args.batch, args.dim), dtype=np.float32)
+    target_lists = targets.tolist()
+    normalized_targets = kernels.normalize_rows(targets)
+
+    print(f"targets={args.targets} dim={args.dim} batch={args.batch} k={args.k} rounds={args.rounds}")
+
+    baseline_queries = queries[: max(1, args.baseline_queries)].tolist()
+
+    def _pairwise_loop() -> None:
+        for query in baseline_queries:
+            [calculator.compute_similarity(query, target) for target in target_lists]
+
+    baseline = _report(
+        f"per-pair loop ({len(baseline_queries)}x{args.targets})",
+        _time(_pairwise_loop, 1),
+        len(baseline_queries) * args.targets,
+    )
+
+    for count in (1, args.batch):
+        batch = queries[:count]
+        batch_lists = batch.tolist()
+        label = f"{count}x{args.targets}"
+        from_lists = _report(
+            f"kernel, python lists ({label})",
+            _time(lambda: kernels.cosine_similarity_matrix(batch_lists, target_lists), args.rounds),
+            count * args.targets,
+        )
+        prepared = _report(
+            f"kernel, pre-normalized targets ({label})",
+            _time(
+                lambda: kernels.cosine_similarity_matrix(
+                    kernels.normalize_rows(batch), normalized_targets, normalized=True
+                ),
+                args.rounds,
+            ),
+            count * args.targets,
+        )
+        scores = kernels.cosine_similarity_matrix(batch, normalized_targets)
+
+        def _select() -> None:
+            for row in scores:
+                kernels.top_k(row, args.k)
+
+        _report(f"top-{args.k} argpartition ({label})", _time(_select, args.rounds), count * args.targets)
+        print(
+            f"{'':<44} speedup vs loop: lists={from_lists / baseline:8.1f}x  "
+            f"pre-normalized={prepared / baseline:8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Performance regression suite for plan, executor, streaming and cache hot paths.
+
+Runs synthetic workloads (stub LLM, isolated SQLite root, in-memory realtime
+bus) and writes a JSON report. Two reports, e.g. from two commits, can be
+compared; the compare command exits non-zero when any case slowed down
+beyond its threshold.
+
+Usage:
+  python scripts/perf_suite.py list
+  python scripts/perf_suite.py run --output perf/base.json
+  python scripts/perf_suite.py run --cases plan_tree_load,sse_fanout --repeat 10 --scale 2
+  python scripts/perf_suite.py compare perf/base.json perf/head.json --threshold 0.15 \\
+      --case-threshold plan_decomposition=0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def _parse_case_thresholds(values: List[str]) -> Dict[str, float]:
+    thresholds: Dict[str, float] = {}
+    for value in values:
+        name, sep, raw = value.partition("=")
+        if not sep:
+            raise SystemExit(f"--case-threshold expects NAME=RATIO, got {value!r}")
+        thresholds[name.strip()] = float(raw)
+    return thresholds
+
+
+def _cmd_list(_args: argparse.Namespace) -> int:
+    from app.services.evaluation.perf_suite import PERF_CASES
+
+    for case in PERF_CASES.values():
+        print(f"{case.name:<24} {case.description}")
+    return 0
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    from app.services.evaluation.perf_suite import run_perf_suite
+
+    cases = [name.strip() for name in args.cases.split(",") if name.strip()] if args.cases else None
+    report = run_perf_suite(
+        cases,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        scale=args.scale,
+        seed=args.seed,
+    )
+    for name, result in report["results"].items():
+        print(
+            f"{name:<24} median={result['median_ms']:10.3f}ms  p95={result['p95_ms']:10.3f}ms  "
+            f"ops/s={result['ops_per_sec']}"
+        )
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"wrote {output}")
+    return 0
+
+
+def _cmd_compare(args: argparse.Namespace) -> int:
+    from app.services.evaluation.perf_suite import compare_perf_reports
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    comparison = compare_perf_reports(
+        baseline,
+        current,
+        threshold=args.threshold,
+        case_thresholds=_parse_case_thresholds(args.case_threshold),
+        metric=args.metric,
+    )
+    for row in comparison["cases"]:
+        change = "n/a" if row["change"] is None else f"{row['change']:+.1%}"
+        print(
+            f"{row['case']:<24} {row['status']:<10} {change:>8}  "
+            f"({row['baseline']} -> {row['current']} {comparison['metric']}, limit {row['threshold']:.0%})"
+        )
+    if args.json:
+        print(json.dumps(comparison, indent=2))
+    return 0 if comparison["ok"] else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run or compare the perf regression suite.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="List available perf cases.")
+
+    run = sub.add_parser("run", help="Run perf cases and emit a JSON report.")
+    run.add_argument("--cases", help="Comma-separated case names (default: all).")
+    run.add_argument("--repeat", type=int, default=5, help="Timed runs per case.")
+    run.add_argument("--warmup", type=int, default=1, help="Untimed runs per case.")
+    run.add_argument("--scale", type=float, default=1.0, help="Multiplier for synthetic input sizes.")
+    run.add_argument("--seed", type=int, default=0, help="Seed for synthetic inputs.")
+    run.add_argument("--output", help="Write the JSON report to this path.")
+
+    compare = sub.add_parser("compare", help="Compare two JSON reports.")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown ratio (0.15 = 15%%).")
+    compare.add_argument(
+        "--case-threshold",
+        action="append",
+        default=[],
+        metavar="NAME=RATIO",
+        help="Per-case override of --threshold; may be repeated.",
+    )
+    compare.add_argument("--metric", default="median_ms", help="Result field to compare.")
+    compare.add_argument("--json", action="store_true", help="Also print the comparison as JSON.")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    handlers = {"list": _cmd_list, "run": _cmd_run, "compare": _cmd_compare}
+    raise SystemExit(handlers[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
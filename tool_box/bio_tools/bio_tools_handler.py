@@ -29,6 +29,15 @@ from .remote_executor import (
     resolve_remote_uid_gid,
     upload_files,
 )
+from .result_cache import (
+    begin_output_capture,
+    build_cache_key,
+    changed_files,
+    fingerprint_input_paths,
+    get_result_cache,
+    resolve_image_digest,
+    snapshot_directory,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,8 +53,9 @@ DEFAULT_EXECUTION_MODE = "local"
 BIO_TOOLS_BACKGROUND_JOB_TYPE = "bio_tools_run"
 BIO_TOOLS_BACKGROUND_MODE = "bio_tools_background"
 JOB_STATUS_OPERATION = "job_status"
+RESULT_CACHE_DIR = str(Path(RUNTIME_BASE_DIR) / "_result_cache")
 
-_CONTROL_PARAM_KEYS = {"background", "async", "detached", "wait", "job_id"}
+_CONTROL_PARAM_KEYS = {"background", "async", "detached", "wait", "job_id", "force"}
 _SYSTEM_RESERVED_PARAM_KEYS = {
     "input_file",
     "output_file",
@@ -1154,6 +1164,58 @@ def _apply_execution_metadata(result: Dict[str, Any], *, mode: str, host: str) -
     return result
 
 
+def _iter_local_input_paths(
+    *,
+    input_file: Optional[str],
+    params: Optional[Dict[str, Any]],
+    tool_dir: Path,
+) -> List[Tuple[str, str]]:
+    paths: List[Tuple[str, str]] = []
+    if input_file:
+        paths.append(("input_file", str(Path(input_file).resolve())))
+    for key, value in sorted((params or {}).items()):
+        if key not in INPUT_PATH_PARAM_KEYS or not isinstance(value, str) or not value:
+            continue
+        parts = value.split(",") if key in MULTI_PATH_PARAM_KEYS else [value]
+        for index, part in enumerate(p.strip() for p in parts):
+            if not part:
+                continue
+            candidate = Path(part).expanduser()
+            if not candidate.is_absolute():
+                candidate = tool_dir / candidate
+            paths.append((f"{key}[{index}]", str(candidate)))
+    return paths
+
+
+async def _resolve_local_cache_key(
+    *,
+    tool_name: str,
+    operation: str,
+    input_file: Optional[str],
+    output_file: Optional[str],
+    params: Optional[Dict[str, Any]],
+    tool_dir: Path,
+) -> Optional[str]:
+    image = str(get_tools_config().get(tool_name, {}).get("image") or "")
+    if not image:
+        return None
+    image_digest = await resolve_image_digest(image)
+    if not image_digest:
+        return None
+    input_paths = _iter_local_input_paths(input_file=input_file, params=params, tool_dir=tool_dir)
+    input_fingerprints = await asyncio.to_thread(fingerprint_input_paths, input_paths)
+    if input_fingerprints is None:
+        return None
+    return build_cache_key(
+        tool_name=tool_name,
+        operation=operation,
+        params=dict(params or {}),
+        output_file=output_file,
+        image_digest=image_digest,
+        input_fingerprints=input_fingerprints,
+    )
+
+
 async def _execute_local_bio_tool(
     *,
     tool_name: str,
@@ -1163,6 +1225,7 @@ async def _execute_local_bio_tool(
     params: Optional[Dict[str, Any]],
     timeout: Optional[int],
     log_callback: Optional[Callable[[str, str], None]] = None,
+    force: bool = False,
 ) -> Dict[str, Any]:
     docker_args = _build_docker_command_args(
         tool_name=tool_name,
@@ -1171,13 +1234,85 @@ async def _execute_local_bio_tool(
         output_file=output_file,
         extra_params=params,
     )
-    result = await execute_docker_command(docker_args, timeout=timeout, log_callback=log_callback)
+    tool_dir = ensure_tool_directory(tool_name)
+
+    cache = get_result_cache(RESULT_CACHE_DIR)
+    cache_key: Optional[str] = None
+    if cache is not None:
+        try:
+            cache_key = await _resolve_local_cache_key(
+                tool_name=tool_name,
+                operation=operation,
+                input_file=input_file,
+                output_file=output_file,
+                params=params,
+                tool_dir=tool_dir,
+            )
+        except Exception as exc:  # pragma: no cover - cache must never block execution
+            logger.warning("bio_tools result cache key resolution failed: %s", exc)
+            cache_key = None
+
+    if cache is not None and cache_key and not force:
+        manifest = await asyncio.to_thread(cache.lookup, cache_key)
+        restored: Optional[List[str]] = None
+        if manifest is not None:
+            try:
+                restored = await asyncio.to_thread(cache.restore, manifest, tool_dir)
+            except OSError as exc:
+                # A blob evicted between lookup and restore: treat as a miss.
+                logger.warning(
+                    "bio_tools cache entry %s could not be restored (%s); running the tool",
+                    cache_key[:12],
+                    exc,
+                )
+                await asyncio.to_thread(cache.discard, cache_key)
+        if manifest is not None and restored is not None:
+            logger.info("bio_tools cache hit for %s.%s (%s)", tool_name, operation, cache_key[:12])
+            cached_result: Dict[str, Any] = dict(manifest.get("result") or {})
+            cached_result["command"] = shlex.join(docker_args)
+            cached_result["cache_hit"] = True
+            cached_result["cache_key"] = cache_key
+            cached_result["cached_at"] = manifest.get("created_at")
+            cached_result["restored_files"] = restored
+            if output_file:
+                cached_result["output_path"] = str(tool_dir / output_file)
+            return _apply_execution_metadata(cached_result, mode="local", host="local")
+
+    capture = begin_output_capture(tool_dir) if cache_key else None
+    try:
+        before = await asyncio.to_thread(snapshot_directory, tool_dir) if capture else None
+        result = await execute_docker_command(docker_args, timeout=timeout, log_callback=log_callback)
+        after = await asyncio.to_thread(snapshot_directory, tool_dir) if capture else None
+    finally:
+        exclusive = capture.finish() if capture else False
     result["command"] = shlex.join(docker_args)
     result["tool"] = tool_name
     result["operation"] = operation
     if output_file and result.get("success"):
-        tool_dir = ensure_tool_directory(tool_name)
         result["output_path"] = str(tool_dir / output_file)
+
+    if cache is not None and cache_key and before is not None:
+        result["cache_hit"] = False
+        result["cache_key"] = cache_key
+        if not exclusive:
+            logger.info(
+                "bio_tools run %s.%s overlapped another run in %s; not caching its outputs",
+                tool_name,
+                operation,
+                tool_dir,
+            )
+        elif result.get("success"):
+            try:
+                await asyncio.to_thread(
+                    cache.store,
+                    cache_key,
+                    result=result,
+                    base_dir=tool_dir,
+                    output_files=changed_files(before, after),
+                    metadata={"tool": tool_name, "operation": operation},
+                )
+            except Exception as exc:  # pragma: no cover - cache must never fail a run
+                logger.warning("Failed to store bio_tools result in cache: %s", exc)
     return _apply_execution_metadata(result, mode="local", host="local")
 
 
@@ -1361,6 +1496,7 @@ async def _execute_bio_tool_once(
     timeout: Optional[int],
     log_callback: Optional[Callable[[str, str], None]] = None,
     tool_context: Optional[Any] = None,
+    force: bool = False,
 ) -> Dict[str, Any]:
     async def _report(stage: str, message: str) -> None:
         if tool_context is not None and tool_context.on_progress:
@@ -1394,6 +1530,7 @@ async def _execute_bio_tool_once(
                 params=params,
                 timeout=timeout,
                 log_callback=log_callback,
+                force=force,
             )
             local_result["remote_fallback"] = True
             local_result["remote_fallback_error"] = remote_result.get(
@@ -1417,9 +1554,13 @@ async def _execute_bio_tool_once(
         params=params,
         timeout=timeout,
         log_callback=log_callback,
+        force=force,
     )
     if local_result.get("success"):
-        await _report("completed", f"{tool_name} {operation} completed successfully")
+        if local_result.get("cache_hit"):
+            await _report("completed", f"{tool_name} {operation} restored from result cache")
+        else:
+            await _report("completed", f"{tool_name} {operation} completed successfully")
     else:
         await _report("failed", f"{tool_name} {operation} failed")
     return local_result
@@ -1481,6 +1622,7 @@ def _run_background_bio_tools_job(
     output_file: Optional[str],
     params: Optional[Dict[str, Any]],
     timeout: Optional[int],
+    force: bool = False,
 ) -> None:
     manager = _get_plan_job_manager()
     ctx_token = _set_current_job_context(job_id)
@@ -1538,6 +1680,7 @@ def _run_background_bio_tools_job(
                 params=params,
                 timeout=timeout,
                 log_callback=_docker_log_callback,
+                force=force,
             )
         )
         # Flush any remaining buffered lines before processing result
@@ -1594,6 +1737,7 @@ def _submit_background_bio_tools_job(
     output_file: Optional[str],
     params: Optional[Dict[str, Any]],
     timeout: Optional[int],
+    force: bool = False,
 ) -> Dict[str, Any]:
     manager = _get_plan_job_manager()
     job_id = f"bio_{uuid.uuid4().hex}"
@@ -1636,6 +1780,7 @@ def _submit_background_bio_tools_job(
             "output_file": output_file,
             "params": safe_params,
             "timeout": timeout,
+            "force": force,
         },
         daemon=True,
     )
@@ -1667,6 +1812,7 @@ async def bio_tools_handler(
     background: Optional[bool] = None,
     job_id: Optional[str] = None,
     session_id: Optional[str] = None,
+    force: Optional[bool] = None,
     tool_context: Optional[Any] = None,
 ) -> Dict[str, Any]:
     """
@@ -1679,6 +1825,7 @@ async def bio_tools_handler(
         output_file: （）
         params: 
         timeout: （）
+        force: Re-run even when an identical cached result exists
     
     Returns:
         
@@ -1690,6 +1837,7 @@ async def bio_tools_handler(
         job_id=job_id,
     )
     effective_timeout = _normalize_handler_timeout(timeout)
+    force_rerun = _coerce_bool((params or {}).get("force"), default=_coerce_bool(force))
     
     # ：
     if tool_name == "list" or operation == "list":
@@ -1895,6 +2043,7 @@ async def bio_tools_handler(
                 output_file=output_file,
                 params=validated_params,
                 timeout=effective_timeout,
+                force=force_rerun,
             )
         else:
             result = await _execute_bio_tool_once(
@@ -1905,6 +2054,7 @@ async def bio_tools_handler(
                 params=validated_params,
                 timeout=effective_timeout,
                 tool_context=tool_context,
+                force=force_rerun,
             )
 
         if input_origin:
@@ -2008,6 +2158,13 @@ Use operation="help" with a tool_name to see available operations.""",
             "session_id": {
                 "type": "string",
                 "description": "Optional session id used for session-scoped inline sequence storage."
+            },
+            "force": {
+                "type": "boolean",
+                "description": (
+                    "If true, re-run the tool even when an identical run (same inputs, params and image) "
+                    "is already cached."
+                )
             }
         },
         "required": ["tool_name"]
@@ -2,19 +2,27 @@
 """Remote execution helpers for bio_tools.
 
 This module executes commands on a remote host via SSH, supports key-first
-authentication with password fallback, and handles file transfer through scp.
+authentication with password fallback, and handles file transfer through scp
+or batched tar-over-ssh streams. Commands for the same host share one
+persistent ControlMaster connection so each step skips the SSH handshake.
 """
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
+import posixpath
 import shlex
 import shutil
+import tarfile
+import tempfile
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple, Union
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 _AUTH_FAILURE_MARKERS = (
     "permission denied",
@@ -36,6 +44,19 @@ _SCP_TRANSIENT_FAILURE_MARKERS = (
     "operation timed out",
 )
 
+_MUX_FAILURE_MARKERS = (
+    "mux_client",
+    "control socket",
+    "controlsocket",
+    "master is dead",
+    "connection to master",
+)
+
+# Seconds between ``ssh -O check`` probes of a master that was healthy, and
+# before retrying a master that failed to start.
+_MASTER_RECHECK_SECONDS = 30.0
+_MASTER_RETRY_BACKOFF_SECONDS = 30.0
+
 
 @dataclass
 class RemoteExecutionConfig:
@@ -50,6 +71,8 @@ class RemoteExecutionConfig:
     connect_timeout: int
     scp_retries: int = 2
     scp_retry_delay: float = 1.5
+    control_persist: int = 600
+    control_dir: Optional[str] = None
 
     @classmethod
     def from_env(cls) -> "RemoteExecutionConfig":
@@ -66,6 +89,8 @@ class RemoteExecutionConfig:
         timeout_raw = os.getenv("BIO_TOOLS_REMOTE_CONNECT_TIMEOUT", "15").strip() or "15"
         scp_retries_raw = os.getenv("BIO_TOOLS_REMOTE_SCP_RETRIES", "2").strip() or "2"
         scp_retry_delay_raw = os.getenv("BIO_TOOLS_REMOTE_SCP_RETRY_DELAY", "1.5").strip() or "1.5"
+        control_persist_raw = os.getenv("BIO_TOOLS_REMOTE_CONTROL_PERSIST", "600").strip() or "600"
+        control_dir = (os.getenv("BIO_TOOLS_REMOTE_CONTROL_DIR") or "").strip() or None
 
         try:
             port = int(port_raw)
@@ -87,6 +112,11 @@ class RemoteExecutionConfig:
         except ValueError:
             scp_retry_delay = 1.5
 
+        try:
+            control_persist = int(control_persist_raw)
+        except ValueError:
+            control_persist = 600
+
         if sudo_policy not in {"on_demand", "always", "never"}:
             sudo_policy = "on_demand"
 
@@ -102,6 +132,8 @@ class RemoteExecutionConfig:
             connect_timeout=max(1, connect_timeout),
             scp_retries=max(0, scp_retries),
             scp_retry_delay=max(0.0, scp_retry_delay),
+            control_persist=max(0, control_persist),
+            control_dir=control_dir,
         )
 
     def missing_required(self) -> List[str]:
@@ -126,6 +158,16 @@ class RemoteExecutionConfig:
     def has_password(self) -> bool:
         return bool(self.password)
 
+    def multiplexing_enabled(self) -> bool:
+        return self.control_persist > 0
+
+    def control_path(self) -> str:
+        # A short hashed socket name keeps the path under the unix socket
+        # length limit regardless of user/host length.
+        base_dir = Path(self.control_dir or Path(tempfile.gettempdir()) / "gagent-ssh-mux").expanduser()
+        identity = f"{self.user}@{self.host}:{self.port}".encode("utf-8")
+        return str(base_dir / f"{hashlib.sha1(identity).hexdigest()[:16]}.sock")
+
 
 @dataclass
 class ResolvedAuth:
@@ -217,13 +259,97 @@ async def _run_subprocess(
         }
 
 
+def _write_tar_stream(write_fd: int, members: Sequence[Tuple[str, str]]) -> None:
+    with os.fdopen(write_fd, "wb") as pipe:
+        try:
+            with tarfile.open(fileobj=pipe, mode="w|") as archive:
+                for local_path, arcname in members:
+                    archive.add(local_path, arcname=arcname, recursive=False)
+        except BrokenPipeError:
+            # The remote side exited early; its stderr carries the reason.
+            pass
+
+
+async def _run_subprocess_with_tar_stdin(
+    args: Sequence[str],
+    timeout: Optional[int],
+    members: Sequence[Tuple[str, str]],
+    *,
+    display_command: str,
+) -> dict:
+    """Run *args* with a tar archive of *members* streamed to its stdin."""
+    start_time = datetime.now()
+    read_fd, write_fd = os.pipe()
+    writer: Optional[threading.Thread] = None
+    try:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=read_fd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        finally:
+            os.close(read_fd)
+        writer = threading.Thread(target=_write_tar_stream, args=(write_fd, members), daemon=True)
+        writer.start()
+        write_fd = -1
+        try:
+            if timeout is None:
+                stdout, stderr = await process.communicate()
+            else:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            try:
+                process.kill()
+                await process.wait()
+            except Exception:
+                pass
+            return {
+                "success": False,
+                "error": f"Command timed out after {timeout} seconds",
+                "command": display_command,
+            }
+        return {
+            "success": process.returncode == 0,
+            "exit_code": process.returncode,
+            "stdout": stdout.decode("utf-8", errors="replace") if stdout else "",
+            "stderr": stderr.decode("utf-8", errors="replace") if stderr else "",
+            "duration_seconds": (datetime.now() - start_time).total_seconds(),
+            "command": display_command,
+        }
+    except Exception as exc:  # pragma: no cover - defensive
+        return {
+            "success": False,
+            "error": str(exc),
+            "command": display_command,
+        }
+    finally:
+        if write_fd >= 0:
+            os.close(write_fd)
+        if writer is not None:
+            await asyncio.to_thread(writer.join, 5)
+
+
 def _normalize_remote_command(command: Union[str, Sequence[str]]) -> str:
     if isinstance(command, str):
         return command
     return shlex.join([str(token) for token in command])
 
 
-def _build_ssh_base(config: RemoteExecutionConfig, auth: ResolvedAuth) -> List[str]:
+def _multiplex_options(config: RemoteExecutionConfig) -> List[str]:
+    """Client options that ride an existing master, or connect directly if none."""
+    if not config.multiplexing_enabled():
+        return []
+    return ["-o", "ControlMaster=no", "-o", f"ControlPath={config.control_path()}"]
+
+
+def _build_ssh_base(
+    config: RemoteExecutionConfig,
+    auth: ResolvedAuth,
+    *,
+    multiplex: bool = True,
+) -> List[str]:
     args: List[str] = []
     if auth.mode == "password":
         if not shutil.which("sshpass"):
@@ -246,6 +372,8 @@ def _build_ssh_base(config: RemoteExecutionConfig, auth: ResolvedAuth) -> List[s
             str(config.port),
         ]
     )
+    if multiplex:
+        args.extend(_multiplex_options(config))
     if auth.mode == "key":
         if not auth.key_path:
             raise RuntimeError("SSH key auth selected but no key path provided")
@@ -276,6 +404,7 @@ def _build_scp_base(config: RemoteExecutionConfig, auth: ResolvedAuth) -> List[s
             str(config.port),
         ]
     )
+    args.extend(_multiplex_options(config))
     if auth.mode == "key":
         if not auth.key_path:
             raise RuntimeError("SSH key auth selected but no key path provided")
@@ -301,12 +430,25 @@ async def _run_scp_with_retries(
     display_command: str,
     retries: int,
     retry_delay: float,
+) -> dict:
+    return await _run_transfer_with_retries(
+        lambda: _run_subprocess(args, timeout=timeout, display_command=display_command),
+        retries=retries,
+        retry_delay=retry_delay,
+    )
+
+
+async def _run_transfer_with_retries(
+    run_once: Callable[[], Awaitable[dict]],
+    *,
+    retries: int,
+    retry_delay: float,
 ) -> dict:
     attempt = 0
     last_result: dict = {}
     while True:
         attempt += 1
-        result = await _run_subprocess(args, timeout=timeout, display_command=display_command)
+        result = await run_once()
         result["attempt"] = attempt
         if result.get("success"):
             result["retries_used"] = attempt - 1
@@ -320,6 +462,111 @@ async def _run_scp_with_retries(
     return last_result
 
 
+# control path -> (healthy, monotonic time of last check or failed start)
+_master_states: Dict[str, Tuple[bool, float]] = {}
+
+
+async def _run_control_command(args: Sequence[str], timeout: float) -> int:
+    # Masters fork into the background (-f) and would keep captured pipes
+    # open, so control commands never capture output.
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        return await asyncio.wait_for(process.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        try:
+            process.kill()
+            await process.wait()
+        except Exception:
+            pass
+        return -1
+    except Exception:
+        return -1
+
+
+def _control_args(config: RemoteExecutionConfig, auth: ResolvedAuth, *extra: str) -> List[str]:
+    base = _build_ssh_base(config, auth, multiplex=False)
+    return base + ["-o", f"ControlPath={config.control_path()}", *extra, f"{config.user}@{config.host}"]
+
+
+async def check_master(config: RemoteExecutionConfig, auth: ResolvedAuth) -> bool:
+    """Return True when a live ControlMaster answers on the control socket."""
+    if not config.multiplexing_enabled():
+        return False
+    if not Path(config.control_path()).exists():
+        return False
+    return await _run_control_command(_control_args(config, auth, "-O", "check"), timeout=10) == 0
+
+
+async def stop_master(config: RemoteExecutionConfig, auth: ResolvedAuth) -> None:
+    control_path = config.control_path()
+    _master_states.pop(control_path, None)
+    if Path(control_path).exists():
+        await _run_control_command(_control_args(config, auth, "-O", "exit"), timeout=10)
+        try:
+            Path(control_path).unlink()
+        except FileNotFoundError:
+            pass
+
+
+async def ensure_master(config: RemoteExecutionConfig, auth: ResolvedAuth) -> bool:
+    """Make sure a persistent ControlMaster is running for *config*'s host.
+
+    Health is re-probed at most every ``_MASTER_RECHECK_SECONDS``; a dead
+    master is restarted. Returns False when multiplexing is disabled or the
+    master could not be started, in which case commands connect directly.
+    """
+    if not config.multiplexing_enabled():
+        return False
+    control_path = config.control_path()
+    now = time.monotonic()
+    state = _master_states.get(control_path)
+    if state is not None:
+        healthy, checked_at = state
+        if healthy and now - checked_at < _MASTER_RECHECK_SECONDS:
+            return True
+        if not healthy and now - checked_at < _MASTER_RETRY_BACKOFF_SECONDS:
+            return False
+
+    if await check_master(config, auth):
+        _master_states[control_path] = (True, now)
+        return True
+
+    # Stale sockets left by a crashed master make ssh refuse to bind a new one.
+    try:
+        Path(control_path).unlink()
+    except FileNotFoundError:
+        pass
+    Path(control_path).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    exit_code = await _run_control_command(
+        _control_args(
+            config,
+            auth,
+            "-o",
+            "ControlMaster=yes",
+            "-o",
+            f"ControlPersist={config.control_persist}",
+            "-N",
+            "-f",
+        ),
+        timeout=config.connect_timeout + 10,
+    )
+    healthy = exit_code == 0 and await check_master(config, auth)
+    _master_states[control_path] = (healthy, time.monotonic())
+    return healthy
+
+
+def _is_mux_failure(result: dict) -> bool:
+    if result.get("success") or result.get("exit_code") != 255:
+        return False
+    text = str(result.get("stderr", "")).lower()
+    return any(marker in text for marker in _MUX_FAILURE_MARKERS)
+
+
 async def _run_ssh_command(
     config: RemoteExecutionConfig,
     auth: ResolvedAuth,
@@ -329,10 +576,17 @@ async def _run_ssh_command(
     display_command: Optional[str] = None,
 ) -> dict:
     command_text = _normalize_remote_command(command)
+    await ensure_master(config, auth)
     base = _build_ssh_base(config, auth)
     target = f"{config.user}@{config.host}"
     args = base + [target, _remote_shell_arg(command_text)]
-    return await _run_subprocess(args, timeout, display_command=display_command)
+    result = await _run_subprocess(args, timeout, display_command=display_command)
+    if _is_mux_failure(result):
+        await stop_master(config, auth)
+        await ensure_master(config, auth)
+        result = await _run_subprocess(args, timeout, display_command=display_command)
+        result["master_restarted"] = True
+    return result
 
 
 async def resolve_auth(config: RemoteExecutionConfig) -> ResolvedAuth:
@@ -429,13 +683,54 @@ async def resolve_remote_uid_gid(
     return values[0], values[1]
 
 
+async def _upload_files_tar(
+    config: RemoteExecutionConfig,
+    auth: ResolvedAuth,
+    uploads: Sequence[Tuple[str, str]],
+) -> List[dict]:
+    """Upload all files in one tar stream over a single ssh invocation."""
+    local_paths = [str(Path(local).expanduser().resolve()) for local, _remote in uploads]
+    remote_root = posixpath.commonpath([posixpath.dirname(remote) for _local, remote in uploads])
+    members = [
+        (local_abs, posixpath.relpath(remote, remote_root))
+        for local_abs, (_local, remote) in zip(local_paths, uploads)
+    ]
+    remote_cmd = f"mkdir -p {shlex.quote(remote_root)} && tar -xf - -C {shlex.quote(remote_root)}"
+    args = _build_ssh_base(config, auth) + [
+        f"{config.user}@{config.host}",
+        _remote_shell_arg(remote_cmd),
+    ]
+    display = f"tar({len(members)} files) -> {config.user}@{config.host}:{remote_root}"
+    timeout = max(config.connect_timeout + 120, 180)
+    batch_result = await _run_transfer_with_retries(
+        lambda: _run_subprocess_with_tar_stdin(args, timeout, members, display_command=display),
+        retries=config.scp_retries,
+        retry_delay=config.scp_retry_delay,
+    )
+    results: List[dict] = []
+    for local_abs, (_local, remote_path) in zip(local_paths, uploads):
+        result = dict(batch_result)
+        result["local_path"] = local_abs
+        result["remote_path"] = remote_path
+        result["batched"] = True
+        results.append(result)
+    return results
+
+
 async def upload_files(
     config: RemoteExecutionConfig,
     auth: ResolvedAuth,
     uploads: Iterable[Tuple[str, str]],
 ) -> List[dict]:
+    pending = list(uploads)
+    if len(pending) > 1:
+        await ensure_master(config, auth)
+        batched = await _upload_files_tar(config, auth, pending)
+        if all(item.get("success") for item in batched):
+            return batched
+        # Fall back to per-file scp, e.g. when the remote host lacks tar.
     results: List[dict] = []
-    for local_path, remote_path in uploads:
+    for local_path, remote_path in pending:
         local_abs = str(Path(local_path).expanduser().resolve())
         scp_base = _build_scp_base(config, auth)
         target = f"{config.user}@{config.host}:{remote_path}"
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""Result memoization for local bio_tools runs.
+
+Identical runs (same tool, operation, normalized parameters, container image
+digest and input file contents) are short-circuited: the first successful run
+stores its result payload and the files it wrote into the tool directory in a
+content-addressed cache, and later runs restore them instead of spawning a new
+container. Entries are evicted least-recently-used once the configured entry
+count or byte budget is exceeded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_VERSION = "v1"
+_HASH_CHUNK_BYTES = 1024 * 1024
+_FILE_HASH_MEMO_SIZE = 4096
+_IMAGE_DIGEST_TTL_SECONDS = 60.0
+_IMAGE_INSPECT_TIMEOUT_SECONDS = 30.0
+
+# Result fields that describe a single invocation rather than its outcome.
+_VOLATILE_RESULT_KEYS = {
+    "output_path",
+    "cache_hit",
+    "cache_key",
+    "cached_at",
+    "restored_files",
+    "execution_mode",
+    "execution_host",
+}
+
+_file_hash_memo: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_file_hash_lock = threading.Lock()
+_image_digest_memo: Dict[str, Tuple[str, float]] = {}
+
+
+@dataclass
+class ResultCacheConfig:
+    enabled: bool
+    root: str
+    max_entries: int
+    max_bytes: int
+
+    @classmethod
+    def from_env(cls, default_root: str) -> "ResultCacheConfig":
+        enabled_raw = (os.getenv("BIO_TOOLS_RESULT_CACHE", "1") or "1").strip().lower()
+        root = (os.getenv("BIO_TOOLS_RESULT_CACHE_DIR") or "").strip() or default_root
+        max_entries_raw = os.getenv("BIO_TOOLS_RESULT_CACHE_MAX_ENTRIES", "256").strip() or "256"
+        max_bytes_raw = (
+            os.getenv("BIO_TOOLS_RESULT_CACHE_MAX_BYTES", str(20 * 1024**3)).strip()
+            or str(20 * 1024**3)
+        )
+
+        try:
+            max_entries = int(max_entries_raw)
+        except ValueError:
+            max_entries = 256
+
+        try:
+            max_bytes = int(max_bytes_raw)
+        except ValueError:
+            max_bytes = 20 * 1024**3
+
+        return cls(
+            enabled=enabled_raw not in {"0", "false", "no", "off"},
+            root=root,
+            max_entries=max(1, max_entries),
+            max_bytes=max(0, max_bytes),
+        )
+
+
+def hash_file_content(path: Path) -> str:
+    """Return the sha256 of *path*, memoized by ``(path, size, mtime_ns)``."""
+    stat = path.stat()
+    memo_key = (str(path), int(stat.st_size), int(stat.st_mtime_ns))
+    with _file_hash_lock:
+        cached = _file_hash_memo.get(memo_key)
+        if cached is not None:
+            _file_hash_memo.move_to_end(memo_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while True:
+            chunk = handle.read(_HASH_CHUNK_BYTES)
+            if not chunk:
+                break
+            digest.update(chunk)
+    value = digest.hexdigest()
+    with _file_hash_lock:
+        _file_hash_memo[memo_key] = value
+        while len(_file_hash_memo) > _FILE_HASH_MEMO_SIZE:
+            _file_hash_memo.popitem(last=False)
+    return value
+
+
+def _fingerprint_directory(path: Path) -> str:
+    # Directories are typically reference databases (BLAST dbs, HMM libraries)
+    # whose full content hash would cost as much as the tool run itself, so
+    # they are fingerprinted by their file listing and stat metadata instead.
+    digest = hashlib.sha256()
+    for child in sorted(p for p in path.rglob("*") if p.is_file()):
+        stat = child.stat()
+        digest.update(
+            f"{child.relative_to(path).as_posix()}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8")
+        )
+    return f"dir:{digest.hexdigest()}"
+
+
+def _fingerprint_prefix(path: Path) -> Optional[str]:
+    # Database arguments such as BLAST's ``-db nr`` name a prefix shared by
+    # several index files (nr.pin, nr.psq, ...) rather than an existing path.
+    if not path.parent.is_dir():
+        return None
+    members = sorted(p for p in path.parent.glob(f"{path.name}.*") if p.is_file())
+    if not members:
+        return None
+    digest = hashlib.sha256()
+    for member in members:
+        stat = member.stat()
+        digest.update(f"{member.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return f"prefix:{digest.hexdigest()}"
+
+
+def fingerprint_input_paths(paths: Iterable[Tuple[str, str]]) -> Optional[Dict[str, str]]:
+    """Fingerprint local input paths given as ``(label, path)`` pairs.
+
+    Returns ``None`` when an input is missing or cannot be read, in which case
+    the run is not memoizable: two runs differing only in a missing input must
+    not share a key.
+    """
+    fingerprints: Dict[str, str] = {}
+    for label, raw_path in paths:
+        path = Path(raw_path).expanduser()
+        try:
+            if path.is_dir():
+                value = _fingerprint_directory(path)
+            elif path.is_file():
+                value = f"{path.name}:{hash_file_content(path)}"
+            else:
+                value = _fingerprint_prefix(path)
+        except OSError as exc:
+            logger.debug("Cannot fingerprint bio_tools input %s: %s", path, exc)
+            return None
+        if value is None:
+            logger.debug("bio_tools input %s does not exist; not caching the run", path)
+            return None
+        fingerprints[label] = value
+    return fingerprints
+
+
+async def resolve_image_digest(image: str) -> Optional[str]:
+    """Resolve the local image id for *image* via ``docker image inspect``."""
+    now = time.monotonic()
+    cached = _image_digest_memo.get(image)
+    if cached is not None and now - cached[1] < _IMAGE_DIGEST_TTL_SECONDS:
+        return cached[0]
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "docker",
+            "image",
+            "inspect",
+            "--format",
+            "{{.Id}}",
+            image,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, _stderr = await asyncio.wait_for(
+            process.communicate(),
+            timeout=_IMAGE_INSPECT_TIMEOUT_SECONDS,
+        )
+    except (OSError, asyncio.TimeoutError) as exc:
+        logger.debug("docker image inspect failed for %s: %s", image, exc)
+        return None
+
+    digest = stdout.decode("utf-8", errors="replace").strip() if stdout else ""
+    if process.returncode != 0 or not digest:
+        return None
+    _image_digest_memo[image] = (digest, now)
+    return digest
+
+
+def build_cache_key(
+    *,
+    tool_name: str,
+    operation: str,
+    params: Dict[str, Any],
+    output_file: Optional[str],
+    image_digest: str,
+    input_fingerprints: Dict[str, str],
+) -> str:
+    payload = {
+        "version": CACHE_KEY_VERSION,
+        "tool": tool_name,
+        "operation": operation,
+        "params": {str(k): str(v) for k, v in sorted((params or {}).items())},
+        "output_file": output_file or "",
+        "image": image_digest,
+        "inputs": dict(sorted(input_fingerprints.items())),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def snapshot_directory(root: Path) -> Dict[str, Tuple[int, int]]:
+    """Map every file under *root* to its ``(size, mtime_ns)``."""
+    snapshot: Dict[str, Tuple[int, int]] = {}
+    if not root.is_dir():
+        return snapshot
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            full = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(full)
+            except OSError:
+                continue
+            rel = os.path.relpath(full, root)
+            snapshot[rel] = (int(stat.st_size), int(stat.st_mtime_ns))
+    return snapshot
+
+
+def changed_files(
+    before: Dict[str, Tuple[int, int]],
+    after: Dict[str, Tuple[int, int]],
+) -> List[str]:
+    return sorted(rel for rel, meta in after.items() if before.get(rel) != meta)
+
+
+class OutputCapture:
+    """One run's window of writing into a shared tool directory.
+
+    Outputs are captured by diffing snapshots of the tool directory, which
+    cannot tell apart files written by two runs in the same directory at the
+    same time. A capture is ``exclusive`` only if no other run in that
+    directory overlapped it; non-exclusive runs must not be cached.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.exclusive = True
+
+    def finish(self) -> bool:
+        with _captures_lock:
+            active = _active_captures.get(self.directory)
+            if active is not None:
+                active.discard(self)
+                if not active:
+                    _active_captures.pop(self.directory, None)
+        return self.exclusive
+
+
+_active_captures: Dict[str, Set[OutputCapture]] = {}
+_captures_lock = threading.Lock()
+
+
+def begin_output_capture(directory: Path) -> OutputCapture:
+    capture = OutputCapture(str(Path(directory).resolve()))
+    with _captures_lock:
+        active = _active_captures.setdefault(capture.directory, set())
+        active.add(capture)
+        if len(active) > 1:
+            for other in active:
+                other.exclusive = False
+    return capture
+
+
+class BioToolsResultCache:
+    """Content-addressed store of bio_tools run manifests and output files.
+
+    Layout under ``root``::
+
+        entries/<key>.json    run manifest; its mtime is the LRU timestamp
+        objects/<ab>/<sha256> output file blobs shared across entries
+    """
+
+    def __init__(self, root: Path, *, max_entries: int, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries_dir = self.root / "entries"
+        self._objects_dir = self.root / "objects"
+        self._lock = threading.RLock()
+
+    def _entry_path(self, key: str) -> Path:
+        return self._entries_dir / f"{key}.json"
+
+    def _object_path(self, digest: str) -> Path:
+        return self._objects_dir / digest[:2] / digest
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        entry_path = self._entry_path(key)
+        try:
+            manifest = json.loads(entry_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        for item in manifest.get("files", []):
+            if not self._object_path(str(item.get("sha256", ""))).is_file():
+                logger.warning("bio_tools cache entry %s lost blob %s; ignoring", key, item.get("sha256"))
+                self.discard(key)
+                return None
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        return manifest
+
+    def restore(self, manifest: Dict[str, Any], target_dir: Path) -> List[str]:
+        """Copy the cached output files of *manifest* back into *target_dir*."""
+        restored: List[str] = []
+        target_root = target_dir.resolve()
+        for item in manifest.get("files", []):
+            rel = str(item.get("path", ""))
+            destination = (target_root / rel).resolve()
+            if not destination.is_relative_to(target_root):
+                continue
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = destination.with_name(f".{destination.name}.{uuid.uuid4().hex[:8]}.tmp")
+            try:
+                shutil.copyfile(self._object_path(str(item["sha256"])), tmp_path)
+                os.replace(tmp_path, destination)
+            except OSError:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            restored.append(str(destination))
+        return restored
+
+    def store(
+        self,
+        key: str,
+        *,
+        result: Dict[str, Any],
+        base_dir: Path,
+        output_files: Sequence[str],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        with self._lock:
+            return self._store_locked(
+                key,
+                result=result,
+                base_dir=base_dir,
+                output_files=output_files,
+                metadata=metadata,
+            )
+
+    def _store_locked(
+        self,
+        key: str,
+        *,
+        result: Dict[str, Any],
+        base_dir: Path,
+        output_files: Sequence[str],
+        metadata: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        files: List[Dict[str, Any]] = []
+        total_bytes = 0
+        for rel in output_files:
+            source = base_dir / rel
+            if not source.is_file():
+                continue
+            digest = hash_file_content(source)
+            blob = self._object_path(digest)
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp_blob = blob.with_name(f".{digest}.{uuid.uuid4().hex[:8]}.tmp")
+                shutil.copyfile(source, tmp_blob)
+                os.replace(tmp_blob, blob)
+            size = source.stat().st_size
+            total_bytes += size
+            files.append({"path": rel, "sha256": digest, "size": size})
+
+        manifest = {
+            "key": key,
+            "created_at": time.time(),
+            "result": {k: v for k, v in result.items() if k not in _VOLATILE_RESULT_KEYS},
+            "files": files,
+            "total_bytes": total_bytes,
+            **(metadata or {}),
+        }
+        self._entries_dir.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(key)
+        tmp_entry = entry_path.with_name(f".{key}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp_entry.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_entry, entry_path)
+        self.evict()
+        return manifest
+
+    def discard(self, key: str) -> None:
+        """Drop the entry for *key*, e.g. after its blobs went missing."""
+        try:
+            self._entry_path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def evict(self) -> None:
+        """Drop least-recently-used entries beyond the limits and orphaned blobs."""
+        with self._lock:
+            entries: List[Tuple[float, Path, Dict[str, Any]]] = []
+            for entry_path in self._entries_dir.glob("*.json"):
+                try:
+                    manifest = json.loads(entry_path.read_text(encoding="utf-8"))
+                    entries.append((entry_path.stat().st_mtime, entry_path, manifest))
+                except (OSError, ValueError):
+                    continue
+            entries.sort(key=lambda item: item[0], reverse=True)
+
+            kept: List[Dict[str, Any]] = []
+            blob_sizes: Dict[str, int] = {}
+            for _mtime, entry_path, manifest in entries:
+                new_blobs = {
+                    str(item["sha256"]): int(item.get("size", 0))
+                    for item in manifest.get("files", [])
+                    if str(item.get("sha256")) not in blob_sizes
+                }
+                projected = sum(blob_sizes.values()) + sum(new_blobs.values())
+                if len(kept) >= self.max_entries or (kept and projected > self.max_bytes):
+                    try:
+                        entry_path.unlink()
+                    except FileNotFoundError:
+                        pass
+                    continue
+                kept.append(manifest)
+                blob_sizes.update(new_blobs)
+
+            if not self._objects_dir.is_dir():
+                return
+            for blob in self._objects_dir.glob("*/*"):
+                if blob.name.startswith("."):
+                    continue
+                if blob.name not in blob_sizes:
+                    try:
+                        blob.unlink()
+                    except FileNotFoundError:
+                        pass
+
+
+_caches: Dict[str, BioToolsResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(default_root: str) -> Optional[BioToolsResultCache]:
+    """Return the process-wide cache for the configured root, or ``None`` if disabled."""
+    config = ResultCacheConfig.from_env(default_root)
+    if not config.enabled:
+        return None
+    with _caches_lock:
+        cache = _caches.get(config.root)
+        if cache is None:
+            cache = BioToolsResultCache(
+                Path(config.root),
+                max_entries=config.max_entries,
+                max_bytes=config.max_bytes,
+            )
+            _caches[config.root] = cache
+        else:
+            cache.max_entries = config.max_entries
+            cache.max_bytes = config.max_bytes
+        return cache
@@ -0,0 +1,133 @@
+"""Resource footprints of built-in tools, derived from call arguments.
+
+Each function takes ``(arguments, context)`` — ``context`` carries the
+``session_id`` and ``plan_id`` of the calling agent — and returns the
+:class:`ToolResources` the call reads and writes.  The async tool executor
+uses them to run non-conflicting calls of one LLM turn concurrently.
+Raising (e.g. for an unknown operation) makes the executor fall back to the
+tool's ``is_concurrent_safe`` flag.  When a call's footprint cannot be worked
+out from its arguments (e.g. a missing path), the functions return
+:data:`UNKNOWN_RESOURCES` so the call runs alone rather than conflicting with
+nothing.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional
+
+from app.services.execution.async_tool_executor import (
+    UNKNOWN_RESOURCES,
+    ToolResources,
+    path_resource,
+    plan_resource,
+    session_resource,
+)
+
+_FILE_READ_OPERATIONS = {"read", "list", "profile", "census", "exists", "info"}
+_PLAN_READ_OPERATIONS = {"get", "todo_list", "review"}
+
+
+def _session(arguments: Dict[str, Any], context: Dict[str, Any]) -> Any:
+    return session_resource(arguments.get("session_id") or context.get("session_id"))
+
+
+def _footprint(
+    *, reads: Iterable[Optional[str]] = (), writes: Iterable[Optional[str]] = ()
+) -> ToolResources:
+    """Build a footprint, or UNKNOWN_RESOURCES if any resource is unresolved."""
+    reads, writes = list(reads), list(writes)
+    if not all(reads) or not all(writes):
+        return UNKNOWN_RESOURCES
+    return ToolResources.of(reads=reads, writes=writes)
+
+
+def no_local_resources(arguments: Dict[str, Any], context: Dict[str, Any]) -> ToolResources:
+    """Network- or index-only tools touch nothing other calls can write."""
+    return ToolResources()
+
+
+def file_operations_resources(arguments: Dict[str, Any], context: Dict[str, Any]) -> ToolResources:
+    operation = str(arguments.get("operation") or "").strip().lower()
+    path = path_resource(arguments.get("path"), context)
+    if operation in _FILE_READ_OPERATIONS:
+        return _footprint(reads=[path])
+    if operation in {"write", "delete"}:
+        return _footprint(writes=[path])
+    destination = path_resource(arguments.get("destination"), context)
+    if operation == "copy":
+        return _footprint(reads=[path], writes=[destination])
+    if operation == "move":
+        return _footprint(writes=[path, destination])
+    raise ValueError(f"unknown file operation: {operation!r}")
+
+
+def document_reader_resources(arguments: Dict[str, Any], context: Dict[str, Any]) -> ToolResources:
+    return _footprint(reads=[path_resource(arguments.get("file_path"), context)])
+
+
+def vision_reader_resources(arguments: Dict[str, Any], context: Dict[str, Any]) -> ToolResources:
+    paths = [
+        path_resource(arguments.get(key), context)
+        for key in ("file_path", "image_path")
+        if arguments.get(key)
+    ]
+    return _footprint(reads=paths or [None])
+
+
+def session_output_resources(arguments: Dict[str, Any], context: Dict[str, Any]) -> ToolResources:
+    """Tools that publish files into the session workspace as a whole."""
+    artifacts = arguments.get("artifacts") or []
+    if not isinstance(artifacts, list):
+        return UNKNOWN_RESOURCES
+    sources = [
+        path_resource(item.get("path") if isinstance(item, dict) else None, context)
+        for item in artifacts
+    ]
+    return _footprint(reads=sources, writes=[_session(arguments, context)])
+
+
+def literature_pipeline_resources(arguments: Dict[str, Any], context: Dict[str, Any]) -> ToolResources:
+    return _footprint(writes=[path_resource(arguments.get("out_dir"), context)])
+
+
+def sequence_fetch_resources(arguments: Dict[str, Any], context: Dict[str, Any]) -> ToolResources:
+    """Writes the named FASTA file, or the whole output directory without a name."""
+    from app.services.tool_output_resolver import get_tool_output_resolver
+    from tool_box.tools_impl.sequence_fetch import _safe_output_name
+
+    # Mirror the tool: it resolves its directory from the session_id argument only.
+    try:
+        output_dir = get_tool_output_resolver().resolve(
+            session_id=arguments.get("session_id") or None,
+            tool_name="sequence_fetch",
+            create=False,
+        )
+        output_name = arguments.get("output_name")
+        if isinstance(output_name, str) and output_name.strip():
+            target = output_dir / _safe_output_name(output_name, "")
+        else:
+            target = output_dir
+    except Exception:
+        return UNKNOWN_RESOURCES
+    return _footprint(writes=[path_resource(str(target))])
+
+
+def plan_operation_resources(arguments: Dict[str, Any], context: Dict[str, Any]) -> ToolResources:
+    operation = str(arguments.get("operation") or "").strip().lower()
+    plan = plan_resource(arguments.get("plan_id") or context.get("plan_id"))
+    if operation in _PLAN_READ_OPERATIONS:
+        return _footprint(reads=[plan])
+    if operation == "create":
+        # A new plan has no ID yet; only an explicit one can conflict.
+        writes = [_session(arguments, context)]
+        if plan:
+            writes.append(plan)
+        return _footprint(writes=writes)
+    if operation == "bind":
+        return _footprint(writes=[plan, _session(arguments, context)])
+    if operation == "execute_all":
+        # Runs every task of the plan, which may touch any file.
+        return UNKNOWN_RESOURCES
+    if operation in {"optimize", "update_task"}:
+        return _footprint(writes=[plan])
+    raise ValueError(f"unknown plan operation: {operation!r}")
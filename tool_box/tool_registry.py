@@ -11,6 +11,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List, Optional
 
+from . import resource_access
 from .tools import register_tool
 from .tools_impl.deliverable_submit import deliverable_submit_tool
 from .tools_impl import (
@@ -44,6 +45,8 @@ logger = logging.getLogger(__name__)
 # Keys match ToolDefinition fields added in Phase 1.1.
 # Only tools that differ from the conservative defaults need entries here;
 # tools not listed get is_read_only=False, is_concurrent_safe=False, etc.
+# ``resource_access`` (see tool_box/resource_access.py) lets the executor run
+# calls concurrently when the paths/plans/sessions they touch do not conflict.
 # ---------------------------------------------------------------------------
 _TOOL_METADATA: Dict[str, Dict[str, Any]] = {
     # --- read-only & concurrent-safe: pure information retrieval ---
@@ -51,31 +54,37 @@ _TOOL_METADATA: Dict[str, Dict[str, Any]] = {
         "is_read_only": True,
         "is_concurrent_safe": True,
         "search_hint": "search web internet query google perplexity",
+        "resource_access": resource_access.no_local_resources,
     },
     "literature_pipeline": {
         "is_read_only": True,
         "is_concurrent_safe": True,
         "search_hint": "paper literature pubmed scholar citation",
+        "resource_access": resource_access.literature_pipeline_resources,
     },
     "document_reader": {
         "is_read_only": True,
         "is_concurrent_safe": True,
         "search_hint": "read pdf docx document parse extract",
+        "resource_access": resource_access.document_reader_resources,
     },
     "vision_reader": {
         "is_read_only": True,
         "is_concurrent_safe": True,
         "search_hint": "image screenshot ocr visual analyze picture",
+        "resource_access": resource_access.vision_reader_resources,
     },
     "graph_rag": {
         "is_read_only": True,
         "is_concurrent_safe": True,
         "search_hint": "knowledge graph rag entity relation",
+        "resource_access": resource_access.no_local_resources,
     },
     "sequence_fetch": {
         "is_read_only": True,
         "is_concurrent_safe": True,
         "search_hint": "ncbi genbank sequence fasta accession fetch",
+        "resource_access": resource_access.sequence_fetch_resources,
     },
     "url_fetch": {
         "search_hint": "download public url link file http https fetch",
@@ -95,6 +104,7 @@ _TOOL_METADATA: Dict[str, Dict[str, Any]] = {
     # --- mutating tools (default: not concurrent-safe) ---
     "file_operations": {
         "search_hint": "file read write copy move delete list",
+        "resource_access": resource_access.file_operations_resources,
     },
     "phagescope": {
         "search_hint": "phage bacteriophage annotation pipeline submit",
@@ -120,9 +130,11 @@ _TOOL_METADATA: Dict[str, Dict[str, Any]] = {
     },
     "plan_operation": {
         "search_hint": "plan create review optimize task decompose",
+        "resource_access": resource_access.plan_operation_resources,
     },
     "deliverable_submit": {
         "search_hint": "deliverable artifact submit publish output",
+        "resource_access": resource_access.session_output_resources,
     },
     "scientific_figure_generator": {
         "is_concurrent_safe": True,
@@ -208,6 +220,7 @@ def _extract_registration_kwargs(tool_def: Dict[str, Any]) -> Dict[str, Any]:
         "is_concurrent_safe": tool_def.get("is_concurrent_safe", meta.get("is_concurrent_safe", False)),
         "is_destructive": tool_def.get("is_destructive", meta.get("is_destructive", False)),
         "search_hint": tool_def.get("search_hint", meta.get("search_hint", "")),
+        "resource_access": tool_def.get("resource_access", meta.get("resource_access")),
     }
 
 
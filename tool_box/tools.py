@@ -24,6 +24,9 @@ class ToolDefinition:
         is_concurrent_safe — safe to run in parallel with other concurrent-safe tools
         is_destructive     — tool may delete data, send emails, etc.
         search_hint        — extra keywords for semantic tool selection
+        resource_access    — ``(arguments, context) -> ToolResources`` naming the
+                             paths, plans and session directories a call
+                             reads/writes, used for concurrent scheduling
 
     All new fields default to conservative values so existing tool dicts
     continue to work without modification.
@@ -44,6 +47,7 @@ class ToolDefinition:
     is_concurrent_safe: bool = False
     is_destructive: bool = False
     search_hint: str = ""
+    resource_access: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Any]] = None
 
 
 class ToolRegistry:
@@ -146,6 +150,7 @@ class ToolRegistry:
             "is_concurrent_safe": tool.is_concurrent_safe,
             "is_destructive": tool.is_destructive,
             "search_hint": tool.search_hint,
+            "declares_resource_access": tool.resource_access is not None,
         }
 
 
@@ -173,6 +178,7 @@ def register_tool(
     is_concurrent_safe: bool = False,
     is_destructive: bool = False,
     search_hint: str = "",
+    resource_access: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Any]] = None,
 ) -> None:
     """Convenience function to register a tool"""
     tool_def = ToolDefinition(
@@ -189,6 +195,7 @@ def register_tool(
         is_concurrent_safe=is_concurrent_safe,
         is_destructive=is_destructive,
         search_hint=search_hint,
+        resource_access=resource_access,
     )
 
     _tool_registry.register_tool(tool_def)
@@ -293,17 +293,19 @@ def _build_deterministic_profile(
             if not name:
                 continue
             column_names.append(name)
-            compact_columns.append(
-                {
-                    "name": name,
-                    "dtype": str(column.get("dtype") or "").strip(),
-                    "null_count": int(column.get("null_count") or 0),
-                    "unique_count": int(column.get("unique_count") or 0),
-                    "sample_values": _format_profile_sample_values(
-                        column.get("sample_values")
-                    ),
-                }
-            )
+            unique_count = column.get("unique_count")
+            compact_column = {
+                "name": name,
+                "dtype": str(column.get("dtype") or "").strip(),
+                "null_count": int(column.get("null_count") or 0),
+                "unique_count": int(unique_count) if unique_count is not None else None,
+                "sample_values": _format_profile_sample_values(
+                    column.get("sample_values")
+                ),
+            }
+            if column.get("unique_count_at_least") is not None:
+                compact_column["unique_count_at_least"] = int(column["unique_count_at_least"])
+            compact_columns.append(compact_column)
 
         structured_profile = {
             "filename": basename,
@@ -315,6 +317,9 @@ def _build_deterministic_profile(
             "column_names": column_names,
             "columns": compact_columns,
         }
+        if metadata_dict.get("stats_truncated"):
+            structured_profile["stats_truncated"] = True
+            structured_profile["rows_profiled"] = metadata_dict.get("rows_profiled")
         structured_profiles.append(structured_profile)
         structured_sources.append((file_path, structured_profile))
 
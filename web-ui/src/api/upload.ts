@@ -1,5 +1,7 @@
 import { BaseApi } from './client';
 
+export type ExtractionStatus = 'queued' | 'running' | 'completed' | 'failed';
+
 export interface UploadResponse {
   success: boolean;
   file_path: string;
@@ -12,6 +14,9 @@ export interface UploadResponse {
   is_archive?: boolean;
   extracted_path?: string;
   extracted_files?: number;
+  extraction_id?: string;
+  extraction_status?: ExtractionStatus;
+  sha256?: string;
   session_id?: string;
 }
 
@@ -26,6 +31,19 @@ export interface UploadedFileInfo {
   is_archive?: boolean;
   extracted_path?: string;
   extracted_files?: number;
+  extraction_id?: string;
+  extraction_status?: ExtractionStatus;
+}
+
+export interface ExtractionStatusResponse {
+  success: boolean;
+  extraction_id: string;
+  session_id: string;
+  extracted_path: string;
+  status: ExtractionStatus;
+  extracted_files: number;
+  extracted_bytes: number;
+  error?: string | null;
 }
 
 export interface FileListResponse {
@@ -68,6 +86,13 @@ export class UploadApi extends BaseApi {
   listFiles = async (sessionId: string): Promise<FileListResponse> => {
   return this.get('/upload/list', { session_id: sessionId });
   };
+
+  /**
+  * archive extraction status
+  */
+  getExtractionStatus = async (extractionId: string, sessionId: string): Promise<ExtractionStatusResponse> => {
+  return this.get(`/upload/extractions/${extractionId}`, { session_id: sessionId });
+  };
 }
 
 export const uploadApi = new UploadApi();
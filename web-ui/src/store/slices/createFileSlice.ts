@@ -2,6 +2,62 @@ import { ChatSliceCreator } from './types';
 import { uploadApi } from '@api/upload';
 import { UploadedFile } from '@/types';
 
+const EXTRACTION_POLL_INTERVAL_MS = 1000;
+const EXTRACTION_POLL_MAX_ERRORS = 5;
+
+const isExtractionPending = (file: UploadedFile) =>
+  Boolean(file.extraction_id) &&
+  (file.extraction_status === 'queued' || file.extraction_status === 'running');
+
+// Archives are extracted in the background after upload; poll until the job
+// finishes so the attachment only advertises its extracted path once ready.
+const pollExtraction = (
+  set: Parameters<ChatSliceCreator>[0],
+  get: Parameters<ChatSliceCreator>[1],
+  file: UploadedFile,
+  sessionId: string,
+) => {
+  const extractionId = file.extraction_id;
+  if (!extractionId) {
+    return;
+  }
+  let errors = 0;
+
+  const tick = async () => {
+    const tracked = get().uploadedFiles.find((f) => f.extraction_id === extractionId);
+    if (!tracked || get().currentSession?.id !== sessionId) {
+      return;
+    }
+    try {
+      const status = await uploadApi.getExtractionStatus(extractionId, sessionId);
+      set((state) => ({
+        uploadedFiles: state.uploadedFiles.map((f) =>
+          f.extraction_id === extractionId
+            ? {
+                ...f,
+                extraction_status: status.status,
+                extraction_error: status.error ?? null,
+                extracted_files: status.extracted_files,
+              }
+            : f
+        ),
+      }));
+      if (status.status === 'completed' || status.status === 'failed') {
+        return;
+      }
+    } catch (error) {
+      errors += 1;
+      if (errors >= EXTRACTION_POLL_MAX_ERRORS) {
+        console.warn('Stopped polling archive extraction status:', error);
+        return;
+      }
+    }
+    setTimeout(tick, EXTRACTION_POLL_INTERVAL_MS);
+  };
+
+  setTimeout(tick, EXTRACTION_POLL_INTERVAL_MS);
+};
+
 export const createFileSlice: ChatSliceCreator = (set, get) => ({
   uploadedFiles: [],
   uploadingFiles: [],
@@ -26,6 +82,8 @@ export const createFileSlice: ChatSliceCreator = (set, get) => ({
         is_archive: response.is_archive,
         extracted_path: response.extracted_path,
         extracted_files: response.extracted_files,
+        extraction_id: response.extraction_id,
+        extraction_status: response.extraction_status,
       };
 
       // 找到旧的同名文件，尝试后台删除（不阻塞）
@@ -45,6 +103,10 @@ export const createFileSlice: ChatSliceCreator = (set, get) => ({
         ],
       }));
 
+      if (isExtractionPending(uploadedFile)) {
+        pollExtraction(set, get, uploadedFile, session.id);
+      }
+
       return uploadedFile;
     } catch (error) {
       console.error('uploadfilefailed:', error);
@@ -54,6 +116,10 @@ export const createFileSlice: ChatSliceCreator = (set, get) => ({
 
   setUploadedFiles: (files: UploadedFile[]) => {
     set({ uploadedFiles: files });
+    const sessionId = get().currentSession?.id;
+    if (sessionId) {
+      files.filter(isExtractionPending).forEach((f) => pollExtraction(set, get, f, sessionId));
+    }
   },
 
   removeUploadedFile: async (fileId: string) => {
@@ -372,6 +372,13 @@ export const createMessageSlice: ChatSliceCreator = (set, get) => ({
   path: f.file_path,
   name: f.original_name || f.file_name,
   ...(f.extracted_path ? { extracted_path: f.extracted_path } : {}),
+  ...(f.extraction_id
+  ? {
+  extraction_id: f.extraction_id,
+  extraction_status: f.extraction_status,
+  extraction_error: f.extraction_error,
+  }
+  : {}),
   }))
   : undefined;
 
@@ -196,6 +196,9 @@ export interface ChatMessage {
       path: string;
       name: string;
       extracted_path?: string;
+      extraction_id?: string;
+      extraction_status?: 'queued' | 'running' | 'completed' | 'failed';
+      extraction_error?: string | null;
     }>;
     task_search_result?: boolean;
     tasks_found?: number;
@@ -10,6 +10,9 @@ export interface UploadedFile {
   is_archive?: boolean;
   extracted_path?: string;
   extracted_files?: number;
+  extraction_id?: string;
+  extraction_status?: 'queued' | 'running' | 'completed' | 'failed';
+  extraction_error?: string | null;
 }
 
 export interface ApiResponse<T = any> {